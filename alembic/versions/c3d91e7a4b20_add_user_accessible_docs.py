@@ -0,0 +1,40 @@
+"""add_user_accessible_docs
+
+Adds the user_accessible_docs materialization (user -> document with
+SeeContents), maintained incrementally by the xECM sync, and a unique index
+on kuaf_membership_flat so it can be refreshed CONCURRENTLY.
+
+Revision ID: c3d91e7a4b20
+Revises: 646bcaa46a68
+Create Date: 2026-04-08 10:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d91e7a4b20"
+down_revision: str | None = "646bcaa46a68"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_accessible_docs",
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("data_id", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "data_id"),
+    )
+    op.create_index("ix_user_accessible_docs_data_id", "user_accessible_docs", ["data_id"])
+
+    # REFRESH MATERIALIZED VIEW CONCURRENTLY requiere un índice único
+    op.execute("CREATE UNIQUE INDEX ux_kuaf_flat_member_group ON kuaf_membership_flat(member_id, group_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ux_kuaf_flat_member_group")
+    op.drop_index("ix_user_accessible_docs_data_id", table_name="user_accessible_docs")
+    op.drop_table("user_accessible_docs")
@@ -0,0 +1,33 @@
+"""add_embedding_cache
+
+Adds the content-addressed chunk embedding cache (SHA-256 key -> float16
+bytes) consulted by IndexingService and the indexing DAGs before Gemini.
+
+Revision ID: d5a8f2c61e93
+Revises: c3d91e7a4b20
+Create Date: 2026-04-09 10:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a8f2c61e93"
+down_revision: str | None = "c3d91e7a4b20"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_cache",
+        sa.Column("key", sa.LargeBinary(), primary_key=True),
+        sa.Column("embedding", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("embedding_cache")
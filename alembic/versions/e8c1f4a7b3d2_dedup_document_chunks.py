@@ -0,0 +1,355 @@
+"""dedup_document_chunks
+
+Cross-document deduplication of chunk text.  Every ``document_chunks`` row
+keeps its ``(document_id, chunk_index, area, metadata)`` membership, but
+only one row per distinct text — the *canonical* row — carries the
+embedding and is indexed by HNSW (NULL embeddings are not indexed) and by
+the (now partial) GIN index on ``content_tsv``.
+
+* ``content_hash`` = ``sha256(convert_to(content, 'UTF8'))``, same as
+  ``chunk_diff.chunk_content_hash``.
+* ``trg_document_chunks_dedup`` (BEFORE INSERT): computes the hash; if a
+  canonical row with that hash exists, the new row is stored as a
+  reference (``is_canonical = false``, ``embedding = NULL``).  The canonical
+  embedding is kept: the new vector only fills it when it is NULL (nothing
+  says the new one is fresher; re-embedding with a new model re-indexes
+  every row, which goes through delete + promote).
+* Concurrency: the lookup runs under ``pg_advisory_xact_lock`` on the hash,
+  so two transactions inserting the same new text are serialized and only
+  the first becomes canonical (a row lock cannot cover a row that does not
+  exist yet).  ``ux_document_chunks_canonical_hash`` (UNIQUE on
+  ``content_hash`` WHERE ``is_canonical``) enforces one canonical row per
+  text.  Writers inserting many texts in one transaction should do it in
+  hash order to avoid lock-order deadlocks (``rag_bulk_indexing`` does).
+* ``trg_document_chunks_promote`` (AFTER DELETE): deleting a canonical row
+  promotes the oldest remaining reference and hands it the embedding
+  (under the same advisory lock).
+* ``hybrid_search`` is redefined to search canonical rows and apply the ACL
+  through any row that shares the text (see ``PgVectorStore``).
+
+Revision ID: e8c1f4a7b3d2
+Revises: d5a8f2c61e93
+Create Date: 2026-05-04 10:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8c1f4a7b3d2"
+down_revision: str | None = "d5a8f2c61e93"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+_HYBRID_SEARCH_DEDUP = """
+    CREATE OR REPLACE FUNCTION hybrid_search(
+        p_embedding    halfvec,
+        p_query_text   text,
+        p_match_count  int     DEFAULT 50,
+        p_rrf_k        int     DEFAULT 60,
+        p_doc_ids      bigint[] DEFAULT NULL
+    )
+    RETURNS TABLE (
+        id            uuid,
+        document_id   bigint,
+        chunk_index   int,
+        content       text,
+        area          text,
+        metadata      jsonb,
+        document_name text,
+        rrf_score     float8
+    )
+    LANGUAGE sql
+    STABLE
+    AS $$
+    WITH
+    -- ── Vector search: top-30 textos distintos visibles ──────────────
+    vector_candidates AS MATERIALIZED (
+        SELECT dc.content_hash, dc.embedding <=> p_embedding AS distance
+        FROM document_chunks dc
+        WHERE dc.embedding IS NOT NULL
+          AND EXISTS (
+              SELECT 1
+              FROM document_chunks ref
+              JOIN documents d ON d.id = ref.document_id
+              WHERE ref.content_hash = dc.content_hash
+                AND d.is_active = true
+                AND (p_doc_ids IS NULL OR ref.document_id = ANY(p_doc_ids))
+          )
+        ORDER BY dc.embedding <=> p_embedding
+        LIMIT 30
+    ),
+    vector_ranked AS (
+        SELECT content_hash, ROW_NUMBER() OVER (ORDER BY min(distance)) AS rank
+        FROM vector_candidates
+        GROUP BY content_hash
+    ),
+
+    -- ── BM25 search: top-30 sobre filas canónicas ─────────────────────
+    bm25_candidates AS MATERIALIZED (
+        SELECT dc.content_hash,
+               ts_rank_cd(dc.content_tsv, plainto_tsquery('spanish', p_query_text)) AS score
+        FROM document_chunks dc
+        WHERE dc.is_canonical
+          AND dc.content_tsv @@ plainto_tsquery('spanish', p_query_text)
+          AND EXISTS (
+              SELECT 1
+              FROM document_chunks ref
+              JOIN documents d ON d.id = ref.document_id
+              WHERE ref.content_hash = dc.content_hash
+                AND d.is_active = true
+                AND (p_doc_ids IS NULL OR ref.document_id = ANY(p_doc_ids))
+          )
+        ORDER BY score DESC
+        LIMIT 30
+    ),
+    bm25_ranked AS (
+        SELECT content_hash, ROW_NUMBER() OVER (ORDER BY max(score) DESC) AS rank
+        FROM bm25_candidates
+        GROUP BY content_hash
+    ),
+
+    -- ── RRF Fusion por texto: score = Σ 1/(k + rank) ──────────────────
+    fused AS (
+        SELECT content_hash, sum(1.0 / (p_rrf_k + rank)) AS rrf_score
+        FROM (
+            SELECT content_hash, rank FROM vector_ranked
+            UNION ALL
+            SELECT content_hash, rank FROM bm25_ranked
+        ) ranked
+        GROUP BY content_hash
+        ORDER BY rrf_score DESC
+        LIMIT p_match_count
+    )
+
+    -- ── Una fila por texto, atribuida a un documento visible ─────────
+    SELECT
+        rep.id,
+        rep.document_id,
+        rep.chunk_index,
+        rep.content,
+        rep.area::text,
+        rep.metadata,
+        rep.filename  AS document_name,
+        f.rrf_score
+    FROM fused f
+    JOIN LATERAL (
+        SELECT ref.id, ref.document_id, ref.chunk_index, ref.content, ref.area, ref.metadata, d.filename
+        FROM document_chunks ref
+        JOIN documents d ON d.id = ref.document_id
+        WHERE ref.content_hash = f.content_hash
+          AND d.is_active = true
+          AND (p_doc_ids IS NULL OR ref.document_id = ANY(p_doc_ids))
+        ORDER BY ref.is_canonical DESC, ref.document_id, ref.chunk_index
+        LIMIT 1
+    ) rep ON true
+    ORDER BY f.rrf_score DESC
+    $$;
+"""
+
+# Definición de la migración 004 (restaurada en downgrade)
+_HYBRID_SEARCH_004 = """
+    CREATE OR REPLACE FUNCTION hybrid_search(
+        p_embedding    halfvec,
+        p_query_text   text,
+        p_match_count  int     DEFAULT 50,
+        p_rrf_k        int     DEFAULT 60,
+        p_doc_ids      bigint[] DEFAULT NULL
+    )
+    RETURNS TABLE (
+        id            uuid,
+        document_id   bigint,
+        chunk_index   int,
+        content       text,
+        area          text,
+        metadata      jsonb,
+        document_name text,
+        rrf_score     float8
+    )
+    LANGUAGE sql
+    STABLE
+    AS $$
+    WITH
+    vector_ranked AS (
+        SELECT dc.id, dc.document_id, dc.chunk_index, dc.content, dc.area::text, dc.metadata,
+               d.filename AS document_name,
+               ROW_NUMBER() OVER (ORDER BY dc.embedding <=> p_embedding) AS rank
+        FROM document_chunks dc
+        JOIN documents d ON dc.document_id = d.id
+        WHERE d.is_active = true
+          AND dc.embedding IS NOT NULL
+          AND (p_doc_ids IS NULL OR dc.document_id = ANY(p_doc_ids))
+        ORDER BY dc.embedding <=> p_embedding
+        LIMIT 30
+    ),
+    bm25_ranked AS (
+        SELECT dc.id, dc.document_id, dc.chunk_index, dc.content, dc.area::text, dc.metadata,
+               d.filename AS document_name,
+               ROW_NUMBER() OVER (
+                   ORDER BY ts_rank_cd(dc.content_tsv, plainto_tsquery('spanish', p_query_text)) DESC
+               ) AS rank
+        FROM document_chunks dc
+        JOIN documents d ON dc.document_id = d.id
+        WHERE d.is_active = true
+          AND dc.content_tsv @@ plainto_tsquery('spanish', p_query_text)
+          AND (p_doc_ids IS NULL OR dc.document_id = ANY(p_doc_ids))
+        ORDER BY ts_rank_cd(dc.content_tsv, plainto_tsquery('spanish', p_query_text)) DESC
+        LIMIT 30
+    ),
+    all_chunks AS (
+        SELECT id, document_id, chunk_index, content, area, metadata, document_name FROM vector_ranked
+        UNION
+        SELECT id, document_id, chunk_index, content, area, metadata, document_name FROM bm25_ranked
+    ),
+    rrf AS (
+        SELECT ac.*,
+               COALESCE(1.0 / (p_rrf_k + vr.rank), 0.0) + COALESCE(1.0 / (p_rrf_k + br.rank), 0.0) AS rrf_score
+        FROM all_chunks ac
+        LEFT JOIN vector_ranked vr ON ac.id = vr.id
+        LEFT JOIN bm25_ranked  br ON ac.id = br.id
+    )
+    SELECT id, document_id, chunk_index, content, area, metadata, document_name, rrf_score
+    FROM rrf
+    ORDER BY rrf_score DESC
+    LIMIT p_match_count
+    $$;
+"""
+
+
+def upgrade() -> None:
+    # -------------------------------------------------------------------------
+    # 1. Columnas y backfill del hash
+    # -------------------------------------------------------------------------
+    op.execute("ALTER TABLE document_chunks ADD COLUMN content_hash bytea")
+    op.execute("ALTER TABLE document_chunks ADD COLUMN is_canonical boolean NOT NULL DEFAULT true")
+    op.execute("UPDATE document_chunks SET content_hash = sha256(convert_to(content, 'UTF8'))")
+    op.execute("ALTER TABLE document_chunks ALTER COLUMN content_hash SET NOT NULL")
+    op.execute("CREATE INDEX ix_document_chunks_content_hash ON document_chunks (content_hash)")
+
+    # -------------------------------------------------------------------------
+    # 2. Duplicados existentes: la fila más antigua con embedding queda canónica
+    # -------------------------------------------------------------------------
+    op.execute("""
+        WITH ranked AS (
+            SELECT id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY content_hash
+                       ORDER BY embedding IS NULL, created_at, id
+                   ) AS rn
+            FROM document_chunks
+        )
+        UPDATE document_chunks dc
+        SET is_canonical = false, embedding = NULL
+        FROM ranked r
+        WHERE r.id = dc.id AND r.rn > 1
+    """)
+
+    # -------------------------------------------------------------------------
+    # 3. GIN parcial: solo las filas canónicas entran al índice BM25
+    # -------------------------------------------------------------------------
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_content_tsv")
+    op.execute(
+        "CREATE INDEX ix_document_chunks_content_tsv ON document_chunks USING gin(content_tsv) WHERE is_canonical"
+    )
+    # Una sola fila canónica por texto (el paso 2 ya dejó una por hash)
+    op.execute(
+        "CREATE UNIQUE INDEX ux_document_chunks_canonical_hash ON document_chunks (content_hash) WHERE is_canonical"
+    )
+
+    # -------------------------------------------------------------------------
+    # 4. Triggers de deduplicación / promoción
+    # -------------------------------------------------------------------------
+    op.execute("""
+        CREATE OR REPLACE FUNCTION document_chunks_dedup() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            canonical_id uuid;
+        BEGIN
+            NEW.content_hash := sha256(convert_to(NEW.content, 'UTF8'));
+            -- Serializa inserts concurrentes del mismo texto (FOR UPDATE no
+            -- bloquea una fila que todavía no existe); se libera al commit
+            PERFORM pg_advisory_xact_lock(hashtextextended(encode(NEW.content_hash, 'hex'), 0));
+            SELECT id INTO canonical_id
+            FROM document_chunks
+            WHERE content_hash = NEW.content_hash AND is_canonical AND id <> NEW.id
+            LIMIT 1;
+
+            IF canonical_id IS NULL THEN
+                NEW.is_canonical := true;
+                RETURN NEW;
+            END IF;
+
+            -- El embedding canónico se conserva; solo se completa si falta
+            IF NEW.embedding IS NOT NULL THEN
+                UPDATE document_chunks
+                SET embedding = NEW.embedding
+                WHERE id = canonical_id AND embedding IS NULL;
+            END IF;
+            NEW.is_canonical := false;
+            NEW.embedding := NULL;
+            RETURN NEW;
+        END
+        $$;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_document_chunks_dedup
+        BEFORE INSERT ON document_chunks
+        FOR EACH ROW EXECUTE FUNCTION document_chunks_dedup()
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION document_chunks_promote() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtextextended(encode(OLD.content_hash, 'hex'), 0));
+            UPDATE document_chunks
+            SET is_canonical = true, embedding = OLD.embedding
+            WHERE id = (
+                SELECT id
+                FROM document_chunks
+                WHERE content_hash = OLD.content_hash AND NOT is_canonical
+                ORDER BY created_at, id
+                LIMIT 1
+                FOR UPDATE
+            );
+            RETURN NULL;
+        END
+        $$;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_document_chunks_promote
+        AFTER DELETE ON document_chunks
+        FOR EACH ROW WHEN (OLD.is_canonical)
+        EXECUTE FUNCTION document_chunks_promote()
+    """)
+
+    # -------------------------------------------------------------------------
+    # 5. hybrid_search sobre filas canónicas con ACL por cualquier referencia
+    # -------------------------------------------------------------------------
+    op.execute(_HYBRID_SEARCH_DEDUP)
+
+
+def downgrade() -> None:
+    op.execute(_HYBRID_SEARCH_004)
+    op.execute("DROP TRIGGER IF EXISTS trg_document_chunks_promote ON document_chunks")
+    op.execute("DROP TRIGGER IF EXISTS trg_document_chunks_dedup ON document_chunks")
+    op.execute("DROP FUNCTION IF EXISTS document_chunks_promote()")
+    op.execute("DROP FUNCTION IF EXISTS document_chunks_dedup()")
+
+    # Las referencias vuelven a tener su propio embedding
+    op.execute("""
+        UPDATE document_chunks ref
+        SET embedding = c.embedding
+        FROM document_chunks c
+        WHERE NOT ref.is_canonical
+          AND c.is_canonical
+          AND c.content_hash = ref.content_hash
+    """)
+
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_content_tsv")
+    op.execute("CREATE INDEX ix_document_chunks_content_tsv ON document_chunks USING gin(content_tsv)")
+    op.execute("DROP INDEX IF EXISTS ux_document_chunks_canonical_hash")
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_content_hash")
+    op.execute("ALTER TABLE document_chunks DROP COLUMN IF EXISTS is_canonical")
+    op.execute("ALTER TABLE document_chunks DROP COLUMN IF EXISTS content_hash")
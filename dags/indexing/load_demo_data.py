@@ -583,6 +583,9 @@ with DAG(
         validator = FileValidator()
         chunker = AdaptiveChunker()
         embedding_service = GeminiEmbeddingService()
+        # One event loop for the whole batch: the async Gemini client is bound
+        # to the loop it first ran on, so asyncio.run() per document breaks it.
+        runner = asyncio.Runner()
 
         indexed_results = []
         failed_results = []
@@ -591,7 +594,7 @@ with DAG(
         total_tokens = 0
 
         # Create a temp directory for GCS downloads (not used in local mode)
-        with tempfile.TemporaryDirectory(prefix="airflow_index_") as tmpdir:
+        with runner, tempfile.TemporaryDirectory(prefix="airflow_index_") as tmpdir:
             for doc_idx, doc_info in enumerate(documents, 1):
                 filename = doc_info["filename"]
                 file_hash = doc_info["file_hash"]
@@ -658,7 +661,7 @@ with DAG(
 
                     # 4. Generate embeddings
                     texts = [c.text for c in chunks]
-                    embeddings = asyncio.run(embedding_service.embed_documents(texts))
+                    embeddings = runner.run(embedding_service.embed_documents(texts))
                     logger.info(
                         "embedded doc_id=%s embeddings=%d",
                         document_id,
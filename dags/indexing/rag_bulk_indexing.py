@@ -0,0 +1,533 @@
+"""DAG de indexacion masiva (bulk) para el sistema RAG.
+
+Variante orientada a throughput de ``rag_indexing``: en lugar de un
+dag_run por documento (y un ``GeminiEmbeddingService`` + ``asyncio.run``
+por documento), selecciona los documentos pendientes, los reparte en
+shards balanceados por tamaño de archivo y los procesa con dynamic task
+mapping (``index_shard.expand``).  Cada shard reutiliza:
+
+  - **un event loop** (``asyncio.Runner``) y **un cliente de embeddings**
+    para todos sus documentos;
+  - **una conexion psycopg** para el cache de embeddings y la escritura;
+  - un ``ChunkingPool`` que carga y chunkea los archivos del shard en
+    paralelo mientras el hilo principal embebe y escribe.
+
+La escritura de cada documento es un ``COPY`` de todos sus chunks mas la
+actualizacion de ``documents`` y ``pipeline_runs`` en la misma transaccion.
+Se hace commit por documento, asi que un reintento de Airflow del mismo
+shard saltea los documentos que ya quedaron ``indexed``.
+
+Deduplicacion: los chunks cuyo texto ya tiene fila canonica embebida en
+otro documento no se embeben; se copian con ``embedding`` NULL y el trigger
+de ``document_chunks`` los guarda como referencias (ver migracion
+``e8c1f4a7b3d2``).
+
+Los documentos que fallan se reparten en shards nuevos y se reintentan una
+sola vez en ``retry_failed_documents`` (el resto del lote no se vuelve a
+procesar).  ``report_results`` resume docs/s y chunks/s por shard.
+
+Variables de Airflow:
+  - ``bulk_index_shard_size`` (default 20): documentos por shard.
+  - ``bulk_index_max_documents`` (default 1000): documentos por corrida.
+
+Shards en paralelo: ``_MAX_PARALLEL_SHARDS`` (4), constante del DAG y no
+Variable, porque ``max_active_tis_per_dagrun`` se evalúa al parsear el
+archivo (leer una Variable ahí consulta la metadata DB en cada parseo).
+Limita la concurrencia total contra Gemini dentro de la corrida.
+
+Disparo manual:
+  {"conf": {"statuses": ["pending", "failed"]}}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from airflow.sdk import DAG, task
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Default args
+# ---------------------------------------------------------------------------
+DEFAULT_ARGS = {
+    "retries": 2,
+    "retry_delay": timedelta(minutes=1),
+    "retry_exponential_backoff": True,
+    "max_retry_delay": timedelta(minutes=10),
+}
+
+_DEFAULT_SHARD_SIZE = 20
+_DEFAULT_MAX_DOCUMENTS = 1000
+_MAX_PARALLEL_SHARDS = 4
+_DEFAULT_STATUSES = ["pending"]
+_SELECTABLE_STATUSES = {"pending", "stale", "failed"}
+
+_EMBEDDED_HASHES_SQL = """
+    SELECT content_hash
+    FROM document_chunks
+    WHERE content_hash = ANY(%s)
+      AND is_canonical
+      AND embedding IS NOT NULL
+      AND document_id <> %s
+"""
+
+_COPY_CHUNKS_SQL = """
+    COPY document_chunks (document_id, chunk_index, content, embedding, area, token_count, metadata)
+    FROM STDIN
+"""
+
+
+def _get_int_variable(name: str, default: int) -> int:
+    """Read an int Airflow Variable (call it inside tasks, not at parse time)."""
+    try:
+        from airflow.models import Variable
+
+        return int(Variable.get(name, default_var=str(default)))
+    except Exception:
+        return default
+
+
+# ---------------------------------------------------------------------------
+# Helpers: sync DB access via psycopg (same pattern as rag_indexing DAG)
+# ---------------------------------------------------------------------------
+def _get_db_url() -> str:
+    """Get the DATABASE_URL from environment, suitable for sync psycopg."""
+    url = os.environ.get("DATABASE_URL", "")
+    if not url:
+        raise RuntimeError("DATABASE_URL environment variable is not set")
+    return url
+
+
+def _get_sync_connection():
+    """Create a sync psycopg connection from DATABASE_URL."""
+    import psycopg
+
+    url = _get_db_url()
+    if "+psycopg" in url:
+        url = url.replace("+psycopg", "")
+    elif "+asyncpg" in url:
+        url = url.replace("+asyncpg", "")
+    return psycopg.connect(url)
+
+
+def _download_from_gcs(gcs_uri: str, dest_dir: str) -> Path:
+    """Download a gs://bucket/path object into *dest_dir*."""
+    from google.cloud import storage
+
+    bucket_name, _, blob_path = gcs_uri[5:].partition("/")
+    if not blob_path:
+        raise ValueError(f"No object path in GCS URI: {gcs_uri}")
+
+    # Prefijo unico: dos documentos del shard pueden tener el mismo nombre
+    local_path = Path(dest_dir) / f"{uuid.uuid4().hex[:8]}_{blob_path.rsplit('/', 1)[-1]}"
+    storage.Client().bucket(bucket_name).blob(blob_path).download_to_filename(str(local_path))
+    return local_path
+
+
+def _partition(documents: list[dict], shard_size: int) -> list[list[dict]]:
+    """Split *documents* into ``ceil(n / shard_size)`` shards balanced by file size.
+
+    Largest-first greedy assignment to the lightest shard, so one shard
+    does not end up with every large PDF.
+    """
+    if not documents:
+        return []
+    shard_count = -(-len(documents) // max(shard_size, 1))
+    shards: list[list[dict]] = [[] for _ in range(shard_count)]
+    loads = [0] * shard_count
+    for doc in sorted(documents, key=lambda d: d.get("file_size") or 0, reverse=True):
+        lightest = min(range(shard_count), key=lambda i: (loads[i], len(shards[i])))
+        shards[lightest].append(doc)
+        loads[lightest] += doc.get("file_size") or 0
+    return shards
+
+
+def _embed_new_chunks(runner, cache, conn, document_id: int, chunks: list):
+    """Embed only the chunks whose text is not indexed by another document.
+
+    Returns ``(embeddings, stats)``; already indexed texts get ``None``
+    (``stats`` is ``None`` when nothing had to be embedded).
+    """
+    from src.infrastructure.rag.chunking.chunk_diff import chunk_content_hash
+
+    hashes = [chunk_content_hash(c.text) for c in chunks]
+    with conn.cursor() as cur:
+        cur.execute(_EMBEDDED_HASHES_SQL, (list(set(hashes)), document_id))
+        indexed = {bytes(row[0]) for row in cur.fetchall()}
+    conn.commit()
+
+    embeddings: list = [None] * len(chunks)
+    pending = [i for i, h in enumerate(hashes) if h not in indexed]
+    if not pending:
+        return embeddings, None
+    vectors, stats = runner.run(cache.embed_documents_with_stats([chunks[i].text for i in pending]))
+    for i, vector in zip(pending, vectors, strict=True):
+        embeddings[i] = vector
+    return embeddings, stats
+
+
+def _backfill_canonical_embeddings(runner, cache, conn, document_id: int) -> int:
+    """Embed canonical rows of *document_id* left without vector (canonical deleted concurrently)."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT id, content FROM document_chunks WHERE document_id = %s AND is_canonical AND embedding IS NULL",
+            (document_id,),
+        )
+        missing = cur.fetchall()
+        if missing:
+            vectors = runner.run(cache.embed_documents([row[1] for row in missing]))
+            cur.executemany(
+                "UPDATE document_chunks SET embedding = %s::halfvec WHERE id = %s",
+                [("[" + ",".join(map(str, v)) + "]", row[0]) for row, v in zip(missing, vectors, strict=True)],
+            )
+    conn.commit()
+    return len(missing)
+
+
+def _store_document(conn, document_id: int, dag_run_id: str, chunks: list, embeddings: list) -> dict[str, int]:
+    """Replace the chunks of one document with a single ``COPY`` and mark it indexed.
+
+    Chunks, document status and the ``pipeline_runs`` row are written in one
+    transaction; ``None`` embeddings are copied as NULL (dedup references).
+    Rows are copied in ``content_hash`` order: the dedup trigger takes an
+    advisory lock per hash until commit, and a common order keeps parallel
+    shards that share texts from deadlocking.
+    Returns the areas distribution.
+    """
+    from src.infrastructure.rag.chunking.chunk_diff import chunk_content_hash
+
+    order = sorted(range(len(chunks)), key=lambda i: chunk_content_hash(chunks[i].text))
+    areas: dict[str, int] = {}
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM document_chunks WHERE document_id = %s", (document_id,))
+        with cur.copy(_COPY_CHUNKS_SQL) as copy:
+            for idx in order:
+                chunk, embedding = chunks[idx], embeddings[idx]
+                area = chunk.metadata.get("area", "general") if chunk.metadata else "general"
+                areas[area] = areas.get(area, 0) + 1
+                copy.write_row(
+                    (
+                        document_id,
+                        idx,
+                        chunk.text,
+                        None if embedding is None else "[" + ",".join(map(str, embedding)) + "]",
+                        area,
+                        chunk.token_count,
+                        json.dumps(chunk.metadata or {}),
+                    )
+                )
+        indexing = {
+            "chunk_count": len(chunks),
+            "total_tokens": sum(c.token_count for c in chunks),
+            "areas": areas,
+        }
+        cur.execute(
+            """
+            UPDATE documents
+            SET status = 'indexed',
+                metadata = COALESCE(metadata, '{}'::jsonb) || jsonb_build_object('indexing', %s::jsonb),
+                updated_at = now()
+            WHERE id = %s
+            """,
+            (json.dumps(indexing), document_id),
+        )
+        cur.execute(
+            """
+            INSERT INTO pipeline_runs (id, document_id, dag_run_id, status, started_at, finished_at)
+            VALUES (%s, %s, %s, 'completed', now(), now())
+            """,
+            (str(uuid.uuid4()), document_id, dag_run_id),
+        )
+    conn.commit()
+    return areas
+
+
+def _mark_failed(conn, document_id: int, dag_run_id: str, error: str) -> None:
+    """Record a failed document (status + pipeline_runs row)."""
+    conn.rollback()
+    with conn.cursor() as cur:
+        cur.execute(
+            "UPDATE documents SET status = 'failed', updated_at = now() WHERE id = %s",
+            (document_id,),
+        )
+        cur.execute(
+            """
+            INSERT INTO pipeline_runs (id, document_id, dag_run_id, status, started_at, finished_at, error_message)
+            VALUES (%s, %s, %s, 'failed', now(), now(), %s)
+            """,
+            (str(uuid.uuid4()), document_id, dag_run_id, error[:2000]),
+        )
+    conn.commit()
+
+
+# ---------------------------------------------------------------------------
+# DAG definition
+# ---------------------------------------------------------------------------
+with DAG(
+    dag_id="rag_bulk_indexing",
+    description="Indexacion masiva por shards: select -> index_shard[] -> retry_failed[] -> report",
+    start_date=datetime(2025, 1, 1),
+    schedule=None,
+    catchup=False,
+    default_args=DEFAULT_ARGS,
+    tags=["indexing", "rag", "batch", "bulk"],
+    params={"statuses": _DEFAULT_STATUSES},
+) as dag:
+
+    @task()
+    def select_shards(**context) -> list[list[dict]]:
+        """Select pending documents and partition them into shards.
+
+        Returns one list of ``{document_id, file_path, file_size}`` per shard.
+        """
+        conf = context["dag_run"].conf or {}
+        statuses = conf.get("statuses") or _DEFAULT_STATUSES
+        invalid = set(statuses) - _SELECTABLE_STATUSES
+        if invalid:
+            raise ValueError(f"Invalid statuses {sorted(invalid)}. Must be in {sorted(_SELECTABLE_STATUSES)}.")
+
+        shard_size = _get_int_variable("bulk_index_shard_size", _DEFAULT_SHARD_SIZE)
+        max_documents = _get_int_variable("bulk_index_max_documents", _DEFAULT_MAX_DOCUMENTS)
+
+        with _get_sync_connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT id, file_path, file_size
+                FROM documents
+                WHERE status = ANY(%s) AND is_active = true
+                ORDER BY updated_at ASC
+                LIMIT %s
+                """,
+                (list(statuses), max_documents),
+            )
+            documents = [
+                {"document_id": row[0], "file_path": row[1], "file_size": row[2] or 0} for row in cur.fetchall()
+            ]
+
+        shards = _partition(documents, shard_size)
+        logger.info(
+            "select_shards statuses=%s documents=%d shards=%d shard_size=%d",
+            statuses,
+            len(documents),
+            len(shards),
+            shard_size,
+        )
+        return shards
+
+    @task(max_active_tis_per_dagrun=_MAX_PARALLEL_SHARDS)
+    def index_shard(shard: list[dict], **context) -> dict:
+        """Index every document of one shard with shared clients.
+
+        Per-document errors are recorded and returned in ``failed`` instead of
+        failing the task; an Airflow retry of the task (worker lost, DB down)
+        re-processes only the documents that are not ``indexed`` yet.
+        """
+        from src.config.settings import settings
+        from src.infrastructure.rag.chunking.process_pool import ChunkingPool
+        from src.infrastructure.rag.embeddings.chunk_cache import ChunkEmbeddingCache, PsycopgEmbeddingCacheStore
+        from src.infrastructure.rag.embeddings.gemini_embeddings import GeminiEmbeddingService
+
+        ti = context["ti"]
+        dag_run_id = context["dag_run"].run_id
+        shard_label = f"{ti.task_id}[{ti.map_index}]"
+        shard_start = time.perf_counter()
+
+        indexed: list[int] = []
+        failed: list[dict] = []
+        chunks_total = tokens_total = cache_hits = cache_misses = deduplicated = 0
+        embed_seconds = store_seconds = 0.0
+
+        with (
+            _get_sync_connection() as conn,
+            asyncio.Runner() as runner,
+            tempfile.TemporaryDirectory(prefix="airflow_bulk_") as tmpdir,
+        ):
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT id FROM documents WHERE id = ANY(%s) AND status <> 'indexed'",
+                    ([d["document_id"] for d in shard],),
+                )
+                todo = {row[0] for row in cur.fetchall()}
+            conn.commit()
+            skipped = [d["document_id"] for d in shard if d["document_id"] not in todo]
+            documents = [d for d in shard if d["document_id"] in todo]
+
+            # Rutas locales (descarga de GCS) -> documentos que las usan
+            by_path: dict[str, list[dict]] = {}
+            for doc in documents:
+                file_path = doc["file_path"]
+                try:
+                    if file_path.startswith("gs://"):
+                        file_path = str(_download_from_gcs(file_path, tmpdir))
+                except Exception as exc:
+                    logger.error("bulk_download_failed document_id=%s error=%s", doc["document_id"], exc)
+                    _mark_failed(conn, doc["document_id"], dag_run_id, f"Download failed: {exc}")
+                    failed.append({**doc, "error": f"Download failed: {exc}"})
+                    continue
+                by_path.setdefault(file_path, []).append(doc)
+
+            embedding_service = GeminiEmbeddingService()
+            cache = ChunkEmbeddingCache(PsycopgEmbeddingCacheStore(conn), embedding_service)
+            pool = ChunkingPool(settings.chunking_pool_workers)
+            try:
+                for chunked in pool.chunk_files(by_path):
+                    for doc in by_path[chunked.file_path]:
+                        document_id = doc["document_id"]
+                        try:
+                            chunked.raise_for_error()
+                            chunks = chunked.chunks
+
+                            started = time.perf_counter()
+                            embeddings, stats = _embed_new_chunks(runner, cache, conn, document_id, chunks)
+                            embed_seconds += time.perf_counter() - started
+
+                            started = time.perf_counter()
+                            _store_document(conn, document_id, dag_run_id, chunks, embeddings)
+                            backfilled = _backfill_canonical_embeddings(runner, cache, conn, document_id)
+                            if backfilled:
+                                logger.warning(
+                                    "bulk_dedup_embeddings_backfilled document_id=%s chunks=%d",
+                                    document_id,
+                                    backfilled,
+                                )
+                            store_seconds += time.perf_counter() - started
+
+                            indexed.append(document_id)
+                            chunks_total += len(chunks)
+                            tokens_total += sum(c.token_count for c in chunks)
+                            deduplicated += embeddings.count(None) - backfilled
+                            if stats is not None:
+                                cache_hits += stats.hits
+                                cache_misses += stats.misses
+                        except Exception as exc:
+                            logger.error(
+                                "bulk_document_failed shard=%s document_id=%s error=%s",
+                                shard_label,
+                                document_id,
+                                str(exc),
+                                exc_info=True,
+                            )
+                            _mark_failed(conn, document_id, dag_run_id, str(exc))
+                            failed.append({**doc, "error": str(exc)})
+            finally:
+                pool.shutdown()
+
+        wall = time.perf_counter() - shard_start
+        cache_total = cache_hits + cache_misses
+        result = {
+            "shard": shard_label,
+            "documents": len(shard),
+            "indexed": indexed,
+            "failed": failed,
+            "skipped": skipped,
+            "chunks": chunks_total,
+            "chunks_deduplicated": deduplicated,
+            "tokens": tokens_total,
+            "wall_seconds": round(wall, 2),
+            "embed_seconds": round(embed_seconds, 2),
+            "store_seconds": round(store_seconds, 2),
+            "docs_per_second": round(len(indexed) / wall, 3) if wall else 0.0,
+            "chunks_per_second": round(chunks_total / wall, 1) if wall else 0.0,
+            "cache_hit_rate": round(cache_hits / cache_total, 3) if cache_total else 0.0,
+        }
+        logger.info(
+            "bulk_shard_done shard=%s indexed=%d failed=%d skipped=%d chunks=%d deduplicated=%d wall=%.1fs "
+            "chunks_per_second=%.1f",
+            shard_label,
+            len(indexed),
+            len(failed),
+            len(skipped),
+            chunks_total,
+            deduplicated,
+            wall,
+            result["chunks_per_second"],
+        )
+        return result
+
+    @task()
+    def plan_retry(shard_results: list[dict]) -> list[list[dict]]:
+        """Re-shard only the documents that failed in the first pass."""
+        failed = [
+            {key: doc[key] for key in ("document_id", "file_path", "file_size")}
+            for result in shard_results
+            for doc in result["failed"]
+        ]
+        shards = _partition(failed, _get_int_variable("bulk_index_shard_size", _DEFAULT_SHARD_SIZE))
+        logger.info("plan_retry failed_documents=%d shards=%d", len(failed), len(shards))
+        return shards
+
+    @task(trigger_rule="all_done")
+    def report_results(shard_results: list[dict], retry_results: list[dict] | None = None) -> dict:
+        """Log per-shard throughput and the documents that still failed after the retry."""
+        shard_results = list(shard_results or [])
+        retry_results = list(retry_results or [])
+        all_results = shard_results + retry_results
+
+        recovered = {doc_id for result in retry_results for doc_id in result["indexed"]}
+        retried = {doc["document_id"] for result in shard_results for doc in result["failed"]}
+        still_failed = [doc for result in retry_results for doc in result["failed"]]
+        if not retry_results:
+            # Sin pasada de reintento (o no corrió): lo fallido sigue fallido
+            still_failed = [doc for result in shard_results for doc in result["failed"]]
+
+        lines = [
+            "=" * 72,
+            "BULK INDEXING REPORT - rag_bulk_indexing",
+            "=" * 72,
+            f"{'shard':<28} {'docs':>5} {'ok':>5} {'fail':>5} {'chunks':>7} "
+            f"{'wall s':>7} {'docs/s':>7} {'chunks/s':>9}",
+        ]
+        for result in all_results:
+            lines.append(
+                f"{result['shard'][:28]:<28} {result['documents']:>5} {len(result['indexed']):>5} "
+                f"{len(result['failed']):>5} {result['chunks']:>7} {result['wall_seconds']:>7.1f} "
+                f"{result['docs_per_second']:>7.2f} {result['chunks_per_second']:>9.1f}"
+            )
+
+        indexed_total = sum(len(r["indexed"]) for r in all_results)
+        chunks_total = sum(r["chunks"] for r in all_results)
+        # Los shards corren en paralelo: el wall-clock del lote es el del shard más lento por pasada
+        wall = max((r["wall_seconds"] for r in shard_results), default=0.0) + max(
+            (r["wall_seconds"] for r in retry_results), default=0.0
+        )
+        summary = {
+            "shards": len(shard_results),
+            "retry_shards": len(retry_results),
+            "documents_indexed": indexed_total,
+            "documents_retried": len(retried),
+            "documents_recovered": len(recovered),
+            "documents_failed": len(still_failed),
+            "failed": still_failed,
+            "chunks": chunks_total,
+            "chunks_deduplicated": sum(r.get("chunks_deduplicated", 0) for r in all_results),
+            "tokens": sum(r["tokens"] for r in all_results),
+            "wall_seconds": round(wall, 2),
+            "chunks_per_second": round(chunks_total / wall, 1) if wall else 0.0,
+        }
+        lines += [
+            "-" * 72,
+            f"indexed={indexed_total} retried={len(retried)} recovered={len(recovered)} failed={len(still_failed)}",
+            f"chunks={chunks_total} deduplicated={summary['chunks_deduplicated']} wall={wall:.1f}s "
+            f"throughput={summary['chunks_per_second']} chunks/s",
+            "=" * 72,
+        ]
+        for line in lines:
+            logger.info(line)
+        print("\n".join(lines))
+        return summary
+
+    # select -> index_shard[] -> plan_retry -> retry_failed_documents[] -> report
+    shards = select_shards()
+    first_pass = index_shard.expand(shard=shards)
+    retry_shards = plan_retry(first_pass)
+    retry_pass = index_shard.override(task_id="retry_failed_documents").expand(shard=retry_shards)
+    report_results(first_pass, retry_pass)
@@ -283,6 +283,13 @@ with DAG(
 
         Uses LoaderFactory (selects PDF/DOCX loader by MIME type) and
         AdaptiveChunker (~1000 tokens, 15% overlap, tables preserved).
+        PDFs are streamed page by page (``PDFLoader.iter_pages_parallel`` ->
+        ``AdaptiveChunker.chunk_pages``), so the full extracted text is never
+        held at once.  Memory is bounded only while loading: the chunk list
+        returned through XCom still carries every chunk text (about the size
+        of the extracted text), serialized as chunks are produced so chunk
+        objects and their XCom dicts are not both alive.  ``rag_bulk_indexing``
+        keeps chunks inside its task instead of pushing them to XCom.
         """
         document_id = validation_result["document_id"]
         file_path = Path(validation_result["file_path"])
@@ -291,29 +298,31 @@ with DAG(
         logger.info("load_and_chunk_start document_id=%s", document_id)
 
         try:
+            from src.config.settings import settings
             from src.infrastructure.rag.chunking.adaptive_chunker import AdaptiveChunker
             from src.infrastructure.rag.loaders.factory import LoaderFactory
+            from src.infrastructure.rag.loaders.pdf_loader import PDFLoader
 
-            loader_factory = LoaderFactory()
-            loaded_doc = loader_factory.load(file_path)
+            chunker = AdaptiveChunker()
 
-            logger.info(
-                "document_loaded document_id=%s pages=%d",
-                document_id,
-                loaded_doc.pages,
-            )
+            if validation_result.get("mime_type") == "application/pdf":
+                pdf_loader = PDFLoader()
+                page_numbers: list[int] = []
 
-            chunker = AdaptiveChunker()
-            chunks = chunker.chunk(loaded_doc)
+                def _pages():
+                    for page in pdf_loader.iter_pages_parallel(file_path, max_workers=settings.pdf_page_workers):
+                        page_numbers.append(page.page_number)
+                        yield page
 
-            logger.info(
-                "document_chunked document_id=%s chunks=%d tokens=%d",
-                document_id,
-                len(chunks),
-                sum(c.token_count for c in chunks),
-            )
+                chunks = chunker.chunk_pages(_pages(), pdf_loader.load_metadata(file_path))
+                page_count = None
+            else:
+                loaded_doc = LoaderFactory().load(file_path)
+                chunks = chunker.chunk(loaded_doc)
+                page_count = loaded_doc.pages
 
             # Serialize chunks for XCom (Airflow inter-task communication)
+            # while they are produced (the PDF path is a generator)
             serialized_chunks = [
                 {
                     "text": chunk.text,
@@ -322,13 +331,29 @@ with DAG(
                 }
                 for chunk in chunks
             ]
+            if page_count is None:
+                page_count = len(page_numbers)
+            total_tokens = sum(c["token_count"] for c in serialized_chunks)
+
+            logger.info(
+                "document_loaded document_id=%s pages=%d",
+                document_id,
+                page_count,
+            )
+
+            logger.info(
+                "document_chunked document_id=%s chunks=%d tokens=%d",
+                document_id,
+                len(serialized_chunks),
+                total_tokens,
+            )
 
             return {
                 **validation_result,
                 "chunks": serialized_chunks,
-                "chunk_count": len(chunks),
-                "total_tokens": sum(c.token_count for c in chunks),
-                "pages": loaded_doc.pages,
+                "chunk_count": len(serialized_chunks),
+                "total_tokens": total_tokens,
+                "pages": page_count,
             }
 
         except Exception as exc:
@@ -358,19 +383,24 @@ with DAG(
         )
 
         try:
+            from src.infrastructure.rag.embeddings.chunk_cache import ChunkEmbeddingCache, PsycopgEmbeddingCacheStore
             from src.infrastructure.rag.embeddings.gemini_embeddings import GeminiEmbeddingService
 
             embedding_service = GeminiEmbeddingService()
             texts = [c["text"] for c in chunks]
 
-            # Bridge async -> sync: Gemini SDK is async-native
-            embeddings = asyncio.run(embedding_service.embed_documents(texts))
+            # Bridge async -> sync: Gemini SDK is async-native.
+            # Chunks already embedded (same text/model/dims) come from embedding_cache.
+            with _get_sync_connection() as cache_conn:
+                cache = ChunkEmbeddingCache(PsycopgEmbeddingCacheStore(cache_conn), embedding_service)
+                embeddings = asyncio.run(cache.embed_documents(texts))
 
             logger.info(
-                "embeddings_generated document_id=%s count=%d dims=%d",
+                "embeddings_generated document_id=%s count=%d dims=%d cache_hit_rate=%.3f",
                 document_id,
                 len(embeddings),
                 len(embeddings[0]) if embeddings else 0,
+                cache.last_stats.hit_rate,
             )
 
             # Don't put full embeddings in XCom — they're too large.
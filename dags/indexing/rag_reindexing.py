@@ -7,11 +7,22 @@ Soporta dos modos:
   - **incremental** (default): re-indexa solo documentos con status='stale'
   - **full**: re-indexa todos los documentos con status='indexed'
 
+y dos estrategias de escritura (``strategy``):
+  - **diff** (default en incremental): compara los chunks nuevos con los
+    existentes por hash de contenido; solo inserta (y embebe) los chunks
+    nuevos, renumera los que se movieron y borra los que desaparecieron.
+    Una edición de un párrafo cuesta proporcional a la edición.
+  - **version** (default en full): inserta todos los chunks con un
+    ``version`` nuevo y ``cleanup_old_chunks`` borra los anteriores.  Es la
+    estrategia necesaria cuando cambia el modelo de embeddings (el texto no
+    cambia pero el vector sí).
+
 Schedule configurable via Airflow Variable `reindex_schedule` (default: @weekly).
 Batch size configurable via Airflow Variable `reindex_batch_size` (default: 10).
 
 Puede dispararse manualmente con:
   {"conf": {"mode": "full"}}  # o "incremental" (default)
+  {"conf": {"mode": "full", "strategy": "diff"}}  # nuevo chunking, mismo modelo
 
 Referencia: spec T3-S7-02 (DAG re-indexacion batch cron semanal/diario)
 """
@@ -88,6 +99,78 @@ def _get_sync_connection():
     return psycopg.connect(url)
 
 
+def _resolve_strategy(mode: str, strategy: str | None) -> str:
+    """Write strategy for *mode*: ``diff`` for incremental, ``version`` for full unless overridden."""
+    strategy = strategy or ("version" if mode == "full" else "diff")
+    if strategy not in ("diff", "version"):
+        raise ValueError(f"Invalid strategy '{strategy}'. Must be 'diff' or 'version'.")
+    return strategy
+
+
+def _apply_chunk_diff(conn, document_id: int, chunks: list, embed_texts, new_version: int) -> dict:
+    """Incremental write: keep unchanged chunks, insert new ones, delete vanished ones.
+
+    *embed_texts* is called with the texts of the inserted chunks only.
+    Everything is written in one transaction, so readers never see a mix.
+    """
+    from src.infrastructure.rag.chunking.chunk_diff import EXISTING_CHUNKS_SQL, ExistingChunk, diff_chunks
+
+    new_chunks = []
+    for chunk in chunks:
+        metadata = json.loads(json.dumps(chunk.metadata or {}))
+        new_chunks.append((chunk.text, metadata.get("area", "general"), metadata))
+
+    with conn.cursor() as cur:
+        cur.execute(EXISTING_CHUNKS_SQL, (document_id,))
+        existing = [ExistingChunk(*row) for row in cur.fetchall()]
+    # No dejar la transacción abierta mientras se llama a Gemini
+    conn.commit()
+
+    diff = diff_chunks(existing, new_chunks)
+    embeddings = embed_texts([new_chunks[i][0] for i in diff.inserted]) if diff.inserted else []
+
+    with conn.cursor() as cur:
+        if diff.deleted:
+            cur.execute("DELETE FROM document_chunks WHERE id = ANY(%s)", (diff.deleted,))
+        for kept in diff.updated:
+            _, area, metadata = new_chunks[kept.new_index]
+            if kept.area_changed:
+                cur.execute(
+                    "UPDATE document_chunks SET chunk_index = %s, area = %s, metadata = %s WHERE id = %s",
+                    (kept.new_index, area, json.dumps(metadata), kept.id),
+                )
+            else:
+                # Sin tocar la columna indexada ``area``: el UPDATE puede ser HOT
+                cur.execute(
+                    "UPDATE document_chunks SET chunk_index = %s, metadata = %s WHERE id = %s",
+                    (kept.new_index, json.dumps(metadata), kept.id),
+                )
+        for idx, embedding in zip(diff.inserted, embeddings, strict=True):
+            chunk = chunks[idx]
+            content, area, metadata = new_chunks[idx]
+            cur.execute(
+                """
+                INSERT INTO document_chunks
+                    (document_id, chunk_index, content, embedding,
+                     area, token_count, metadata, version)
+                VALUES
+                    (%s, %s, %s, CAST(%s AS halfvec), %s, %s, %s, %s)
+                """,
+                (
+                    document_id,
+                    idx,
+                    content,
+                    "[" + ",".join(map(str, embedding)) + "]",
+                    area,
+                    chunk.token_count,
+                    json.dumps(metadata),
+                    new_version,
+                ),
+            )
+    conn.commit()
+    return diff.summary()
+
+
 def _get_current_chunk_version(conn, document_id: int) -> int:
     """Get the current max version of chunks for a document."""
     with conn.cursor() as cur:
@@ -112,6 +195,7 @@ with DAG(
     tags=["indexing", "rag", "reindexing", "batch"],
     params={
         "mode": "incremental",
+        "strategy": None,
     },
 ) as dag:
 
@@ -122,7 +206,7 @@ with DAG(
         - incremental (default): documents with status='stale'
         - full: all documents with status='indexed'
 
-        Returns list of {document_id, file_path, current_version} dicts.
+        Returns list of {document_id, file_path, current_version, new_version, strategy} dicts.
         """
         conf = context["dag_run"].conf or {}
         mode = conf.get("mode", "incremental")
@@ -130,13 +214,16 @@ with DAG(
         if mode not in ("incremental", "full"):
             raise ValueError(f"Invalid mode '{mode}'. Must be 'incremental' or 'full'.")
 
+        strategy = _resolve_strategy(mode, conf.get("strategy"))
+
         batch_size = _get_batch_size()
 
         status_filter = "indexed" if mode == "full" else "stale"
 
         logger.info(
-            "select_documents mode=%s status_filter=%s batch_size=%d",
+            "select_documents mode=%s strategy=%s status_filter=%s batch_size=%d",
             mode,
+            strategy,
             status_filter,
             batch_size,
         )
@@ -164,6 +251,7 @@ with DAG(
                         "file_path": file_path,
                         "current_version": current_version,
                         "new_version": current_version + 1,
+                        "strategy": strategy,
                     }
                 )
 
@@ -180,11 +268,14 @@ with DAG(
 
         For each document:
         1. Load and chunk the document
-        2. Generate new embeddings
-        3. Store chunks with incremented version number
-
-        Processes sequentially within this task. Parallelism is achieved
-        by running multiple task instances via Airflow's task mapping.
+        2. ``diff``: diff against the stored chunks and embed/insert only the
+           new ones; ``version``: embed all chunks and store them with an
+           incremented version number
+
+        Loading and chunking run in a ``ChunkingPool`` (one process per core)
+        and stream back per document; embedding and storage then proceed
+        sequentially within this task, sharing one embedding client, one
+        event loop and one cache connection.
         """
         if not documents:
             logger.info("No documents to re-index.")
@@ -192,110 +283,156 @@ with DAG(
 
         results = []
 
-        for doc_info in documents:
-            document_id = doc_info["document_id"]
-            file_path_str = doc_info["file_path"]
-            new_version = doc_info["new_version"]
-
-            logger.info(
-                "reindex_start document_id=%s version=%d",
-                document_id,
-                new_version,
-            )
+        from src.config.settings import settings
+        from src.infrastructure.rag.chunking.process_pool import ChunkingPool
+        from src.infrastructure.rag.embeddings.chunk_cache import ChunkEmbeddingCache, PsycopgEmbeddingCacheStore
+        from src.infrastructure.rag.embeddings.gemini_embeddings import GeminiEmbeddingService
 
-            try:
-                from pathlib import Path
-
-                # Use the same components as rag_indexing DAG
-                from src.infrastructure.rag.chunking.adaptive_chunker import AdaptiveChunker
-                from src.infrastructure.rag.embeddings.gemini_embeddings import GeminiEmbeddingService
-                from src.infrastructure.rag.loaders.factory import LoaderFactory
+        by_path: dict[str, list[dict]] = {}
+        for doc_info in documents:
+            by_path.setdefault(doc_info["file_path"], []).append(doc_info)
+
+        # 1. Load and chunk every file across cores; each document continues
+        #    to embed/store as soon as its chunks are ready.
+        # One embedding client, event loop and cache connection for the whole
+        # batch (the async Gemini client is bound to the loop it first ran on).
+        pool = ChunkingPool(settings.chunking_pool_workers)
+        runner = asyncio.Runner()
+        cache_conn = _get_sync_connection()
+        cache = ChunkEmbeddingCache(PsycopgEmbeddingCacheStore(cache_conn), GeminiEmbeddingService())
+        try:
+            for chunked in pool.chunk_files(by_path):
+                for doc_info in by_path[chunked.file_path]:
+                    document_id = doc_info["document_id"]
+                    new_version = doc_info["new_version"]
+                    strategy = doc_info.get("strategy", "version")
 
-                file_path = Path(file_path_str)
+                    logger.info(
+                        "reindex_start document_id=%s version=%d strategy=%s",
+                        document_id,
+                        new_version,
+                        strategy,
+                    )
 
-                # 1. Load and chunk
-                loader_factory = LoaderFactory()
-                loaded_doc = loader_factory.load(file_path)
-                chunker = AdaptiveChunker()
-                chunks = chunker.chunk(loaded_doc)
+                    try:
+                        chunked.raise_for_error()
+                        chunks = chunked.chunks
 
-                logger.info(
-                    "reindex_chunked document_id=%s chunks=%d",
-                    document_id,
-                    len(chunks),
-                )
+                        logger.info(
+                            "reindex_chunked document_id=%s chunks=%d",
+                            document_id,
+                            len(chunks),
+                        )
 
-                # 2. Generate embeddings
-                embedding_service = GeminiEmbeddingService()
-                texts = [c.text for c in chunks]
-                embeddings = asyncio.run(embedding_service.embed_documents(texts))
-
-                # 3. Store with new version
-                with _get_sync_connection() as conn:
-                    with conn.cursor() as cur:
-                        chunk_ids = []
-                        for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings, strict=True)):
-                            area = chunk.metadata.get("area", "general") if chunk.metadata else "general"
-                            embedding_str = "[" + ",".join(map(str, embedding)) + "]"
-                            metadata = chunk.metadata or {}
-
-                            cur.execute(
-                                """
-                                INSERT INTO document_chunks
-                                    (document_id, chunk_index, content, embedding,
-                                     area, token_count, metadata, version)
-                                VALUES
-                                    (%s, %s, %s, CAST(%s AS halfvec), %s, %s, %s, %s)
-                                RETURNING id
-                                """,
-                                (
+                        if strategy == "diff":
+                            with _get_sync_connection() as conn:
+                                counts = _apply_chunk_diff(
+                                    conn,
                                     document_id,
-                                    idx,
-                                    chunk.text,
-                                    embedding_str,
-                                    area,
-                                    chunk.token_count,
-                                    json.dumps(metadata),
+                                    chunks,
+                                    lambda texts: runner.run(cache.embed_documents(texts)),
                                     new_version,
-                                ),
+                                )
+                            results.append(
+                                {
+                                    "document_id": document_id,
+                                    "new_version": new_version,
+                                    "strategy": strategy,
+                                    "chunk_count": len(chunks),
+                                    **counts,
+                                    # Sin inserts no se llamó a embed_documents: last_stats es del doc anterior
+                                    "cache_hits": cache.last_stats.hits if counts["inserted"] else 0,
+                                    "status": "success",
+                                }
                             )
-                            row = cur.fetchone()
-                            chunk_ids.append(str(row[0]))
-
-                    conn.commit()
+                            logger.info(
+                                "reindex_diff_done document_id=%s chunks=%d counts=%s",
+                                document_id,
+                                len(chunks),
+                                counts,
+                            )
+                            continue
+
+                        # 2. Generate embeddings (unchanged chunk text comes from embedding_cache)
+                        texts = [c.text for c in chunks]
+                        embeddings = runner.run(cache.embed_documents(texts))
+
+                        # 3. Store with new version
+                        with _get_sync_connection() as conn:
+                            with conn.cursor() as cur:
+                                chunk_ids = []
+                                for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings, strict=True)):
+                                    area = chunk.metadata.get("area", "general") if chunk.metadata else "general"
+                                    embedding_str = "[" + ",".join(map(str, embedding)) + "]"
+                                    metadata = chunk.metadata or {}
+
+                                    cur.execute(
+                                        """
+                                        INSERT INTO document_chunks
+                                            (document_id, chunk_index, content, embedding,
+                                             area, token_count, metadata, version)
+                                        VALUES
+                                            (%s, %s, %s, CAST(%s AS halfvec), %s, %s, %s, %s)
+                                        RETURNING id
+                                        """,
+                                        (
+                                            document_id,
+                                            idx,
+                                            chunk.text,
+                                            embedding_str,
+                                            area,
+                                            chunk.token_count,
+                                            json.dumps(metadata),
+                                            new_version,
+                                        ),
+                                    )
+                                    row = cur.fetchone()
+                                    chunk_ids.append(str(row[0]))
+
+                            conn.commit()
+
+                        results.append(
+                            {
+                                "document_id": document_id,
+                                "new_version": new_version,
+                                "strategy": strategy,
+                                "chunk_count": len(chunk_ids),
+                                "cache_hits": cache.last_stats.hits,
+                                "cache_hit_rate": round(cache.last_stats.hit_rate, 3),
+                                "status": "success",
+                            }
+                        )
 
-                results.append(
-                    {
-                        "document_id": document_id,
-                        "new_version": new_version,
-                        "chunk_count": len(chunk_ids),
-                        "status": "success",
-                    }
-                )
+                        logger.info(
+                            "reindex_done document_id=%s version=%d chunks=%d cache_hit_rate=%.3f",
+                            document_id,
+                            new_version,
+                            len(chunk_ids),
+                            cache.last_stats.hit_rate,
+                        )
 
-                logger.info(
-                    "reindex_done document_id=%s version=%d chunks=%d",
-                    document_id,
-                    new_version,
-                    len(chunk_ids),
-                )
+                    except Exception as exc:
+                        logger.error(
+                            "reindex_failed document_id=%s error=%s",
+                            document_id,
+                            str(exc),
+                            exc_info=True,
+                        )
+                        results.append(
+                            {
+                                "document_id": document_id,
+                                "new_version": new_version,
+                                "strategy": strategy,
+                                "chunk_count": 0,
+                                "status": "failed",
+                                "error": str(exc),
+                            }
+                        )
 
-            except Exception as exc:
-                logger.error(
-                    "reindex_failed document_id=%s error=%s",
-                    document_id,
-                    str(exc),
-                    exc_info=True,
-                )
-                results.append(
-                    {
-                        "document_id": document_id,
-                        "new_version": new_version,
-                        "chunk_count": 0,
-                        "status": "failed",
-                        "error": str(exc),
-                    }
-                )
+        finally:
+            pool.shutdown()
+            runner.close()
+            cache_conn.close()
 
         return results
 
@@ -335,14 +472,18 @@ with DAG(
     def cleanup_old_chunks(reindex_results: list[dict]) -> dict:
         """Delete old chunk versions after successful re-indexing.
 
-        Only removes chunks from documents that were successfully re-indexed.
+        Only removes chunks from documents that were successfully re-indexed
+        with the ``version`` strategy; ``diff`` already deleted its vanished
+        chunks and keeps unchanged rows at their old version.
         Keeps only the latest version (new_version) for each document.
         """
         if not reindex_results:
             logger.info("No results to cleanup.")
             return {"cleaned": 0, "errors": 0}
 
-        successful = [r for r in reindex_results if r["status"] == "success"]
+        successful = [
+            r for r in reindex_results if r["status"] == "success" and r.get("strategy", "version") == "version"
+        ]
         cleaned_total = 0
         error_count = 0
 
@@ -0,0 +1,97 @@
+"""Benchmark del chunker: RecursiveCharacterTextSplitter vs TokenOffsetSplitter.
+
+Carga cada documento una vez con ``LoaderFactory`` y lo chunkea con los dos
+motores de ``AdaptiveChunker`` (``use_token_offsets=False`` / ``True``).
+Reporta tiempo por motor y speed-up, y compara la salida contra la actual:
+
+* cantidad de chunks y fracción de chunks con texto idéntico;
+* diferencia de ``token_count`` (máxima y media, chunks emparejados por
+  posición) — el camino rápido cuenta tokens por offset en lugar de
+  re-tokenizar cada pieza.
+
+Uso:
+    python scripts/bench_chunker.py docs/                 # todos los PDF/DOCX de la carpeta
+    python scripts/bench_chunker.py a.pdf b.pdf --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raiz al PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_EXTENSIONS = {".pdf", ".docx"}
+
+
+def _collect(paths: list[str]) -> list[Path]:
+    files: list[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix.lower() in _EXTENSIONS))
+        else:
+            files.append(path)
+    return files
+
+
+def _time(fn, runs: int):
+    timings, result = [], None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings), result
+
+
+def main(paths: list[str], runs: int) -> None:
+    from src.infrastructure.rag.chunking.adaptive_chunker import AdaptiveChunker, ChunkingConfig
+    from src.infrastructure.rag.loaders.factory import LoaderFactory
+
+    files = _collect(paths)
+    if not files:
+        print("Sin documentos PDF/DOCX en las rutas indicadas.")
+        return
+
+    loader = LoaderFactory()
+    slow = AdaptiveChunker(ChunkingConfig(use_token_offsets=False))
+    fast = AdaptiveChunker(ChunkingConfig(use_token_offsets=True))
+
+    print(f"\n{len(files)} documentos, mediana de {runs} corridas")
+    header = f"{'documento':<40} {'chunks':>7} {'splitter s':>10} {'offsets s':>10} {'speedup':>8}"
+    print(header + f" {'iguales':>8} {'Δtok max':>8} {'Δtok media':>10}")
+    total_slow = total_fast = 0.0
+    all_diffs: list[int] = []
+    for path in files:
+        document = loader.load(path)
+        t_slow, expected = _time(lambda d=document: slow.chunk(d), runs)
+        t_fast, actual = _time(lambda d=document: fast.chunk(d), runs)
+        total_slow += t_slow
+        total_fast += t_fast
+
+        same = sum(1 for a, b in zip(expected, actual, strict=False) if a.text == b.text)
+        diffs = [abs(a.token_count - b.token_count) for a, b in zip(expected, actual, strict=False)]
+        all_diffs.extend(diffs)
+        print(
+            f"{path.name[:40]:<40} {len(expected):>4}/{len(actual):<3}{t_slow:>9.3f} {t_fast:>10.3f} "
+            f"{t_slow / t_fast if t_fast else 0:>8.1f} {same / max(len(expected), 1):>8.1%} "
+            f"{max(diffs, default=0):>8} {statistics.fmean(diffs) if diffs else 0:>10.2f}"
+        )
+
+    print(
+        f"\nTotal: splitter {total_slow:.2f}s, offsets {total_fast:.2f}s, "
+        f"speed-up {total_slow / total_fast if total_fast else 0:.1f}x, "
+        f"Δtoken_count medio {statistics.fmean(all_diffs) if all_diffs else 0:.2f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Velocidad y fidelidad del camino rápido del chunker")
+    parser.add_argument("paths", nargs="+", help="Archivos o carpetas con PDF/DOCX")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    main(args.paths, args.runs)
@@ -0,0 +1,109 @@
+"""Benchmark de la etapa load + chunk con ``ChunkingPool``.
+
+Genera PDFs sintéticos con PyMuPDF (párrafos + una tabla por página, así
+``find_tables`` y la detección de tablas trabajan) y mide docs/min:
+
+* ``inline``: ``LoaderFactory.load`` + ``AdaptiveChunker.chunk`` en el
+  proceso actual, un documento tras otro (lo que hacían IndexingService y
+  los DAGs);
+* ``pool N``: ``ChunkingPool(N).chunk_files`` para cada N.
+
+El tiempo del pool incluye el arranque de los workers (``spawn``).  Verifica
+además que el pool produzca exactamente los mismos chunks que el inline.
+
+Uso:
+    python scripts/bench_chunking_pool.py
+    python scripts/bench_chunking_pool.py --docs 64 --pages 20 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar el directorio raiz al PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _make_pdf(path: Path, pages: int, seed: int) -> None:
+    import fitz
+
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        y = 60
+        for p in range(6):
+            paragraph = (
+                f"Documento {seed}, página {page_num + 1}, párrafo {p + 1}. "
+                "La política de crédito establece los límites de exposición por contraparte "
+                "y los controles de riesgo operacional aplicables a cada área funcional. "
+            ) * 2
+            rect = fitz.Rect(50, y, 545, y + 70)
+            page.insert_textbox(rect, paragraph, fontsize=9)
+            y += 75
+        # Tabla simple con líneas: find_tables la detecta
+        x0, y0, cols, rows, w, h = 50, y + 10, 4, 6, 120, 18
+        for r in range(rows + 1):
+            page.draw_line((x0, y0 + r * h), (x0 + cols * w, y0 + r * h))
+        for c in range(cols + 1):
+            page.draw_line((x0 + c * w, y0), (x0 + c * w, y0 + rows * h))
+        for r in range(rows):
+            for c in range(cols):
+                text = "Concepto" if r == 0 else f"{seed * 100 + r * c:,}"
+                page.insert_text((x0 + c * w + 4, y0 + r * h + 13), text, fontsize=8)
+    doc.save(path)
+    doc.close()
+
+
+def _signature(chunks) -> list[tuple[str, int]]:
+    return [(c.text, c.token_count) for c in chunks]
+
+
+def main(docs: int, pages: int, workers_list: list[int]) -> None:
+    from src.infrastructure.rag.chunking.adaptive_chunker import AdaptiveChunker
+    from src.infrastructure.rag.chunking.process_pool import ChunkingPool
+    from src.infrastructure.rag.loaders.factory import LoaderFactory
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(tmp) / f"doc_{i:04d}.pdf" for i in range(docs)]
+        for i, path in enumerate(paths):
+            _make_pdf(path, pages, i)
+        print(f"\n{docs} PDFs x {pages} páginas, {os.cpu_count()} CPUs")
+        print(f"{'etapa':>10} {'segundos':>9} {'docs/min':>9} {'speedup':>8} {'chunks':>8} {'iguales':>8}")
+
+        loader, chunker = LoaderFactory(), AdaptiveChunker()
+        t0 = time.perf_counter()
+        expected = {str(p): _signature(chunker.chunk(loader.load(p))) for p in paths}
+        baseline = time.perf_counter() - t0
+        total_chunks = sum(len(v) for v in expected.values())
+        print(f"{'inline':>10} {baseline:>9.2f} {docs / baseline * 60:>9.0f} {1.0:>8.2f} {total_chunks:>8} {'-':>8}")
+
+        for workers in workers_list:
+            pool = ChunkingPool(workers)
+            t0 = time.perf_counter()
+            results = list(pool.chunk_files(paths))
+            elapsed = time.perf_counter() - t0
+            pool.shutdown()
+            errors = [r.error for r in results if not r.ok]
+            same = not errors and all(_signature(r.chunks) == expected[r.file_path] for r in results)
+            print(
+                f"{'pool ' + str(workers):>10} {elapsed:>9.2f} {docs / elapsed * 60:>9.0f} "
+                f"{baseline / elapsed:>8.2f} {sum(len(r.chunks) for r in results):>8} {'ok' if same else 'FAIL':>8}"
+            )
+            for error in errors[:3]:
+                print(f"    error: {error}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="docs/min de load + chunk inline vs ChunkingPool")
+    parser.add_argument("--docs", type=int, default=32)
+    parser.add_argument("--pages", type=int, default=15)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    args = parser.parse_args()
+    cpus = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1)))
+    main(args.docs, args.pages, args.workers or default_workers)
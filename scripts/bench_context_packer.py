@@ -0,0 +1,132 @@
+"""Benchmark del ensamblado de contexto: tokens de prompt antes y después del packer.
+
+Para cada query de ``eval_queries.json`` recupera los candidatos con
+``hybrid_search``, toma los primeros ``--top-k`` (como llegarían del
+reranker) y arma el prompt completo (``build_rag_prompt``) de dos formas:
+
+* **verbatim** — cada chunk concatenado tal cual (comportamiento previo).
+* **packed**   — ``ContextPacker`` con ``--budget`` tokens.
+
+Reporta histogramas de tokens de prompt (tiktoken ``cl100k_base``), p50/p95
+y cuántos chunks se unieron, recortaron o descartaron.
+
+Uso:
+    python scripts/bench_context_packer.py --top-k 5 --budget 3000
+    python scripts/bench_context_packer.py --top-k 10 --candidates 30 --budget 2000 --bins 12
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+from pathlib import Path
+
+# Agregar el directorio raiz al PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _percentile(values: list[int], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return float(ordered[idx])
+
+
+def _histogram(label: str, values: list[int], lo: int, hi: int, bins: int, width: int = 40) -> None:
+    print(f"\n{label} (n={len(values)}, p50={_percentile(values, 50):.0f}, p95={_percentile(values, 95):.0f})")
+    step = max(1, -(-(hi - lo + 1) // bins))
+    counts = [0] * bins
+    for v in values:
+        counts[min(bins - 1, (v - lo) // step)] += 1
+    peak = max(counts) or 1
+    for i, count in enumerate(counts):
+        start = lo + i * step
+        bar = "#" * round(count / peak * width)
+        print(f"  {start:>6}-{start + step - 1:<6} {count:>4} {bar}")
+
+
+def _chunk_dict(chunk) -> dict:
+    return {
+        "id": str(chunk.id),
+        "document_id": chunk.document_id,
+        "chunk_index": chunk.chunk_index,
+        "content": chunk.content,
+        "score": chunk.score,
+        "document_name": chunk.document_name or "Documento desconocido",
+        "page": chunk.page_number or "N/A",
+    }
+
+
+async def main(queries_path: str, db_url: str, top_k: int, candidates: int, budget: int, bins: int) -> int:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from src.application.graphs.nodes.generate import _build_sources_text
+    from src.config.settings import settings
+    from src.infrastructure.llm.prompts.system_prompt import build_rag_prompt
+    from src.infrastructure.llm.tokens import count_tokens
+    from src.infrastructure.rag.embeddings.gemini_embeddings import GeminiEmbeddingService
+    from src.infrastructure.rag.retrieval.context_packer import ContextPacker
+    from src.infrastructure.rag.retrieval.models import StoredChunk
+    from src.infrastructure.rag.vector_store.pgvector_store import PgVectorStore
+
+    queries = json.loads(Path(queries_path).read_text(encoding="utf-8"))["queries"]
+    engine = create_async_engine(db_url, echo=False, pool_size=2)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    embedding_service = GeminiEmbeddingService()
+    verbatim = ContextPacker(token_budget=0, merge_adjacent=False)
+    packer = ContextPacker(token_budget=budget, min_block_tokens=settings.context_min_block_tokens)
+
+    before: list[int] = []
+    after: list[int] = []
+    merged = dropped = truncated = 0
+    async with session_maker() as session:
+        store = PgVectorStore(session)
+        for q in queries:
+            embedding = await embedding_service.embed_query(q["query"])
+            rows = await store.hybrid_search(query_embedding=embedding, query_text=q["query"], match_count=candidates)
+            chunks = [_chunk_dict(StoredChunk.from_row(r)) for r in rows][:top_k]
+            if not chunks:
+                continue
+            packed = packer.pack(chunks)
+            for ctx, bucket in ((verbatim.pack(chunks), before), (packed, after)):
+                prompt = build_rag_prompt(
+                    context=ctx.context_text, sources=_build_sources_text(ctx.sources), query=q["query"]
+                )
+                bucket.append(count_tokens(prompt))
+            merged += packed.chunks_merged
+            dropped += packed.chunks_dropped
+            truncated += packed.blocks_truncated
+    await engine.dispose()
+
+    if not before:
+        print("Sin resultados para las queries del dataset")
+        return 1
+
+    lo, hi = min(before + after), max(before + after)
+    print(f"{len(before)} queries, top_k={top_k}, presupuesto de contexto={budget or 'sin límite'} tokens")
+    _histogram("Tokens de prompt — verbatim", before, lo, hi, bins)
+    _histogram("Tokens de prompt — packed", after, lo, hi, bins)
+    saved = statistics.mean(b - a for b, a in zip(before, after, strict=True))
+    print(
+        f"\nAhorro medio: {saved:.0f} tokens/prompt ({saved / statistics.mean(before):.1%}) | "
+        f"chunks unidos={merged} descartados={dropped} bloques truncados={truncated}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tokens de prompt con y sin ContextPacker")
+    parser.add_argument("--queries", default="scripts/eval_queries.json")
+    parser.add_argument("--db-url", default=os.environ.get("DATABASE_URL", ""))
+    parser.add_argument("--top-k", type=int, default=5, help="Chunks que llegan a la generación")
+    parser.add_argument("--candidates", type=int, default=20, help="Candidatos de hybrid search")
+    parser.add_argument("--budget", type=int, default=3000, help="CONTEXT_TOKEN_BUDGET (0 = sin límite)")
+    parser.add_argument("--bins", type=int, default=10)
+    args = parser.parse_args()
+    if not args.db_url:
+        parser.error("--db-url o DATABASE_URL es requerido")
+    sys.exit(asyncio.run(main(args.queries, args.db_url, args.top_k, args.candidates, args.budget, args.bins)))
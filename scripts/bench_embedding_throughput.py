@@ -0,0 +1,178 @@
+"""Benchmark de throughput de ``GeminiEmbeddingService.embed_documents``.
+
+Levanta un servidor de embeddings falso en local (FastAPI + uvicorn, mismo
+endpoint ``:batchEmbedContents`` que usa ``google-genai``) con latencia
+simulada y una cuota RPM del lado servidor que responde 429 con
+``Retry-After``.  Para cada nivel de concurrencia mide chunks/seg, cantidad
+de 429 y verifica que los embeddings vuelvan en el orden de los textos.
+
+Los vectores son deterministas por texto (semilla = crc32), así que el
+chequeo de orden compara contra lo esperado sin llamar a Gemini.
+
+Uso:
+    python scripts/bench_embedding_throughput.py
+    python scripts/bench_embedding_throughput.py --chunks 5000 --concurrency 1 2 4 8 16
+    python scripts/bench_embedding_throughput.py --server-rpm 300 --client-rpm 240
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import socket
+import sys
+import time
+import zlib
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio raiz al PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _fake_vector(text: str, dims: int) -> np.ndarray:
+    return np.random.default_rng(zlib.crc32(text.encode())).standard_normal(dims).astype(np.float32)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+class FakeEmbeddingServer:
+    """Servidor falso: latencia base + por texto y cuota RPM (ventana deslizante)."""
+
+    def __init__(self, *, latency_ms: float, per_text_ms: float, rpm: int) -> None:
+        self.latency_ms = latency_ms
+        self.per_text_ms = per_text_ms
+        self.rpm = rpm
+        self.requests = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._window: deque[float] = deque()
+
+    def reset(self) -> None:
+        self.requests = self.rejected = self.max_in_flight = 0
+        self._window.clear()
+
+    def build_app(self):
+        from fastapi import FastAPI, Request
+        from fastapi.responses import JSONResponse
+
+        app = FastAPI()
+
+        @app.post("/{path:path}")
+        async def embed(path: str, request: Request) -> JSONResponse:
+            if not path.endswith(":batchEmbedContents"):
+                return JSONResponse({"error": {"code": 404, "message": path}}, status_code=404)
+
+            now = time.monotonic()
+            while self._window and now - self._window[0] > 60.0:
+                self._window.popleft()
+            if self.rpm and len(self._window) >= self.rpm:
+                self.rejected += 1
+                retry_after = max(60.0 - (now - self._window[0]), 0.1)
+                return JSONResponse(
+                    {"error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}},
+                    status_code=429,
+                    headers={"Retry-After": f"{retry_after:.1f}"},
+                )
+            self._window.append(now)
+
+            body = await request.json()
+            texts = [req["content"]["parts"][0]["text"] for req in body["requests"]]
+            dims = int(body["requests"][0].get("outputDimensionality") or 768)
+
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep((self.latency_ms + self.per_text_ms * len(texts)) / 1000)
+            finally:
+                self.in_flight -= 1
+            return JSONResponse({"embeddings": [{"values": _fake_vector(t, dims).tolist()} for t in texts]})
+
+        return app
+
+
+async def main(
+    chunks: int,
+    concurrency_levels: list[int],
+    latency_ms: float,
+    per_text_ms: float,
+    server_rpm: int,
+    client_rpm: int,
+    dims: int,
+) -> None:
+    import uvicorn
+    from google import genai
+    from google.genai import types
+    from src.infrastructure.rag.embeddings.gemini_embeddings import GeminiEmbeddingService
+    from src.infrastructure.rag.embeddings.normalization import normalize_l2_batch
+    from src.infrastructure.rag.embeddings.rate_limiter import AdaptiveRateLimiter
+
+    fake = FakeEmbeddingServer(latency_ms=latency_ms, per_text_ms=per_text_ms, rpm=server_rpm)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(fake.build_app(), host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    texts = [f"chunk {i}: texto sintético de prueba para el benchmark de embeddings " * 8 for i in range(chunks)]
+    expected = np.asarray(normalize_l2_batch([_fake_vector(t, dims).tolist() for t in texts]), dtype=np.float32)
+
+    print(
+        f"\n{chunks} chunks, latencia {latency_ms:.0f} ms + {per_text_ms:.1f} ms/texto, "
+        f"cuota servidor {server_rpm or '∞'} RPM, limitador cliente {client_rpm or '∞'} RPM"
+    )
+    print(
+        f"{'concurrencia':>12} {'segundos':>9} {'chunks/s':>9} {'requests':>9} "
+        f"{'429':>5} {'max_in_flight':>14} {'orden':>6}"
+    )
+    for level in concurrency_levels:
+        fake.reset()
+        client = genai.Client(api_key="fake-key", http_options=types.HttpOptions(base_url=f"http://127.0.0.1:{port}"))
+        service = GeminiEmbeddingService(
+            dimensions=dims,
+            max_concurrency=level,
+            rate_limiter=AdaptiveRateLimiter(requests_per_minute=client_rpm),
+            client=client,
+        )
+        t0 = time.perf_counter()
+        embeddings = await service.embed_documents(texts)
+        elapsed = time.perf_counter() - t0
+        in_order = np.allclose(np.asarray(embeddings, dtype=np.float32), expected, atol=1e-5)
+        print(
+            f"{level:>12} {elapsed:>9.2f} {chunks / elapsed:>9.0f} {fake.requests:>9} {fake.rejected:>5} "
+            f"{fake.max_in_flight:>14} {'ok' if in_order else 'FAIL':>6}"
+        )
+
+    server.should_exit = True
+    await server_task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput de embed_documents contra un servidor falso")
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Latencia base por request")
+    parser.add_argument("--per-text-ms", type=float, default=2.0, help="Latencia adicional por texto")
+    parser.add_argument("--server-rpm", type=int, default=0, help="Cuota del servidor falso (0 = sin cuota)")
+    parser.add_argument("--client-rpm", type=int, default=0, help="Límite del limitador cliente (0 = sin límite)")
+    parser.add_argument("--dims", type=int, default=768)
+    args = parser.parse_args()
+    asyncio.run(
+        main(
+            args.chunks,
+            args.concurrency,
+            args.latency_ms,
+            args.per_text_ms,
+            args.server_rpm,
+            args.client_rpm,
+            args.dims,
+        )
+    )
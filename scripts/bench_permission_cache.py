@@ -0,0 +1,127 @@
+"""Benchmark de serialización de PermissionCache: lista JSON vs DocIdSet.
+
+Compara, para sets sintéticos de DataIDs accesibles (100 / 5k / 50k), el
+formato anterior (``json.dumps`` de la lista + ``json.loads`` e ``int()`` por
+ID) contra ``DocIdSet`` (deltas de ancho fijo o bitset):
+
+* tamaño serializado (lo que viaja y se guarda en Redis);
+* tiempo de encode y decode;
+* tiempo de "intersectar con documentos activos" — ``set`` de Python sobre
+  la lista decodificada vs ``DocIdSet.intersect`` sobre los arrays.
+
+Dos distribuciones de IDs: ``sparse`` (DataIDs dispersos en un rango de
+10M, el peor caso para deltas) y ``clustered`` (carpetas con IDs casi
+contiguos, donde gana el bitset).  No necesita Redis ni Postgres.
+
+Uso:
+    python scripts/bench_permission_cache.py
+    python scripts/bench_permission_cache.py --sizes 1000 50000 200000 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+# Agregar el directorio raiz al PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.infrastructure.security.doc_id_set import DocIdSet
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_ID_SPACE = 10_000_000
+_ID_BASE = 2_000_000
+
+
+def _sparse_ids(rng: np.random.Generator, size: int) -> list[int]:
+    return sorted(int(d) for d in rng.choice(_ID_SPACE, size=size, replace=False) + _ID_BASE)
+
+
+def _clustered_ids(rng: np.random.Generator, size: int) -> list[int]:
+    """Carpetas de 20-200 documentos con IDs casi contiguos."""
+    ids: set[int] = set()
+    while len(ids) < size:
+        start = int(rng.integers(_ID_BASE, _ID_BASE + _ID_SPACE))
+        run = int(rng.integers(20, 200))
+        steps = rng.integers(1, 4, size=run).cumsum()
+        ids.update(int(start + s) for s in steps)
+    return sorted(ids)[:size]
+
+
+def _best_ms(fn: Callable[[], object], repeat: int) -> float:
+    """Mediana de *repeat* ejecuciones, en ms."""
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return float(np.median(timings))
+
+
+def _bench(ids: list[int], active: list[int], repeat: int) -> dict[str, float]:
+    json_payload = json.dumps(ids)
+    doc_set = DocIdSet.from_iterable(ids)
+    bitmap_payload = doc_set.to_bytes()
+    active_set = DocIdSet.from_iterable(active)
+    active_py = set(active)
+
+    assert DocIdSet.from_bytes(bitmap_payload) == doc_set
+
+    return {
+        "json_bytes": len(json_payload.encode()),
+        "bitmap_bytes": len(bitmap_payload),
+        "json_encode_ms": _best_ms(lambda: json.dumps(ids), repeat),
+        "bitmap_encode_ms": _best_ms(doc_set.to_bytes, repeat),
+        "json_decode_ms": _best_ms(lambda: [int(d) for d in json.loads(json_payload)], repeat),
+        "bitmap_decode_ms": _best_ms(lambda: DocIdSet.from_bytes(bitmap_payload), repeat),
+        "bitmap_decode_list_ms": _best_ms(lambda: DocIdSet.from_bytes(bitmap_payload).tolist(), repeat),
+        "json_intersect_ms": _best_ms(
+            lambda: sorted(active_py.intersection(int(d) for d in json.loads(json_payload))), repeat
+        ),
+        "bitmap_intersect_ms": _best_ms(lambda: DocIdSet.from_bytes(bitmap_payload).intersect(active_set), repeat),
+    }
+
+
+def main(sizes: list[int], repeat: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    generators = {"sparse": _sparse_ids, "clustered": _clustered_ids}
+
+    header = (
+        f"{'dist':<10} {'ids':>7} {'json_KB':>8} {'bmp_KB':>7} {'ratio':>6} "
+        f"{'enc_json':>9} {'enc_bmp':>8} {'dec_json':>9} {'dec_bmp':>8} {'dec+list':>9} "
+        f"{'int_json':>9} {'int_bmp':>8}"
+    )
+    print(f"\nTiempos en ms (mediana de {repeat}); int_* = decode + intersección con documentos activos")
+    print(header)
+    print("-" * len(header))
+    for name, generate in generators.items():
+        for size in sizes:
+            ids = generate(rng, size)
+            # "Activos": 90% de los accesibles + otros tantos documentos ajenos
+            keep = rng.random(len(ids)) < 0.9
+            active = [d for d, k in zip(ids, keep, strict=True) if k] + generate(rng, size)
+            r = _bench(ids, active, repeat)
+            print(
+                f"{name:<10} {size:>7} {r['json_bytes'] / 1024:>8.1f} {r['bitmap_bytes'] / 1024:>7.1f} "
+                f"{r['json_bytes'] / r['bitmap_bytes']:>5.1f}x "
+                f"{r['json_encode_ms']:>9.3f} {r['bitmap_encode_ms']:>8.3f} "
+                f"{r['json_decode_ms']:>9.3f} {r['bitmap_decode_ms']:>8.3f} {r['bitmap_decode_list_ms']:>9.3f} "
+                f"{r['json_intersect_ms']:>9.3f} {r['bitmap_intersect_ms']:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON vs DocIdSet para PermissionCache")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 5_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat, args.seed)
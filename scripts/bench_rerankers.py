@@ -0,0 +1,176 @@
+"""Benchmark de backends de reranking: latencia p50/p99 y nDCG.
+
+Para cada query del dataset de ``tune_retrieval.py`` (``eval_queries.json``)
+recupera una sola vez los candidatos con ``hybrid_search`` y los rerankea con
+cada backend sobre exactamente los mismos chunks:
+
+* ``rrf``    — orden de entrada (línea base, sin reranker).
+* ``gemini`` — ``GeminiReranker`` (LLM).
+* ``vertex`` — ``VertexAIReranker`` (requiere GCP).
+* ``local``  — ``LocalCrossEncoderReranker`` (``--model-path`` o
+  ``RERANKER_LOCAL_MODEL_PATH``).
+
+Relevancia graduada por chunk: 2 si es del documento esperado y contiene
+alguna keyword esperada, 1 si solo es del documento esperado, 0 si no.  El
+nDCG@k usa como ideal el mejor orden posible del mismo pool de candidatos.
+
+Calibración de ``score_gate``: cada backend puntúa en su propia escala, así
+que se reporta el score del top-1 separado según sea relevante o no
+(``rel p25`` = percentil 25 del score cuando el top-1 es relevante;
+``irr p75`` = percentil 75 cuando no lo es).  Para ``local`` son los puntos de
+partida de ``RERANKER_LOCAL_THRESHOLD`` (alto) y
+``RERANKER_LOCAL_MIN_THRESHOLD`` (bajo); entre ambos queda la zona ``ambiguo``.
+
+Uso:
+    python scripts/bench_rerankers.py --backends rrf gemini local --model-path models/mmarco-int8
+    python scripts/bench_rerankers.py --queries scripts/eval_queries.json --k 5 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio raiz al PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _relevance(chunk, query: dict) -> int:
+    name = (chunk.document_name or "").lower()
+    if not any(p.lower() in name for p in query["expected_doc_patterns"]):
+        return 0
+    content = chunk.content.lower()
+    return 2 if any(k.lower() in content for k in query.get("expected_keywords", [])) else 1
+
+
+def _dcg(relevances: list[int]) -> float:
+    return sum((2**rel - 1) / math.log2(i + 2) for i, rel in enumerate(relevances))
+
+
+def _ndcg(ranked: list[int], pool: list[int], k: int) -> float:
+    ideal = _dcg(sorted(pool, reverse=True)[:k])
+    return _dcg(ranked[:k]) / ideal if ideal else 0.0
+
+
+def _score_percentile(scores: list[float], pct: float) -> str:
+    return f"{np.percentile(scores, pct):.3f}" if scores else "-"
+
+
+class _RrfBaseline:
+    model = "rrf"
+
+    async def try_rerank(self, query, chunks, top_k=5):
+        return chunks[:top_k]
+
+
+def _build_backend(name: str, model_path: str):
+    if name == "rrf":
+        return _RrfBaseline()
+    from src.infrastructure.rag.retrieval.rerank_backend import create_reranker
+
+    if name == "local" and model_path:
+        from src.infrastructure.rag.retrieval.cross_encoder import LocalCrossEncoderReranker
+
+        reranker = LocalCrossEncoderReranker(model_path)
+    else:
+        reranker = create_reranker(name)
+    warmup = getattr(reranker, "warmup", None)
+    if warmup is not None:
+        warmup()
+    return reranker
+
+
+async def main(
+    queries_path: str,
+    db_url: str,
+    backends: list[str],
+    model_path: str,
+    k: int,
+    candidates: int,
+    repeat: int,
+) -> int:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from src.infrastructure.rag.embeddings.gemini_embeddings import GeminiEmbeddingService
+    from src.infrastructure.rag.retrieval.models import StoredChunk
+    from src.infrastructure.rag.vector_store.pgvector_store import PgVectorStore
+
+    queries = json.loads(Path(queries_path).read_text(encoding="utf-8"))["queries"]
+    engine = create_async_engine(db_url, echo=False, pool_size=2)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    embedding_service = GeminiEmbeddingService()
+
+    # Candidatos fijos por query (mismo input para todos los backends)
+    pools: list[tuple[dict, list]] = []
+    async with session_maker() as session:
+        store = PgVectorStore(session)
+        for q in queries:
+            embedding = await embedding_service.embed_query(q["query"])
+            rows = await store.hybrid_search(query_embedding=embedding, query_text=q["query"], match_count=candidates)
+            pools.append((q, [StoredChunk.from_row(r) for r in rows]))
+    await engine.dispose()
+    print(f"{len(pools)} queries, {candidates} candidatos c/u, k={k}, repeticiones={repeat}")
+
+    print(f"\n{'backend':<10} {'p50 ms':>9} {'p99 ms':>9} {'nDCG@k':>8} {'fallos':>7} {'rel p25':>8} {'irr p75':>8}")
+    for name in backends:
+        try:
+            reranker = _build_backend(name, model_path)
+        except Exception as exc:
+            print(f"{name:<10} no disponible: {exc}")
+            continue
+        timings: list[float] = []
+        ndcgs: list[float] = []
+        top_relevant: list[float] = []
+        top_irrelevant: list[float] = []
+        failures = 0
+        for q, pool in pools:
+            if not pool:
+                continue
+            pool_relevance = [_relevance(c, q) for c in pool]
+            for _ in range(repeat):
+                chunks = copy.deepcopy(pool)
+                t0 = time.perf_counter()
+                ranked = await reranker.try_rerank(q["query"], chunks, k)
+                timings.append((time.perf_counter() - t0) * 1000)
+                if ranked is None:
+                    failures += 1
+                    ranked = chunks[:k]
+            ndcgs.append(_ndcg([_relevance(c, q) for c in ranked], pool_relevance, k))
+            if ranked:
+                (top_relevant if _relevance(ranked[0], q) else top_irrelevant).append(ranked[0].score)
+        if not timings:
+            continue
+        print(
+            f"{name:<10} {np.percentile(timings, 50):>9.1f} {np.percentile(timings, 99):>9.1f} "
+            f"{statistics.mean(ndcgs):>8.3f} {failures:>7} "
+            f"{_score_percentile(top_relevant, 25):>8} {_score_percentile(top_irrelevant, 75):>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latencia y nDCG de los backends de reranking")
+    parser.add_argument("--queries", default="scripts/eval_queries.json")
+    parser.add_argument("--db-url", default=os.environ.get("DATABASE_URL", ""))
+    parser.add_argument("--backends", nargs="+", default=["rrf", "gemini", "local"])
+    parser.add_argument("--model-path", default=os.environ.get("RERANKER_LOCAL_MODEL_PATH", ""))
+    parser.add_argument("--k", type=int, default=5, help="top_k del reranker / corte de nDCG")
+    parser.add_argument("--candidates", type=int, default=20, help="Candidatos de hybrid search")
+    parser.add_argument("--repeat", type=int, default=1, help="Corridas por query (latencia)")
+    args = parser.parse_args()
+    if not args.db_url:
+        parser.error("--db-url o DATABASE_URL es requerido")
+    sys.exit(
+        asyncio.run(
+            main(args.queries, args.db_url, args.backends, args.model_path, args.k, args.candidates, args.repeat)
+        )
+    )
@@ -0,0 +1,122 @@
+"""Benchmark del guardrail de salida incremental (``StreamingOutputGuard``).
+
+Genera respuestas sintéticas con y sin PII (DNI, CUIT, CBU, email,
+teléfono y falsos positivos como leyes y fechas), las parte en tokens de
+``--token-chars`` caracteres y las pasa por el guard como lo hace
+``stream_rag_events``.  Reporta:
+
+* latencia agregada por token (p50/p99/max en µs) y total por respuesta,
+* caracteres retenidos como máximo (demora visible para el cliente),
+* comparación con ``OutputValidator.validate`` sobre la respuesta completa,
+* verificación de que ningún PII crudo llegó a la salida emitida.
+
+No requiere base de datos ni LLM.
+
+Uso:
+    python scripts/bench_stream_guard.py
+    python scripts/bench_stream_guard.py --responses 500 --token-chars 3 --lookbehind 48
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raiz al PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_SENTENCES = [
+    "Según la Ley 25.326 de protección de datos personales, el banco debe resguardar la información del cliente.",
+    "El Decreto 1234/2020 establece los plazos de conservación de la documentación respaldatoria.",
+    "La Comunicación A 7724 del BCRA regula la apertura de cuentas a la vista.",
+    "El trámite puede iniciarse desde la banca en línea o en cualquier sucursal habilitada.",
+    "La circular vigente desde el 01/03/2024 actualiza los montos máximos por operación.",
+    "Para operaciones en moneda extranjera se requiere la declaración jurada correspondiente.",
+]
+_PII = [
+    "El cliente con DNI 32.456.789 figura como titular.",
+    "La cuenta informada es CBU 0123456789012345678901.",
+    "El CUIT registrado es 20-12345678-9.",
+    "Puede escribir a juan.perez@ejemplo.com.ar para más información.",
+    "El teléfono de contacto es +54 11 4567-8901.",
+]
+
+
+def _response(rng: random.Random, pii_ratio: float) -> str:
+    parts = rng.sample(_SENTENCES, k=rng.randint(3, len(_SENTENCES)))
+    if rng.random() < pii_ratio:
+        parts.insert(rng.randint(0, len(parts)), rng.choice(_PII))
+    return " ".join(parts)
+
+
+def _pct(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))] if ordered else 0.0
+
+
+async def main(responses: int, token_chars: int, lookbehind: int, pii_ratio: float, seed: int) -> int:
+    from src.infrastructure.security.guardrails.output_validator import OutputValidator
+    from src.infrastructure.security.guardrails.pii_detector import PiiOutputDetector
+    from src.infrastructure.security.guardrails.stream_guard import StreamingOutputGuard
+
+    # validate() loguea cada bloqueo por PII; acá solo interesa el tiempo
+    logging.getLogger("src.infrastructure.security.guardrails").setLevel(logging.ERROR)
+    rng = random.Random(seed)  # noqa: S311 — respuestas sintéticas reproducibles, no criptografía
+    context = " ".join(_SENTENCES)
+    detector = PiiOutputDetector(block_threshold=99)
+    validator = OutputValidator()
+
+    per_token_us: list[float] = []
+    per_response_ms: list[float] = []
+    posthoc_ms: list[float] = []
+    held: list[int] = []
+    leaks = 0
+    for _ in range(responses):
+        text = _response(rng, pii_ratio)
+        guard = StreamingOutputGuard(
+            context=context, detector=detector, validator=validator, lookbehind_chars=lookbehind
+        )
+        emitted: list[str] = []
+        for i in range(0, len(text), token_chars):
+            emitted.append(guard.feed(text[i : i + token_chars]))
+        emitted.append(guard.finish())
+        await guard.result()
+        per_token_us.extend(guard.stats.scan_us)
+        per_response_ms.append(sum(guard.stats.scan_us) / 1000)
+        held.append(guard.stats.max_held_chars)
+
+        raw_pii = [m.value for m in detector.find_matches(text)]
+        output = "".join(emitted)
+        leaks += sum(1 for value in raw_pii if value in output)
+
+        t0 = time.perf_counter()
+        validator.validate(response=text, context=context)
+        posthoc_ms.append((time.perf_counter() - t0) * 1000)
+
+    print(f"{responses} respuestas, tokens de {token_chars} caracteres, look-behind={lookbehind}")
+    print(
+        f"Por token:     p50={_pct(per_token_us, 50):.1f}µs  p99={_pct(per_token_us, 99):.1f}µs  "
+        f"max={max(per_token_us):.1f}µs"
+    )
+    print(f"Por respuesta: media={statistics.mean(per_response_ms):.2f}ms  p99={_pct(per_response_ms, 99):.2f}ms")
+    print(f"Post-hoc:      media={statistics.mean(posthoc_ms):.2f}ms (validate sobre la respuesta completa)")
+    print(f"Retención:     p50={_pct(held, 50):.0f}  max={max(held)} caracteres")
+    print(f"PII crudo emitido: {leaks}")
+    return 1 if leaks else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latencia por token del guardrail de salida incremental")
+    parser.add_argument("--responses", type=int, default=200)
+    parser.add_argument("--token-chars", type=int, default=4, help="Caracteres por token simulado")
+    parser.add_argument("--lookbehind", type=int, default=64, help="OUTPUT_STREAM_GUARD_LOOKBEHIND_CHARS")
+    parser.add_argument("--pii-ratio", type=float, default=0.5, help="Fracción de respuestas con PII")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.responses, args.token_chars, args.lookbehind, args.pii_ratio, args.seed)))
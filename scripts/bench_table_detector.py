@@ -0,0 +1,125 @@
+"""Regresión + benchmark del detector de tablas de ``AdaptiveChunker``.
+
+1. Corre el corpus de regresión (``scripts/table_detector_corpus.json``)
+   con el detector de una pasada (``_detect_tables``) y con el original de
+   tres regex (``_detect_tables_regex``); ambos deben devolver exactamente
+   los spans esperados.
+2. Arma un documento sintético tipo normativa (~``--mb`` MB: prosa, líneas
+   con espacios alineados, tablas pipe y ``[TABLA]``) y mide la mediana de
+   ``--runs`` corridas de cada detector, verificando que coincidan.
+3. Opcionalmente mide también documentos reales (``--files``).
+
+Uso:
+    python scripts/bench_table_detector.py
+    python scripts/bench_table_detector.py --mb 2 --runs 5
+    python scripts/bench_table_detector.py --files docs/normativa.pdf
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raiz al PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_CORPUS = Path(__file__).parent / "table_detector_corpus.json"
+
+
+def _synthetic_document(size_mb: float, seed: int = 7) -> str:
+    rng = random.Random(seed)  # noqa: S311 — texto sintético reproducible, no criptografía
+    words = [
+        "el",
+        "la",
+        "de",
+        "banco",
+        "riesgo",
+        "crédito",
+        "límite",
+        "cliente",
+        "cuenta",
+        "norma",
+        "artículo",
+        "plazo",
+        "tasa",
+        "monto",
+    ]
+    parts: list[str] = []
+    size = 0
+    while size < size_mb * 1_000_000:
+        kind = rng.random()
+        if kind < 0.70:
+            block = " ".join(rng.choice(words) for _ in range(rng.randint(40, 120))) + ".\n\n"
+        elif kind < 0.85:
+            # Texto con espacios dobles (caso caro para TABLE_PATTERN_ALIGNED)
+            block = "".join(f"{rng.choice(words)}  {rng.choice(words)} {rng.choice(words)}\n" for _ in range(2)) + "\n"
+            block += "".join(f"{rng.choice(words)}{' ' * rng.randint(2, 6)}{rng.randint(1, 9999)}\n" for _ in range(6))
+        elif kind < 0.95:
+            rows = "".join(f"| {rng.choice(words)} | {rng.randint(1, 999)} | {rng.random():.2f} |\n" for _ in range(8))
+            block = "| Concepto | Valor | Tasa |\n|---|---|---|\n" + rows + "\n"
+        else:
+            block = "[TABLA]\n| a | b |\n|---|---|\n| 1 | 2 |\n[/TABLA]\n\n"
+        parts.append(block)
+        size += len(block)
+    return "".join(parts)
+
+
+def _median_seconds(fn, text: str, runs: int) -> tuple[float, list]:
+    timings, result = [], []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        result = fn(text)
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings), result
+
+
+def main(size_mb: float, runs: int, files: list[str]) -> int:
+    from src.infrastructure.rag.chunking.adaptive_chunker import AdaptiveChunker
+
+    chunker = AdaptiveChunker()
+    corpus = json.loads(_CORPUS.read_text(encoding="utf-8"))["cases"]
+
+    failures = 0
+    for case in corpus:
+        expected = [tuple(span) for span in case["expected"]]
+        for name, detector in (("single_pass", chunker._detect_tables), ("regex", chunker._detect_tables_regex)):
+            got = [(start, end) for start, end, _ in detector(case["text"])]
+            if got != expected:
+                failures += 1
+                print(f"FAIL {case['name']} [{name}]: esperado {expected}, obtenido {got}")
+    print(f"Corpus: {len(corpus)} casos, {failures} fallas")
+
+    documents = [(f"sintético {size_mb:g} MB", _synthetic_document(size_mb))]
+    if files:
+        from src.infrastructure.rag.loaders.factory import LoaderFactory
+
+        loader = LoaderFactory()
+        documents += [(Path(f).name, loader.load(Path(f)).text) for f in files]
+
+    print(
+        f"\n{'documento':<30} {'MB':>6} {'tablas':>7} {'regex s':>9} {'1 pasada s':>11} {'speedup':>8} {'iguales':>8}"
+    )
+    for name, text in documents:
+        t_regex, expected_tables = _median_seconds(chunker._detect_tables_regex, text, runs)
+        t_fast, tables = _median_seconds(chunker._detect_tables, text, runs)
+        same = tables == expected_tables
+        failures += 0 if same else 1
+        print(
+            f"{name[:30]:<30} {len(text) / 1e6:>6.2f} {len(tables):>7} {t_regex:>9.3f} {t_fast:>11.3f} "
+            f"{t_regex / t_fast if t_fast else 0:>8.1f} {'ok' if same else 'FAIL':>8}"
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regresión y tiempos del detector de tablas")
+    parser.add_argument("--mb", type=float, default=2.0, help="Tamaño del documento sintético")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--files", nargs="*", default=[], help="Documentos reales (PDF/DOCX) a medir")
+    args = parser.parse_args()
+    sys.exit(main(args.mb, args.runs, args.files))
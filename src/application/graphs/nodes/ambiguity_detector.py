@@ -25,7 +25,7 @@ import logging
 import re
 from typing import TYPE_CHECKING
 
-from src.infrastructure.llm.client import GeminiClient, GeminiModel
+from src.infrastructure.llm.client import GeminiClient, GeminiModel, get_gemini_client
 from src.infrastructure.observability.langfuse_client import observe
 
 if TYPE_CHECKING:
@@ -150,7 +150,7 @@ _llm_client: GeminiClient | None = None
 def _get_llm_client() -> GeminiClient:
     global _llm_client
     if _llm_client is None:
-        _llm_client = GeminiClient(model=GeminiModel.FLASH_LITE, temperature=0.0)
+        _llm_client = get_gemini_client(model=GeminiModel.FLASH_LITE, temperature=0.0)
     return _llm_client
 
 
@@ -6,6 +6,11 @@ para metadata de la respuesta.
 
 Separado del nodo generate para permitir cambiar el formato de contexto
 sin tocar la lógica de generación.
+
+Con ``CONTEXT_PACKER_ENABLED`` el contexto se arma con ``ContextPacker``:
+chunks consecutivos del mismo documento se unen en una sola fuente (sin el
+overlap repetido) y el total se limita a ``CONTEXT_TOKEN_BUDGET`` tokens,
+recortando primero los chunks de menor score.
 """
 
 from __future__ import annotations
@@ -13,7 +18,14 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
+from src.config.settings import settings
 from src.infrastructure.observability.langfuse_client import observe
+from src.infrastructure.rag.retrieval.context_packer import ContextPacker, format_context_block
+
+try:
+    from langfuse.decorators import langfuse_context  # type: ignore
+except ImportError:
+    langfuse_context = None  # type: ignore
 
 if TYPE_CHECKING:
     from src.application.graphs.state import RAGState
@@ -49,6 +61,9 @@ def assemble_context_node(state: RAGState) -> dict:
             "sources": [],
         }
 
+    if settings.context_packer_enabled:
+        return _pack_context(chunks, settings.context_token_budget, settings.context_min_block_tokens)
+
     sources: list[dict] = []
     context_parts: list[str] = []
 
@@ -58,7 +73,7 @@ def assemble_context_node(state: RAGState) -> dict:
         page = chunk.get("page", "N/A")
         document_id = chunk.get("document_id")
 
-        context_parts.append(f"[{i}] {content}\n(Fuente: {document_name}, p.{page})")
+        context_parts.append(format_context_block(i, content, document_name, page))
         sources.append(
             {
                 "index": i,
@@ -81,3 +96,26 @@ def assemble_context_node(state: RAGState) -> dict:
         "context_text": context_text,
         "sources": sources,
     }
+
+
+def _pack_context(chunks: list[dict], token_budget: int, min_block_tokens: int) -> dict:
+    """Ensambla el contexto con ``ContextPacker`` y registra tokens antes/después."""
+    packed = ContextPacker(token_budget=token_budget, min_block_tokens=min_block_tokens).pack(chunks)
+
+    logger.info(
+        "assemble_context: chunks=%d blocks=%d merged=%d dropped=%d truncated=%d tokens_before=%d tokens_after=%d",
+        packed.chunks_in,
+        len(packed.sources),
+        packed.chunks_merged,
+        packed.chunks_dropped,
+        packed.blocks_truncated,
+        packed.tokens_before,
+        packed.tokens_after,
+    )
+    if langfuse_context is not None:
+        langfuse_context.update_current_observation(metadata={"context_packer": packed.to_dict()})
+
+    return {
+        "context_text": packed.context_text,
+        "sources": packed.sources,
+    }
@@ -4,7 +4,7 @@ from typing import Any
 
 from src.application.graphs.state import RAGState
 from src.application.services.memory_service import MemoryService
-from src.infrastructure.database.session import async_session_maker
+from src.infrastructure.database.session import borrow_session
 from src.infrastructure.rag.embeddings.gemini_embeddings import GeminiEmbeddingService
 
 
@@ -20,12 +20,17 @@ async def extract_memories(state: RAGState) -> dict[str, Any]:
     # Extraemos el historial de conversación en el formato esperado
     conversation_history = [{"role": msg.type, "content": msg.content} for msg in messages]
 
-    # Instanciar el servicio de base de datos
-    async with async_session_maker() as session:
-        embedding_service = GeminiEmbeddingService()
-        memory_service = MemoryService(session=session, embedding_service=embedding_service)
+    embedding_service = GeminiEmbeddingService()
+    memory_service = MemoryService(session=None, embedding_service=embedding_service)
 
-        await memory_service.extract_and_store_memories(user_id=user_id, conversation_history=conversation_history)
-        await session.commit()
+    # La extracción (LLM + DLP) corre sin sesión; la conexión solo se toma
+    # (prestada del request si sigue activo) para deduplicar y escribir.
+    memories = await memory_service.extract_memories(conversation_history)
+    if not memories:
+        return {}
+
+    # store_memories solo hace flush: commitea el dueño de la sesión
+    async with borrow_session() as session:
+        await memory_service.store_memories(user_id, memories, session=session)
 
     return {}
@@ -17,7 +17,7 @@ from typing import TYPE_CHECKING
 from langchain_core.messages import AIMessage
 
 from src.config.settings import settings
-from src.infrastructure.llm.client import GeminiClient, GeminiModel
+from src.infrastructure.llm.client import GeminiClient, GeminiModel, get_gemini_client
 from src.infrastructure.llm.prompts.system_prompt import RAG_FALLBACK_MESSAGE, build_rag_prompt
 from src.infrastructure.observability.langfuse_client import observe
 
@@ -44,7 +44,7 @@ def _get_client() -> GeminiClient:
     """
     global _client
     if _client is None:
-        _client = GeminiClient(model=GeminiModel.FLASH)
+        _client = get_gemini_client(model=GeminiModel.FLASH)
     return _client
 
 
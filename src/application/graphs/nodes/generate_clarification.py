@@ -16,7 +16,7 @@ from typing import TYPE_CHECKING
 
 from langchain_core.messages import AIMessage
 
-from src.infrastructure.llm.client import GeminiClient, GeminiModel
+from src.infrastructure.llm.client import GeminiClient, GeminiModel, get_gemini_client
 from src.infrastructure.llm.prompts.clarification_prompt import (
     CLARIFICATION_SYSTEM_PROMPT,
     build_clarification_prompt,
@@ -44,7 +44,7 @@ _llm_client: GeminiClient | None = None
 def _get_llm_client() -> GeminiClient:
     global _llm_client
     if _llm_client is None:
-        _llm_client = GeminiClient(model=GeminiModel.FLASH_LITE, temperature=0.3)
+        _llm_client = get_gemini_client(model=GeminiModel.FLASH_LITE, temperature=0.3)
     return _llm_client
 
 
@@ -45,7 +45,7 @@ FALLBACK_MESSAGE_PII = (
 _detector: PiiOutputDetector | None = None
 
 
-def _get_detector() -> PiiOutputDetector:
+def get_pii_detector() -> PiiOutputDetector:
     """Return the PiiOutputDetector singleton.
 
     Allows injection in tests via ``set_pii_detector()``.
@@ -125,7 +125,7 @@ def guardrail_pii_output_node(state: RAGState) -> dict:
         logger.debug("guardrail_pii_output: empty response, skipping")
         return {"guardrail_passed": True, "pii_detected": []}
 
-    detector = _get_detector()
+    detector = get_pii_detector()
     result = detector.detect(response)
 
     if not result.has_pii:
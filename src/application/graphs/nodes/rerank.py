@@ -1,34 +1,91 @@
-"""Nodo rerank: re-ordena los chunks recuperados usando Gemini."""
+"""Nodo rerank: re-ordena los chunks recuperados.
+
+El backend (Gemini, Vertex AI o cross-encoder local) se elige con
+``RERANKER_BACKEND`` (ver ``rerank_backend``).  Con ``RERANK_CACHE_ENABLED``
+el ranking se cachea por (query normalizada, candidatos + versiones, top_k,
+modelo): un hit evita la llamada al reranker.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from typing import TYPE_CHECKING
 
+from redis.asyncio import Redis
+
+from src.application.graphs.stage_timings import elapsed_ms, merge_stage_timings
 from src.config.settings import settings
+from src.infrastructure.database.session import borrow_session
 from src.infrastructure.observability.langfuse_client import observe
-from src.infrastructure.rag.retrieval.gemini_reranker import GeminiReranker
 from src.infrastructure.rag.retrieval.models import StoredChunk
+from src.infrastructure.rag.retrieval.rerank_backend import create_reranker
+from src.infrastructure.rag.retrieval.rerank_cache import RerankCache, apply_cached_ranking, build_rerank_key
+from src.infrastructure.rag.vector_store.chunk_versions import source_fingerprint
+
+try:
+    from langfuse.decorators import langfuse_context  # type: ignore
+except ImportError:
+    langfuse_context = None  # type: ignore
 
 if TYPE_CHECKING:
     from src.application.graphs.state import RAGState
+    from src.infrastructure.rag.retrieval.rerank_backend import Reranker
 
 logger = logging.getLogger(__name__)
 
 # Instancia global del reranker
-_reranker: GeminiReranker | None = None
+_reranker: Reranker | None = None
+_rerank_cache: RerankCache | None = None
 
 
-def _get_reranker() -> GeminiReranker:
+def _get_reranker() -> Reranker:
     global _reranker
     if _reranker is None:
-        _reranker = GeminiReranker()
+        _reranker = create_reranker()
     return _reranker
 
 
+async def warm_up_reranker() -> None:
+    """Instancia el reranker y, si es local, carga el modelo fuera del event loop."""
+    warmup = getattr(_get_reranker(), "warmup", None)
+    if warmup is not None:
+        await asyncio.to_thread(warmup)
+
+
+def get_rerank_cache() -> RerankCache | None:
+    global _rerank_cache
+    if not settings.rerank_cache_enabled:
+        return None
+    if _rerank_cache is None:
+        redis_client = None
+        if settings.rerank_cache_redis_enabled:
+            redis_client = Redis.from_url(settings.redis_url.get_secret_value(), decode_responses=False)
+        _rerank_cache = RerankCache(
+            max_entries=settings.rerank_cache_max_entries,
+            ttl_seconds=settings.rerank_cache_ttl_seconds,
+            redis_client=redis_client,
+        )
+    return _rerank_cache
+
+
+async def _rerank_key(query: str, chunks: list[StoredChunk], top_k: int, model: str) -> str | None:
+    """Key de ``RerankCache`` para estos candidatos, o ``None`` si alguno ya no existe.
+
+    La consulta de versiones corre en un savepoint de la sesión del request
+    (``borrow_session``): si falla no aborta la transacción del turno.
+    """
+    async with borrow_session() as session:
+        fingerprint = await source_fingerprint(session, [str(c.id) for c in chunks])
+    if fingerprint is None:
+        return None
+    return build_rerank_key(query, fingerprint, top_k=top_k, model=model)
+
+
 @observe(name="rag_rerank")
 async def rerank_node(state: RAGState) -> dict:
-    """Toma los chunks de 'retrieved_chunks' y los re-ordena con Gemini.
+    """Toma los chunks de 'retrieved_chunks' y los re-ordena con el reranker configurado.
 
     Retorna 'reranked_chunks'.  El ``top_k`` se lee de ``settings.reranker_top_k``
     (configurable via env ``RERANKER_TOP_K``, spec T3-S4-02).
@@ -43,13 +100,42 @@ async def rerank_node(state: RAGState) -> dict:
     # Convertir dicts a objetos StoredChunk para el reranker
     chunks_to_rerank = [StoredChunk.from_row(c) for c in retrieved_chunks]
 
-    # 2. Reranking con Gemini (top_k configurable via settings — T3-S4-02)
+    # 2. Reranking (top_k configurable via settings — T3-S4-02)
     reranker = _get_reranker()
-    reranked_objs = await reranker.rerank(
-        query=query,
-        chunks=chunks_to_rerank,
-        top_k=settings.reranker_top_k,
-    )
+    top_k = settings.reranker_top_k
+    cache = get_rerank_cache()
+    timings: dict[str, float] = {}
+    t0 = time.monotonic()
+
+    cache_key: str | None = None
+    reranked_objs: list[StoredChunk] | None = None
+    if cache is not None:
+        try:
+            cache_key = await _rerank_key(query, chunks_to_rerank, top_k, reranker.model)
+            ranking = await cache.get(cache_key) if cache_key is not None else None
+            if ranking is not None:
+                reranked_objs = apply_cached_ranking(chunks_to_rerank, ranking)
+        except Exception:
+            logger.warning("rerank_cache_lookup_failed", exc_info=True)
+            cache_key = None
+        timings["rerank_cache_lookup_ms"] = elapsed_ms(t0)
+
+    cache_hit = reranked_objs is not None
+    if reranked_objs is None:
+        t_rerank = time.monotonic()
+        reranked_objs = await reranker.try_rerank(query=query, chunks=chunks_to_rerank, top_k=top_k)
+        if reranked_objs is None:
+            # Fallback al orden original si falla la IA (no se cachea)
+            reranked_objs = chunks_to_rerank[:top_k]
+        elif cache is not None and cache_key is not None:
+            cache.record_miss_compute(elapsed_ms(t_rerank))
+            await cache.set(cache_key, [(str(c.id), c.score) for c in reranked_objs])
+    timings["rerank_ms"] = elapsed_ms(t0)
+
+    if cache is not None and langfuse_context is not None:
+        langfuse_context.update_current_observation(
+            metadata={"rerank_cache_hit": cache_hit, "rerank_cache": cache.stats.to_dict()}
+        )
 
     # Volver a convertir a dicts para el estado del grafo
     # Usamos el método to_dict manual para ser consistentes
@@ -69,9 +155,13 @@ async def rerank_node(state: RAGState) -> dict:
     ]
 
     logger.info(
-        "rerank: %d chunks rerankeados (top %d seleccionados)",
+        "rerank: %d chunks rerankeados (top %d seleccionados) cache_hit=%s rerank_ms=%.1f",
         len(reranked_chunks),
-        settings.reranker_top_k,
+        top_k,
+        cache_hit,
+        timings["rerank_ms"],
     )
+    if cache is not None:
+        logger.debug("rerank_cache_stats %s", cache.stats.to_dict())
 
-    return {"reranked_chunks": reranked_chunks}
+    return {"reranked_chunks": reranked_chunks, "stage_timings": merge_stage_timings(state, **timings)}
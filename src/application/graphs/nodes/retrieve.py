@@ -3,16 +3,22 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import TYPE_CHECKING
 
+from redis.asyncio import Redis
 from sqlalchemy import text
 
+from src.application.graphs.stage_timings import elapsed_ms, merge_stage_timings
 from src.application.services.memory_retrieval_service import MemoryRetrievalService
 from src.config.settings import settings
-from src.infrastructure.database.session import async_session_maker
+from src.infrastructure.database.session import borrow_session
 from src.infrastructure.observability.langfuse_client import observe
 from src.infrastructure.rag.embeddings.gemini_embeddings import GeminiEmbeddingService
+from src.infrastructure.rag.embeddings.query_cache import QueryEmbeddingCache
+from src.infrastructure.rag.retrieval.hybrid_search import HybridSearchConfig, HybridSearchService
 from src.infrastructure.rag.vector_store.pgvector_store import PgVectorStore
+from src.infrastructure.security.doc_id_set import DocIdSet
 from src.infrastructure.security.permission_cache import PermissionCache
 from src.infrastructure.security.permission_resolver import PermissionResolver
 
@@ -22,6 +28,8 @@ except ImportError:
     langfuse_context = None  # type: ignore
 
 if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
     from src.application.graphs.state import RAGState
 
 logger = logging.getLogger(__name__)
@@ -32,10 +40,24 @@ _embedding_service: GeminiEmbeddingService | None = None
 _permission_cache: PermissionCache | None = None
 
 
-def _get_embedding_service() -> GeminiEmbeddingService:
+def _build_query_cache() -> QueryEmbeddingCache | None:
+    if not settings.query_embedding_cache_enabled:
+        return None
+    redis_client = None
+    if settings.query_embedding_cache_redis_enabled:
+        # Valores binarios (float16): sin decode_responses
+        redis_client = Redis.from_url(settings.redis_url.get_secret_value(), decode_responses=False)
+    return QueryEmbeddingCache(
+        max_entries=settings.query_embedding_cache_max_entries,
+        ttl_seconds=settings.query_embedding_cache_ttl_seconds,
+        redis_client=redis_client,
+    )
+
+
+def get_embedding_service() -> GeminiEmbeddingService:
     global _embedding_service
     if _embedding_service is None:
-        _embedding_service = GeminiEmbeddingService()
+        _embedding_service = GeminiEmbeddingService(query_cache=_build_query_cache())
     return _embedding_service
 
 
@@ -46,7 +68,7 @@ def _get_permission_cache() -> PermissionCache:
     return _permission_cache
 
 
-def _build_enriched_query(query: str, messages: list) -> str:
+def build_enriched_query(query: str, messages: list) -> str:
     """Enriquece la query con contexto del turno anterior para mejorar el retrieval.
 
     Solo actúa cuando la query es corta (≤ 5 tokens) y hay historial previo.
@@ -81,6 +103,12 @@ def _build_enriched_query(query: str, messages: list) -> str:
     return f"{query} (contexto: {prev_human})"
 
 
+async def resolve_accessible_doc_ids(session: AsyncSession, user_id: int) -> DocIdSet:
+    """Resuelve los documentos accesibles del usuario (CTE de grupos + caché L1/Redis)."""
+    resolver = PermissionResolver(session, _get_permission_cache())
+    return await resolver.get_accessible_document_ids(user_id, use_cte=True)
+
+
 @observe(name="retrieve")
 async def retrieve_node(state: RAGState) -> dict:
     """Ejecuta búsqueda híbrida (Vector + BM25) sobre los documentos.
@@ -88,8 +116,13 @@ async def retrieve_node(state: RAGState) -> dict:
     1. Resuelve los documentos accesibles para el usuario (Late binding).
     2. Configura ef_search de HNSW para la sesión (spec T3-S4-02).
     3. Genera embedding de la consulta.
-    4. Ejecuta búsqueda híbrida en Postgres con filtro de permisos.
+    4. Ejecuta búsqueda híbrida con filtro de permisos (en Postgres, o con el
+       vector leg en el índice en proceso si ``RETRIEVAL_VECTOR_BACKEND=in_process``).
     5. Busca memorias episódicas relevantes (T4-S5-02).
+
+    Si ``guardrail_input`` corrió en modo especulativo, el embedding y los
+    documentos accesibles ya vienen en ``speculative_retrieval`` y no se
+    recalculan.
     """
     query = state.get("query", "")
     user_id = state.get("user_id")
@@ -100,19 +133,34 @@ async def retrieve_node(state: RAGState) -> dict:
         return {"retrieved_chunks": [], "context_text": "No tengo documentos disponibles para tu consulta"}
 
     # 1. Generar Embedding (con query enriquecida si hay historial y la query es corta)
-    retrieval_query = _build_enriched_query(query, messages)
+    retrieval_query = build_enriched_query(query, messages)
     if retrieval_query != query:
         logger.debug("retrieve: query enriched for retrieval (original=%r)", query)
 
-    embedding_service = _get_embedding_service()
-    query_vector = await embedding_service.embed_query(retrieval_query)
+    # Resultados del prefetch especulativo (guardrail_input), solo si son de esta query
+    speculative: dict = state.get("speculative_retrieval") or {}
+    if speculative.get("query") != retrieval_query:
+        speculative = {}
+    timings: dict[str, float] = {}
+
+    embedding_service = get_embedding_service()
+    query_vector = speculative.get("query_embedding")
+    if query_vector is None:
+        t0 = time.monotonic()
+        query_vector = await embedding_service.embed_query(retrieval_query)
+        timings["embedding_ms"] = elapsed_ms(t0)
 
     # 2. Búsqueda Híbrida con ef_search tuneable (T3-S4-02), Filtro de Permisos y Memoria (T4-S5-02)
-    async with async_session_maker() as session:
+    # Reutiliza la sesión del request si hay un scope activo (una conexión por turno)
+    async with borrow_session() as session:
         # Resolver permisos usando CTE para grupos
-        permission_cache = _get_permission_cache()
-        resolver = PermissionResolver(session, permission_cache)
-        accessible_doc_ids = await resolver.get_accessible_document_ids(user_id, use_cte=True)
+        # El prefetch lo deja serializado (bytes) para que el estado sea checkpointeable
+        packed_doc_ids = speculative.get("accessible_doc_ids")
+        accessible_doc_ids = DocIdSet.from_bytes(packed_doc_ids) if packed_doc_ids is not None else None
+        if accessible_doc_ids is None:
+            t0 = time.monotonic()
+            accessible_doc_ids = await resolve_accessible_doc_ids(session, user_id)
+            timings["permissions_ms"] = elapsed_ms(t0)
 
         if not accessible_doc_ids:
             logger.info("Usuario %s no tiene acceso a ningún documento. Cortocircuitando búsqueda.", user_id)
@@ -122,11 +170,17 @@ async def retrieve_node(state: RAGState) -> dict:
                 "query_embedding": query_vector,
                 "retrieved_chunks": [],
                 "context_text": "No tengo documentos disponibles para tu consulta",
+                "stage_timings": merge_stage_timings(state, **timings),
             }
 
-        if langfuse_context is not None:
-            langfuse_context.update_current_observation(metadata={"accessible_doc_ids": list(accessible_doc_ids)})
+        metadata: dict = {
+            "accessible_doc_ids": accessible_doc_ids.tolist(),
+            "speculative_prefetch": bool(speculative),
+        }
+        if embedding_service.query_cache is not None:
+            metadata["query_embedding_cache"] = embedding_service.query_cache.stats.to_dict()
 
+        t0 = time.monotonic()
         # Configurar ef_search para esta sesión (SET LOCAL no afecta otras)
         # SET no acepta bind params ($1) en PostgreSQL, se interpola como literal.
         # Es seguro: retrieval_ef_search es un int validado por Pydantic.
@@ -135,22 +189,55 @@ async def retrieve_node(state: RAGState) -> dict:
         vector_store = PgVectorStore(session)
 
         # Recuperamos un pool amplio para luego rerankear
-        hybrid_results = await vector_store.hybrid_search(
-            query_embedding=query_vector,
-            query_text=retrieval_query,
-            match_count=settings.retrieval_top_k,
-            rrf_k=settings.retrieval_rrf_k,
-            accessible_doc_ids=list(accessible_doc_ids),
-        )
+        if settings.retrieval_vector_backend == "in_process":
+            # Vector leg desde InProcessVectorIndex (cargado en el lifespan); si
+            # el índice no está listo el servicio cae solo al camino pgvector
+            search_service = HybridSearchService(
+                embedding_service, vector_store, config=HybridSearchConfig.from_settings()
+            )
+            stored_chunks, search_metrics = await search_service.search(
+                retrieval_query,
+                accessible_doc_ids=accessible_doc_ids.tolist(),
+                query_embedding=query_vector,
+            )
+            hybrid_results = [chunk.to_row() for chunk in stored_chunks]
+            metadata["hybrid_search"] = search_metrics.to_dict()
+        elif settings.retrieval_acl_strategy_enabled:
+            # Estrategia según selectividad del ACL (exact scan / iterative HNSW)
+            hybrid_results, acl_plan = await vector_store.acl_hybrid_search(
+                query_embedding=query_vector,
+                query_text=retrieval_query,
+                accessible_doc_ids=accessible_doc_ids,
+                match_count=settings.retrieval_top_k,
+                rrf_k=settings.retrieval_rrf_k,
+                ef_search=settings.retrieval_ef_search,
+                exact_max_chunks=settings.retrieval_acl_exact_max_chunks,
+                max_scan_tuples=settings.retrieval_acl_max_scan_tuples,
+                acl_cache_keys=settings.retrieval_acl_cache_keys,
+            )
+            metadata["acl_search"] = acl_plan.to_dict()
+        else:
+            hybrid_results = await vector_store.hybrid_search(
+                query_embedding=query_vector,
+                query_text=retrieval_query,
+                match_count=settings.retrieval_top_k,
+                rrf_k=settings.retrieval_rrf_k,
+                accessible_doc_ids=accessible_doc_ids.tolist(),
+            )
+        timings["search_ms"] = elapsed_ms(t0)
+        if langfuse_context is not None:
+            langfuse_context.update_current_observation(metadata=metadata)
 
         # Buscar memorias relevantes
         memories = []
         if user_id:
+            t0 = time.monotonic()
             memory_service = MemoryRetrievalService(session)
             memories = await memory_service.search_memories(
                 user_id=user_id,
                 query_embedding=query_vector,
             )
+            timings["memory_search_ms"] = elapsed_ms(t0)
 
     logger.info("retrieve: %d chunks encontrados para la query '%s'", len(hybrid_results), query)
 
@@ -158,4 +245,5 @@ async def retrieve_node(state: RAGState) -> dict:
         "query_embedding": query_vector,
         "retrieved_chunks": hybrid_results,
         "user_memories": memories,
+        "stage_timings": merge_stage_timings(state, **timings),
     }
@@ -2,6 +2,7 @@
 
 Determina si los documentos recuperados son suficientemente relevantes
 para generar una respuesta, usando los scores de reranking como indicador.
+Los umbrales dependen del backend de reranking (``score_thresholds``).
 
 Ubicacion en el grafo: rerank -> score_gate -> [routing condicional]
 """
@@ -13,6 +14,7 @@ from typing import TYPE_CHECKING
 
 from src.config.settings import settings
 from src.infrastructure.observability.langfuse_client import observe
+from src.infrastructure.rag.retrieval.rerank_backend import score_thresholds
 
 if TYPE_CHECKING:
     from src.application.graphs.state import RAGState
@@ -25,10 +27,13 @@ def score_gate_node(state: RAGState) -> dict:
     """Evalua la calidad de los chunks rerankeados y clasifica la confianza.
 
     Resultado ``retrieval_confidence``:
-    - ``"suficiente"``: max score >= reranking_threshold → continuar a generate.
-    - ``"insuficiente"``: max score < similarity_threshold → fallback.
+    - ``"suficiente"``: max score >= umbral alto → continuar a generate.
+    - ``"insuficiente"``: max score < umbral bajo → fallback.
     - ``"ambiguo"``: score entre ambos umbrales → escalar a topic_classifier.
 
+    Los umbrales son ``reranking_threshold`` / ``similarity_threshold``, o los
+    ``reranker_local_*`` con ``RERANKER_BACKEND=local``.
+
     Caso especial: si no hay chunks, clasifica como ``"sin_contexto"``
     (tratado como insuficiente por el routing).
     """
@@ -40,8 +45,7 @@ def score_gate_node(state: RAGState) -> dict:
 
     max_score = max(chunk.get("score", 0.0) for chunk in reranked_chunks)
 
-    high_threshold = settings.reranking_threshold
-    low_threshold = settings.similarity_threshold
+    low_threshold, high_threshold = score_thresholds(settings.reranker_backend)
 
     if max_score >= high_threshold:
         confidence = "suficiente"
@@ -51,11 +55,12 @@ def score_gate_node(state: RAGState) -> dict:
         confidence = "ambiguo"
 
     logger.info(
-        "score_gate: confidence=%s max_score=%.3f thresholds=[%.2f, %.2f] n_chunks=%d",
+        "score_gate: confidence=%s max_score=%.3f thresholds=[%.2f, %.2f] backend=%s n_chunks=%d",
         confidence,
         max_score,
         low_threshold,
         high_threshold,
+        settings.reranker_backend,
         len(reranked_chunks),
     )
     return {"retrieval_confidence": confidence}
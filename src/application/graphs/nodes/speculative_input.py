@@ -0,0 +1,126 @@
+"""Nodo guardrail_input en modo especulativo.
+
+El guardrail de entrada (clasificador LLM de ``InputValidator``), el embedding
+de la query (Gemini) y la resolución de permisos (Postgres/Redis) son
+independientes entre sí.  En el pipeline secuencial se pagan uno detrás del
+otro antes de llegar a la búsqueda híbrida; este nodo los lanza en paralelo:
+
+- Si el guardrail bloquea, el prefetch se descarta: se cancela el embedding y
+  se espera (sin usar el resultado) la resolución de permisos, que tiene
+  prestada la sesión del request y no debe cortarse a mitad de una query.
+- Si el guardrail aprueba, el embedding y los documentos accesibles se dejan
+  en ``speculative_retrieval`` y ``retrieve`` los reutiliza.
+
+Un fallo del prefetch no falla el turno: ``retrieve`` recalcula lo que falte.
+Se registran los tiempos por etapa en ``stage_timings`` (``guardrail_ms``,
+``embedding_ms``, ``permissions_ms``, ``speculative_total_ms`` y
+``speculative_overlap_ms``, el tiempo ahorrado respecto a la ejecución
+secuencial).
+
+Se activa con ``settings.rag_speculative_prefetch_enabled`` (ver
+``build_rag_graph``); ocupa el lugar de ``validate_input_node`` en el grafo.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, cast
+
+from src.application.graphs.nodes.retrieve import (
+    build_enriched_query,
+    get_embedding_service,
+    resolve_accessible_doc_ids,
+)
+from src.application.graphs.nodes.validate_input import validate_input_node
+from src.application.graphs.stage_timings import elapsed_ms, merge_stage_timings
+from src.infrastructure.database.session import borrow_session
+from src.infrastructure.observability.langfuse_client import observe
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
+    from src.application.graphs.state import RAGState
+
+logger = logging.getLogger(__name__)
+
+
+async def _timed(awaitable: Awaitable[Any]) -> tuple[Any, float]:
+    """Await *awaitable* and return ``(result, elapsed_ms)``."""
+    t0 = time.monotonic()
+    result = await awaitable
+    return result, elapsed_ms(t0)
+
+
+async def _prefetch_accessible_doc_ids(user_id: int) -> bytes:
+    # Serializado: ``speculative_retrieval`` viaja en el estado checkpointeado
+    async with borrow_session() as session:
+        return (await resolve_accessible_doc_ids(session, user_id)).to_bytes()
+
+
+@observe(name="rag_speculative_input")
+async def speculative_input_node(state: RAGState) -> dict:
+    """Guardrail de entrada con embedding y permisos en paralelo.
+
+    Solo especula para ``query_type == "consulta"`` con ``user_id``; el resto
+    (saludos, declaraciones de contexto) delega en ``validate_input_node``.
+
+    Returns
+    -------
+    dict
+        Lo mismo que ``validate_input_node`` más ``speculative_retrieval``
+        (vacío si se bloqueó o no se especuló) y ``stage_timings``.
+    """
+    user_id = state.get("user_id")
+    if state.get("query_type", "consulta") != "consulta" or not user_id:
+        return cast("dict[str, Any]", await validate_input_node(state))
+
+    retrieval_query = build_enriched_query(state.get("query", ""), state.get("messages", []))
+    t_start = time.monotonic()
+    embed_task = asyncio.create_task(_timed(get_embedding_service().embed_query(retrieval_query)))
+    perms_task = asyncio.create_task(_timed(_prefetch_accessible_doc_ids(user_id)))
+
+    try:
+        guardrail: dict[str, Any] = await validate_input_node(state)
+    except BaseException:
+        embed_task.cancel()
+        await asyncio.gather(embed_task, perms_task, return_exceptions=True)
+        raise
+
+    if not guardrail.get("guardrail_passed", False):
+        embed_task.cancel()
+        await asyncio.gather(embed_task, perms_task, return_exceptions=True)
+        logger.info("speculative_prefetch_discarded user_id=%s", user_id)
+        return {
+            **guardrail,
+            "speculative_retrieval": {},
+            "stage_timings": merge_stage_timings(guardrail, speculative_total_ms=elapsed_ms(t_start)),
+        }
+
+    embed_result: tuple[list[float], float] | BaseException
+    perms_result: tuple[bytes, float] | BaseException
+    embed_result, perms_result = await asyncio.gather(embed_task, perms_task, return_exceptions=True)
+    total_ms = elapsed_ms(t_start)
+    speculative: dict[str, Any] = {"query": retrieval_query}
+    timings: dict[str, float] = {"speculative_total_ms": total_ms}
+
+    if isinstance(embed_result, BaseException):
+        logger.warning("speculative_embedding_failed error=%s", embed_result)
+    else:
+        speculative["query_embedding"], timings["embedding_ms"] = embed_result
+
+    if isinstance(perms_result, BaseException):
+        logger.warning("speculative_permissions_failed user_id=%s error=%s", user_id, perms_result)
+    else:
+        speculative["accessible_doc_ids"], timings["permissions_ms"] = perms_result
+
+    stage_timings = merge_stage_timings(guardrail, **timings)
+    sequential_ms = sum(stage_timings.get(k, 0.0) for k in ("guardrail_ms", "embedding_ms", "permissions_ms"))
+    stage_timings["speculative_overlap_ms"] = round(max(sequential_ms - total_ms, 0.0), 1)
+
+    return {
+        **guardrail,
+        "speculative_retrieval": speculative,
+        "stage_timings": stage_timings,
+    }
@@ -13,7 +13,7 @@ import logging
 from typing import TYPE_CHECKING
 
 from src.config.topic_config import topic_config
-from src.infrastructure.llm.client import GeminiClient, GeminiModel
+from src.infrastructure.llm.client import GeminiModel, get_gemini_client
 from src.infrastructure.observability.langfuse_client import observe
 from src.infrastructure.security.guardrails.topic_guard import (
     TopicCategory,
@@ -38,7 +38,7 @@ def _get_guard() -> TopicGuard:
     """
     global _guard
     if _guard is None:
-        client = GeminiClient(model=GeminiModel.FLASH, temperature=0.0)
+        client = get_gemini_client(model=GeminiModel.FLASH, temperature=0.0)
         from src.config.settings import settings
 
         enable_llm = settings.environment != "development"
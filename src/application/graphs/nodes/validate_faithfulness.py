@@ -21,7 +21,7 @@ import logging
 from typing import TYPE_CHECKING
 
 from src.config.settings import settings
-from src.infrastructure.llm.client import GeminiClient, GeminiModel
+from src.infrastructure.llm.client import GeminiClient, GeminiModel, get_gemini_client
 from src.infrastructure.observability.langfuse_client import get_langfuse, observe
 from src.infrastructure.security.guardrails.faithfulness_judge import (
     FaithfulnessJudge,
@@ -74,7 +74,7 @@ def _get_judge() -> FaithfulnessJudge:
     """
     global _judge
     if _judge is None:
-        client = GeminiClient(model=GeminiModel.FLASH, temperature=0.0)
+        client = get_gemini_client(model=GeminiModel.FLASH, temperature=0.0)
         _judge = FaithfulnessJudge(
             llm_client=client,
             threshold=settings.faithfulness_threshold,
@@ -90,7 +90,7 @@ def _get_regen_client() -> GeminiClient:
     """
     global _regen_client
     if _regen_client is None:
-        _regen_client = GeminiClient(model=GeminiModel.FLASH, temperature=0.1)
+        _regen_client = get_gemini_client(model=GeminiModel.FLASH, temperature=0.1)
     return _regen_client
 
 
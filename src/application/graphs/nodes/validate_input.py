@@ -13,9 +13,11 @@ Ubicación en el grafo: classify_intent → guardrail_input → [routing]
 from __future__ import annotations
 
 import logging
+import time
 from typing import TYPE_CHECKING
 
-from src.infrastructure.llm.client import GeminiClient, GeminiModel
+from src.application.graphs.stage_timings import elapsed_ms, merge_stage_timings
+from src.infrastructure.llm.client import GeminiModel, get_gemini_client
 from src.infrastructure.observability.langfuse_client import observe
 from src.infrastructure.security.guardrails.input_validator import (
     InputValidator,
@@ -65,7 +67,7 @@ def _get_validator() -> InputValidator:
     """
     global _validator
     if _validator is None:
-        client = GeminiClient(model=GeminiModel.FLASH_LITE, temperature=0.0)
+        client = get_gemini_client(model=GeminiModel.FLASH_LITE, temperature=0.0)
         from src.config.settings import settings
 
         enable_llm = settings.environment != "development"
@@ -100,6 +102,7 @@ async def validate_input_node(state: RAGState) -> dict:
         - guardrail_passed: bool
         - query_type: str (solo se cambia si se bloquea)
         - response: str (solo si se bloquea — mensaje predefinido)
+        - stage_timings: dict (``guardrail_ms``)
     """
     query = state.get("query", "")
     query_type = state.get("query_type", "consulta")
@@ -109,12 +112,14 @@ async def validate_input_node(state: RAGState) -> dict:
         logger.debug("guardrail_input: saludo, skipping validation")
         return {"guardrail_passed": True}
 
+    t0 = time.monotonic()
     validator = _get_validator()
     result = await validator.validate(query)
+    stage_timings = merge_stage_timings(state, guardrail_ms=elapsed_ms(t0))
 
     if result.is_safe:
         logger.debug("guardrail_input: query SAFE")
-        return {"guardrail_passed": True}
+        return {"guardrail_passed": True, "stage_timings": stage_timings}
 
     # ── Query bloqueada ──────────────────────────────────────────
     blocked_response = _BLOCKED_RESPONSES.get(result.threat_category, _DEFAULT_BLOCKED_RESPONSE)
@@ -131,4 +136,5 @@ async def validate_input_node(state: RAGState) -> dict:
         "guardrail_passed": False,
         "query_type": "blocked",
         "response": blocked_response,
+        "stage_timings": stage_timings,
     }
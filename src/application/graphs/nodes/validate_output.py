@@ -9,6 +9,12 @@ fallback seguro y marca ``guardrail_passed=False``.
 Logging del resultado a Langfuse via el decorador ``observe()``.
 
 Ubicacion en el flujo: post-generate (invocado desde stream_response).
+
+En streaming, ``create_output_stream_guard`` arma un
+``StreamingOutputGuard`` (mismo validator + detector PII del nodo
+``guardrail_pii_output``) que redacta PII token a token y evalua
+faithfulness por oracion; ``finish_output_stream_guard`` da el veredicto
+final sin re-escanear la respuesta.
 """
 
 from __future__ import annotations
@@ -16,12 +22,16 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
+from src.application.graphs.nodes.guardrail_pii_output import FALLBACK_MESSAGE_PII, get_pii_detector
+from src.config.settings import settings
 from src.infrastructure.observability.langfuse_client import observe
 from src.infrastructure.security.guardrails.output_validator import (
     FALLBACK_MESSAGE,
     OutputGuardrailResult,
+    OutputRejectionReason,
     OutputValidator,
 )
+from src.infrastructure.security.guardrails.stream_guard import StreamingOutputGuard
 
 if TYPE_CHECKING:
     from src.application.graphs.state import RAGState
@@ -150,3 +160,63 @@ def validate_output(response: str, context: str) -> tuple[bool, str]:
         result.detail,
     )
     return False, FALLBACK_MESSAGE
+
+
+# ── Guard incremental para streaming ────────────────────────────────
+
+
+def create_output_stream_guard(context: str) -> StreamingOutputGuard:
+    """Crea el guard incremental para una respuesta en streaming.
+
+    Debe llamarse dentro del event loop (agenda la extraccion de keywords
+    del contexto en un thread, en paralelo con la generacion).
+    """
+    return StreamingOutputGuard(
+        context=context,
+        detector=get_pii_detector(),
+        validator=_get_validator(),
+        lookbehind_chars=settings.output_stream_guard_lookbehind_chars,
+    )
+
+
+@observe(name="guardrail_output_stream")
+async def finish_output_stream_guard(
+    guard: StreamingOutputGuard,
+    *,
+    check_faithfulness: bool = True,
+) -> tuple[bool, str]:
+    """Veredicto final del guard incremental (equivalente a ``validate_output``).
+
+    Parameters
+    ----------
+    guard:
+        Guard que ya recibio todos los tokens y ``finish()``.
+    check_faithfulness:
+        ``False`` para respuestas de fallback (solo aplica el bloqueo PII).
+
+    Returns
+    -------
+    tuple[bool, str]
+        ``(is_safe, final_response)`` — si es safe, el texto emitido (con PII
+        redactado); si no, el fallback message correspondiente.
+    """
+    result = await guard.result(check_faithfulness=check_faithfulness)
+    logger.info(
+        "guardrail_output_stream: safe=%s reason=%s faithfulness=%.2f pii_types=%s stats=%s",
+        result.is_safe,
+        result.reason,
+        result.faithfulness_score,
+        guard.pii_types,
+        guard.stats.to_dict(),
+    )
+    if result.is_safe:
+        return True, guard.emitted_text
+
+    logger.warning(
+        "guardrail_output: BLOCKED — reason=%s, detail=%s",
+        result.reason,
+        result.detail,
+    )
+    if result.reason == OutputRejectionReason.SENSITIVE_DATA:
+        return False, FALLBACK_MESSAGE_PII
+    return False, FALLBACK_MESSAGE
@@ -10,6 +10,11 @@ Pipeline retrieve-first:
         suficiente → assemble_context
         insuficiente → respond_blocked
         ambiguo → topic_classifier → [routing] → assemble_context | respond_blocked
+
+Con ``settings.rag_speculative_prefetch_enabled`` el nodo ``guardrail_input``
+es ``speculative_input_node``: lanza el embedding de la query y la resolución
+de permisos en paralelo con el guardrail, y ``retrieve`` reutiliza ese
+prefetch (se descarta si la query se bloquea).
 """
 
 from __future__ import annotations
@@ -32,9 +37,11 @@ from src.application.graphs.nodes.respond_blocked import respond_blocked_node
 from src.application.graphs.nodes.respond_greeting import respond_greeting_node
 from src.application.graphs.nodes.retrieve import retrieve_node
 from src.application.graphs.nodes.score_gate import score_gate_node
+from src.application.graphs.nodes.speculative_input import speculative_input_node
 from src.application.graphs.nodes.topic_classifier import topic_classifier_node
 from src.application.graphs.nodes.validate_input import validate_input_node
 from src.application.graphs.state import RAGState
+from src.config.settings import settings
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
@@ -126,7 +133,9 @@ def build_rag_graph(checkpointer=None):
 
     # --- Nodos ---
     graph.add_node("classify_intent", classify_intent_node)
-    graph.add_node("guardrail_input", validate_input_node)
+    # Modo especulativo: mismo nodo/routing, con prefetch de embedding y permisos
+    guardrail_node = speculative_input_node if settings.rag_speculative_prefetch_enabled else validate_input_node
+    graph.add_node("guardrail_input", guardrail_node)
     graph.add_node("retrieve", retrieve_node)
     graph.add_node("rerank", rerank_node)
     graph.add_node("score_gate", score_gate_node)
@@ -0,0 +1,25 @@
+"""Per-stage timings of the RAG prep graph.
+
+Nodes record wall-clock durations (ms) under ``state["stage_timings"]`` so the
+streaming use case can log them next to the time-to-first-token.  The field is
+a plain dict (no reducer): nodes run sequentially, each one returns a merged
+copy, and ``stream_rag_events`` resets it at the start of every turn.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+def elapsed_ms(t0: float) -> float:
+    """Milliseconds elapsed since *t0* (a ``time.monotonic()`` reading)."""
+    return round((time.monotonic() - t0) * 1000, 1)
+
+
+def merge_stage_timings(state: Mapping, **timings: float) -> dict[str, float]:
+    """Return the state's ``stage_timings`` updated with *timings*."""
+    return {**(state.get("stage_timings") or {}), **timings}
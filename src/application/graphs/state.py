@@ -24,6 +24,11 @@ class RAGState(TypedDict):
     # Retrieval
     retrieved_chunks: list[dict]
     reranked_chunks: list[dict]
+    # Speculative prefetch (guardrail_input): {"query", "query_embedding", "accessible_doc_ids" (DocIdSet bytes)}
+    speculative_retrieval: dict
+
+    # Per-stage durations in ms (see graphs/stage_timings.py)
+    stage_timings: dict[str, float]
 
     # Generación
     context_text: str
@@ -0,0 +1,268 @@
+"""Pipelined indexing: load/chunk -> embed -> store as overlapping stages.
+
+``IndexingService._execute_pipeline`` runs the stages strictly in sequence:
+embedding waits for the whole document to be chunked and storage waits for
+every embedding, so the document's chunks *and* all its vectors are held in
+memory at once and wall-clock is the sum of the stages.
+
+``IndexingPipeline`` connects the stages with bounded ``asyncio.Queue``s:
+
+* **chunk** — a worker thread iterates the (streaming) chunk generator and
+  pushes batches of ``batch_size`` chunks; it blocks when the queue is full
+  (backpressure reaches the PDF reader);
+* **embed** — ``embed_workers`` tasks embed each batch as soon as it arrives;
+* **store** — a single task writes each embedded batch with
+  ``PgVectorStore.add_chunks_bulk`` (one ``COPY`` per batch).  A single
+  writer is required: the stages share the caller's ``AsyncSession``, and
+  every database access goes through ``session_lock``.
+
+Peak memory is bounded by the queue sizes instead of the document size, and
+wall-clock approaches the slowest stage.  ``PipelineMetrics`` reports, per
+stage, items, busy time, throughput and the occupancy of its input queue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import Awaitable, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+ChunkTuple = tuple[int, str, list[float] | None, str, int | None, dict | None]
+
+
+@dataclass
+class StageMetrics:
+    """Counters of one stage; queue stats describe the stage's input queue."""
+
+    name: str
+    items: int = 0
+    batches: int = 0
+    busy_seconds: float = 0.0
+    queue_samples: int = 0
+    queue_depth_total: int = 0
+    queue_depth_max: int = 0
+
+    def observe_queue(self, depth: int) -> None:
+        self.queue_samples += 1
+        self.queue_depth_total += depth
+        self.queue_depth_max = max(self.queue_depth_max, depth)
+
+    def to_dict(self, wall_seconds: float) -> dict[str, Any]:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "items_per_second": round(self.items / wall_seconds, 1) if wall_seconds else 0.0,
+            "utilization": round(self.busy_seconds / wall_seconds, 3) if wall_seconds else 0.0,
+            "queue_avg": round(self.queue_depth_total / self.queue_samples, 2) if self.queue_samples else 0.0,
+            "queue_max": self.queue_depth_max,
+        }
+
+
+@dataclass
+class PipelineMetrics:
+    """Per-stage metrics of one pipelined run."""
+
+    chunk: StageMetrics = field(default_factory=lambda: StageMetrics("chunk"))
+    embed: StageMetrics = field(default_factory=lambda: StageMetrics("embed"))
+    store: StageMetrics = field(default_factory=lambda: StageMetrics("store"))
+    wall_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "wall_seconds": round(self.wall_seconds, 3),
+            **{stage.name: stage.to_dict(self.wall_seconds) for stage in (self.chunk, self.embed, self.store)},
+        }
+
+
+@dataclass
+class PipelineResult:
+    """Aggregates of a pipelined run (the chunks themselves are not retained)."""
+
+    chunk_ids: list[uuid.UUID] = field(default_factory=list)
+    tokens_total: int = 0
+    areas_distribution: dict[str, int] = field(default_factory=dict)
+    metrics: PipelineMetrics = field(default_factory=PipelineMetrics)
+
+
+class IndexingPipeline:
+    """Run chunk -> embed -> store for one document with bounded queues.
+
+    Parameters
+    ----------
+    embed:
+        ``async (texts) -> embeddings`` (``ChunkEmbeddingCache.embed_documents``
+        or ``GeminiEmbeddingService.embed_documents``); ``None`` marks a chunk
+        whose text is already indexed (stored as a dedup reference).
+    store:
+        ``async (chunk_tuples) -> ids`` (``PgVectorStore.add_chunks_bulk`` bound
+        to the document).
+    session_lock:
+        Lock serializing database access between the embed stage (embedding
+        cache) and the store stage.  The store stage always takes it.
+    batch_size:
+        Chunks per batch between stages.
+    queue_size:
+        Capacity (in batches) of each inter-stage queue.
+    embed_workers:
+        Concurrent embed tasks.
+    """
+
+    def __init__(
+        self,
+        *,
+        embed: Callable[[list[str]], Awaitable[list[list[float] | None]]],
+        store: Callable[[list[ChunkTuple]], Awaitable[list[uuid.UUID]]],
+        session_lock: asyncio.Lock,
+        batch_size: int = 100,
+        queue_size: int = 4,
+        embed_workers: int = 2,
+    ) -> None:
+        self._embed = embed
+        self._store = store
+        self._session_lock = session_lock
+        self._batch_size = batch_size
+        self._queue_size = queue_size
+        self._embed_workers = embed_workers
+
+    async def run(
+        self,
+        chunks: Iterator[Any],
+        *,
+        on_batch_stored: Callable[[int], None] | None = None,
+    ) -> PipelineResult:
+        """Consume the (blocking) *chunks* iterator in a worker thread and index every chunk.
+
+        ``on_batch_stored`` receives the total chunks stored so far.
+        """
+        loop = asyncio.get_running_loop()
+        chunk_queue: asyncio.Queue[Any] = asyncio.Queue(self._queue_size)
+        embedded_queue: asyncio.Queue[Any] = asyncio.Queue(self._queue_size)
+        stop = threading.Event()
+        result = PipelineResult()
+        metrics = result.metrics
+        areas: Counter[str] = Counter()
+        t0 = time.perf_counter()
+
+        def put_from_thread(item: Any) -> bool:
+            if stop.is_set():
+                return False
+            future = asyncio.run_coroutine_threadsafe(chunk_queue.put(item), loop)
+            while True:
+                try:
+                    future.result(timeout=0.5)
+                    return True
+                except TimeoutError:
+                    if stop.is_set():
+                        future.cancel()
+                        return False
+
+        def produce() -> None:
+            # (position, chunk) pairs: position is the chunk_index in document_chunks
+            batch: list[tuple[int, Any]] = []
+            started = time.perf_counter()
+            try:
+                for position, chunk in enumerate(chunks):
+                    batch.append((position, chunk))
+                    if len(batch) >= self._batch_size:
+                        metrics.chunk.busy_seconds += time.perf_counter() - started
+                        metrics.chunk.items += len(batch)
+                        metrics.chunk.batches += 1
+                        if not put_from_thread(batch):
+                            return
+                        batch = []
+                        started = time.perf_counter()
+                if batch:
+                    metrics.chunk.busy_seconds += time.perf_counter() - started
+                    metrics.chunk.items += len(batch)
+                    metrics.chunk.batches += 1
+                    put_from_thread(batch)
+            except BaseException as exc:
+                put_from_thread(exc)
+                return
+            put_from_thread(_DONE)
+
+        async def embed_worker() -> None:
+            while True:
+                item = await chunk_queue.get()
+                if item is _DONE or isinstance(item, BaseException):
+                    # Re-publicar para los demás workers del embed stage
+                    await chunk_queue.put(item)
+                    if isinstance(item, BaseException):
+                        raise item
+                    return
+                metrics.embed.observe_queue(chunk_queue.qsize() + 1)
+                started = time.perf_counter()
+                embeddings = await self._embed([chunk.text for _, chunk in item])
+                metrics.embed.busy_seconds += time.perf_counter() - started
+                metrics.embed.items += len(item)
+                metrics.embed.batches += 1
+                await embedded_queue.put(list(zip(item, embeddings, strict=True)))
+
+        async def store_worker() -> None:
+            while True:
+                item = await embedded_queue.get()
+                if item is _DONE:
+                    return
+                metrics.store.observe_queue(embedded_queue.qsize() + 1)
+                tuples: list[ChunkTuple] = []
+                for (position, chunk), embedding in item:
+                    area = chunk.metadata.get("area", "general") if chunk.metadata else "general"
+                    areas[area] += 1
+                    result.tokens_total += chunk.token_count
+                    tuples.append((position, chunk.text, embedding, area, chunk.token_count, chunk.metadata))
+                started = time.perf_counter()
+                async with self._session_lock:
+                    result.chunk_ids.extend(await self._store(tuples))
+                metrics.store.busy_seconds += time.perf_counter() - started
+                metrics.store.items += len(tuples)
+                metrics.store.batches += 1
+                if on_batch_stored is not None:
+                    on_batch_stored(len(result.chunk_ids))
+
+        async def close_embed_stage() -> None:
+            await asyncio.gather(*embedders)
+            await embedded_queue.put(_DONE)
+
+        producer = loop.run_in_executor(None, produce)
+        embedders = [asyncio.create_task(embed_worker()) for _ in range(self._embed_workers)]
+        storer = asyncio.create_task(store_worker())
+        tasks = [*embedders, asyncio.create_task(close_embed_stage()), storer]
+        try:
+            # Supervisar todas las etapas juntas: si el store falla, los embedders
+            # quedarían bloqueados en embedded_queue.put esperando un consumidor
+            pending: set[asyncio.Task[None]] = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+                for task in done:
+                    exc = None if task.cancelled() else task.exception()
+                    if exc is not None:
+                        raise exc
+            await producer
+        except BaseException:
+            stop.set()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Liberar al productor si quedó bloqueado en put
+            while not chunk_queue.empty():
+                chunk_queue.get_nowait()
+            await asyncio.gather(producer, return_exceptions=True)
+            raise
+
+        metrics.wall_seconds = time.perf_counter() - t0
+        result.areas_distribution = dict(areas)
+        logger.info("indexing_pipeline_done chunks=%d metrics=%s", len(result.chunk_ids), metrics.to_dict())
+        return result
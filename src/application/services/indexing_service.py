@@ -9,6 +9,7 @@ for committing or rolling back the transaction.
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
 import time
@@ -17,9 +18,15 @@ from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import text
 
+from src.application.services.indexing_pipeline import IndexingPipeline
+from src.config.settings import settings
+from src.infrastructure.rag.chunking.chunk_diff import chunk_content_hash
+from src.infrastructure.rag.chunking.process_pool import ChunkingPool, get_chunking_pool
+from src.infrastructure.rag.embeddings.chunk_cache import ChunkEmbeddingCache, PgEmbeddingCacheStore
+
 if TYPE_CHECKING:
     import uuid
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterator
     from pathlib import Path
 
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -44,6 +51,16 @@ class IndexingResult:
     duration_seconds: float
     success: bool
     error: str | None = None
+    embedding_cache_hits: int = 0
+    embedding_cache_misses: int = 0
+    chunks_deduplicated: int = 0
+    stage_metrics: dict[str, Any] | None = None
+
+    @property
+    def embedding_cache_hit_rate(self) -> float:
+        """Fraction of chunks whose embedding came from ``embedding_cache``."""
+        total = self.embedding_cache_hits + self.embedding_cache_misses
+        return self.embedding_cache_hits / total if total else 0.0
 
 
 class IndexingService:
@@ -65,6 +82,22 @@ class IndexingService:
         PgVectorStore for persisting chunks with embeddings.
     document_repository:
         Repository for document CRUD operations.
+    embedding_cache:
+        Content-addressed chunk embedding cache consulted before Gemini.
+        Defaults to the Postgres ``embedding_cache`` table on *session* when
+        ``settings.embedding_cache_enabled``.
+    chunking_pool:
+        Process pool for the CPU-bound load + chunk stages.  Defaults to the
+        process-wide pool when ``settings.chunking_pool_enabled``; otherwise
+        *loader_factory* / *chunker* run in a worker thread.
+
+    Chunks whose text is already indexed (by this or another document) are
+    not embedded: they are stored as references to the canonical row
+    (``IndexingResult.chunks_deduplicated``).
+
+    With ``settings.indexing_pipeline_enabled`` the load/chunk, embed and
+    store stages overlap (``IndexingPipeline``); ``IndexingResult.stage_metrics``
+    then reports per-stage throughput and queue occupancy.
     """
 
     def __init__(
@@ -76,6 +109,8 @@ class IndexingService:
         embedding_service: GeminiEmbeddingService,
         vector_store: PgVectorStore,
         document_repository: DocumentRepositoryBase,
+        embedding_cache: ChunkEmbeddingCache | None = None,
+        chunking_pool: ChunkingPool | None = None,
     ) -> None:
         self._session = session
         self._loader_factory = loader_factory
@@ -83,6 +118,15 @@ class IndexingService:
         self._embedding_service = embedding_service
         self._vector_store = vector_store
         self._document_repository = document_repository
+        # Serializa el uso de la sesión entre los stages del modo pipelined
+        self._session_lock = asyncio.Lock()
+        if embedding_cache is None and settings.embedding_cache_enabled:
+            embedding_cache = ChunkEmbeddingCache(
+                PgEmbeddingCacheStore(session, lock=self._session_lock),
+                embedding_service,
+            )
+        self._embedding_cache = embedding_cache
+        self._chunking_pool = chunking_pool or get_chunking_pool()
 
     async def index_document(
         self,
@@ -199,23 +243,35 @@ class IndexingService:
                 file_hash,
             )
 
-        # 2. Load document
+        if settings.indexing_pipeline_enabled:
+            return await self._execute_pipelined(
+                file_path=file_path,
+                document_id=document_id,
+                file_hash=file_hash,
+                start_time=start_time,
+                on_progress=on_progress,
+            )
+
+        # 2-3. Load and chunk document (CPU-bound: off the event loop)
         self._notify(on_progress, "loading", 0.10)
 
-        loaded_doc = self._loader_factory.load(file_path)
+        if self._chunking_pool is not None:
+            chunked = await self._chunking_pool.chunk_file(file_path)
+            chunked.raise_for_error()
+            chunks, pages = chunked.chunks, chunked.pages
+        else:
+            loaded_doc = await asyncio.to_thread(self._loader_factory.load, file_path)
+            self._notify(on_progress, "chunking", 0.20)
+            chunks = await asyncio.to_thread(self._chunker.chunk, loaded_doc)
+            pages = loaded_doc.pages
 
         logger.info(
             "document_loaded document_id=%s filename=%s pages=%d",
             document_id,
             file_path.name,
-            loaded_doc.pages,
+            pages,
         )
 
-        # 3. Chunk document
-        self._notify(on_progress, "chunking", 0.20)
-
-        chunks = self._chunker.chunk(loaded_doc)
-
         logger.info(
             "document_chunked document_id=%s chunks=%d tokens=%d",
             document_id,
@@ -233,19 +289,19 @@ class IndexingService:
                 pct = 0.40 + (0.40 * batch_num / max(total_batches, 1))
                 on_progress("embedding", pct)
 
-        embeddings = await self._embedding_service.embed_documents(
-            texts,
-            on_progress=_embedding_progress,
+        embeddings, cache_hits, cache_misses = await self._embed_new_texts(
+            texts, document_id=document_id, on_progress=_embedding_progress
         )
 
         # 5. Store chunks in pgvector
         self._notify(on_progress, "storing", 0.85)
 
         chunk_tuples = self._build_chunk_tuples(chunks, embeddings)
-        chunk_ids = await self._vector_store.add_chunks(
+        chunk_ids = await self._vector_store.add_chunks_bulk(
             document_id=document_id,
             chunks=chunk_tuples,
         )
+        deduplicated = await self._finalize_dedup(document_id)
 
         # 6. Update document metadata
         self._notify(on_progress, "finalizing", 0.95)
@@ -264,9 +320,11 @@ class IndexingService:
         duration = time.monotonic() - start_time
 
         logger.info(
-            "indexing_completed document_id=%s chunks=%d duration=%.2f",
+            "indexing_completed document_id=%s chunks=%d deduplicated=%d embedding_cache_hits=%d duration=%.2f",
             document_id,
             len(chunk_ids),
+            deduplicated,
+            cache_hits,
             duration,
         )
 
@@ -277,8 +335,148 @@ class IndexingService:
             areas_distribution=areas_dist,
             duration_seconds=duration,
             success=True,
+            embedding_cache_hits=cache_hits,
+            embedding_cache_misses=cache_misses,
+            chunks_deduplicated=deduplicated,
+        )
+
+    async def _execute_pipelined(
+        self,
+        *,
+        file_path: Path,
+        document_id: int,
+        file_hash: str,
+        start_time: float,
+        on_progress: Callable[[str, float], None] | None,
+    ) -> IndexingResult:
+        """Load/chunk, embed and store as overlapping stages (``IndexingPipeline``)."""
+        self._notify(on_progress, "pipelined", 0.10)
+
+        cache_hits = cache_misses = 0
+
+        async def _embed(texts: list[str]) -> list[list[float] | None]:
+            nonlocal cache_hits, cache_misses
+            vectors, hits, misses = await self._embed_new_texts(texts, document_id=document_id)
+            cache_hits += hits
+            cache_misses += misses
+            return vectors
+
+        async def _store(tuples: list) -> list[uuid.UUID]:
+            return await self._vector_store.add_chunks_bulk(document_id=document_id, chunks=tuples)
+
+        def _stored(total: int) -> None:
+            logger.debug("pipeline_progress document_id=%s stored=%d", document_id, total)
+
+        pipeline = IndexingPipeline(
+            embed=_embed,
+            store=_store,
+            session_lock=self._session_lock,
+            batch_size=settings.indexing_pipeline_batch_size,
+            queue_size=settings.indexing_pipeline_queue_size,
+            embed_workers=settings.embedding_max_concurrency,
+        )
+        result = await pipeline.run(self._iter_chunks(file_path), on_batch_stored=_stored)
+
+        self._notify(on_progress, "finalizing", 0.95)
+
+        async with self._session_lock:
+            deduplicated = await self._finalize_dedup(document_id)
+            await self._document_repository.update_after_indexing(
+                document_id,
+                file_hash=file_hash,
+                chunk_count=len(result.chunk_ids),
+                areas=result.areas_distribution,
+            )
+
+        self._notify(on_progress, "completed", 1.0)
+
+        duration = time.monotonic() - start_time
+        stage_metrics = result.metrics.to_dict()
+
+        logger.info(
+            "indexing_completed document_id=%s chunks=%d deduplicated=%d embedding_cache_hits=%d duration=%.2f "
+            "mode=pipelined",
+            document_id,
+            len(result.chunk_ids),
+            deduplicated,
+            cache_hits,
+            duration,
+        )
+
+        return IndexingResult(
+            document_id=document_id,
+            chunks_created=len(result.chunk_ids),
+            tokens_total=result.tokens_total,
+            areas_distribution=result.areas_distribution,
+            duration_seconds=duration,
+            success=True,
+            embedding_cache_hits=cache_hits,
+            embedding_cache_misses=cache_misses,
+            chunks_deduplicated=deduplicated,
+            stage_metrics=stage_metrics,
         )
 
+    def _iter_chunks(self, file_path: Path) -> Iterator[Any]:
+        """Chunks of *file_path* in document order, streaming pages when the loader supports it.
+
+        Blocking: ``IndexingPipeline`` iterates it in a worker thread.
+        """
+        stream = self._loader_factory.stream_pages(file_path)
+        if stream is not None:
+            metadata, pages = stream
+            yield from self._chunker.chunk_pages(pages, metadata)
+        else:
+            yield from self._chunker.chunk(self._loader_factory.load(file_path))
+
+    # ------------------------------------------------------------------
+    # Private: cross-document dedup
+    # ------------------------------------------------------------------
+
+    async def _embed_new_texts(
+        self,
+        texts: list[str],
+        *,
+        document_id: int,
+        on_progress: Callable[[int, int, int], None] | None = None,
+    ) -> tuple[list[list[float] | None], int, int]:
+        """Embed the texts that are not indexed yet; already indexed ones get ``None``.
+
+        Returns ``(embeddings, cache_hits, cache_misses)``.
+        """
+        hashes = [chunk_content_hash(t) for t in texts]
+        async with self._session_lock:
+            indexed = await self._vector_store.embedded_content_hashes(hashes, exclude_document_id=document_id)
+        pending = [i for i, h in enumerate(hashes) if h not in indexed]
+
+        embeddings: list[list[float] | None] = [None] * len(texts)
+        if not pending:
+            return embeddings, 0, 0
+
+        pending_texts = [texts[i] for i in pending]
+        hits = misses = 0
+        if self._embedding_cache is not None:
+            vectors, stats = await self._embedding_cache.embed_documents_with_stats(
+                pending_texts, on_progress=on_progress
+            )
+            hits, misses = stats.hits, stats.misses
+        else:
+            vectors = await self._embedding_service.embed_documents(pending_texts, on_progress=on_progress)
+        for i, vector in zip(pending, vectors, strict=True):
+            embeddings[i] = vector
+        return embeddings, hits, misses
+
+    async def _finalize_dedup(self, document_id: int) -> int:
+        """Embed canonical rows left without vector, then count the document's reference chunks."""
+        missing = await self._vector_store.chunks_missing_embedding(document_id)
+        if missing:
+            embedder = self._embedding_cache or self._embedding_service
+            vectors = await embedder.embed_documents([content for _, content in missing])
+            await self._vector_store.set_embeddings(
+                [(chunk_id, vector) for (chunk_id, _), vector in zip(missing, vectors, strict=True)]
+            )
+            logger.warning("dedup_embeddings_backfilled document_id=%s chunks=%d", document_id, len(missing))
+        return await self._vector_store.count_reference_chunks(document_id)
+
     # ------------------------------------------------------------------
     # Private: helpers
     # ------------------------------------------------------------------
@@ -295,14 +493,14 @@ class IndexingService:
     @staticmethod
     def _build_chunk_tuples(
         chunks: list[Any],
-        embeddings: list[list[float]],
-    ) -> list[tuple[int, str, list[float], str, int | None, dict | None]]:
+        embeddings: list[list[float] | None],
+    ) -> list[tuple[int, str, list[float] | None, str, int | None, dict | None]]:
         """Transform Chunk objects + embeddings into the tuple format
-        expected by ``PgVectorStore.add_chunks``.
+        expected by ``PgVectorStore.add_chunks`` / ``add_chunks_bulk``.
 
         Format: ``(chunk_index, content, embedding, area, token_count, metadata)``
         """
-        result: list[tuple[int, str, list[float], str, int | None, dict | None]] = []
+        result: list[tuple[int, str, list[float] | None, str, int | None, dict | None]] = []
         for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings, strict=True)):
             area = chunk.metadata.get("area", "general") if chunk.metadata else "general"
             result.append(
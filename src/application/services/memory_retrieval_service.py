@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config.settings import settings
 from src.infrastructure.database.models.episodic_memory import EpisodicMemory
+from src.infrastructure.database.vector_codec import vector_param
 
 logger = logging.getLogger(__name__)
 
@@ -30,13 +31,16 @@ class MemoryRetrievalService:
         Filtra aquellos cuya similitud coseno es menor al umbral.
         """
         # Calcular similitud coseno (pgvector: 1 - cosine_distance)
-        similarity_expr = 1 - EpisodicMemory.embedding.cosine_distance(query_embedding)
+        # El embedding viaja en formato binario (un solo parametro reutilizado)
+        embedding_param = vector_param("query_embedding", query_embedding)
+        distance_expr = EpisodicMemory.embedding.cosine_distance(embedding_param)
+        similarity_expr = 1 - distance_expr
 
         stmt = (
             select(EpisodicMemory, similarity_expr.label("similarity"))
             .where(EpisodicMemory.user_id == user_id)
             .where(similarity_expr >= threshold)
-            .order_by(EpisodicMemory.embedding.cosine_distance(query_embedding))
+            .order_by(distance_expr)
             .limit(top_k)
         )
 
@@ -69,7 +73,7 @@ class MemoryRetrievalService:
                 update(EpisodicMemory).where(EpisodicMemory.id.in_(memory_ids)).values(last_accessed=text("now()"))
             )
             await self.session.execute(update_stmt)
-            await self.session.commit()
+            await self.session.flush()
 
         logger.info(
             "memory_retrieval: Encontrados %d recuerdos para user_id=%s (threshold=%f)",
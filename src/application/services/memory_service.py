@@ -8,7 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config.settings import settings
 from src.infrastructure.database.models.episodic_memory import EpisodicMemory
-from src.infrastructure.llm.client import GeminiClient, GeminiModel
+from src.infrastructure.database.vector_codec import vector_param
+from src.infrastructure.llm.client import GeminiModel, get_gemini_client
 from src.infrastructure.rag.embeddings.gemini_embeddings import GeminiEmbeddingService
 from src.infrastructure.security.dlp_client import DlpClient
 
@@ -59,11 +60,15 @@ class MemoryExtractionResult(BaseModel):
 class MemoryService:
     """Servicio para la extracción y gestión de memorias episódicas."""
 
-    def __init__(self, session: AsyncSession, embedding_service: GeminiEmbeddingService) -> None:
-        """Inicializa el servicio."""
+    def __init__(self, session: AsyncSession | None, embedding_service: GeminiEmbeddingService) -> None:
+        """Inicializa el servicio.
+
+        ``session`` puede ser ``None`` si solo se usa ``extract_memories`` o si
+        la sesión se pasa explícitamente a ``store_memories``.
+        """
         self._session = session
         self._embedding_service = embedding_service
-        self._llm = GeminiClient(model=GeminiModel.FLASH)
+        self._llm = get_gemini_client(model=GeminiModel.FLASH)
         self._dlp = DlpClient(
             project_id=settings.gcp_project_id,
             dlp_enabled=settings.dlp_enabled,
@@ -72,6 +77,11 @@ class MemoryService:
 
     async def extract_and_store_memories(self, user_id: int, conversation_history: list[dict[str, Any]]) -> None:
         """Extrae recuerdos de la conversación y los almacena en la base de datos."""
+        memories = await self.extract_memories(conversation_history)
+        await self.store_memories(user_id, memories)
+
+    async def extract_memories(self, conversation_history: list[dict[str, Any]]) -> list[ExtractedMemory]:
+        """Extrae y sanitiza recuerdos con el LLM (no usa la base de datos)."""
         formatted_history = "\n".join(
             f"{msg.get('role', 'unknown').capitalize()}: {msg.get('content', '')}" for msg in conversation_history
         )
@@ -87,9 +97,27 @@ class MemoryService:
         for mem in valid_memories:
             sanitized = await self._dlp.sanitize(mem.content)
             mem.content = sanitized.sanitized_text
-            await self._store_memory(user_id, mem)
-
-    async def _store_memory(self, user_id: int, extracted_memory: ExtractedMemory) -> None:
+        return valid_memories
+
+    async def store_memories(
+        self,
+        user_id: int,
+        memories: list[ExtractedMemory],
+        *,
+        session: AsyncSession | None = None,
+    ) -> None:
+        """Deduplica y almacena recuerdos ya extraídos.
+
+        ``session`` sobreescribe la sesión del constructor (p. ej. una sesión
+        prestada del request solo durante la escritura).
+        """
+        effective_session = session or self._session
+        if effective_session is None:
+            raise ValueError("MemoryService.store_memories requires a session.")
+        for mem in memories:
+            await self._store_memory(user_id, mem, effective_session)
+
+    async def _store_memory(self, user_id: int, extracted_memory: ExtractedMemory, session: AsyncSession) -> None:
         """Verifica duplicados usando embeddings y almacena si es nuevo."""
         valid_types = {"preferencia_usuario", "hecho_mencionado", "contexto_laboral", "instruccion_explicita"}
         if extracted_memory.memory_type not in valid_types:
@@ -107,11 +135,11 @@ class MemoryService:
         stmt = (
             select(EpisodicMemory)
             .where(EpisodicMemory.user_id == user_id)
-            .where(EpisodicMemory.embedding.cosine_distance(embedding) < distance_threshold)
+            .where(EpisodicMemory.embedding.cosine_distance(vector_param("embedding", embedding)) < distance_threshold)
             .limit(1)
         )
 
-        result = await self._session.execute(stmt)
+        result = await session.execute(stmt)
         existing = result.scalar_one_or_none()
 
         if existing:
@@ -125,4 +153,4 @@ class MemoryService:
             embedding=embedding,
             confidence=extracted_memory.confidence,
         )
-        self._session.add(new_memory)
+        session.add(new_memory)
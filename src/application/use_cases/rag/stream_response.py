@@ -6,7 +6,12 @@ Orchestrates the full chat flow:
    any ``NotFoundError`` is raised in the normal request scope (not inside
    an async generator where ``sse-starlette`` wraps it in an ExceptionGroup).
 2. ``stream_rag_events`` - iterate the RAG graph with timeout and yield SSE
-   events (``token``, ``done``, ``error``).
+   events (``token``, ``done``, ``error``).  With ``ANSWER_CACHE_ENABLED`` a
+   cached answer for the same sources and a similar question is replayed
+   through the same ``token`` events instead of calling the LLM.  With
+   ``OUTPUT_STREAM_GUARD_ENABLED`` tokens pass through a
+   ``StreamingOutputGuard`` first: PII is redacted before it is sent and
+   faithfulness is scored per sentence while the answer streams.
 
 Each ``yield`` produces a dict ready for ``sse-starlette``'s
 ``EventSourceResponse`` (keys: ``event``, ``data``).
@@ -17,6 +22,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
 from typing import TYPE_CHECKING, Any
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
@@ -26,10 +32,18 @@ if TYPE_CHECKING:
 
 from src.application.graphs.nodes.extract_memories import extract_memories
 from src.application.graphs.nodes.generate import format_user_memories
-from src.application.graphs.nodes.validate_output import validate_output
+from src.application.graphs.nodes.retrieve import resolve_accessible_doc_ids
+from src.application.graphs.nodes.validate_output import (
+    create_output_stream_guard,
+    finish_output_stream_guard,
+    validate_output,
+)
+from src.application.graphs.stage_timings import elapsed_ms
 from src.config.settings import settings
+from src.infrastructure.cache.answer_cache import count_llm_tokens, get_answer_cache
 from src.infrastructure.database.models.conversation import Message
-from src.infrastructure.llm.client import GeminiClient, GeminiModel
+from src.infrastructure.database.session import borrow_session, request_db_scope
+from src.infrastructure.llm.client import GeminiModel, get_gemini_client
 from src.infrastructure.llm.prompts.system_prompt import (
     RAG_FALLBACK_MESSAGE,
     build_rag_prompt,
@@ -41,6 +55,7 @@ from src.infrastructure.observability.langfuse_client import (
     observe,
     propagate_attributes,
 )
+from src.infrastructure.rag.vector_store.chunk_versions import source_fingerprint
 from src.shared.exceptions import NotFoundError
 
 if TYPE_CHECKING:
@@ -53,6 +68,8 @@ if TYPE_CHECKING:
 
     from src.application.graphs.state import RAGState
     from src.domain.repositories.conversation_repository import ConversationRepositoryBase
+    from src.infrastructure.cache.answer_cache import CachedAnswer, SemanticAnswerCache
+    from src.infrastructure.database.session import RequestDbScope
 
 # Maximo de turnos previos a incluir en el prompt (user+assistant = 1 turno).
 # Limitar para no exceder la ventana de contexto del LLM.
@@ -66,13 +83,15 @@ async def _generate_and_save_title(
     user_id: int,
     message: str,
 ) -> None:
-    """Generate a title using LLM and update the conversation."""
+    """Generate a title using LLM and update the conversation.
+
+    Writes through ``borrow_session`` and only flushes (the repository does):
+    the session's owner commits, unlike ``update_conversation``.
+    """
     try:
-        from src.application.use_cases.rag.conversations import update_conversation
         from src.infrastructure.database.repositories.conversation_repository import ConversationRepository
-        from src.infrastructure.database.session import async_session_maker
 
-        client = GeminiClient(model=GeminiModel.FLASH_LITE, temperature=0.3, max_tokens=10)
+        client = get_gemini_client(model=GeminiModel.FLASH_LITE, temperature=0.3, max_tokens=10)
         prompt = TITLE_GENERATION_PROMPT.format(message=message)
 
         try:
@@ -81,15 +100,10 @@ async def _generate_and_save_title(
         except Exception:
             title = message[:50]
 
-        async with async_session_maker() as session:
-            repo = ConversationRepository(session)
-            await update_conversation(
-                conversation_id=conversation_id,
-                user_id=user_id,
-                title=title,
-                db=session,
-                repo=repo,
-            )
+        async with borrow_session() as session:
+            conversation = await ConversationRepository(session).update(conversation_id, user_id, title=title)
+        if conversation is None:
+            logger.warning("conversation_title_skipped conversation_id=%s reason=not_found", conversation_id)
     except Exception as e:
         logging.getLogger(__name__).error(f"Failed to generate title for conversation {conversation_id}: {e}")
 
@@ -146,12 +160,39 @@ async def stream_rag_events(
        to get the context synchronously.
     2. Stream the LLM response directly token-by-token, bypassing LangGraph.
 
+    The request session *db* is published via ``request_db_scope`` so graph
+    nodes and post-turn tasks borrow it instead of checking out another
+    pooled connection; the turn's own writes go through ``scope.owned()``
+    so they never overlap a borrow.
+
     Events emitted
     --------------
     - ``token``: incremental content chunk (``{"content": "..."}``)
     - ``done``:  final event with sources and message id
     - ``error``: error event
     """
+    async with request_db_scope(db) as scope:
+        async for sse_event in _stream_turn_events(
+            conversation_id=conversation_id,
+            user_id=user_id,
+            message=message,
+            db=db,
+            scope=scope,
+            rag_graph=rag_graph,
+        ):
+            yield sse_event
+
+
+async def _stream_turn_events(
+    *,
+    conversation_id: uuid.UUID,
+    user_id: int,
+    message: str,
+    db: AsyncSession,
+    scope: RequestDbScope,
+    rag_graph: CompiledStateGraph,
+) -> AsyncIterator[dict[str, str]]:
+    """Body of ``stream_rag_events`` (runs inside the request DB scope)."""
     graph_input: dict[str, Any] = {
         "query": message,
         "user_id": user_id,
@@ -168,7 +209,10 @@ async def stream_rag_events(
         "reranked_chunks": [],
         "faithfulness_score": 0.0,
         "pii_detected": [],
+        "speculative_retrieval": {},
+        "stage_timings": {},
     }
+    turn_started = time.monotonic()
 
     try:
         with propagate_attributes(
@@ -192,6 +236,13 @@ async def stream_rag_events(
             )
 
             query_type = prep_result.get("query_type", "consulta")
+            logger.info(
+                "rag_prep_timings conversation_id=%s query_type=%s prep_ms=%.1f stages=%s",
+                conversation_id,
+                query_type,
+                elapsed_ms(turn_started),
+                prep_result.get("stage_timings") or {},
+            )
 
             # ── Caso: Saludo o Bloqueado (respuesta directa, sin LLM) ─
             if query_type in ("saludo", "blocked", "fuera_dominio"):
@@ -207,8 +258,7 @@ async def stream_rag_events(
                     role="assistant",
                     content=response_text,
                 )
-                db.add(assistant_msg)
-                await db.commit()
+                await _commit_message(scope, assistant_msg)
 
                 yield {
                     "event": "done",
@@ -234,8 +284,7 @@ async def stream_rag_events(
                     role="assistant",
                     content=acknowledgment,
                 )
-                db.add(assistant_msg)
-                await db.commit()
+                await _commit_message(scope, assistant_msg)
 
                 yield {
                     "event": "done",
@@ -276,8 +325,7 @@ async def stream_rag_events(
                     role="assistant",
                     content=response_text,
                 )
-                db.add(assistant_msg)
-                await db.commit()
+                await _commit_message(scope, assistant_msg)
 
                 yield {
                     "event": "done",
@@ -304,8 +352,7 @@ async def stream_rag_events(
                     role="assistant",
                     content=RAG_FALLBACK_MESSAGE,
                 )
-                db.add(assistant_msg)
-                await db.commit()
+                await _commit_message(scope, assistant_msg)
                 yield {
                     "event": "done",
                     "data": json.dumps(
@@ -332,11 +379,38 @@ async def stream_rag_events(
                 user_memories=user_memories_text,
             )
 
-            # Stream directo del LLM
-            client = GeminiClient(model=GeminiModel.FLASH)
+            # Cache de respuestas: solo primer turno sin memorias (el prompt no
+            # depende del usuario más allá de las fuentes)
+            answer_cache = get_answer_cache()
+            cache_key: str | None = None
+            cached: CachedAnswer | None = None
+            query_embedding: list[float] | None = prep_result.get("query_embedding")
+            if answer_cache is not None and query_embedding and not conversation_history and not user_memories_text:
+                cache_key, cached = await _lookup_answer_cache(
+                    answer_cache,
+                    user_id,
+                    prep_result.get("reranked_chunks") or prep_result.get("retrieved_chunks") or [],
+                    query_embedding,
+                )
+
+            # Stream directo del LLM (o replay de la respuesta cacheada)
+            if cached is not None:
+                logger.info(
+                    "answer_cache_hit conversation_id=%s saved_llm_tokens=%d stats=%s",
+                    conversation_id,
+                    cached.llm_tokens,
+                    answer_cache.stats.to_dict() if answer_cache is not None else {},
+                )
+                token_source = _replay_tokens(cached.tokens)
+            else:
+                client = get_gemini_client(model=GeminiModel.FLASH)
+                token_source = client.generate_stream(prompt, config={"callbacks": [cb]} if cb else {})
+            # Guard incremental: el contexto se procesa en paralelo con la generación
+            guard = create_output_stream_guard(context_text) if settings.output_stream_guard_enabled else None
             accumulated_response = ""
+            streamed_tokens: list[str] = []
 
-            async for token in client.generate_stream(prompt, config={"callbacks": [cb]} if cb else {}):
+            async for token in token_source:
                 content = token
                 if isinstance(content, list):
                     text_parts = []
@@ -349,9 +423,33 @@ async def stream_rag_events(
 
                 if content:
                     accumulated_response += str(content)
+                    safe_content = str(content)
+                    if guard is not None:
+                        safe_content = guard.feed(safe_content)
+                        if guard.blocked:
+                            # Umbral de PII alcanzado: cortar la generación
+                            break
+                    if not safe_content:
+                        continue
+                    if not streamed_tokens:
+                        logger.info(
+                            "rag_ttft conversation_id=%s ttft_ms=%.1f",
+                            conversation_id,
+                            elapsed_ms(turn_started),
+                        )
+                    streamed_tokens.append(safe_content)
                     yield {
                         "event": "token",
-                        "data": json.dumps({"content": str(content)}),
+                        "data": json.dumps({"content": safe_content}),
+                    }
+
+            if guard is not None:
+                tail = guard.finish()
+                if tail:
+                    streamed_tokens.append(tail)
+                    yield {
+                        "event": "token",
+                        "data": json.dumps({"content": tail}),
                     }
 
             # Asegurar que las trazas se envíen
@@ -361,34 +459,57 @@ async def stream_rag_events(
             is_fallback = RAG_FALLBACK_MESSAGE.lower() in accumulated_response.lower()
             guardrail_ok = True
 
-            if not is_fallback:
+            if guard is not None:
+                # Fallback: sin chequeo de faithfulness (el redactado de PII aplica igual)
+                guardrail_ok, validated_response = await finish_output_stream_guard(
+                    guard, check_faithfulness=not is_fallback
+                )
+                # Persistir lo que vio el cliente (PII redactado) o el fallback
+                accumulated_response = validated_response
+            elif not is_fallback:
                 guardrail_ok, validated_response = validate_output(
                     response=accumulated_response,
                     context=context_text,
                 )
-                if not guardrail_ok:
-                    logger.warning(
-                        "output_guardrail_blocked conversation_id=%s user_id=%s",
-                        conversation_id,
-                        user_id,
-                    )
-                    yield {
-                        "event": "guardrail_blocked",
-                        "data": json.dumps({"content": validated_response}),
-                    }
-                    accumulated_response = validated_response
-                    sources = []
+
+            if not guardrail_ok:
+                logger.warning(
+                    "output_guardrail_blocked conversation_id=%s user_id=%s",
+                    conversation_id,
+                    user_id,
+                )
+                yield {
+                    "event": "guardrail_blocked",
+                    "data": json.dumps({"content": validated_response}),
+                }
+                accumulated_response = validated_response
+                sources = []
 
             final_sources = [] if is_fallback or not guardrail_ok else sources
 
+            if (
+                answer_cache is not None
+                and cache_key is not None
+                and query_embedding is not None
+                and cached is None
+                and final_sources
+            ):
+                await _store_answer(
+                    answer_cache,
+                    cache_key,
+                    query_embedding,
+                    tokens=streamed_tokens,
+                    sources=final_sources,
+                    llm_tokens=count_llm_tokens(prompt) + count_llm_tokens(accumulated_response),
+                )
+
             assistant_msg = Message(
                 conversation_id=conversation_id,
                 role="assistant",
                 content=accumulated_response,
                 sources={"items": final_sources} if final_sources else None,
             )
-            db.add(assistant_msg)
-            await db.commit()
+            await _commit_message(scope, assistant_msg)
 
             # ── FASE 4: Extracción de memorias episódicas ────────────
             memory_state: dict[str, Any] = {
@@ -447,6 +568,68 @@ async def stream_rag_events(
         }
 
 
+async def _commit_message(scope: RequestDbScope, message: Message) -> None:
+    """Persiste *message* y commitea el turno con el lock del scope tomado."""
+    async with scope.owned() as session:
+        session.add(message)
+        await session.commit()
+
+
+async def _lookup_answer_cache(
+    answer_cache: SemanticAnswerCache,
+    user_id: int,
+    chunks: list[dict],
+    query_embedding: list[float],
+) -> tuple[str | None, CachedAnswer | None]:
+    """Busca una respuesta cacheada para las fuentes de este turno.
+
+    Retorna ``(fingerprint, respuesta)``; ``fingerprint`` es ``None`` si el
+    turno no es cacheable.  Fail-open: un error equivale a miss.
+
+    Las consultas van en un savepoint de la sesión del request
+    (``borrow_session``): un error acá no aborta la transacción con la que
+    después se guarda el mensaje del asistente.
+    """
+    try:
+        async with borrow_session() as session:
+            fingerprint = await source_fingerprint(session, [str(c["id"]) for c in chunks if c.get("id")])
+            if fingerprint is None:
+                return None, None
+            accessible_doc_ids = await resolve_accessible_doc_ids(session, user_id)
+        return fingerprint, await answer_cache.lookup(fingerprint, query_embedding, accessible_doc_ids)
+    except Exception:
+        logger.warning("answer_cache_lookup_failed user_id=%s", user_id, exc_info=True)
+        return None, None
+
+
+async def _store_answer(
+    answer_cache: SemanticAnswerCache,
+    fingerprint: str,
+    query_embedding: list[float],
+    *,
+    tokens: list[str],
+    sources: list[dict],
+    llm_tokens: int,
+) -> None:
+    """Guarda una respuesta que pasó el guardrail; nunca propaga excepciones."""
+    try:
+        await answer_cache.store(
+            fingerprint,
+            query_embedding,
+            tokens=tokens,
+            document_ids=[s["document_id"] for s in sources if s.get("document_id") is not None],
+            llm_tokens=llm_tokens,
+        )
+    except Exception:
+        logger.warning("answer_cache_store_failed", exc_info=True)
+
+
+async def _replay_tokens(tokens: tuple[str, ...]) -> AsyncIterator[str]:
+    """Re-emite los tokens de una respuesta cacheada como si vinieran del LLM."""
+    for token in tokens:
+        yield token
+
+
 def _build_sources_text(sources: list[dict]) -> str:
     """Formatea la lista de sources como texto numerado."""
     if not sources:
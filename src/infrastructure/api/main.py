@@ -1,5 +1,7 @@
 """FastAPI application factory."""
 
+import asyncio
+import contextlib
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from typing import Any
@@ -17,6 +19,7 @@ from starlette.middleware.trustedhost import TrustedHostMiddleware
 from src.api.middleware.audit_middleware import AuditMiddleware
 from src.api.routes.admin import router as admin_router
 from src.api.routes.feedback import router as feedback_router
+from src.application.graphs.nodes.rerank import warm_up_reranker
 from src.application.graphs.rag_graph import build_rag_graph, create_checkpointer
 from src.config.settings import settings
 from src.infrastructure.api.middleware import (
@@ -30,8 +33,10 @@ from src.infrastructure.api.v1.chat import router as chat_router
 from src.infrastructure.api.v1.documents import router as documents_router
 from src.infrastructure.api.v1.health import router as health_router
 from src.infrastructure.database.session import async_session_maker, engine
+from src.infrastructure.llm.client import warm_up_gemini_clients
 from src.infrastructure.observability.langfuse_client import flush_langfuse, get_langfuse
 from src.infrastructure.observability.logging_config import configure_logging
+from src.infrastructure.rag.vector_store.ann_index import InProcessVectorIndex, set_vector_index
 from src.shared.exceptions import AppError
 
 # Configure structured logging
@@ -61,6 +66,37 @@ async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     _app.state.redis = redis
     logger.info("redis_connection_verified")
 
+    # Startup: build the shared GeminiClient registry (and warm it up)
+    await warm_up_gemini_clients(dummy_call=settings.gemini_warmup_enabled)
+
+    # Startup: load the local cross-encoder (RERANKER_BACKEND=local) before the first turn
+    if settings.reranker_backend == "local":
+        await warm_up_reranker()
+        logger.info("reranker_warmed_up", backend=settings.reranker_backend)
+
+    # Startup: load the in-process ANN index (optional) and keep it fresh.
+    # Only the "in_process" vector backend queries it; otherwise skip the load.
+    refresh_task: asyncio.Task | None = None
+    if settings.ann_index_enabled and settings.retrieval_vector_backend != "in_process":
+        logger.warning(
+            "ann_index_not_loaded",
+            reason="retrieval_vector_backend is not in_process",
+            backend=settings.retrieval_vector_backend,
+        )
+    elif settings.ann_index_enabled:
+        vector_index = InProcessVectorIndex(
+            ivf_min_rows=settings.ann_index_ivf_min_rows,
+            nlist=settings.ann_index_nlist,
+            nprobe=settings.ann_index_nprobe,
+        )
+        await vector_index.refresh(async_session_maker)
+        set_vector_index(vector_index)
+        refresh_task = asyncio.create_task(
+            vector_index.run_refresh_loop(async_session_maker, settings.ann_index_refresh_seconds),
+            name="ann_index_refresh",
+        )
+        logger.info("ann_index_loaded", **vector_index.snapshot())
+
     # Startup: create checkpointer and compile RAG graph
     async with create_checkpointer(settings.database_url.get_secret_value()) as checkpointer:
         _app.state.checkpointer = checkpointer
@@ -70,6 +106,11 @@ async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
         yield
 
     # Shutdown
+    if refresh_task is not None:
+        refresh_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await refresh_task
+        set_vector_index(None)
     flush_langfuse()
     await redis.close()
     await engine.dispose()
@@ -10,6 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config.settings import settings
 from src.infrastructure.api.dependencies import get_db, get_redis
+from src.infrastructure.database.session import engine
+from src.infrastructure.observability.metrics import db_pool_metrics
 
 router = APIRouter(tags=["health"])
 
@@ -55,3 +57,9 @@ async def readiness(
 
     status = "ready" if status_code == 200 else "degraded"
     return _envelope({"status": status, "checks": checks}, status_code=status_code)
+
+
+@router.get("/health/db-pool")
+async def db_pool() -> JSONResponse:
+    """Utilización del pool de conexiones (contadores + estado instantáneo)."""
+    return _envelope(db_pool_metrics.snapshot(engine))
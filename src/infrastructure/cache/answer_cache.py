@@ -0,0 +1,302 @@
+"""Permission-scoped semantic cache of generated answers.
+
+Policy questions repeat across employees ("¿cuántos días de vacaciones me
+corresponden?"), and each one pays a full Flash generation even when
+retrieval and rerank selected exactly the same chunks.  This cache sits
+between the prep graph and the LLM stream in ``stream_rag_events``:
+
+* **Key** — a fingerprint of the *ordered* source chunks and their
+  ``document_chunks.version`` (``chunk_versions.source_fingerprint``, shared
+  with ``RerankCache``).  The order is part of the key because the answer
+  cites ``[N]`` by position.  Re-indexing a document (new ids) or bumping a
+  chunk version yields a different key, so stale answers are never matched
+  and simply age out.
+* **Similarity** — within a key, an entry is a hit when the cosine
+  similarity between its query embedding and the current one is at least
+  ``similarity_threshold``.
+* **Permissions** — an entry records the documents it cites and is served
+  only if every one of them is in the user's ``DocIdSet``.
+* **Tiers** — in-process ``OrderedDict`` LRU with TTL, optionally backed by
+  Redis (one list per key).  Redis failures are fail-open (miss).
+
+``AnswerCacheStats`` reports hit rate and the LLM tokens (prompt + answer,
+counted with the ``cl100k_base`` tiktoken encoding used by the chunker) that
+hits did not spend.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from redis.exceptions import RedisError
+
+from src.infrastructure.llm.tokens import count_tokens
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from redis.asyncio import Redis
+
+    from src.infrastructure.security.doc_id_set import DocIdSet
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "ans:"
+
+
+def count_llm_tokens(text_value: str) -> int:
+    """Approximate Gemini tokens of *text_value* (tiktoken ``cl100k_base``)."""
+    return count_tokens(text_value)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedAnswer:
+    """Answer tokens as streamed, plus what is needed to match and authorize a hit."""
+
+    tokens: tuple[str, ...]
+    query_embedding: np.ndarray
+    document_ids: frozenset[int]
+    llm_tokens: int
+    expires_at: float
+
+    @property
+    def response(self) -> str:
+        return "".join(self.tokens)
+
+    def to_json(self) -> bytes:
+        return json.dumps(
+            {
+                "tokens": list(self.tokens),
+                "embedding": base64.b64encode(self.query_embedding.astype("<f2").tobytes()).decode("ascii"),
+                "document_ids": sorted(self.document_ids),
+                "llm_tokens": self.llm_tokens,
+                "expires_at": self.expires_at,
+            }
+        ).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, data: bytes | str) -> CachedAnswer:
+        payload = json.loads(data)
+        return cls(
+            tokens=tuple(payload["tokens"]),
+            query_embedding=np.frombuffer(base64.b64decode(payload["embedding"]), dtype="<f2").astype(np.float32),
+            document_ids=frozenset(payload["document_ids"]),
+            llm_tokens=payload["llm_tokens"],
+            expires_at=payload["expires_at"],
+        )
+
+
+@dataclass
+class AnswerCacheStats:
+    """Hit/miss counters of the answer cache."""
+
+    hits: int = 0
+    misses: int = 0
+    acl_rejections: int = 0
+    stores: int = 0
+    errors: int = 0
+    saved_llm_tokens: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "acl_rejections": self.acl_rejections,
+            "stores": self.stores,
+            "errors": self.errors,
+            "hit_rate": round(self.hit_rate, 4),
+            "saved_llm_tokens": self.saved_llm_tokens,
+        }
+
+
+def _normalize(vector: Sequence[float] | np.ndarray) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array))
+    return array / norm if norm > 0 else array
+
+
+class SemanticAnswerCache:
+    """Answer cache keyed by source fingerprint, matched by query similarity.
+
+    Parameters
+    ----------
+    similarity_threshold:
+        Minimum cosine similarity between query embeddings for a hit.
+    max_keys:
+        Source fingerprints kept in the L1 LRU.
+    max_entries_per_key:
+        Answers kept per fingerprint (different phrasings of the question).
+    ttl_seconds:
+        Time-to-live for both tiers.
+    redis_client:
+        Optional Redis client (``decode_responses=False``).
+    """
+
+    def __init__(
+        self,
+        *,
+        similarity_threshold: float = 0.95,
+        max_keys: int = 1024,
+        max_entries_per_key: int = 4,
+        ttl_seconds: int = 3600,
+        redis_client: Redis | None = None,
+    ) -> None:
+        self._threshold = similarity_threshold
+        self._max_keys = max_keys
+        self._max_entries_per_key = max_entries_per_key
+        self._ttl_seconds = ttl_seconds
+        self._redis = redis_client
+        self._entries: OrderedDict[str, list[CachedAnswer]] = OrderedDict()
+        self.stats = AnswerCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def lookup(
+        self,
+        fingerprint: str,
+        query_embedding: Sequence[float],
+        accessible_doc_ids: DocIdSet,
+    ) -> CachedAnswer | None:
+        """Return a cached answer for the same sources and a similar query, or ``None``.
+
+        A similar answer citing a document outside *accessible_doc_ids* is
+        never returned (counted in ``acl_rejections``).
+        """
+        query = _normalize(query_embedding)
+        now = time.time()
+        candidates = self._get_l1(fingerprint, now)
+        if not candidates:
+            candidates = await self._get_l2(fingerprint, now)
+            if candidates:
+                self._set_l1(fingerprint, candidates)
+
+        best: CachedAnswer | None = None
+        best_score = self._threshold
+        rejected = False
+        for entry in candidates:
+            score = float(entry.query_embedding @ query)
+            if score < best_score:
+                continue
+            if not all(doc_id in accessible_doc_ids for doc_id in entry.document_ids):
+                rejected = True
+                continue
+            best, best_score = entry, score
+
+        if best is None:
+            self.stats.misses += 1
+            self.stats.acl_rejections += int(rejected)
+            return None
+        self.stats.hits += 1
+        self.stats.saved_llm_tokens += best.llm_tokens
+        return best
+
+    async def store(
+        self,
+        fingerprint: str,
+        query_embedding: Sequence[float],
+        *,
+        tokens: Sequence[str],
+        document_ids: Sequence[int],
+        llm_tokens: int,
+    ) -> None:
+        """Cache an answer that passed the output guardrail."""
+        entry = CachedAnswer(
+            tokens=tuple(tokens),
+            query_embedding=_normalize(query_embedding),
+            document_ids=frozenset(int(d) for d in document_ids),
+            llm_tokens=llm_tokens,
+            expires_at=time.time() + self._ttl_seconds,
+        )
+        entries = [*self._get_l1(fingerprint, time.time()), entry][-self._max_entries_per_key :]
+        self._set_l1(fingerprint, entries)
+        self.stats.stores += 1
+        if self._redis is None:
+            return
+        key = f"{_KEY_PREFIX}{fingerprint}"
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.rpush(key, entry.to_json())
+                pipe.ltrim(key, -self._max_entries_per_key, -1)
+                pipe.expire(key, self._ttl_seconds)
+                await pipe.execute()
+        except RedisError as exc:
+            self.stats.errors += 1
+            logger.warning("answer_cache_redis_set_failed error=%s", exc)
+
+    def clear(self) -> None:
+        """Drop every L1 entry (the Redis tier expires on its own)."""
+        self._entries.clear()
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _get_l1(self, fingerprint: str, now: float) -> list[CachedAnswer]:
+        entries = self._entries.get(fingerprint)
+        if entries is None:
+            return []
+        alive = [e for e in entries if e.expires_at > now]
+        if not alive:
+            del self._entries[fingerprint]
+            return []
+        self._entries[fingerprint] = alive
+        self._entries.move_to_end(fingerprint)
+        return alive
+
+    def _set_l1(self, fingerprint: str, entries: list[CachedAnswer]) -> None:
+        self._entries[fingerprint] = entries
+        self._entries.move_to_end(fingerprint)
+        while len(self._entries) > self._max_keys:
+            self._entries.popitem(last=False)
+
+    async def _get_l2(self, fingerprint: str, now: float) -> list[CachedAnswer]:
+        if self._redis is None:
+            return []
+        try:
+            raw = await self._redis.lrange(f"{_KEY_PREFIX}{fingerprint}", 0, -1)
+        except RedisError as exc:
+            self.stats.errors += 1
+            logger.warning("answer_cache_redis_get_failed error=%s", exc)
+            return []
+        entries = [CachedAnswer.from_json(data) for data in raw]
+        return [e for e in entries if e.expires_at > now]
+
+
+# ── Module-level instance ────────────────────────────────────────────
+
+_answer_cache: SemanticAnswerCache | None = None
+
+
+def get_answer_cache() -> SemanticAnswerCache | None:
+    """Cache de respuestas del proceso, o ``None`` si ``ANSWER_CACHE_ENABLED`` es falso."""
+    global _answer_cache
+    from src.config.settings import settings
+
+    if not settings.answer_cache_enabled:
+        return None
+    if _answer_cache is None:
+        redis_client = None
+        if settings.answer_cache_redis_enabled:
+            from redis.asyncio import Redis
+
+            redis_client = Redis.from_url(settings.redis_url.get_secret_value(), decode_responses=False)
+        _answer_cache = SemanticAnswerCache(
+            similarity_threshold=settings.answer_cache_similarity_threshold,
+            max_keys=settings.answer_cache_max_keys,
+            ttl_seconds=settings.answer_cache_ttl_seconds,
+            redis_client=redis_client,
+        )
+    return _answer_cache
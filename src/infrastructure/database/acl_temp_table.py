@@ -0,0 +1,164 @@
+"""Connection-cached ACL temp table for permission-filtered queries.
+
+Passing every accessible document id as ``dc.document_id = ANY(:doc_ids)``
+costs a large ``bigint[]`` parameter per query and a linear array probe per
+candidate row.  Instead, the ACL is loaded once into a session-local temp
+table with binary ``COPY`` and queries filter with a semi-join:
+
+    EXISTS (SELECT 1 FROM rag_acl_docs acl
+            WHERE acl.acl_key = :acl_key AND acl.document_id = dc.document_id)
+
+ACLs are content-addressed (``acl_key`` = hash of the sorted ids), so a key
+never goes stale: a permission change simply yields a new key.  Each pooled
+connection remembers which keys it already holds in ``connection.info`` and
+keeps at most ``max_keys`` of them (oldest evicted first).
+
+Temp-table writes are transactional, so a key is only trusted across
+transactions after the transaction that loaded it commits.  The engine
+listeners installed by ``install_acl_cache_events`` promote pending keys on
+``commit`` and drop them on ``rollback`` / savepoint rollback / pool reset.
+The filter uses ``EXISTS`` rather than ``JOIN`` so duplicate rows (e.g. a key
+reloaded after a rolled-back eviction) can never duplicate results.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event, text
+
+from src.infrastructure.security.doc_id_set import DocIdSet
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, MutableMapping
+
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+logger = logging.getLogger(__name__)
+
+ACL_TABLE = "rag_acl_docs"
+_INFO_KEY = "rag_acl_cache"
+
+_CREATE_SQL = text(f"""
+    CREATE TEMP TABLE IF NOT EXISTS {ACL_TABLE} (
+        acl_key     text   NOT NULL,
+        document_id bigint NOT NULL
+    ) ON COMMIT PRESERVE ROWS
+""")
+_CREATE_INDEX_SQL = text(f"CREATE INDEX IF NOT EXISTS {ACL_TABLE}_key_doc ON {ACL_TABLE} (acl_key, document_id)")
+_DELETE_SQL = text(f"DELETE FROM {ACL_TABLE} WHERE acl_key = :acl_key")  # noqa: S608
+
+
+@dataclass
+class _AclConnectionState:
+    """Keys held by one pooled connection (lives in ``connection.info``)."""
+
+    table_ready: bool = False
+    committed: OrderedDict[str, None] = field(default_factory=OrderedDict)
+    pending_table: bool = False
+    pending: list[str] = field(default_factory=list)
+
+    def promote(self) -> None:
+        self.table_ready = self.table_ready or self.pending_table
+        for key in self.pending:
+            self.committed[key] = None
+        self.discard_pending()
+
+    def discard_pending(self) -> None:
+        self.pending_table = False
+        self.pending.clear()
+
+
+def _state(info: MutableMapping[Any, Any]) -> _AclConnectionState:
+    state = info.get(_INFO_KEY)
+    if state is None:
+        state = info[_INFO_KEY] = _AclConnectionState()
+    return state
+
+
+def acl_key(document_ids: Iterable[int]) -> str:
+    """Content-addressed key for a set of document ids.
+
+    A ``DocIdSet`` is already sorted and unique, so it is hashed as-is.
+    """
+    packed = DocIdSet.from_iterable(document_ids).to_numpy().astype("<i8", copy=False).tobytes()
+    return hashlib.blake2b(packed, digest_size=12).hexdigest()
+
+
+async def load_acl(
+    session: AsyncSession,
+    document_ids: Iterable[int],
+    *,
+    max_keys: int = 32,
+) -> tuple[str, bool]:
+    """Ensure *document_ids* are available in ``rag_acl_docs`` on the session's connection.
+
+    Returns ``(acl_key, cache_hit)``.  On a miss the ids are streamed with a
+    single binary ``COPY`` inside the caller's transaction.
+    """
+    unique_ids = DocIdSet.from_iterable(document_ids)
+    key = acl_key(unique_ids)
+
+    connection = await session.connection()
+    state = _state(connection.info)
+    if key in state.committed:
+        state.committed.move_to_end(key)
+        return key, True
+    if key in state.pending:
+        return key, True
+
+    if not (state.table_ready or state.pending_table):
+        await connection.execute(_CREATE_SQL)
+        await connection.execute(_CREATE_INDEX_SQL)
+        state.pending_table = True
+
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    if driver_connection is None:
+        raise RuntimeError("rag_acl_docs COPY requires a live asyncpg connection")
+    await driver_connection.copy_records_to_table(
+        ACL_TABLE,
+        records=[(key, doc_id) for doc_id in unique_ids],
+        columns=["acl_key", "document_id"],
+    )
+    state.pending.append(key)
+
+    while len(state.committed) + len(state.pending) > max_keys and state.committed:
+        evicted, _ = state.committed.popitem(last=False)
+        await connection.execute(_DELETE_SQL, {"acl_key": evicted})
+
+    return key, False
+
+
+def install_acl_cache_events(engine: AsyncEngine) -> None:
+    """Keep per-connection ACL key bookkeeping in sync with transaction outcome."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "commit")
+    def _on_commit(conn: Any) -> None:
+        state = conn.info.get(_INFO_KEY)
+        if state is not None:
+            state.promote()
+
+    @event.listens_for(sync_engine, "rollback")
+    def _on_rollback(conn: Any) -> None:
+        state = conn.info.get(_INFO_KEY)
+        if state is not None:
+            state.discard_pending()
+
+    @event.listens_for(sync_engine, "rollback_savepoint")
+    def _on_rollback_savepoint(conn: Any, _name: Any, _context: Any) -> None:
+        # Conservador: no sabemos qué claves se cargaron dentro del savepoint
+        state = conn.info.get(_INFO_KEY)
+        if state is not None:
+            state.discard_pending()
+
+    @event.listens_for(sync_engine.pool, "reset")
+    def _on_reset(_dbapi_connection: Any, connection_record: Any, *_args: Any) -> None:
+        state = connection_record.info.get(_INFO_KEY)
+        if state is not None:
+            state.discard_pending()
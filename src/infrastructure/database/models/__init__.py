@@ -4,10 +4,18 @@ from src.infrastructure.database.models.audit import AuditLog, PipelineRun, Secu
 from src.infrastructure.database.models.base import Base, TimestampMixin
 from src.infrastructure.database.models.conversation import Conversation, Message
 from src.infrastructure.database.models.document import AreaFuncional, Document, DocumentChunk
+from src.infrastructure.database.models.embedding_cache import EmbeddingCacheEntry
 from src.infrastructure.database.models.episodic_memory import EpisodicMemory
 from src.infrastructure.database.models.evaluation import RagasEvaluation
 from src.infrastructure.database.models.feedback import Feedback
-from src.infrastructure.database.models.permission import DTree, DTreeACL, DTreeAncestors, Kuaf, KuafChildren
+from src.infrastructure.database.models.permission import (
+    DTree,
+    DTreeACL,
+    DTreeAncestors,
+    Kuaf,
+    KuafChildren,
+    UserAccessibleDoc,
+)
 from src.infrastructure.database.models.user import RefreshToken, User
 
 __all__ = [
@@ -20,6 +28,7 @@ __all__ = [
     "DTreeAncestors",
     "Document",
     "DocumentChunk",
+    "EmbeddingCacheEntry",
     "EpisodicMemory",
     "Feedback",
     "Kuaf",
@@ -32,4 +41,5 @@ __all__ = [
     "SecurityEventType",
     "TimestampMixin",
     "User",
+    "UserAccessibleDoc",
 ]
@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from pgvector.sqlalchemy import HALFVEC
-from sqlalchemy import BigInteger, Enum, ForeignKey, Integer, String, Text, func, text
+from sqlalchemy import BigInteger, Enum, ForeignKey, Integer, LargeBinary, String, Text, func, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -88,6 +88,12 @@ class DocumentChunk(Base):
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
 
+    # Deduplicación entre documentos (trigger trg_document_chunks_dedup): el
+    # hash lo calcula la BD y solo la fila canónica de cada texto guarda el
+    # embedding y entra a los índices HNSW/GIN; las demás son referencias.
+    content_hash: Mapped[bytes] = mapped_column(LargeBinary, nullable=False, index=True)
+    is_canonical: Mapped[bool] = mapped_column(server_default=text("true"), nullable=False)
+
     # EMBEDDING: halfvec(768) - Gemini text-embedding-004 con Matryoshka
     embedding = mapped_column(HALFVEC(768), nullable=True)
 
@@ -0,0 +1,21 @@
+"""Modelo de la caché de embeddings de chunks (content-addressed)."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, LargeBinary, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.database.models.base import Base
+
+
+class EmbeddingCacheEntry(Base):
+    """Embedding float16 por SHA-256 de (texto del chunk, modelo, dimensiones, task type).
+
+    Ver ``src.infrastructure.rag.embeddings.chunk_cache``.
+    """
+
+    __tablename__ = "embedding_cache"
+
+    key: Mapped[bytes] = mapped_column(LargeBinary, primary_key=True)
+    embedding: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -133,3 +133,26 @@ class DTreeAncestors(Base):
         Integer,
         doc="Profundidad en la jerarquia",
     )
+
+
+class UserAccessibleDoc(Base):
+    """Materializacion usuario -> documento con SeeContents (permissions & 2).
+
+    Mantenida incrementalmente por ``XECMSyncService`` (ver
+    ``security.access_materializer``); permite resolver los documentos
+    accesibles con un lookup por PK en vez de expandir grupos.
+    """
+
+    __tablename__ = "user_accessible_docs"
+
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        doc="ID del Usuario (KUAF.ID)",
+    )
+    data_id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        index=True,
+        doc="ID del documento accesible (DTREE.DataID)",
+    )
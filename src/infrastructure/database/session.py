@@ -1,18 +1,50 @@
-"""Async database engine y session factory."""
+"""Async database engine y session factory.
 
-from collections.abc import AsyncGenerator
+Además de ``get_db`` (dependency de FastAPI) expone un *scope* de sesión por
+request: ``request_db_scope`` publica la sesión del request en un
+``ContextVar`` y ``borrow_session`` permite que los nodos del grafo y las
+tareas post-turno la reutilicen en lugar de tomar otra conexión del pool.
+Cada préstamo corre dentro de un SAVEPOINT: un error de SQL en un nodo
+(aunque el nodo lo trague) se revierte hasta el savepoint y no aborta la
+transacción que persiste los mensajes del turno.  El dueño del request
+usa ``RequestDbScope.owned`` para tomar el mismo lock.
+Fuera de un scope activo, ``borrow_session`` abre una sesión propia.
 
+Solo el dueño commitea: los préstamos hacen ``flush()``, el dueño commitea
+con ``scope.owned()`` y el cierre normal del scope commitea lo que los
+préstamos dejaron después del último commit del turno.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from src.config.settings import settings
+from src.infrastructure.database.acl_temp_table import install_acl_cache_events
+from src.infrastructure.database.vector_codec import install_vector_codecs
+from src.infrastructure.observability.metrics import db_pool_metrics
+
+logger = logging.getLogger(__name__)
 
 engine = create_async_engine(
     settings.database_url.get_secret_value(),
     echo=settings.debug,
-    pool_size=20,
-    max_overflow=10,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
     pool_pre_ping=True,
 )
+# Codecs binarios de pgvector en cada conexion nueva del pool
+install_vector_codecs(engine)
+# Cache de ACLs en tabla temporal por conexion (ver acl_temp_table.py)
+install_acl_cache_events(engine)
+# Metricas de utilizacion del pool (checkout/checkin/peak)
+db_pool_metrics.install(engine)
+
 
 async_session_maker = async_sessionmaker(
     engine,
@@ -30,3 +62,122 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+class RequestDbScope:
+    """Sesión compartida de un request, serializada con un ``asyncio.Lock``.
+
+    ``AsyncSession`` no admite uso concurrente: cada préstamo toma el lock,
+    y al cerrar el scope se espera al préstamo en curso antes de marcarlo
+    inactivo, de modo que nadie use la sesión después de que el request
+    la cierre.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.active = True
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def borrow(self) -> AsyncIterator[AsyncSession | None]:
+        """Presta la sesión, o ``None`` si el scope ya se cerró."""
+        async with self._lock:
+            yield self.session if self.active else None
+
+    @asynccontextmanager
+    async def owned(self) -> AsyncIterator[AsyncSession]:
+        """Sesión para el dueño del request (sin savepoint), con el lock tomado.
+
+        La usa quien creó el scope para persistir el turno, sin competir
+        con los préstamos de nodos y tareas en curso.
+        """
+        async with self._lock:
+            yield self.session
+
+    async def close(self, *, commit: bool = False) -> None:
+        """Marca el scope inactivo; con *commit*, antes persiste lo que dejaron los préstamos."""
+        async with self._lock:
+            if commit and self.session.in_transaction():
+                try:
+                    await self.session.commit()
+                except SQLAlchemyError:
+                    logger.warning("request_db_scope_commit_failed", exc_info=True)
+                    await self.session.rollback()
+            self.active = False
+
+
+_request_db_scope: ContextVar[RequestDbScope | None] = ContextVar("request_db_scope", default=None)
+
+
+@asynccontextmanager
+async def request_db_scope(session: AsyncSession) -> AsyncIterator[RequestDbScope]:
+    """Publica *session* como sesión compartida del request en curso.
+
+    Las tareas creadas dentro del scope (``asyncio.create_task``, nodos de
+    LangGraph) heredan el ``ContextVar`` y pueden tomarla prestada con
+    ``borrow_session``.  Al salir sin error se commitean las escrituras de
+    préstamos posteriores al último commit del dueño; si el bloque lanza,
+    se descartan.
+    """
+    scope = RequestDbScope(session)
+    token = _request_db_scope.set(scope)
+    try:
+        yield scope
+    except BaseException:
+        await scope.close()
+        raise
+    else:
+        await scope.close(commit=True)
+    finally:
+        _request_db_scope.reset(token)
+
+
+@asynccontextmanager
+async def borrow_session() -> AsyncIterator[AsyncSession]:
+    """Sesión del request activo si existe; si no, una sesión propia.
+
+    El llamador no cierra ni commitea la sesión: solo hace ``flush()``.  La
+    sesión compartida se presta dentro de un SAVEPOINT (ver ``_savepoint``) y
+    la commitea únicamente el dueño del scope (``scope.owned()`` o el cierre
+    de ``request_db_scope``); un ``commit()`` del préstamo persistiría a mitad
+    de turno lo que el dueño aún no decidió guardar.  La sesión propia se
+    commitea aquí al salir sin error.
+    El préstamo no es reentrante: no anidar ``borrow_session`` en la misma tarea.
+    """
+    scope = _request_db_scope.get()
+    if scope is not None and scope.active:
+        async with scope.borrow() as shared:
+            if shared is not None:
+                db_pool_metrics.record_borrow(shared=True)
+                async with _savepoint(shared):
+                    yield shared
+                return
+
+    db_pool_metrics.record_borrow(shared=False)
+    async with async_session_maker() as session:
+        yield session
+        await session.commit()
+
+
+@asynccontextmanager
+async def _savepoint(session: AsyncSession) -> AsyncIterator[None]:
+    """Aísla un préstamo de la sesión compartida en un SAVEPOINT.
+
+    Si el bloque lanza, se revierte al savepoint y se propaga.  Si el bloque
+    tragó un error de SQL, la transacción queda abortada y el ``RELEASE``
+    falla: se revierte al savepoint para que el commit del turno siga siendo
+    posible.
+    """
+    nested = await session.begin_nested()
+    try:
+        yield
+    except BaseException:
+        if nested.is_active:
+            await nested.rollback()
+        raise
+    if nested.is_active:
+        try:
+            await nested.commit()
+        except SQLAlchemyError:
+            logger.warning("borrow_session_savepoint_rolled_back", exc_info=True)
+            await nested.rollback()
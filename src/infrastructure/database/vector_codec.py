@@ -0,0 +1,156 @@
+"""Binary pgvector codecs for the asyncpg driver.
+
+By default asyncpg has no codec for the pgvector types, so every embedding
+travels as a decimal text literal (``"[0.0123,-0.0456,...]"``, ~10 KB for
+768 dims) that Postgres has to re-parse.  Registering binary codecs lets
+asyncpg send ``vector`` / ``halfvec`` values in their native wire format:
+
+* ``vector``  — ``int16 dim | int16 unused | dim x float32`` (big-endian)
+* ``halfvec`` — ``int16 dim | int16 unused | dim x float16`` (big-endian)
+
+The encoders are deliberately tolerant: they accept lists, numpy arrays,
+pgvector objects **and** text literals, because the pgvector SQLAlchemy
+types (``Vector`` / ``HALFVEC``) still render bind values as text before
+handing them to the driver.  Decoders mirror ``pgvector.asyncpg`` so ORM
+result processors keep working unchanged.
+
+Registration happens once per pooled connection via the engine ``connect``
+event installed by ``install_vector_codecs`` (see ``database/session.py``).
+Binary codecs are also what make ``COPY ... FORMAT binary`` possible for
+bulk chunk ingestion.
+
+Query code should bind embeddings with ``halfvec_param`` / ``vector_param``:
+they pass a ``float32`` array straight to the driver codec, skipping both the
+text literal and the pgvector SQLAlchemy bind processor.
+"""
+
+from __future__ import annotations
+
+import logging
+import struct
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from pgvector import HalfVector, Vector
+from sqlalchemy import bindparam, event
+from sqlalchemy.types import UserDefinedType
+
+if TYPE_CHECKING:
+    import asyncpg
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.sql.elements import BindParameter
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">HH")
+
+
+def to_float_array(value: Any) -> np.ndarray:
+    """Coerce an embedding-like value into a 1-d ``float32`` numpy array.
+
+    Accepts lists/tuples, numpy arrays, pgvector ``Vector``/``HalfVector``
+    objects and pgvector text literals (``"[1,2,3]"``).
+    """
+    if isinstance(value, np.ndarray):
+        return value.astype(np.float32, copy=False).ravel()
+    if isinstance(value, Vector | HalfVector):
+        return np.asarray(value.to_numpy(), dtype=np.float32)
+    if isinstance(value, str):
+        body = value.strip().removeprefix("[").removesuffix("]")
+        if not body:
+            return np.empty(0, dtype=np.float32)
+        return np.array(body.split(","), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32).ravel()
+
+
+def encode_vector(value: Any) -> bytes:
+    """Encode a value in the binary ``vector`` wire format."""
+    arr = to_float_array(value)
+    return _HEADER.pack(arr.shape[0], 0) + arr.astype(">f4").tobytes()
+
+
+def encode_halfvec(value: Any) -> bytes:
+    """Encode a value in the binary ``halfvec`` wire format."""
+    arr = to_float_array(value)
+    return _HEADER.pack(arr.shape[0], 0) + arr.astype(">f2").tobytes()
+
+
+def decode_vector(data: bytes) -> np.ndarray:
+    """Decode a binary ``vector`` into a ``float32`` numpy array."""
+    return Vector.from_binary(data).to_numpy()
+
+
+def decode_halfvec(data: bytes) -> HalfVector:
+    """Decode a binary ``halfvec`` into a pgvector ``HalfVector``."""
+    return HalfVector.from_binary(data)
+
+
+class BinaryVectorParam(UserDefinedType):
+    """SQLAlchemy type for embedding *parameters* encoded by the driver codec.
+
+    Unlike ``pgvector.sqlalchemy.HALFVEC`` / ``Vector`` it does not render the
+    value as a text literal: the bind processor only coerces to ``float32``
+    and the registered asyncpg codec produces the binary wire format.
+    """
+
+    cache_ok = True
+
+    def __init__(self, typename: str = "halfvec", dim: int | None = None) -> None:
+        super().__init__()
+        self.typename = typename
+        self.dim = dim
+
+    def get_col_spec(self, **_kw: Any) -> str:
+        if self.dim is None:
+            return self.typename.upper()
+        return f"{self.typename.upper()}({self.dim})"
+
+    def bind_processor(self, _dialect: Any) -> Any:
+        def process(value: Any) -> np.ndarray | None:
+            return None if value is None else to_float_array(value)
+
+        return process
+
+
+def halfvec_param(key: str, embedding: Any) -> BindParameter[Any]:
+    """Bind *embedding* as a binary ``halfvec`` parameter named *key*."""
+    return bindparam(key, value=embedding, type_=BinaryVectorParam("halfvec"))
+
+
+def vector_param(key: str, embedding: Any) -> BindParameter[Any]:
+    """Bind *embedding* as a binary ``vector`` parameter named *key*."""
+    return bindparam(key, value=embedding, type_=BinaryVectorParam("vector"))
+
+
+async def register_vector_codecs(conn: asyncpg.Connection) -> None:
+    """Register binary ``vector`` and ``halfvec`` codecs on *conn*.
+
+    Missing types (e.g. the ``vector`` extension is not installed in a test
+    database) are logged and skipped so the connection stays usable.
+    """
+    codecs = (
+        ("vector", encode_vector, decode_vector),
+        ("halfvec", encode_halfvec, decode_halfvec),
+    )
+    for typename, encoder, decoder in codecs:
+        try:
+            await conn.set_type_codec(
+                typename,
+                schema="public",
+                encoder=encoder,
+                decoder=decoder,
+                format="binary",
+            )
+        except ValueError:
+            logger.warning("vector_codec_unavailable type=%s", typename)
+
+
+def install_vector_codecs(engine: AsyncEngine) -> None:
+    """Register the codecs on every new connection of an asyncpg *engine*."""
+    if engine.dialect.driver != "asyncpg":
+        logger.info("vector_codec_skipped driver=%s", engine.dialect.driver)
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, _connection_record: Any) -> None:
+        dbapi_connection.run_async(register_vector_codecs)
@@ -9,6 +9,12 @@ Two sync modes:
 - **Delta sync**: Process DAUDITNEW events since the last checkpoint.
 
 The DB models already exist in ``src.infrastructure.database.models.permission``.
+
+After writing the mirror, both modes refresh ``kuaf_membership_flat`` and,
+with ``permission_materialized_docs_enabled``, ``user_accessible_docs``
+(see ``security.access_materializer``).  ``publish_changes`` — called by the
+owner of the session *after* commit — bumps the ACL epoch so the shared
+per-group permission caches are rebuilt from the new snapshot.
 """
 
 from __future__ import annotations
@@ -18,20 +24,29 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy import delete
 
+from src.config.settings import settings
 from src.infrastructure.database.models.permission import (
     DTree,
     DTreeACL,
     Kuaf,
     KuafChildren,
 )
+from src.infrastructure.security.access_materializer import AccessDelta, UserAccessMaterializer
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
     from src.infrastructure.ecm.opentext_client import OpenTextClient
+    from src.infrastructure.security.permission_cache import PermissionCache
 
 logger = logging.getLogger(__name__)
 
+# DAUDITNEW events that change who can see a node vs. who belongs to a group
+_NODE_ACCESS_EVENTS = frozenset(
+    {"AuditCreate", "AuditModify", "AuditDelete", "AuditMoveNode", "AuditChangePermissions"}
+)
+_MEMBERSHIP_EVENTS = frozenset({"AuditAddMember", "AuditRemoveMember"})
+
 
 class XECMSyncService:
     """Synchronises OpenText permission data into the local Security Mirror.
@@ -41,15 +56,24 @@ class XECMSyncService:
     ```python
     async with async_session_maker() as session:
         client = ConcreteOpenTextClient(base_url=..., credentials=...)
-        sync = XECMSyncService(session=session, client=client)
+        sync = XECMSyncService(session=session, client=client, permission_cache=PermissionCache())
         await sync.full_sync()
         await session.commit()
+        await sync.publish_changes()
     ```
     """
 
-    def __init__(self, session: AsyncSession, client: OpenTextClient) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        client: OpenTextClient,
+        permission_cache: PermissionCache | None = None,
+    ) -> None:
         self._session = session
         self._client = client
+        self._permission_cache = permission_cache
+        self._access = UserAccessMaterializer(session)
+        self._pending_publish = False
 
     # ── Full Sync ────────────────────────────────────────────────────
 
@@ -121,6 +145,13 @@ class XECMSyncService:
         logger.info("sync_dtreeancestors_skipped reason=not_yet_implemented")
 
         await self._session.flush()
+
+        # 6. Derived access structures
+        await self._access.refresh_membership_view()
+        if settings.permission_materialized_docs_enabled:
+            counts["user_accessible_docs"] = await self._access.rebuild_all()
+        self._pending_publish = True
+
         logger.info("full_sync_complete counts=%s", counts)
         return counts
 
@@ -144,6 +175,7 @@ class XECMSyncService:
 
         events = await self._client.fetch_audit_events(since_event_id=since_event_id)
         counts: dict[str, int] = {"processed": 0, "skipped": 0}
+        delta = AccessDelta()
 
         for event in events:
             # TODO: Dispatch on event type:
@@ -155,16 +187,46 @@ class XECMSyncService:
             event_type = event.get("type", "unknown")
             logger.debug("delta_sync_event type=%s data_id=%s", event_type, event.get("data_id"))
             counts["skipped"] += 1
-
-        # TODO: After processing, refresh kuaf_membership_flat materialized view:
-        #   await self._session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY kuaf_membership_flat"))
+            self._collect_access_change(event, delta)
 
         await self._session.flush()
+
+        if delta:
+            if delta.member_ids:
+                await self._access.refresh_membership_view()
+            if settings.permission_materialized_docs_enabled:
+                access_counts = await self._access.apply(delta)
+                counts["user_accessible_docs"] = access_counts["user_rows"] + access_counts["document_rows"]
+            self._pending_publish = True
+
         logger.info("delta_sync_complete since=%d counts=%s", since_event_id, counts)
         return counts
 
+    async def publish_changes(self) -> None:
+        """Invalidate shared permission caches after the sync transaction commits.
+
+        Bumping the epoch before commit would let a concurrent request cache
+        the old snapshot under the new epoch, so this must run post-commit.
+        """
+        if not self._pending_publish or self._permission_cache is None:
+            return
+        epoch = await self._permission_cache.bump_acl_epoch()
+        self._pending_publish = False
+        logger.info("permission_acl_epoch_bumped epoch=%d", epoch)
+
     # ── Helpers ──────────────────────────────────────────────────────
 
+    @staticmethod
+    def _collect_access_change(event: dict, delta: AccessDelta) -> None:
+        """Record which documents / members an audit event affects."""
+        event_type = event.get("type")
+        if event_type in _NODE_ACCESS_EVENTS and event.get("data_id") is not None:
+            delta.data_ids.add(int(event["data_id"]))
+        elif event_type in _MEMBERSHIP_EVENTS:
+            member_id = event.get("child_id", event.get("data_id"))
+            if member_id is not None:
+                delta.member_ids.add(int(member_id))
+
     async def _rebuild_ancestors(self, data_ids: list[int] | None = None) -> int:
         """Rebuild dtreeancestors from dtree parent_id hierarchy.
 
@@ -3,13 +3,15 @@
 Public API:
     - GeminiClient: Unified wrapper for generation (sync + streaming) and embeddings.
     - GeminiModel: Enum for model selection (FLASH, FLASH_LITE).
+    - get_gemini_client: Process-wide GeminiClient registry keyed by (model, temperature, max_tokens).
+    - warm_up_gemini_clients: Pre-build and warm the registry at startup.
     - SYSTEM_PROMPT_RAG: Base system prompt with 6 mandatory sections.
     - build_rag_prompt: Build a zero-shot RAG prompt with XML delimiters.
     - build_few_shot_prompt: Build a few-shot RAG prompt with banking examples.
     - build_zero_shot_prompt: Build a minimal zero-shot RAG prompt.
 """
 
-from src.infrastructure.llm.client import GeminiClient, GeminiModel
+from src.infrastructure.llm.client import GeminiClient, GeminiModel, get_gemini_client, warm_up_gemini_clients
 from src.infrastructure.llm.prompts.system_prompt import SYSTEM_PROMPT_RAG, build_rag_prompt
 from src.infrastructure.llm.prompts.templates.few_shot import build_few_shot_prompt
 from src.infrastructure.llm.prompts.templates.zero_shot import build_zero_shot_prompt
@@ -21,4 +23,6 @@ __all__ = [
     "build_few_shot_prompt",
     "build_rag_prompt",
     "build_zero_shot_prompt",
+    "get_gemini_client",
+    "warm_up_gemini_clients",
 ]
@@ -9,11 +9,22 @@ Supports:
 - Streaming and synchronous generation
 - Text embeddings with configurable task_type
 - Retry with exponential backoff for transient errors (429, 500, 503)
+- Process-wide client registry (``get_gemini_client``) pre-warmed at startup
+
+Building a ``ChatGoogleGenerativeAI`` is not free: it resolves credentials
+(``google.auth.default()`` on Vertex AI) and opens a fresh HTTP transport on
+first use.  Hot paths must obtain clients through ``get_gemini_client`` so
+each ``(model, temperature, max_tokens)`` combination is built once per
+process, and the FastAPI lifespan calls ``warm_up_gemini_clients`` so the
+first request after a deploy does not pay that cost.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
+import time
 from enum import StrEnum
 from typing import TYPE_CHECKING, Any
 
@@ -59,6 +70,14 @@ class GeminiModel(StrEnum):
     FLASH_LITE = "flash_lite"
 
 
+@functools.cache
+def _default_credentials() -> Any:
+    """Resolve ADC credentials once per process (Vertex AI only)."""
+    effective_quota = settings.gcp_quota_project_id or settings.gcp_project_id
+    credentials, _ = google.auth.default(quota_project_id=effective_quota)
+    return credentials
+
+
 def _model_name(model: GeminiModel) -> str:
     """Resolve a GeminiModel enum to the actual model identifier."""
     mapping = {
@@ -112,15 +131,28 @@ class GeminiClient:
             kwargs["vertexai"] = True
             kwargs["project"] = settings.gcp_project_id
             kwargs["location"] = settings.gcp_location
-            effective_quota = settings.gcp_quota_project_id or settings.gcp_project_id
-            credentials, _ = google.auth.default(quota_project_id=effective_quota)
-            kwargs["credentials"] = credentials
+            kwargs["credentials"] = _default_credentials()
         else:
             kwargs["google_api_key"] = settings.gemini_api_key.get_secret_value()
         if self._safety_settings:
             kwargs["safety_settings"] = self._safety_settings
         return ChatGoogleGenerativeAI(**kwargs)
 
+    async def warm_up(self) -> None:
+        """Issue a tiny request to establish the HTTP transport and auth token.
+
+        Bypasses retries and Langfuse tracing; failures and timeouts
+        (``gemini_warmup_timeout_seconds``) are only logged, so a slow or
+        unreachable Gemini never delays startup beyond that bound.
+        """
+        timeout = settings.gemini_warmup_timeout_seconds
+        try:
+            await asyncio.wait_for(self._llm.ainvoke("OK"), timeout=timeout)
+        except TimeoutError:
+            logger.warning("gemini_warm_up_timeout model=%s timeout_s=%.1f", self._model_name, timeout)
+        except Exception as exc:
+            logger.warning("gemini_warm_up_failed model=%s error=%s", self._model_name, exc)
+
     def get_langchain_chat_model(self) -> ChatGoogleGenerativeAI:
         """Expose the underlying LangChain chat model for integrations like RAGAS."""
         return self._llm
@@ -310,8 +342,6 @@ class GeminiClient:
                         details={"model": self._model_name, "attempts": attempt},
                     ) from exc
                 logger.warning("Gemini stream rate limited, retry %d/%d", attempt, _MAX_RETRIES)
-                import asyncio
-
                 await asyncio.sleep(min(_WAIT_MIN_SECONDS * (2 ** (attempt - 1)), _WAIT_MAX_SECONDS))
             except (InternalServerError, ServiceUnavailable) as exc:
                 attempt += 1
@@ -321,8 +351,6 @@ class GeminiClient:
                         details={"model": self._model_name, "attempts": attempt},
                     ) from exc
                 logger.warning("Gemini stream transient error, retry %d/%d", attempt, _MAX_RETRIES)
-                import asyncio
-
                 await asyncio.sleep(min(_WAIT_MIN_SECONDS * (2 ** (attempt - 1)), _WAIT_MAX_SECONDS))
             except Exception as exc:
                 logger.exception("Gemini stream failed: %s", exc)
@@ -344,9 +372,7 @@ class GeminiClient:
                 emb_kwargs["vertexai"] = True
                 emb_kwargs["project"] = settings.gcp_project_id
                 emb_kwargs["location"] = settings.gcp_location
-                effective_quota = settings.gcp_quota_project_id or settings.gcp_project_id
-                emb_credentials, _ = google.auth.default(quota_project_id=effective_quota)
-                emb_kwargs["credentials"] = emb_credentials
+                emb_kwargs["credentials"] = _default_credentials()
             else:
                 emb_kwargs["google_api_key"] = settings.gemini_api_key.get_secret_value()
             self._embeddings_cache[task_type] = GoogleGenerativeAIEmbeddings(**emb_kwargs)  # type: ignore[call-arg]
@@ -407,3 +433,83 @@ class GeminiClient:
                 message=f"Gemini embeddings failed: {exc}",
                 details={"model": settings.gemini_embedding_model, "task_type": task_type},
             ) from exc
+
+
+# ── Process-wide client registry ─────────────────────────────────────
+
+_ClientKey = tuple[GeminiModel, float, int]
+
+_client_registry: dict[_ClientKey, GeminiClient] = {}
+
+# Combinations used on the chat hot path (generation, title, guardrails,
+# classifiers).  Pre-built and warmed in the FastAPI lifespan.
+PREWARM_CLIENT_SPECS: tuple[dict[str, Any], ...] = (
+    {"model": GeminiModel.FLASH},  # generation / streaming / memory extraction
+    {"model": GeminiModel.FLASH, "temperature": 0.0},  # topic + faithfulness judges
+    {"model": GeminiModel.FLASH_LITE, "temperature": 0.0},  # input guardrail, ambiguity
+    {"model": GeminiModel.FLASH_LITE, "temperature": 0.3},  # clarification
+    {"model": GeminiModel.FLASH_LITE, "temperature": 0.7},  # greeting
+    {"model": GeminiModel.FLASH_LITE, "temperature": 0.3, "max_tokens": 10},  # conversation title
+)
+
+
+def _client_key(model: GeminiModel, temperature: float | None, max_tokens: int | None) -> _ClientKey:
+    return (
+        model,
+        temperature if temperature is not None else settings.gemini_temperature,
+        max_tokens if max_tokens is not None else settings.gemini_max_tokens,
+    )
+
+
+def get_gemini_client(
+    *,
+    model: GeminiModel = GeminiModel.FLASH,
+    temperature: float | None = None,
+    max_tokens: int | None = None,
+) -> GeminiClient:
+    """Return the shared ``GeminiClient`` for ``(model, temperature, max_tokens)``.
+
+    ``None`` values resolve to the settings defaults before keying, so
+    ``get_gemini_client()`` and ``get_gemini_client(temperature=0.2)`` share
+    one instance when 0.2 is the configured default.
+    """
+    key = _client_key(model, temperature, max_tokens)
+    client = _client_registry.get(key)
+    if client is None:
+        client = GeminiClient(model=key[0], temperature=key[1], max_tokens=key[2])
+        _client_registry[key] = client
+    return client
+
+
+def reset_gemini_clients() -> None:
+    """Drop every registered client (tests / settings reload)."""
+    _client_registry.clear()
+
+
+async def warm_up_gemini_clients(
+    specs: tuple[dict[str, Any], ...] = PREWARM_CLIENT_SPECS,
+    *,
+    dummy_call: bool = True,
+) -> None:
+    """Build the registry entries for *specs* and optionally warm them up.
+
+    Construction and dummy calls are both guarded: a spec whose client
+    cannot be built (e.g. credential resolution fails) is logged and left to
+    the lazy path, so failures never abort startup.  The dummy calls run
+    concurrently.
+    """
+    t0 = time.monotonic()
+    clients: list[GeminiClient] = []
+    for spec in specs:
+        try:
+            clients.append(get_gemini_client(**spec))
+        except Exception as exc:
+            logger.warning("gemini_client_prewarm_failed spec=%s error=%s", spec, exc)
+    if dummy_call:
+        await asyncio.gather(*(client.warm_up() for client in clients))
+    logger.info(
+        "gemini_clients_warmed count=%d dummy_call=%s duration_ms=%.1f",
+        len(clients),
+        dummy_call,
+        (time.monotonic() - t0) * 1000,
+    )
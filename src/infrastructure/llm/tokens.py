@@ -0,0 +1,38 @@
+"""Conteo y truncado de tokens para prompts (tiktoken ``cl100k_base``).
+
+Misma codificación que ``AdaptiveChunker`` (``ChunkingConfig.encoding_name``),
+así los presupuestos de prompt se miden en las mismas unidades que
+``CHUNK_SIZE``.  No es el tokenizer de Gemini: es una aproximación estable
+para presupuestos y métricas.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+ENCODING_NAME = "cl100k_base"
+
+
+@lru_cache(maxsize=1)
+def get_encoding() -> Any:
+    import tiktoken
+
+    return tiktoken.get_encoding(ENCODING_NAME)
+
+
+def count_tokens(text: str) -> int:
+    """Tokens de *text*."""
+    return len(get_encoding().encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Primeros *max_tokens* tokens de *text* (sin cortar caracteres multibyte)."""
+    if max_tokens <= 0:
+        return ""
+    encoding = get_encoding()
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    truncated: str = encoding.decode(tokens[:max_tokens], errors="ignore")
+    return truncated
@@ -1,7 +1,101 @@
 """Base para recolección de métricas (Prometheus/Langfuse)."""
 
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
 import structlog
+from sqlalchemy import event
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
 
 logger = structlog.get_logger()
 
 # TODO(T1-S3-03): Implementar Prometheus metrics collector
+
+
+@dataclass
+class DbPoolMetrics:
+    """Utilización del pool de conexiones de SQLAlchemy.
+
+    Los contadores se alimentan de los eventos ``checkout``/``checkin`` del
+    pool y de ``borrow_session`` (sesión compartida del request vs. sesión
+    propia).  ``snapshot()`` combina ambos con el estado instantáneo del pool
+    para dimensionar ``pool_size``/``max_overflow`` a partir de datos.
+    """
+
+    checkouts: int = 0
+    checkins: int = 0
+    connects: int = 0
+    checked_out: int = 0
+    peak_checked_out: int = 0
+    checkout_hold_ms_total: float = 0.0
+    shared_session_borrows: int = 0
+    fallback_sessions: int = 0
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def install(self, engine: AsyncEngine) -> None:
+        """Registra los listeners de eventos del pool de *engine*."""
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _on_connect(_dbapi_connection: Any, _record: Any) -> None:
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(engine.sync_engine, "checkout")
+        def _on_checkout(_dbapi_connection: Any, record: Any, _proxy: Any) -> None:
+            record.info["checkout_at"] = time.monotonic()
+            with self._lock:
+                self.checkouts += 1
+                self.checked_out += 1
+                self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+        @event.listens_for(engine.sync_engine, "checkin")
+        def _on_checkin(_dbapi_connection: Any, record: Any) -> None:
+            checkout_at = record.info.pop("checkout_at", None)
+            with self._lock:
+                self.checkins += 1
+                self.checked_out = max(self.checked_out - 1, 0)
+                if checkout_at is not None:
+                    self.checkout_hold_ms_total += (time.monotonic() - checkout_at) * 1000
+
+    def record_borrow(self, *, shared: bool) -> None:
+        """Contabiliza un ``borrow_session`` (compartida o sesión propia)."""
+        with self._lock:
+            if shared:
+                self.shared_session_borrows += 1
+            else:
+                self.fallback_sessions += 1
+
+    def snapshot(self, engine: AsyncEngine | None = None) -> dict:
+        """Retorna contadores acumulados y, si se pasa *engine*, el estado del pool."""
+        with self._lock:
+            data: dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "avg_checkout_hold_ms": (
+                    round(self.checkout_hold_ms_total / self.checkins, 3) if self.checkins else 0.0
+                ),
+                "shared_session_borrows": self.shared_session_borrows,
+                "fallback_sessions": self.fallback_sessions,
+            }
+        if engine is not None:
+            pool: Any = engine.sync_engine.pool
+            if hasattr(pool, "size"):
+                data["pool_size"] = pool.size()
+                data["pool_checked_in"] = pool.checkedin()
+                data["pool_overflow"] = pool.overflow()
+                data["pool_checked_out_now"] = pool.checkedout()
+        return data
+
+
+db_pool_metrics = DbPoolMetrics()
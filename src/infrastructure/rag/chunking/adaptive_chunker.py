@@ -5,15 +5,23 @@ Segmenta documentos en chunks de ~4KB (1000 tokens) con 15% overlap,
 detectando y preservando tablas como unidades atómicas.
 """
 
+import bisect
 import re
-from dataclasses import dataclass, field
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field, replace
 from typing import Any
 
 import tiktoken
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from src.config.settings import settings
-from src.infrastructure.rag.loaders.models import LoadedDocument
+from src.infrastructure.rag.chunking.table_detector import detect_tables
+from src.infrastructure.rag.chunking.token_splitter import TokenOffsetSplitter
+from src.infrastructure.rag.loaders.models import LoadedDocument, LoadedPage
+
+# Ventana de chunk_pages, en múltiplos de chunk_size (~4 caracteres por token)
+_STREAM_WINDOW_CHUNKS = 8
+_CHARS_PER_TOKEN = 4
 
 
 @dataclass(frozen=True)
@@ -35,6 +43,9 @@ class ChunkingConfig:
     separators: list[str] = field(default_factory=lambda: ["\n\n", "\n", ". ", " "])
     # Encoding de tiktoken
     encoding_name: str = "cl100k_base"
+    # Camino rápido: tokenizar cada segmento una vez y cortar por offsets
+    # (TokenOffsetSplitter) en lugar de RecursiveCharacterTextSplitter
+    use_token_offsets: bool = True
 
 
 class AdaptiveChunker:
@@ -75,10 +86,20 @@ class AdaptiveChunker:
         self.config = config or ChunkingConfig()
         self._tokenizer = tiktoken.get_encoding(self.config.encoding_name)
 
-        self._splitter = RecursiveCharacterTextSplitter(
+        self._splitter = self._build_splitter(self.config.separators)
+
+    def _build_splitter(self, separators: list[str]) -> TokenOffsetSplitter | RecursiveCharacterTextSplitter:
+        if self.config.use_token_offsets:
+            return TokenOffsetSplitter(
+                self._tokenizer,
+                chunk_size=self.config.chunk_size,
+                chunk_overlap=self.config.chunk_overlap,
+                separators=separators,
+            )
+        return RecursiveCharacterTextSplitter(
             chunk_size=self.config.chunk_size,
             chunk_overlap=self.config.chunk_overlap,
-            separators=self.config.separators,
+            separators=separators,
             length_function=self._count_tokens,
         )
 
@@ -90,9 +111,21 @@ class AdaptiveChunker:
         """
         Detecta tablas en el texto y retorna sus posiciones.
 
+        Usa el detector de una pasada por líneas (``table_detector``), con la
+        misma salida que ``_detect_tables_regex``.
+
         Returns:
             Lista de tuplas (start, end, table_text) ordenadas por posición.
         """
+        return detect_tables(text)
+
+    def _detect_tables_regex(self, text: str) -> list[tuple[int, int, str]]:
+        """
+        Detector original con tres regex sobre el texto completo.
+
+        Se conserva como referencia para el corpus de regresión y el
+        benchmark (``scripts/bench_table_detector.py``).
+        """
         tables: list[tuple[int, int, str]] = []
 
         # Buscar tablas con pipes
@@ -181,18 +214,67 @@ class AdaptiveChunker:
         Returns:
             Lista de chunks.
         """
-        custom_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.config.chunk_size,
-            chunk_overlap=self.config.chunk_overlap,
-            separators=separators,
-            length_function=self._count_tokens,
-        )
-        return self._chunk_with_splitter(document, custom_splitter)
+        return self._chunk_with_splitter(document, self._build_splitter(separators))
+
+    def chunk_pages(
+        self,
+        pages: Iterable[LoadedPage],
+        metadata: dict[str, Any],
+        *,
+        window_chars: int | None = None,
+    ) -> Iterator[Chunk]:
+        """
+        Chunking en streaming sobre páginas (p. ej. ``PDFLoader.iter_pages``).
+
+        Acumula páginas hasta ~``window_chars`` caracteres (default: 8 chunks)
+        y chunkea cada ventana como un documento, así la memoria queda acotada
+        a una ventana en lugar del texto completo.  Los cortes entre ventanas
+        caen siempre en un límite de página.  ``chunk_index`` es global y cada
+        chunk lleva el ``page_number`` de la página donde empieza.
+
+        Args:
+            pages: Páginas en orden.
+            metadata: Metadata del documento (se copia a cada chunk).
+            window_chars: Tamaño de la ventana en caracteres.
+
+        Yields:
+            Chunks en orden de documento.
+        """
+        limit = window_chars or self.config.chunk_size * _CHARS_PER_TOKEN * _STREAM_WINDOW_CHUNKS
+        window: list[LoadedPage] = []
+        window_len = 0
+        next_index = 0
+
+        def flush() -> Iterator[Chunk]:
+            nonlocal next_index
+            texts, page_starts, offset = [], [], 0
+            for page in window:
+                page_starts.append((offset, page.page_number))
+                texts.append(page.text)
+                offset += len(page.text) + 1
+            document = LoadedDocument(
+                text="\n".join(texts),
+                metadata=metadata,
+                pages=len(window),
+                extra_info={"page_starts": page_starts},
+            )
+            for chunk in self._chunk_with_splitter(document, self._splitter):
+                yield replace(chunk, metadata={**chunk.metadata, "chunk_index": next_index})
+                next_index += 1
+
+        for page in pages:
+            window.append(page)
+            window_len += len(page.text)
+            if window_len >= limit:
+                yield from flush()
+                window, window_len = [], 0
+        if window:
+            yield from flush()
 
     def _chunk_with_splitter(
         self,
         document: LoadedDocument,
-        splitter: RecursiveCharacterTextSplitter,
+        splitter: TokenOffsetSplitter | RecursiveCharacterTextSplitter,
     ) -> list[Chunk]:
         """Lógica interna de chunking con un splitter dado (thread-safe)."""
         text = document.text
@@ -228,9 +310,11 @@ class AdaptiveChunker:
                 chunk_index += 1
             else:
                 # Texto normal: usar el splitter recibido
-                split_texts = splitter.split_text(segment_text)
-                for split_text in split_texts:
-                    token_count = self._count_tokens(split_text)
+                if isinstance(splitter, TokenOffsetSplitter):
+                    pieces = splitter.split_with_counts(segment_text)
+                else:
+                    pieces = [(t, self._count_tokens(t)) for t in splitter.split_text(segment_text)]
+                for split_text, token_count in pieces:
                     chunk_metadata = {
                         "doc_id": base_metadata.get("doc_id"),
                         "chunk_index": chunk_index,
@@ -247,4 +331,29 @@ class AdaptiveChunker:
                     )
                     chunk_index += 1
 
+        page_starts = document.extra_info.get("page_starts")
+        if page_starts:
+            self._assign_page_numbers(text, chunks, page_starts)
+
         return chunks
+
+    @staticmethod
+    def _assign_page_numbers(text: str, chunks: list[Chunk], page_starts: list[tuple[int, int]]) -> None:
+        """Completa ``page_number`` con la página donde empieza cada chunk.
+
+        ``page_starts`` son pares ``(offset, page_number)`` ordenados, como
+        los deja ``PDFLoader`` en ``extra_info``.  Los chunks salen en orden
+        de documento, así que cada uno se busca a partir del anterior.
+        """
+        offsets = [offset for offset, _ in page_starts]
+        cursor = 0
+        for chunk in chunks:
+            probe = chunk.text[:64]
+            position = text.find(probe, cursor)
+            if position < 0:
+                position = text.find(probe)
+            if position < 0:
+                continue
+            cursor = position + 1
+            page_index = max(bisect.bisect_right(offsets, position) - 1, 0)
+            chunk.metadata["page_number"] = page_starts[page_index][1]
@@ -0,0 +1,107 @@
+"""Diff a document's new chunks against the rows already in ``document_chunks``.
+
+Used by the incremental re-index: instead of writing a new ``version`` of
+every chunk and deleting the old one (which churns the HNSW and GIN indexes
+for the whole document), chunks are matched by SHA-256 of their text:
+
+* a new chunk whose text already exists keeps its row (and its embedding);
+  only ``chunk_index`` / ``metadata`` are updated if they moved — neither is
+  indexed, so Postgres can do a HOT update when the page has room.  ``area``
+  is indexed (``ix_document_chunks_area``), so it is only written when it
+  actually changed; those rows get a regular (non-HOT) update;
+* a new chunk without a match is inserted (and is the only one embedded);
+* an existing row without a match is deleted.
+
+Duplicate texts inside a document are matched as a multiset, in order.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+# SELECT for the existing rows; ``content_hash`` is maintained by the dedup
+# trigger (migration e8c1f4a7b3d2), so the content never leaves the database.
+EXISTING_CHUNKS_SQL = """
+    SELECT id, chunk_index, content_hash, area, metadata
+    FROM document_chunks
+    WHERE document_id = %s
+    ORDER BY chunk_index
+"""
+
+
+def chunk_content_hash(content: str) -> bytes:
+    """SHA-256 of the chunk text (same as ``sha256(convert_to(content, 'UTF8'))``)."""
+    return hashlib.sha256(content.encode("utf-8")).digest()
+
+
+@dataclass(frozen=True)
+class ExistingChunk:
+    """Row of ``document_chunks`` as returned by ``EXISTING_CHUNKS_SQL``."""
+
+    id: Any
+    chunk_index: int
+    content_hash: bytes
+    area: str
+    metadata: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class KeptChunk:
+    """Existing row reused for the new chunk at ``new_index``."""
+
+    id: Any
+    new_index: int
+    changed: bool
+    area_changed: bool = False
+
+
+@dataclass
+class ChunkDiff:
+    """Plan to turn the stored chunks into the new ones."""
+
+    kept: list[KeptChunk] = field(default_factory=list)
+    inserted: list[int] = field(default_factory=list)
+    deleted: list[Any] = field(default_factory=list)
+
+    @property
+    def updated(self) -> list[KeptChunk]:
+        """Kept rows that need an UPDATE (moved or new metadata)."""
+        return [k for k in self.kept if k.changed]
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "kept": len(self.kept),
+            "updated": len(self.updated),
+            "inserted": len(self.inserted),
+            "deleted": len(self.deleted),
+        }
+
+
+def diff_chunks(
+    existing: list[ExistingChunk],
+    new_chunks: list[tuple[str, str, dict[str, Any]]],
+) -> ChunkDiff:
+    """Match *new_chunks* ``(text, area, metadata)`` against *existing* rows by content hash.
+
+    ``inserted`` holds positions in *new_chunks*; ``kept`` / ``deleted`` hold row IDs.
+    """
+    by_hash: dict[bytes, deque[ExistingChunk]] = defaultdict(deque)
+    for row in sorted(existing, key=lambda r: r.chunk_index):
+        by_hash[bytes(row.content_hash)].append(row)
+
+    diff = ChunkDiff()
+    for new_index, (chunk_text, area, metadata) in enumerate(new_chunks):
+        candidates = by_hash.get(chunk_content_hash(chunk_text))
+        if candidates:
+            row = candidates.popleft()
+            area_changed = row.area != area
+            changed = area_changed or row.chunk_index != new_index or (row.metadata or {}) != metadata
+            diff.kept.append(KeptChunk(id=row.id, new_index=new_index, changed=changed, area_changed=area_changed))
+        else:
+            diff.inserted.append(new_index)
+
+    diff.deleted = [row.id for rows in by_hash.values() for row in rows]
+    return diff
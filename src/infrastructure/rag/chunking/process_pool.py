@@ -0,0 +1,222 @@
+"""Process-pool stage for document loading + chunking.
+
+``LoaderFactory.load`` (PyMuPDF extraction, ``find_tables`` + markdown,
+regex table detection) and ``AdaptiveChunker.chunk`` (tiktoken counting) are
+CPU-bound and hold the GIL: called from ``IndexingService`` they block the
+event loop for seconds per PDF, and the DAGs process one document at a time.
+
+``ChunkingPool`` runs ``load + chunk`` in worker processes:
+
+* each worker builds its ``LoaderFactory`` / ``AdaptiveChunker`` once (pool
+  initializer), so the tiktoken encoding is loaded once per process;
+* ``chunk_file`` awaits one document without blocking the loop;
+* ``stream`` (async) and ``chunk_files`` (sync, for Airflow tasks) accept many
+  files, keep at most ``max_in_flight`` submitted and yield one
+  ``ChunkedDocument`` — the chunk batch of a document — as soon as it is
+  ready, so the embedding stage starts before the last file is parsed.
+
+Workers are started with ``spawn``: forking a process that already runs an
+event loop, Gemini clients or DB pools is not safe.  Failures are returned in
+``ChunkedDocument.error`` (library exceptions are not always picklable).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.config.settings import settings
+from src.infrastructure.rag.chunking.adaptive_chunker import AdaptiveChunker, Chunk, ChunkingConfig
+from src.shared.exceptions import PipelineError
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChunkedDocument:
+    """Result of loading and chunking one file in a worker."""
+
+    file_path: str
+    chunks: list[Chunk] = field(default_factory=list)
+    pages: int = 0
+    tables_count: int = 0
+    duration_seconds: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def raise_for_error(self) -> None:
+        if self.error is not None:
+            raise PipelineError(
+                message=f"Loading/chunking failed for {Path(self.file_path).name}: {self.error}",
+                details={"file": self.file_path},
+            )
+
+
+# ---------------------------------------------------------------------------
+# Worker side (module-level so it pickles under ``spawn``)
+# ---------------------------------------------------------------------------
+
+_worker_loader = None
+_worker_chunker: AdaptiveChunker | None = None
+
+
+def _init_worker(config: ChunkingConfig | None) -> None:
+    global _worker_loader, _worker_chunker
+    from src.infrastructure.rag.loaders.factory import LoaderFactory
+
+    _worker_loader = LoaderFactory()
+    _worker_chunker = AdaptiveChunker(config)
+
+
+def load_and_chunk(file_path: str) -> ChunkedDocument:
+    """Load and chunk *file_path* (runs inside a worker process)."""
+    if _worker_loader is None or _worker_chunker is None:
+        _init_worker(None)
+    assert _worker_loader is not None and _worker_chunker is not None
+
+    t0 = time.perf_counter()
+    try:
+        loaded = _worker_loader.load(Path(file_path))
+        chunks = _worker_chunker.chunk(loaded)
+    except Exception as exc:
+        return ChunkedDocument(
+            file_path=file_path,
+            duration_seconds=time.perf_counter() - t0,
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    return ChunkedDocument(
+        file_path=file_path,
+        chunks=chunks,
+        pages=loaded.pages,
+        tables_count=loaded.tables_count,
+        duration_seconds=time.perf_counter() - t0,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+
+
+class ChunkingPool:
+    """Load + chunk documents across CPU cores.
+
+    Parameters
+    ----------
+    max_workers:
+        Worker processes.  ``0`` = ``os.cpu_count()``.
+    config:
+        ``ChunkingConfig`` for the workers' chunker (default settings if omitted).
+    max_in_flight:
+        Documents submitted at once by ``stream`` / ``chunk_files``; bounds
+        the memory held by finished-but-unconsumed results.  Default
+        ``2 * max_workers``.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 0,
+        *,
+        config: ChunkingConfig | None = None,
+        max_in_flight: int | None = None,
+    ) -> None:
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._config = config
+        self._max_in_flight = max_in_flight or 2 * self._max_workers
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._config,),
+            )
+            logger.info("chunking_pool_started workers=%d", self._max_workers)
+        return self._executor
+
+    async def chunk_file(self, file_path: Path | str) -> ChunkedDocument:
+        """Load and chunk one file in the pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), load_and_chunk, str(file_path))
+
+    async def stream(self, file_paths: Iterable[Path | str]) -> AsyncIterator[ChunkedDocument]:
+        """Yield each file's ``ChunkedDocument`` in completion order."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        paths = iter(file_paths)
+        pending: set[asyncio.Future[ChunkedDocument]] = set()
+        try:
+            while True:
+                for path in paths:
+                    pending.add(loop.run_in_executor(executor, load_and_chunk, str(path)))
+                    if len(pending) >= self._max_in_flight:
+                        break
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def chunk_files(self, file_paths: Iterable[Path | str]) -> Iterator[ChunkedDocument]:
+        """Sync version of ``stream`` for Airflow tasks."""
+        executor = self._get_executor()
+        paths = iter(file_paths)
+        pending: set[Future[ChunkedDocument]] = set()
+        try:
+            while True:
+                for path in paths:
+                    pending.add(executor.submit(load_and_chunk, str(path)))
+                    if len(pending) >= self._max_in_flight:
+                        break
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            logger.info("chunking_pool_stopped")
+
+
+_chunking_pool: ChunkingPool | None = None
+
+
+def get_chunking_pool() -> ChunkingPool | None:
+    """Process-wide pool, or ``None`` when ``settings.chunking_pool_enabled`` is off."""
+    global _chunking_pool
+    if _chunking_pool is None and settings.chunking_pool_enabled:
+        _chunking_pool = ChunkingPool(settings.chunking_pool_workers)
+    return _chunking_pool
+
+
+def set_chunking_pool(pool: ChunkingPool | None) -> None:
+    global _chunking_pool
+    _chunking_pool = pool
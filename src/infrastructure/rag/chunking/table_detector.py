@@ -0,0 +1,120 @@
+"""Detector de tablas de una sola pasada por líneas (``AdaptiveChunker._detect_tables``).
+
+Reemplaza las tres búsquedas con regex sobre el documento completo
+(``TABLE_PATTERN_PIPE``, ``TABLE_PATTERN_ALIGNED``, ``TABLE_PATTERN_TAGGED``)
+por un único recorrido de las líneas que clasifica cada una y mantiene las
+corridas abiertas de tablas pipe y alineadas.  Cada línea se examina un
+número constante de veces (tiempo lineal garantizado; ``TABLE_PATTERN_ALIGNED``
+reintentaba cada línea desde cada inicio de corrida).  Las tablas
+``[TABLA]...[/TABLA]`` se ubican saltando con ``str.find`` entre etiquetas,
+también sin volver atrás.
+
+La salida es idéntica a la del detector con regex — mismas tablas
+candidatas, misma resolución de solapamientos — que se conserva como
+``AdaptiveChunker._detect_tables_regex``.  Semántica replicada:
+
+* **pipe**: una línea que empieza y termina con ``|`` (≥ 3 caracteres) y
+  tiene ``\\n``, seguida de ≥ 1 fila.  Una fila es una línea que empieza con
+  ``|`` y tiene otro ``|`` desde la posición 2; si no termina en ``|`` la
+  fila se corta en el último ``|`` y la tabla termina ahí.
+* **alineada**: ≥ 3 líneas consecutivas con ``\\n`` cuyo primer token está
+  seguido de ≥ 2 espacios/tabs y otro token.
+* **tagged**: desde cada ``[TABLA]`` hasta el siguiente ``[/TABLA]``.
+"""
+
+from __future__ import annotations
+
+import re
+
+Table = tuple[int, int, str]
+
+# Una línea de tabla alineada (sin el "\n", que se verifica aparte)
+_ALIGNED_LINE = re.compile(r"[ \t]*\S+[ \t]{2,}\S")
+_OPEN_TAG = "[TABLA]"
+_CLOSE_TAG = "[/TABLA]"
+
+# Orden de desempate a igual inicio (el sort estable del detector regex)
+_PIPE, _ALIGNED, _TAGGED = 0, 1, 2
+
+
+def _pipe_row_end(line: str) -> int:
+    """Largo de la fila pipe que empieza la línea (0 si no es fila)."""
+    if not line.startswith("|"):
+        return 0
+    last = line.rfind("|")
+    return last + 1 if last >= 2 else 0
+
+
+def _tagged_tables(text: str) -> list[tuple[int, int, int]]:
+    found: list[tuple[int, int, int]] = []
+    open_at = text.find(_OPEN_TAG)
+    while open_at != -1:
+        close = text.find(_CLOSE_TAG, open_at + len(_OPEN_TAG))
+        if close == -1:
+            break
+        end = close + len(_CLOSE_TAG)
+        found.append((open_at, _TAGGED, end))
+        open_at = text.find(_OPEN_TAG, end)
+    return found
+
+
+def detect_tables(text: str) -> list[Table]:
+    """Tablas ``(start, end, table_text)`` sin solapamientos, ordenadas por posición."""
+    candidates = _tagged_tables(text)  # (start, kind, end)
+    text_len = len(text)
+
+    # Bloque pipe abierto: inicio, fin consumido y filas después de la primera línea
+    pipe_start, pipe_end, pipe_rows = -1, 0, 0
+    # Corrida alineada abierta: inicio, fin y cantidad de líneas
+    aligned_start, aligned_end, aligned_lines = -1, 0, 0
+
+    line_start = 0
+    while True:
+        newline = text.find("\n", line_start)
+        has_newline = newline != -1
+        line_end = newline if has_newline else text_len
+        line = text[line_start:line_end]
+
+        # --- pipe
+        row = _pipe_row_end(line)
+        full_line = row > 0 and row == len(line)
+        if pipe_start >= 0:
+            if row:
+                pipe_rows += 1
+                if full_line and has_newline:
+                    pipe_end = line_end + 1
+                else:
+                    # Fila parcial o fin de texto: la tabla termina en el último "|"
+                    candidates.append((pipe_start, _PIPE, line_start + row))
+                    pipe_start = -1
+            else:
+                if pipe_rows:
+                    candidates.append((pipe_start, _PIPE, pipe_end))
+                pipe_start = -1
+        elif full_line and has_newline:
+            pipe_start, pipe_end, pipe_rows = line_start, line_end + 1, 0
+
+        # --- alineadas
+        if has_newline and _ALIGNED_LINE.match(line):
+            if aligned_start < 0:
+                aligned_start, aligned_lines = line_start, 0
+            aligned_lines += 1
+            aligned_end = line_end + 1
+        else:
+            if aligned_start >= 0 and aligned_lines >= 3:
+                candidates.append((aligned_start, _ALIGNED, aligned_end))
+            aligned_start = -1
+
+        if not has_newline:
+            break
+        line_start = line_end + 1
+
+    # Resolución de solapamientos idéntica al detector regex
+    candidates.sort()
+    filtered: list[Table] = []
+    for start, _, end in candidates:
+        if not filtered or start >= filtered[-1][1]:
+            filtered.append((start, end, text[start:end]))
+        elif end - start > filtered[-1][1] - filtered[-1][0]:
+            filtered[-1] = (start, end, text[start:end])
+    return filtered
@@ -0,0 +1,157 @@
+"""Splitter recursivo sobre offsets de tokens (camino rápido de ``AdaptiveChunker``).
+
+``RecursiveCharacterTextSplitter`` con ``length_function=_count_tokens``
+re-codifica con tiktoken cada pieza cada vez que la mide (en el split, en el
+merge y otra vez al descartar el overlap), y el chunker vuelve a contar los
+tokens de cada chunk al final.
+
+``TokenOffsetSplitter`` codifica cada segmento **una sola vez**, guarda el
+offset de carácter donde empieza cada token y reproduce el mismo algoritmo
+recursivo (separadores jerárquicos, ``keep_separator`` al inicio, merge con
+overlap, ``strip``) trabajando con spans ``(start, end)`` del texto.  La
+longitud de un span es la cantidad de tokens que empiezan dentro de él: una
+búsqueda binaria en lugar de un ``encode``.
+
+Diferencia con el splitter de LangChain: un token de BPE que cruza el borde
+de una pieza se cuenta una vez (en la pieza donde empieza) en lugar de
+re-tokenizar cada pieza aislada, así que los conteos pueden diferir en ±1
+token por borde y, cerca del límite de ``chunk_size``, algún corte puede
+moverse una pieza.  ``scripts/bench_chunker.py`` mide la diferencia.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import tiktoken
+
+Span = tuple[int, int]
+
+
+class TokenOffsetSplitter:
+    """Mismo contrato que ``RecursiveCharacterTextSplitter.split_text`` + conteo de tokens.
+
+    Args:
+        tokenizer: Encoding de tiktoken.
+        chunk_size: Tamaño máximo del chunk en tokens.
+        chunk_overlap: Overlap máximo en tokens.
+        separators: Separadores jerárquicos (literales, no regex).
+    """
+
+    def __init__(
+        self,
+        tokenizer: tiktoken.Encoding,
+        *,
+        chunk_size: int,
+        chunk_overlap: int,
+        separators: list[str],
+    ) -> None:
+        self._tokenizer = tokenizer
+        self._chunk_size = chunk_size
+        self._chunk_overlap = chunk_overlap
+        self._separators = separators
+
+    def split_with_counts(self, text: str) -> list[tuple[str, int]]:
+        """Divide *text* y devuelve ``(chunk_text, token_count)`` por chunk."""
+        tokens = self._tokenizer.encode(text)
+        decoded, starts = self._tokenizer.decode_with_offsets(tokens)
+        if decoded != text:
+            # Texto que no sobrevive el round-trip (p. ej. surrogates): offsets aproximados
+            starts = [min(s, len(text)) for s in starts]
+
+        def length(span: Span) -> int:
+            return bisect_left(starts, span[1]) - bisect_left(starts, span[0])
+
+        spans = self._split(text, (0, len(text)), self._separators, length)
+        return [(text[a:b], length((a, b))) for a, b in spans]
+
+    def split_text(self, text: str) -> list[str]:
+        return [chunk for chunk, _ in self.split_with_counts(text)]
+
+    # ------------------------------------------------------------------
+    # Algoritmo recursivo (réplica de RecursiveCharacterTextSplitter)
+    # ------------------------------------------------------------------
+
+    def _split(self, text: str, span: Span, separators: list[str], length) -> list[Span]:
+        start, end = span
+        separator = separators[-1]
+        new_separators: list[str] = []
+        for i, candidate in enumerate(separators):
+            if not candidate:
+                separator = candidate
+                break
+            if text.find(candidate, start, end) != -1:
+                separator = candidate
+                new_separators = separators[i + 1 :]
+                break
+
+        final: list[Span] = []
+        good: list[Span] = []
+        for piece in self._split_on_separator(text, span, separator):
+            if length(piece) < self._chunk_size:
+                good.append(piece)
+                continue
+            if good:
+                final.extend(self._merge(text, good, length))
+                good = []
+            if not new_separators:
+                final.append(piece)
+            else:
+                final.extend(self._split(text, piece, new_separators, length))
+        if good:
+            final.extend(self._merge(text, good, length))
+        return final
+
+    @staticmethod
+    def _split_on_separator(text: str, span: Span, separator: str) -> list[Span]:
+        """Piezas contiguas con el separador al inicio de cada una (``keep_separator=True``)."""
+        start, end = span
+        if not separator:
+            return [(i, i + 1) for i in range(start, end)]
+        pieces: list[Span] = []
+        piece_start = start
+        position = text.find(separator, start, end)
+        while position != -1:
+            if position > piece_start:
+                pieces.append((piece_start, position))
+            piece_start = position
+            position = text.find(separator, position + len(separator), end)
+        if end > piece_start:
+            pieces.append((piece_start, end))
+        return pieces
+
+    def _merge(self, text: str, pieces: list[Span], length) -> list[Span]:
+        # Con keep_separator el separador de merge es "" (longitud 0) y las
+        # piezas son contiguas: unir = tomar el span desde la primera a la última
+        docs: list[Span] = []
+        current: list[Span] = []
+        current_lengths: list[int] = []
+        total = 0
+        for piece in pieces:
+            piece_len = length(piece)
+            if total + piece_len > self._chunk_size and current:
+                doc = self._strip(text, (current[0][0], current[-1][1]))
+                if doc is not None:
+                    docs.append(doc)
+                while total > self._chunk_overlap or (total + piece_len > self._chunk_size and total > 0):
+                    total -= current_lengths.pop(0)
+                    current.pop(0)
+            current.append(piece)
+            current_lengths.append(piece_len)
+            total += piece_len
+        if current:
+            doc = self._strip(text, (current[0][0], current[-1][1]))
+            if doc is not None:
+                docs.append(doc)
+        return docs
+
+    @staticmethod
+    def _strip(text: str, span: Span) -> Span | None:
+        start, end = span
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return (start, end) if end > start else None
@@ -1,10 +1,19 @@
 """Embedding services for the RAG pipeline."""
 
+from src.infrastructure.rag.embeddings.chunk_cache import ChunkEmbeddingCache, EmbeddingCacheStats
 from src.infrastructure.rag.embeddings.gemini_embeddings import GeminiEmbeddingService
 from src.infrastructure.rag.embeddings.normalization import normalize_l2, normalize_l2_batch
+from src.infrastructure.rag.embeddings.query_cache import QueryEmbeddingCache, QueryEmbeddingCacheStats
+from src.infrastructure.rag.embeddings.rate_limiter import AdaptiveRateLimiter, get_embedding_rate_limiter
 
 __all__ = [
+    "AdaptiveRateLimiter",
+    "ChunkEmbeddingCache",
+    "EmbeddingCacheStats",
     "GeminiEmbeddingService",
+    "QueryEmbeddingCache",
+    "QueryEmbeddingCacheStats",
+    "get_embedding_rate_limiter",
     "normalize_l2",
     "normalize_l2_batch",
 ]
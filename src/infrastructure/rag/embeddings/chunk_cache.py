@@ -0,0 +1,229 @@
+"""Content-addressed embedding cache for document chunks (Postgres, float16).
+
+``AdaptiveChunker`` is deterministic, so re-indexing a document whose text
+barely changed produces mostly the same chunks — and used to pay Gemini for
+every one of them again.  ``ChunkEmbeddingCache`` sits in front of
+``GeminiEmbeddingService.embed_documents``:
+
+* key = SHA-256 of ``(chunk text, model, dimensions, task type)`` — the
+  exact text, no normalization, so a hit is always the same API input;
+* value = the normalized vector as little-endian ``float16`` bytes (768-d →
+  1.5 KB), the same precision as the ``halfvec(768)`` column, so a hit
+  stores exactly what a fresh embedding would;
+* table ``embedding_cache`` in Postgres, shared by the API workers and every
+  Airflow worker.
+
+Only misses go to the API (de-duplicated within the call), and the stats of
+the last call feed ``IndexingResult.embedding_cache_hit_rate``.
+
+Two stores with the same async interface: ``PgEmbeddingCacheStore`` over an
+``AsyncSession`` (``IndexingService``) and ``PsycopgEmbeddingCacheStore`` over
+a sync psycopg connection (Airflow DAGs; blocking calls, fine inside a task's
+``asyncio.run``).  Cache failures are fail-open: logged, treated as misses.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Protocol
+
+import numpy as np
+from sqlalchemy import text
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Callable
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from src.infrastructure.rag.embeddings.gemini_embeddings import GeminiEmbeddingService
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_TASK_TYPE = "RETRIEVAL_DOCUMENT"
+
+
+def build_chunk_cache_key(chunk_text: str, *, model: str, dimensions: int, task_type: str) -> bytes:
+    """SHA-256 digest identifying one embedding request."""
+    payload = "\x1f".join((model, str(dimensions), task_type, chunk_text))
+    return hashlib.sha256(payload.encode("utf-8")).digest()
+
+
+def _encode(embedding: list[float]) -> bytes:
+    return np.asarray(embedding, dtype="<f2").tobytes()
+
+
+def _decode(data: bytes) -> list[float]:
+    result: list[float] = np.frombuffer(data, dtype="<f2").astype(np.float32).tolist()
+    return result
+
+
+class EmbeddingCacheStore(Protocol):
+    """Persistence for ``key -> float16 bytes``."""
+
+    async def get_many(self, keys: list[bytes]) -> dict[bytes, bytes]: ...
+
+    async def put_many(self, items: dict[bytes, bytes]) -> None: ...
+
+
+class PgEmbeddingCacheStore:
+    """``embedding_cache`` over an ``AsyncSession`` (joins the caller's transaction).
+
+    Each call runs in a SAVEPOINT so a cache error cannot abort the caller's
+    indexing transaction.  *lock* serializes the calls with other users of
+    the same session (the pipelined indexer's store stage).
+    """
+
+    def __init__(self, session: AsyncSession, *, lock: asyncio.Lock | None = None) -> None:
+        self._session = session
+        self._lock = lock
+
+    def _locked(self) -> contextlib.AbstractAsyncContextManager[Any]:
+        return self._lock if self._lock is not None else contextlib.nullcontext()
+
+    async def get_many(self, keys: list[bytes]) -> dict[bytes, bytes]:
+        async with self._locked(), self._session.begin_nested():
+            result = await self._session.execute(
+                text("SELECT key, embedding FROM embedding_cache WHERE key = ANY(:keys)"),
+                {"keys": keys},
+            )
+            return {bytes(row.key): bytes(row.embedding) for row in result.all()}
+
+    async def put_many(self, items: dict[bytes, bytes]) -> None:
+        async with self._locked(), self._session.begin_nested():
+            await self._session.execute(
+                text("""
+                    INSERT INTO embedding_cache (key, embedding)
+                    SELECT * FROM unnest(CAST(:keys AS bytea[]), CAST(:embeddings AS bytea[]))
+                    ON CONFLICT (key) DO NOTHING
+                """),
+                {"keys": list(items), "embeddings": list(items.values())},
+            )
+
+
+class PsycopgEmbeddingCacheStore:
+    """``embedding_cache`` over a sync psycopg connection (Airflow tasks).
+
+    Uses its own connection and commits each call, so the cache survives a
+    later failure of the task and a cache error never poisons the task's
+    transaction.
+    """
+
+    def __init__(self, conn: Any) -> None:
+        self._conn = conn
+
+    async def get_many(self, keys: list[bytes]) -> dict[bytes, bytes]:
+        try:
+            with self._conn.cursor() as cur:
+                cur.execute("SELECT key, embedding FROM embedding_cache WHERE key = ANY(%s)", (keys,))
+                rows = cur.fetchall()
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        return {bytes(key): bytes(embedding) for key, embedding in rows}
+
+    async def put_many(self, items: dict[bytes, bytes]) -> None:
+        try:
+            with self._conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO embedding_cache (key, embedding)
+                    SELECT * FROM unnest(%s::bytea[], %s::bytea[])
+                    ON CONFLICT (key) DO NOTHING
+                    """,
+                    (list(items), list(items.values())),
+                )
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Hits/misses of one ``embed_documents`` call (per chunk, not per unique text)."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ChunkEmbeddingCache:
+    """Cache-through wrapper for ``GeminiEmbeddingService.embed_documents``."""
+
+    def __init__(self, store: EmbeddingCacheStore, embedding_service: GeminiEmbeddingService) -> None:
+        self._store = store
+        self._embedding_service = embedding_service
+        self.last_stats = EmbeddingCacheStats()
+
+    def _key(self, chunk_text: str) -> bytes:
+        return build_chunk_cache_key(
+            chunk_text,
+            model=self._embedding_service.model,
+            dimensions=self._embedding_service.dimensions,
+            task_type=DOCUMENT_TASK_TYPE,
+        )
+
+    async def embed_documents(
+        self,
+        texts: list[str],
+        *,
+        on_progress: Callable[[int, int, int], None] | None = None,
+    ) -> list[list[float]]:
+        """Same contract as ``GeminiEmbeddingService.embed_documents``; only misses hit the API.
+
+        ``on_progress`` reports the batches of the misses only.
+        """
+        vectors, self.last_stats = await self.embed_documents_with_stats(texts, on_progress=on_progress)
+        return vectors
+
+    async def embed_documents_with_stats(
+        self,
+        texts: list[str],
+        *,
+        on_progress: Callable[[int, int, int], None] | None = None,
+    ) -> tuple[list[list[float]], EmbeddingCacheStats]:
+        """``embed_documents`` returning the stats of this call (safe for concurrent callers)."""
+        keys = [self._key(t) for t in texts]
+        unique_keys = list(dict.fromkeys(keys))
+
+        cached: dict[bytes, bytes] = {}
+        try:
+            cached = await self._store.get_many(unique_keys)
+        except Exception as exc:
+            logger.warning("embedding_cache_get_failed error=%s", exc)
+
+        vectors: dict[bytes, list[float]] = {key: _decode(data) for key, data in cached.items()}
+
+        miss_texts: dict[bytes, str] = {}
+        for key, chunk_text in zip(keys, texts, strict=True):
+            if key not in vectors:
+                miss_texts.setdefault(key, chunk_text)
+
+        if miss_texts:
+            fresh = await self._embedding_service.embed_documents(list(miss_texts.values()), on_progress=on_progress)
+            fresh_by_key = dict(zip(miss_texts, fresh, strict=True))
+            vectors.update(fresh_by_key)
+            try:
+                await self._store.put_many({key: _encode(vector) for key, vector in fresh_by_key.items()})
+            except Exception as exc:
+                logger.warning("embedding_cache_put_failed error=%s", exc)
+
+        hits = sum(1 for key in keys if key in cached)
+        stats = EmbeddingCacheStats(hits=hits, misses=len(keys) - hits)
+        logger.info(
+            "embedding_cache chunks=%d hits=%d api_texts=%d hit_rate=%.3f",
+            len(keys),
+            hits,
+            len(miss_texts),
+            stats.hit_rate,
+        )
+        return [vectors[key] for key in keys], stats
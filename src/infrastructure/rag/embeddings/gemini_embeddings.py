@@ -5,14 +5,22 @@ Supports dual task types (``RETRIEVAL_DOCUMENT`` for indexing,
 Matryoshka-truncated 768-d vectors.
 
 Batch embedding respects the safe limit of 100 texts per request to avoid
-the ordering bug documented in batch-embedding-caveats.md.
+the ordering bug documented in batch-embedding-caveats.md.  Batches run with
+bounded concurrency (``embedding_max_concurrency`` in flight) behind the
+process-wide ``AdaptiveRateLimiter`` (RPM/TPM buckets that back off on 429),
+and results are reassembled in input order.
+
+Query embeddings can be served from an optional ``QueryEmbeddingCache``
+(in-process LRU + Redis) so repeated questions skip the API call entirely.
 
 See: rag-indexing/references/gemini-embeddings.md
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from typing import TYPE_CHECKING
 
 from google import genai
@@ -24,16 +32,24 @@ from src.infrastructure.rag.embeddings.normalization import (
     normalize_l2,
     normalize_l2_batch,
 )
+from src.infrastructure.rag.embeddings.query_cache import build_cache_key
+from src.infrastructure.rag.embeddings.rate_limiter import AdaptiveRateLimiter, get_embedding_rate_limiter
 from src.shared.exceptions import ExternalServiceError
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+    from src.infrastructure.rag.embeddings.query_cache import QueryEmbeddingCache
+
 logger = logging.getLogger(__name__)
 
 # Safe batch limit — see rag-indexing/references/batch-embedding-caveats.md
 _MAX_BATCH_SIZE = 100
 
+# 429s are paced by the rate limiter and do not consume the tenacity budget,
+# but a quota that never recovers must still fail the batch eventually
+_MAX_RATE_LIMITED_ATTEMPTS = 8
+
 # Gemini native dimensionality (text-embedding-004 / gemini-embedding-001)
 _NATIVE_DIMENSIONS = 3072
 
@@ -49,6 +65,17 @@ class GeminiEmbeddingService:
         Embedding model name.  Defaults to ``settings.gemini_embedding_model``.
     dimensions:
         Output dimensionality (Matryoshka truncation).  Default ``768``.
+    query_cache:
+        Optional ``QueryEmbeddingCache`` consulted by ``embed_query`` before
+        calling the API.
+    max_concurrency:
+        Batches in flight in ``embed_documents``.  Defaults to
+        ``settings.embedding_max_concurrency``.
+    rate_limiter:
+        Defaults to the process-wide ``get_embedding_rate_limiter()``.
+    client:
+        Pre-built ``genai.Client`` (e.g. pointed at a local fake server for
+        benchmarks).  Skips credential resolution.
     """
 
     def __init__(
@@ -57,8 +84,14 @@ class GeminiEmbeddingService:
         api_key: str | None = None,
         model: str | None = None,
         dimensions: int = 768,
+        query_cache: QueryEmbeddingCache | None = None,
+        max_concurrency: int | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        client: genai.Client | None = None,
     ) -> None:
-        if settings.use_vertex_ai:
+        if client is not None:
+            self._client = client
+        elif settings.use_vertex_ai:
             import google.auth
 
             effective_quota = settings.gcp_quota_project_id or settings.gcp_project_id
@@ -75,6 +108,24 @@ class GeminiEmbeddingService:
         self._model = model or settings.gemini_embedding_model
         self._dimensions = dimensions
         self._needs_normalization = dimensions < _NATIVE_DIMENSIONS
+        self._query_cache = query_cache
+        self._max_concurrency = max(1, max_concurrency or settings.embedding_max_concurrency)
+        self._rate_limiter = rate_limiter or get_embedding_rate_limiter()
+
+    @property
+    def model(self) -> str:
+        """Embedding model name."""
+        return self._model
+
+    @property
+    def dimensions(self) -> int:
+        """Output dimensionality."""
+        return self._dimensions
+
+    @property
+    def query_cache(self) -> QueryEmbeddingCache | None:
+        """The query embedding cache, if one was configured."""
+        return self._query_cache
 
     # ------------------------------------------------------------------
     # Public API
@@ -93,8 +144,31 @@ class GeminiEmbeddingService:
         return embedding  # type: ignore[no-any-return]
 
     async def embed_query(self, text: str) -> list[float]:
-        """Embed a search query (uses ``RETRIEVAL_QUERY`` task type)."""
-        return await self.embed_text(text, task_type="RETRIEVAL_QUERY")
+        """Embed a search query (uses ``RETRIEVAL_QUERY`` task type).
+
+        When a query cache is configured, a hit returns the stored vector
+        without calling the API.
+        """
+        task_type = "RETRIEVAL_QUERY"
+        if self._query_cache is None:
+            return await self.embed_text(text, task_type=task_type)
+
+        key = build_cache_key(
+            text,
+            model=self._model,
+            dimensions=self._dimensions,
+            task_type=task_type,
+        )
+        cached = await self._query_cache.get(key)
+        if cached is not None:
+            logger.debug("query_embedding_cache_hit key=%s", key)
+            return cached
+
+        t0 = time.monotonic()
+        embedding = await self.embed_text(text, task_type=task_type)
+        self._query_cache.record_miss_compute((time.monotonic() - t0) * 1000)
+        await self._query_cache.set(key, embedding)
+        return embedding
 
     async def embed_documents(
         self,
@@ -104,12 +178,18 @@ class GeminiEmbeddingService:
     ) -> list[list[float]]:
         """Embed a list of document texts in safe batches of 100.
 
+        Up to ``max_concurrency`` batches are in flight at once, each paced by
+        the rate limiter; every batch is normalized as soon as it arrives so
+        the CPU work overlaps with the remaining API calls.
+
         Parameters
         ----------
         texts:
             Texts to embed (any length — split internally).
         on_progress:
-            Optional callback ``(batch_num, total_batches, total_embedded)``.
+            Optional callback ``(batches_done, total_batches, total_embedded)``,
+            called once per completed batch (completion order, so the counts
+            are monotonic even though batches finish out of order).
 
         Returns
         -------
@@ -119,12 +199,17 @@ class GeminiEmbeddingService:
         if not texts:
             return []
 
-        all_embeddings: list[list[float]] = []
         total_batches = (len(texts) + _MAX_BATCH_SIZE - 1) // _MAX_BATCH_SIZE
+        results: list[list[list[float]]] = [[] for _ in range(total_batches)]
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        batches_done = 0
+        total_embedded = 0
 
-        for batch_num, start in enumerate(range(0, len(texts), _MAX_BATCH_SIZE)):
+        async def _run(batch_num: int, start: int) -> None:
+            nonlocal batches_done, total_embedded
             batch = texts[start : start + _MAX_BATCH_SIZE]
-            batch_embeddings = await self._embed_batch_with_retry(batch)
+            async with semaphore:
+                batch_embeddings = await self._embed_batch_with_retry(batch)
 
             # Validate response count — catch silent ordering bug
             if len(batch_embeddings) != len(batch):
@@ -137,24 +222,37 @@ class GeminiEmbeddingService:
                     },
                 )
 
-            all_embeddings.extend(batch_embeddings)
+            if self._needs_normalization:
+                batch_embeddings = normalize_l2_batch(batch_embeddings)
+            results[batch_num] = batch_embeddings
 
+            batches_done += 1
+            total_embedded += len(batch)
             if on_progress:
-                on_progress(batch_num + 1, total_batches, len(all_embeddings))
+                on_progress(batches_done, total_batches, total_embedded)
 
             logger.info(
                 "batch_embedded batch=%d/%d chunks=%d total=%d",
                 batch_num + 1,
                 total_batches,
                 len(batch),
-                len(all_embeddings),
+                total_embedded,
             )
 
-        # Normalize the full batch at once (numpy vectorized)
-        if self._needs_normalization:
-            all_embeddings = normalize_l2_batch(all_embeddings)
+        tasks = [
+            asyncio.create_task(_run(batch_num, start))
+            for batch_num, start in enumerate(range(0, len(texts), _MAX_BATCH_SIZE))
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Un batch falló (o nos cancelaron): no dejar llamadas huérfanas
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
 
-        return all_embeddings
+        return [embedding for batch_embeddings in results for embedding in batch_embeddings]
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -199,26 +297,55 @@ class GeminiEmbeddingService:
         self,
         batch: list[str],
     ) -> list[list[float]]:
-        """Call the API for a batch with retry."""
-        try:
-            response = await self._client.aio.models.embed_content(
-                model=self._model,
-                contents=batch,  # type: ignore[arg-type]
-                config=types.EmbedContentConfig(
-                    task_type="RETRIEVAL_DOCUMENT",
-                    output_dimensionality=self._dimensions,
-                ),
-            )
+        """Call the API for a batch, paced by the rate limiter, with retry.
+
+        429s are absorbed here (the limiter backs off and the call is
+        repeated); other errors go through the tenacity retry.
+        """
+        estimated_tokens = sum(len(text) for text in batch) // 4 + 1
+        rate_limited_attempts = 0
+        while True:
+            await self._rate_limiter.acquire(estimated_tokens)
+            try:
+                response = await self._client.aio.models.embed_content(
+                    model=self._model,
+                    contents=batch,  # type: ignore[arg-type]
+                    config=types.EmbedContentConfig(
+                        task_type="RETRIEVAL_DOCUMENT",
+                        output_dimensionality=self._dimensions,
+                    ),
+                )
+            except Exception as exc:
+                if _is_rate_limited(exc) and rate_limited_attempts < _MAX_RATE_LIMITED_ATTEMPTS:
+                    rate_limited_attempts += 1
+                    self._rate_limiter.on_rate_limited(_retry_after_seconds(exc))
+                    continue
+                logger.error("embed_batch_error error=%s", exc)
+                raise ExternalServiceError(
+                    message=f"Gemini batch embedding failed: {exc}",
+                    details={"model": self._model, "batch_size": len(batch)},
+                ) from exc
+
+            self._rate_limiter.on_success()
             if not response.embeddings:
                 raise ExternalServiceError(
                     message="Gemini returned no embeddings for batch.",
                 )
             return [emb.values for emb in response.embeddings if emb.values]
-        except ExternalServiceError:
-            raise
-        except Exception as exc:
-            logger.error("embed_batch_error error=%s", exc)
-            raise ExternalServiceError(
-                message=f"Gemini batch embedding failed: {exc}",
-                details={"model": self._model, "batch_size": len(batch)},
-            ) from exc
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    """``True`` for quota errors (HTTP 429 / ``RESOURCE_EXHAUSTED``)."""
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    return code == 429 or "RESOURCE_EXHAUSTED" in str(exc)
+
+
+def _retry_after_seconds(exc: Exception) -> float | None:
+    """``Retry-After`` header of a 429 response, if the SDK exposes it."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after", ""))
+    except ValueError:
+        return None
@@ -0,0 +1,214 @@
+"""Two-tier cache for query embeddings (in-process LRU + Redis).
+
+Most chat traffic consists of near-identical questions ("¿cuántos días de
+vacaciones tengo?"), so ``embed_query`` keeps paying a full Gemini round-trip
+(100-300 ms) for vectors it has already computed.  This cache sits in front of
+``GeminiEmbeddingService.embed_query``:
+
+* **L1** — in-process ``OrderedDict`` LRU with per-entry TTL.
+* **L2** — optional Redis tier storing compact ``float16`` bytes (768-d →
+  1.5 KB instead of ~15 KB of JSON).  ``float16`` matches the precision of
+  the ``halfvec(768)`` column, so nothing is lost with respect to search.
+
+Cache keys are SHA-256 digests of the *normalized* query text plus model,
+dimensions and task type, so a model or dimensionality change never serves
+stale vectors.
+
+Redis failures are fail-open: the cache logs a warning and behaves as a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from redis.exceptions import RedisError
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "emb:q:"
+
+
+def normalize_query_text(text: str) -> str:
+    """Normalize a query for cache lookup.
+
+    Applies Unicode NFKC, case folding and whitespace collapsing so that
+    ``"¿Cuántos  días?"`` and ``"¿cuántos días?"`` share the same entry.
+    Accents are preserved — they can change meaning in Spanish.
+    """
+    normalized = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(normalized.split())
+
+
+def build_cache_key(text: str, *, model: str, dimensions: int, task_type: str) -> str:
+    """Build the cache key for a query embedding."""
+    payload = "\x1f".join((normalize_query_text(text), model, str(dimensions), task_type))
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{_KEY_PREFIX}{digest}"
+
+
+def encode_float16(embedding: list[float]) -> bytes:
+    """Serialize an embedding as little-endian ``float16`` bytes."""
+    return np.asarray(embedding, dtype="<f2").tobytes()
+
+
+def decode_float16(data: bytes) -> list[float]:
+    """Deserialize ``float16`` bytes back into a list of Python floats."""
+    result: list[float] = np.frombuffer(data, dtype="<f2").astype(np.float32).tolist()
+    return result
+
+
+@dataclass
+class QueryEmbeddingCacheStats:
+    """Hit/miss counters and cumulative lookup latency.
+
+    ``lookup_ms_total`` covers time spent inside the cache (L1 + L2), and
+    ``miss_compute_ms_total`` the time spent computing embeddings on a miss,
+    which is the latency a hit saves.
+    """
+
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    lookup_ms_total: float = 0.0
+    miss_compute_ms_total: float = 0.0
+
+    @property
+    def hits(self) -> int:
+        return self.l1_hits + self.l2_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hit_rate, 4),
+            "avg_lookup_ms": round(self.lookup_ms_total / lookups, 3) if lookups else 0.0,
+            "avg_miss_compute_ms": round(self.miss_compute_ms_total / self.misses, 3) if self.misses else 0.0,
+        }
+
+
+class QueryEmbeddingCache:
+    """In-process LRU with TTL, optionally backed by Redis.
+
+    Parameters
+    ----------
+    max_entries:
+        Maximum number of entries kept in the L1 LRU.
+    ttl_seconds:
+        Time-to-live for both tiers.
+    redis_client:
+        Optional Redis client for the L2 tier.  Must be created with
+        ``decode_responses=False`` since values are raw bytes.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 2048,
+        ttl_seconds: int = 3600,
+        redis_client: Redis | None = None,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._redis = redis_client
+        self._entries: OrderedDict[str, tuple[float, list[float]]] = OrderedDict()
+        self.stats = QueryEmbeddingCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> list[float] | None:
+        """Return the cached embedding for *key*, or ``None`` on miss."""
+        t0 = time.monotonic()
+        try:
+            embedding = self._get_l1(key)
+            if embedding is not None:
+                self.stats.l1_hits += 1
+                return embedding
+
+            embedding = await self._get_l2(key)
+            if embedding is not None:
+                self.stats.l2_hits += 1
+                self._set_l1(key, embedding)
+                return embedding
+
+            self.stats.misses += 1
+            return None
+        finally:
+            self.stats.lookup_ms_total += (time.monotonic() - t0) * 1000
+
+    async def set(self, key: str, embedding: list[float]) -> None:
+        """Store *embedding* under *key* in both tiers."""
+        self._set_l1(key, embedding)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(key, encode_float16(embedding), ex=self._ttl_seconds)
+        except RedisError as exc:
+            self.stats.errors += 1
+            logger.warning("query_embedding_cache_redis_set_failed error=%s", exc)
+
+    def record_miss_compute(self, elapsed_ms: float) -> None:
+        """Account the time spent computing an embedding after a miss."""
+        self.stats.miss_compute_ms_total += elapsed_ms
+
+    def clear(self) -> None:
+        """Drop every L1 entry (the Redis tier expires on its own)."""
+        self._entries.clear()
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _get_l1(self, key: str) -> list[float] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, embedding = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return embedding
+
+    def _set_l1(self, key: str, embedding: list[float]) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def _get_l2(self, key: str) -> list[float] | None:
+        if self._redis is None:
+            return None
+        try:
+            data = await self._redis.get(key)
+        except RedisError as exc:
+            self.stats.errors += 1
+            logger.warning("query_embedding_cache_redis_get_failed error=%s", exc)
+            return None
+        if data is None:
+            return None
+        if not isinstance(data, bytes):
+            # Cliente con decode_responses: tratar como miss (fail-open)
+            self.stats.errors += 1
+            logger.warning("query_embedding_cache_redis_value_not_bytes key=%s", key)
+            return None
+        return decode_float16(data)
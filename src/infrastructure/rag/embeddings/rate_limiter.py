@@ -0,0 +1,191 @@
+"""Client-side, 429-adaptive rate limiter for embedding API calls.
+
+``embed_documents`` runs several batches concurrently; without pacing, a
+reindex bursts past the project quota and spends most of its time in
+exponential backoff.  ``AdaptiveRateLimiter`` paces calls with two token
+buckets — requests per minute and (estimated) input tokens per minute — and
+adapts to the quota actually granted (AIMD):
+
+* a ``429`` / ``RESOURCE_EXHAUSTED`` halves the effective rate (at most once
+  per cooldown window, so a burst of concurrent 429s counts once) and pauses
+  all callers for ``Retry-After`` seconds (or ``cooldown_seconds``);
+* every success adds back ``recovery_step`` of the configured rate, up to
+  100 %.
+
+A limit of ``0`` disables that bucket (429 cooldowns still apply).  The
+limiter is process-wide (``get_embedding_rate_limiter``) because the quota
+is per project, not per ``GeminiEmbeddingService`` instance.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimiterStats:
+    """Counters for observability / benchmarks."""
+
+    acquired: int = 0
+    rate_limited: int = 0
+    wait_seconds_total: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "acquired": self.acquired,
+            "rate_limited": self.rate_limited,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+        }
+
+
+class AdaptiveRateLimiter:
+    """Token-bucket limiter (RPM + TPM) with multiplicative decrease on 429.
+
+    Parameters
+    ----------
+    requests_per_minute:
+        Request quota.  ``0`` = unlimited.
+    tokens_per_minute:
+        Input-token quota.  ``0`` = unlimited.
+    min_fraction:
+        Lower bound for the adaptive rate, as a fraction of the configured one.
+    recovery_step:
+        Fraction of the configured rate recovered per successful call.
+    cooldown_seconds:
+        Pause after a 429 without ``Retry-After``.
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        min_fraction: float = 0.1,
+        recovery_step: float = 0.05,
+        cooldown_seconds: float = 1.0,
+    ) -> None:
+        self._rpm = requests_per_minute
+        self._tpm = tokens_per_minute
+        self._min_fraction = min_fraction
+        self._recovery_step = recovery_step
+        self._cooldown_seconds = cooldown_seconds
+        self._fraction = 1.0
+        # Buckets start full: one second worth of quota as burst
+        self._requests = self._request_capacity
+        self._tokens = self._token_capacity
+        self._updated_at = time.monotonic()
+        self._cooldown_until = 0.0
+        self._last_decrease = float("-inf")
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+        self.stats = RateLimiterStats()
+
+    @property
+    def fraction(self) -> float:
+        """Current adaptive rate as a fraction of the configured quota."""
+        return self._fraction
+
+    @property
+    def _request_capacity(self) -> float:
+        return max(1.0, self._rpm / 60.0)
+
+    @property
+    def _token_capacity(self) -> float:
+        return max(1.0, self._tpm / 60.0)
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Los DAGs llaman asyncio.run() por documento: un lock por event loop
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        if self._rpm:
+            self._requests = min(self._request_capacity, self._requests + elapsed * self._rpm / 60.0 * self._fraction)
+        if self._tpm:
+            self._tokens = min(self._token_capacity, self._tokens + elapsed * self._tpm / 60.0 * self._fraction)
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until one request of *tokens* estimated input tokens fits the quota.
+
+        Waiters are served FIFO (the lock is held while sleeping).  A request
+        larger than the token bucket is admitted once the bucket is full and
+        drives it negative, which delays the following calls accordingly.
+        """
+        t0 = time.monotonic()
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._cooldown_until - now
+                if wait <= 0:
+                    wait = 0.0
+                    if self._rpm and self._requests < 1.0:
+                        wait = (1.0 - self._requests) / (self._rpm / 60.0 * self._fraction)
+                    if self._tpm:
+                        needed = min(float(tokens), self._token_capacity)
+                        if self._tokens < needed:
+                            wait = max(wait, (needed - self._tokens) / (self._tpm / 60.0 * self._fraction))
+                    if wait <= 0:
+                        if self._rpm:
+                            self._requests -= 1.0
+                        if self._tpm:
+                            self._tokens -= tokens
+                        break
+                await asyncio.sleep(wait)
+        self.stats.acquired += 1
+        self.stats.wait_seconds_total += time.monotonic() - t0
+
+    def on_success(self) -> None:
+        """Additive increase towards the configured quota."""
+        if self._fraction < 1.0:
+            self._fraction = min(1.0, self._fraction + self._recovery_step)
+
+    def on_rate_limited(self, retry_after: float | None = None) -> None:
+        """Multiplicative decrease and a shared cooldown after a 429."""
+        now = time.monotonic()
+        self.stats.rate_limited += 1
+        pause = retry_after if retry_after is not None and retry_after > 0 else self._cooldown_seconds
+        self._cooldown_until = max(self._cooldown_until, now + pause)
+        # Las 429 de batches concurrentes llegan juntas: reducir una vez por ventana
+        if now - self._last_decrease >= pause:
+            self._fraction = max(self._min_fraction, self._fraction * 0.5)
+            self._last_decrease = now
+            self._requests = min(self._requests, 0.0)
+            self._tokens = min(self._tokens, 0.0)
+        logger.warning(
+            "embedding_rate_limited retry_after=%.2f fraction=%.2f total=%d",
+            pause,
+            self._fraction,
+            self.stats.rate_limited,
+        )
+
+
+_rate_limiter: AdaptiveRateLimiter | None = None
+
+
+def get_embedding_rate_limiter() -> AdaptiveRateLimiter:
+    """Process-wide limiter built from ``settings.embedding_*_limit``."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = AdaptiveRateLimiter(
+            requests_per_minute=settings.embedding_rpm_limit,
+            tokens_per_minute=settings.embedding_tpm_limit,
+        )
+    return _rate_limiter
+
+
+def set_embedding_rate_limiter(limiter: AdaptiveRateLimiter | None) -> None:
+    global _rate_limiter
+    _rate_limiter = limiter
@@ -1,7 +1,7 @@
 from .base import DocumentLoader
 from .docx_loader import DOCXLoader
 from .factory import LoaderFactory
-from .models import LoadedDocument
+from .models import LoadedDocument, LoadedPage
 from .pdf_loader import PDFLoader
 from .validator import AllowedFileType, FileValidationError, FileValidator
 
@@ -12,6 +12,7 @@ __all__ = [
     "FileValidationError",
     "FileValidator",
     "LoadedDocument",
+    "LoadedPage",
     "LoaderFactory",
     "PDFLoader",
 ]
@@ -10,10 +10,12 @@ from src.infrastructure.rag.loaders.pdf_loader import PDFLoader
 from src.infrastructure.rag.loaders.validator import FileValidator
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
+    from typing import Any
 
     from src.infrastructure.rag.loaders.base import DocumentLoader
-    from src.infrastructure.rag.loaders.models import LoadedDocument
+    from src.infrastructure.rag.loaders.models import LoadedDocument, LoadedPage
 
 logger = logging.getLogger(__name__)
 
@@ -76,3 +78,17 @@ class LoaderFactory:
         )
 
         return loader.load(file_path)
+
+    def stream_pages(self, file_path: Path) -> tuple[dict[str, Any], Iterator[LoadedPage]] | None:
+        """Validate the file and, if its loader streams pages, return ``(metadata, pages)``.
+
+        Only ``PDFLoader`` streams (see ``PDFLoader.iter_pages``); for other
+        types ``None`` is returned and the caller falls back to ``load``.
+        """
+        mime_type = self._validator.validate(file_path)
+        if _MIME_TO_LOADER.get(mime_type) is not PDFLoader:
+            return None
+
+        loader = PDFLoader()
+        logger.info("streaming_document file=%s mime=%s", file_path.name, mime_type)
+        return loader.load_metadata(file_path), loader.iter_pages(file_path)
@@ -11,3 +11,12 @@ class LoadedDocument:
     pages: int
     tables_count: int = 0
     extra_info: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class LoadedPage:
+    """Una página de un documento, tal como la produce un loader en streaming."""
+
+    page_number: int
+    text: str
+    tables_count: int = 0
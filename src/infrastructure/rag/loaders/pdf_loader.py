@@ -1,49 +1,140 @@
+"""Cargador de PDFs con PyMuPDF, en streaming por página.
+
+``iter_pages`` produce un ``LoadedPage`` por página (``page_number`` desde 1)
+sin acumular el documento: la memoria de un PDF de 1.000 páginas queda
+acotada a una página (más la ventana del chunker, ver
+``AdaptiveChunker.chunk_pages``).  ``iter_pages_parallel`` reparte rangos de
+páginas entre procesos y los devuelve en orden.
+
+Las tablas se extraen de forma perezosa: ``find_tables()`` (estrategia
+``lines``, la default) solo encuentra tablas delimitadas por trazos
+vectoriales, así que se invoca únicamente en páginas con al menos
+``_MIN_TABLE_EDGES`` segmentos/rectángulos dibujados.  Las tablas se
+convierten con ``Table.to_markdown()`` sin pasar por pandas.
+
+``load`` mantiene el contrato de ``DocumentLoader`` (texto completo) y deja
+en ``extra_info["page_starts"]`` el offset de inicio de cada página, que el
+chunker usa para asignar ``page_number`` a cada chunk.
+"""
+
 import logging
+import multiprocessing
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 
 import fitz
 
 from .base import DocumentLoader
-from .models import LoadedDocument
+from .models import LoadedDocument, LoadedPage
 
 logger = logging.getLogger(__name__)
 
+# Segmentos dibujados (un rectángulo cuenta 4) necesarios para intentar find_tables
+_MIN_TABLE_EDGES = 4
+# Páginas por tarea en iter_pages_parallel
+_PAGES_PER_TASK = 32
+
+
+def _may_contain_tables(page: fitz.Page) -> bool:
+    """Heurística barata: ¿hay suficientes trazos vectoriales para formar una tabla?"""
+    edges = 0
+    for path in page.get_drawings():
+        for item in path["items"]:
+            kind = item[0]
+            if kind == "l":
+                edges += 1
+            elif kind in ("re", "qu"):
+                edges += 4
+            if edges >= _MIN_TABLE_EDGES:
+                return True
+    return False
+
+
+def _extract_page(page: fitz.Page) -> LoadedPage:
+    parts = [page.get_text()]
+    tables_count = 0
+    if _may_contain_tables(page):
+        try:
+            tabs = page.find_tables()
+            tables_count = len(tabs.tables)
+            for table in tabs.tables:
+                parts.append("\n[TABLA]\n" + table.to_markdown() + "\n[/TABLA]\n")
+        except Exception as exc:
+            logger.warning("table_extraction_failed page=%s error=%s", page.number, str(exc))
+    return LoadedPage(page_number=page.number + 1, text="\n".join(parts), tables_count=tables_count)
+
+
+def _load_page_range(file_path: str, start: int, stop: int) -> list[LoadedPage]:
+    """Extrae las páginas ``[start, stop)`` (corre en un worker de iter_pages_parallel)."""
+    with fitz.open(file_path) as doc:
+        return [_extract_page(doc[i]) for i in range(start, min(stop, len(doc)))]
+
 
 class PDFLoader(DocumentLoader):
     """Cargador de documentos PDF usando PyMuPDF."""
 
     def load(self, file_path: Path) -> LoadedDocument:
         """Extrae texto, metadata y tablas de un PDF."""
-        doc = None
         try:
-            doc = fitz.open(str(file_path))
-            full_text = []
+            full_text: list[str] = []
+            page_starts: list[tuple[int, int]] = []
+            offset = 0
             tables_count = 0
 
-            for page in doc:
-                full_text.append(page.get_text())
+            for page in self.iter_pages(file_path):
+                page_starts.append((offset, page.page_number))
+                full_text.append(page.text)
+                offset += len(page.text) + 1  # separador "\n"
+                tables_count += page.tables_count
 
-                try:
-                    tabs = page.find_tables()
-                    if tabs and tabs.tables:
-                        tables_count += len(tabs.tables)
-                        for table in tabs.tables:
-                            df = table.to_pandas()
-                            full_text.append("\n[TABLA]\n" + df.to_markdown(index=False) + "\n[/TABLA]\n")
-                except Exception as exc:
-                    logger.warning("table_extraction_failed page=%s error=%s", page.number, str(exc))
-
-            metadata = self._extract_metadata(doc, file_path)
+            with fitz.open(str(file_path)) as doc:
+                metadata = self._extract_metadata(doc, file_path)
 
             return LoadedDocument(
-                text="\n".join(full_text), metadata=metadata, pages=len(doc), tables_count=tables_count
+                text="\n".join(full_text),
+                metadata=metadata,
+                pages=len(page_starts),
+                tables_count=tables_count,
+                extra_info={"page_starts": page_starts},
             )
         except Exception as e:
             raise Exception(f"Error cargando PDF {file_path}: {e}") from e
-        finally:
-            if doc:
-                doc.close()
+
+    def iter_pages(self, file_path: Path, *, start: int = 0, stop: int | None = None) -> Iterator[LoadedPage]:
+        """Produce las páginas ``[start, stop)`` de a una (índices desde 0)."""
+        with fitz.open(str(file_path)) as doc:
+            for index in range(start, min(stop if stop is not None else len(doc), len(doc))):
+                yield _extract_page(doc[index])
+
+    def iter_pages_parallel(self, file_path: Path, *, max_workers: int) -> Iterator[LoadedPage]:
+        """Como ``iter_pages`` pero repartiendo rangos de páginas entre procesos.
+
+        Mantiene a lo sumo ``2 * max_workers`` rangos en vuelo y devuelve las
+        páginas en orden.  Con ``max_workers <= 1`` o PDFs de un solo rango
+        equivale a ``iter_pages``.
+        """
+        with fitz.open(str(file_path)) as doc:
+            page_count = len(doc)
+        if max_workers <= 1 or page_count <= _PAGES_PER_TASK:
+            yield from self.iter_pages(file_path)
+            return
+
+        starts = deque(range(0, page_count, _PAGES_PER_TASK))
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            in_flight: deque[Future[list[LoadedPage]]] = deque()
+            while starts or in_flight:
+                while starts and len(in_flight) < 2 * max_workers:
+                    start = starts.popleft()
+                    in_flight.append(pool.submit(_load_page_range, str(file_path), start, start + _PAGES_PER_TASK))
+                yield from in_flight.popleft().result()
+
+    def load_metadata(self, file_path: Path) -> dict[str, Any]:
+        """Metadata del PDF sin extraer texto (para el camino en streaming)."""
+        with fitz.open(str(file_path)) as doc:
+            return self._extract_metadata(doc, file_path)
 
     def _extract_metadata(self, doc: fitz.Document, file_path: Path) -> dict[str, Any]:
         info = doc.metadata or {}
@@ -0,0 +1,225 @@
+"""Ensamblado de contexto con presupuesto de tokens.
+
+``assemble_context_node`` concatenaba cada chunk rerankeado tal cual: el
+prompt crecía con ``CHUNK_SIZE`` x ``RERANKER_TOP_K`` y además repetía el
+overlap (~15 %) entre chunks consecutivos del mismo documento.
+``ContextPacker`` arma el contexto en tres pasos:
+
+1. **Merge** — chunks del mismo documento con ``chunk_index`` consecutivos
+   forman un solo bloque (una sola citación ``[N]``); el texto repetido entre
+   el final de uno y el inicio del siguiente se elimina.
+2. **Orden** — los bloques quedan en el orden del reranker (posición del
+   mejor chunk de cada bloque).
+3. **Presupuesto** — se agregan bloques mientras entren en ``token_budget``
+   (medido sobre el texto formateado, con citación y fuente).  El primero
+   que no entra se trunca si le quedan al menos ``min_block_tokens``; el
+   resto (los de menor score) se descartan.
+
+``PackedContext`` reporta tokens antes (concatenación literal) y después.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.infrastructure.llm.tokens import count_tokens, truncate_to_tokens
+
+# Overlap mínimo (caracteres) para considerar que dos chunks se solapan
+_MIN_OVERLAP_CHARS = 32
+# Máximo de caracteres del final de un chunk donde buscar el overlap
+_MAX_OVERLAP_CHARS = 8_000
+
+
+def format_context_block(index: int, content: str, document_name: str, page: Any) -> str:
+    """Formato de un bloque de contexto con su citación (igual al de ``assemble_context_node``)."""
+    return f"[{index}] {content}\n(Fuente: {document_name}, p.{page})"
+
+
+def strip_overlap(previous: str, current: str) -> tuple[str, int]:
+    """Quita de *current* el prefijo que repite el final de *previous*.
+
+    Retorna ``(current sin el overlap, caracteres quitados)``.
+    """
+    head = current[:_MIN_OVERLAP_CHARS]
+    if len(head) < _MIN_OVERLAP_CHARS:
+        return current, 0
+    tail = previous[-_MAX_OVERLAP_CHARS:]
+    start = tail.find(head)
+    while start != -1:
+        overlap = len(tail) - start
+        if current.startswith(tail[start:]):
+            return current[overlap:].lstrip(), overlap
+        start = tail.find(head, start + 1)
+    return current, 0
+
+
+@dataclass
+class ContextBlock:
+    """Uno o más chunks consecutivos de un documento, citados como una fuente."""
+
+    document_id: Any
+    document_name: str
+    page: Any
+    rank: int
+    score: float
+    chunk_ids: list[str] = field(default_factory=list)
+    parts: list[str] = field(default_factory=list)
+    truncated: bool = False
+
+    @property
+    def content(self) -> str:
+        return "\n".join(self.parts)
+
+
+@dataclass
+class PackedContext:
+    """Contexto final y métricas del empaquetado."""
+
+    context_text: str
+    sources: list[dict]
+    tokens_before: int
+    tokens_after: int
+    chunks_in: int = 0
+    chunks_merged: int = 0
+    chunks_dropped: int = 0
+    blocks_truncated: int = 0
+    overlap_chars_removed: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "chunks_in": self.chunks_in,
+            "blocks": len(self.sources),
+            "chunks_merged": self.chunks_merged,
+            "chunks_dropped": self.chunks_dropped,
+            "blocks_truncated": self.blocks_truncated,
+            "overlap_chars_removed": self.overlap_chars_removed,
+        }
+
+
+class ContextPacker:
+    """Arma ``context_text`` y ``sources`` dentro de un presupuesto de tokens.
+
+    Parameters
+    ----------
+    token_budget:
+        Tokens máximos del contexto formateado (``0`` = sin límite).
+    min_block_tokens:
+        Contenido mínimo para incluir un bloque truncado; por debajo se
+        descarta.
+    merge_adjacent:
+        Unir chunks consecutivos del mismo documento.
+    """
+
+    def __init__(self, *, token_budget: int = 5000, min_block_tokens: int = 64, merge_adjacent: bool = True) -> None:
+        self._token_budget = token_budget
+        self._min_block_tokens = min_block_tokens
+        self._merge_adjacent = merge_adjacent
+
+    def pack(self, chunks: list[dict]) -> PackedContext:
+        """Empaqueta *chunks* (orden del reranker, mejor primero)."""
+        tokens_before = sum(
+            count_tokens(
+                format_context_block(
+                    i,
+                    c.get("content", ""),
+                    c.get("document_name", "Documento desconocido"),
+                    c.get("page", "N/A"),
+                )
+            )
+            for i, c in enumerate(chunks, 1)
+        )
+        blocks, overlap_removed = self._build_blocks(chunks)
+
+        sources: list[dict] = []
+        parts: list[str] = []
+        used = 0
+        dropped = 0
+        truncated = 0
+        separator_tokens = count_tokens("\n\n")
+        for block in blocks:
+            index = len(sources) + 1
+            formatted = format_context_block(index, block.content, block.document_name, block.page)
+            cost = count_tokens(formatted) + (separator_tokens if parts else 0)
+            if self._token_budget and used + cost > self._token_budget:
+                overhead = cost - count_tokens(block.content)
+                room = self._token_budget - used - overhead
+                if room < self._min_block_tokens:
+                    dropped += len(block.chunk_ids)
+                    continue
+                content = truncate_to_tokens(block.content, room)
+                block.parts = [content]
+                block.truncated = True
+                truncated += 1
+                formatted = format_context_block(index, content, block.document_name, block.page)
+                cost = count_tokens(formatted) + (separator_tokens if parts else 0)
+            parts.append(formatted)
+            used += cost
+            sources.append(
+                {
+                    "index": index,
+                    "document_id": block.document_id,
+                    "document_name": block.document_name,
+                    "page": block.page,
+                    "chunk_text": block.content,
+                }
+            )
+
+        return PackedContext(
+            context_text="\n\n".join(parts),
+            sources=sources,
+            tokens_before=tokens_before,
+            tokens_after=used,
+            chunks_in=len(chunks),
+            chunks_merged=sum(len(b.chunk_ids) for b in blocks) - len(blocks),
+            chunks_dropped=dropped,
+            blocks_truncated=truncated,
+            overlap_chars_removed=overlap_removed,
+        )
+
+    def _build_blocks(self, chunks: list[dict]) -> tuple[list[ContextBlock], int]:
+        """Agrupa chunks consecutivos por documento y los ordena por rank."""
+        ranked = list(enumerate(chunks))
+        if self._merge_adjacent:
+            # Por documento y chunk_index para detectar vecinos; el rank original se conserva
+            ranked.sort(key=lambda rc: (str(rc[1].get("document_id")), rc[1].get("chunk_index", -1), rc[0]))
+
+        blocks: list[ContextBlock] = []
+        overlap_removed = 0
+        previous: dict | None = None
+        for rank, chunk in ranked:
+            content = chunk.get("content", "")
+            block = blocks[-1] if blocks else None
+            if (
+                self._merge_adjacent
+                and block is not None
+                and previous is not None
+                and chunk.get("chunk_index") is not None
+                and previous.get("document_id") == chunk.get("document_id")
+                and previous.get("chunk_index") is not None
+                and chunk["chunk_index"] == previous["chunk_index"] + 1
+            ):
+                content, removed = strip_overlap(previous.get("content", ""), content)
+                overlap_removed += removed
+                block.parts.append(content)
+                block.chunk_ids.append(str(chunk.get("id", "")))
+                block.rank = min(block.rank, rank)
+                block.score = max(block.score, float(chunk.get("score", 0.0)))
+            else:
+                blocks.append(
+                    ContextBlock(
+                        document_id=chunk.get("document_id"),
+                        document_name=chunk.get("document_name", "Documento desconocido"),
+                        page=chunk.get("page", "N/A"),
+                        rank=rank,
+                        score=float(chunk.get("score", 0.0)),
+                        chunk_ids=[str(chunk.get("id", ""))],
+                        parts=[content],
+                    )
+                )
+            previous = chunk
+
+        blocks.sort(key=lambda b: b.rank)
+        return blocks, overlap_removed
@@ -0,0 +1,192 @@
+"""Reranker local en CPU con un cross-encoder ONNX (sin llamadas de red).
+
+``GeminiReranker`` es una llamada completa a un LLM (1-3 s) y
+``VertexAIReranker`` depende de un servicio de GCP; ambos agregan segundos de
+cola y, ante fallos, el circuit breaker vuelve al orden RRF.  Este backend
+puntúa los pares (query, chunk) en el mismo proceso:
+
+* **Modelo** — un cross-encoder multilingüe pequeño exportado a ONNX,
+  idealmente cuantizado a int8 (p. ej. ``mmarco-mMiniLMv2-L12-H384-v1``,
+  ~120 MB en int8).  El directorio ``RERANKER_LOCAL_MODEL_PATH`` debe tener
+  ``model.onnx`` (o ``model_quantized.onnx``) y el ``tokenizer.json`` de
+  Hugging Face.
+* **Batching** — los pares se tokenizan con truncado ``only_second`` (la
+  query nunca se corta) y se puntúan de a ``batch_size`` con padding al más
+  largo del batch.
+* **Concurrencia** — la inferencia corre en un ``ThreadPoolExecutor``
+  propio (ONNX Runtime libera el GIL), fuera del event loop; los threads
+  internos de ONNX se limitan con ``intra_op_threads``.
+
+El score es ``sigmoid(logit)`` en ``[0, 1]`` y queda en ``StoredChunk.score``,
+igual que con los otros backends.
+
+Dependencias opcionales (extra ``rerank-local``): ``onnxruntime`` y
+``tokenizers``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from src.shared.exceptions import ExternalServiceError
+
+if TYPE_CHECKING:
+    from src.infrastructure.rag.retrieval.models import StoredChunk
+
+logger = logging.getLogger(__name__)
+
+_MODEL_FILES = ("model_quantized.onnx", "model_int8.onnx", "model.onnx")
+
+
+def _relevance_logits(logits: np.ndarray) -> np.ndarray:
+    """Logit de relevancia por par: el único logit, o ``l1 - l0`` con dos clases.
+
+    Con dos clases ``softmax([l0, l1])[1] == sigmoid(l1 - l0)``; tomar solo
+    ``l1`` ignoraría ``l0`` y no daría una probabilidad.
+    """
+    if logits.shape[-1] == 1:
+        return logits[:, 0]
+    if logits.shape[-1] == 2:
+        margin: np.ndarray = logits[:, 1] - logits[:, 0]
+        return margin
+    raise ExternalServiceError(
+        message="Salida del cross-encoder no soportada: se esperaban 1 o 2 logits por par",
+        details={"logits_per_pair": int(logits.shape[-1])},
+    )
+
+
+class LocalCrossEncoderReranker:
+    """Cross-encoder ONNX en CPU con scoring por batches.
+
+    Parameters
+    ----------
+    model_path:
+        Directorio con el modelo ONNX y ``tokenizer.json``.
+    max_length:
+        Tokens máximos por par (query + chunk).
+    batch_size:
+        Pares por inferencia.
+    intra_op_threads:
+        Threads de ONNX Runtime por inferencia (``0`` = automático).
+    workers:
+        Inferencias concurrentes (threads del executor).
+    """
+
+    def __init__(
+        self,
+        model_path: str | Path,
+        *,
+        max_length: int = 512,
+        batch_size: int = 16,
+        intra_op_threads: int = 0,
+        workers: int = 1,
+    ) -> None:
+        self._model_path = Path(model_path)
+        self._max_length = max_length
+        self._batch_size = batch_size
+        self._intra_op_threads = intra_op_threads
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cross_encoder")
+        self._load_lock = threading.Lock()
+        self._session: Any | None = None
+        self._tokenizer: Any | None = None
+        self._input_names: set[str] = set()
+
+    @property
+    def model(self) -> str:
+        """Identificador del modelo (parte de la key de ``RerankCache``)."""
+        return f"local:{self._model_path.name}"
+
+    # ------------------------------------------------------------------
+    # Interfaz pública
+    # ------------------------------------------------------------------
+
+    async def rerank(self, query: str, chunks: list[StoredChunk], top_k: int = 5) -> list[StoredChunk]:
+        """Reordena por score del cross-encoder (orden original si la inferencia falla)."""
+        reranked = await self.try_rerank(query, chunks, top_k)
+        return chunks[:top_k] if reranked is None else reranked
+
+    async def try_rerank(self, query: str, chunks: list[StoredChunk], top_k: int = 5) -> list[StoredChunk] | None:
+        """Como ``rerank`` pero retorna ``None`` si la inferencia falla."""
+        if not chunks:
+            return []
+        loop = asyncio.get_running_loop()
+        try:
+            scores = await loop.run_in_executor(self._executor, self.score, query, [c.content for c in chunks])
+        except Exception:
+            logger.exception("cross_encoder_rerank_failed model=%s chunks=%d", self.model, len(chunks))
+            return None
+        for chunk, score in zip(chunks, scores, strict=True):
+            chunk.score = float(score)
+        return sorted(chunks, key=lambda c: c.score, reverse=True)[:top_k]
+
+    def score(self, query: str, texts: list[str]) -> np.ndarray:
+        """Scores ``[0, 1]`` de cada par (query, text), en el orden de *texts* (bloqueante)."""
+        session, tokenizer = self._load()
+        scores = np.empty(len(texts), dtype=np.float32)
+        for start in range(0, len(texts), self._batch_size):
+            batch = texts[start : start + self._batch_size]
+            encodings = tokenizer.encode_batch([(query, text) for text in batch])
+            feeds = {
+                "input_ids": np.asarray([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": np.asarray([e.attention_mask for e in encodings], dtype=np.int64),
+            }
+            if "token_type_ids" in self._input_names:
+                feeds["token_type_ids"] = np.asarray([e.type_ids for e in encodings], dtype=np.int64)
+            logits = np.asarray(session.run(None, feeds)[0], dtype=np.float32).reshape(len(batch), -1)
+            scores[start : start + len(batch)] = _relevance_logits(logits)
+        return 1.0 / (1.0 + np.exp(-scores))
+
+    def warmup(self) -> None:
+        """Carga el modelo y corre una inferencia (evita pagar la carga en el primer request)."""
+        self.score("warmup", ["warmup"])
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Carga lazy
+    # ------------------------------------------------------------------
+
+    def _load(self) -> tuple[Any, Any]:
+        if self._session is not None:
+            return self._session, self._tokenizer
+        with self._load_lock:
+            if self._session is None:
+                try:
+                    import onnxruntime as ort
+                    from tokenizers import Tokenizer
+                except ImportError as exc:  # pragma: no cover
+                    raise ExternalServiceError(
+                        message="onnxruntime/tokenizers no instalados. Instala: pip install '.[rerank-local]'",
+                        details={"import_error": str(exc)},
+                    ) from exc
+
+                model_file = next((self._model_path / f for f in _MODEL_FILES if (self._model_path / f).exists()), None)
+                if model_file is None:
+                    raise ExternalServiceError(
+                        message="Modelo ONNX del cross-encoder no encontrado",
+                        details={"model_path": str(self._model_path), "expected": list(_MODEL_FILES)},
+                    )
+
+                tokenizer = Tokenizer.from_file(str(self._model_path / "tokenizer.json"))
+                tokenizer.enable_truncation(max_length=self._max_length, strategy="only_second")
+                tokenizer.enable_padding()
+
+                options = ort.SessionOptions()
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                if self._intra_op_threads:
+                    options.intra_op_num_threads = self._intra_op_threads
+                session = ort.InferenceSession(str(model_file), options, providers=["CPUExecutionProvider"])
+
+                self._input_names = {i.name for i in session.get_inputs()}
+                self._tokenizer = tokenizer
+                self._session = session
+                logger.info("cross_encoder_loaded model=%s file=%s", self.model, model_file.name)
+        return self._session, self._tokenizer
@@ -34,8 +34,18 @@ class GeminiReranker:
             self._client = genai.Client(api_key=resolved_key)
         self._model = model or settings.gemini_model_flash
 
+    @property
+    def model(self) -> str:
+        """Modelo de Gemini usado para rerankear (parte de la key de ``RerankCache``)."""
+        return self._model
+
     async def rerank(self, query: str, chunks: list[StoredChunk], top_k: int = 5) -> list[StoredChunk]:
-        """Re-ordena los chunks usando Gemini."""
+        """Re-ordena los chunks usando Gemini (orden original si Gemini falla)."""
+        reranked = await self.try_rerank(query, chunks, top_k)
+        return chunks[:top_k] if reranked is None else reranked
+
+    async def try_rerank(self, query: str, chunks: list[StoredChunk], top_k: int = 5) -> list[StoredChunk] | None:
+        """Como ``rerank`` pero retorna ``None`` si Gemini falla (para no cachear el fallback)."""
         if not chunks:
             return []
 
@@ -103,5 +113,4 @@ Solo devuelve el JSON, nada de texto extra.
 
         except Exception as e:
             logger.error(f"Error en Gemini Reranker: {e}")
-            # Fallback al orden original si falla la IA
-            return chunks[:top_k]
+            return None
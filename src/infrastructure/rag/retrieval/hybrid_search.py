@@ -15,6 +15,11 @@ Ver:
     - rag-retrieval/SKILL.md sección "Búsqueda Híbrida con RRF"
     - rag-retrieval/references/pgvector-store.md
 
+Vector leg intercambiable: con ``vector_backend="in_process"`` la búsqueda
+vectorial la resuelve ``InProcessVectorIndex`` (matriz float16 en RAM) y solo
+los ids ganadores se hidratan desde Postgres; BM25 sigue en Postgres y la
+fusión RRF se hace en Python.
+
 Out of scope (spec T4-S2-01):
     - Reranking Vertex AI (T4-S2-02)
     - Cache semántico Redis (post-MVP)
@@ -34,11 +39,13 @@ from src.infrastructure.rag.retrieval.models import (
     RetrievalMetrics,
     StoredChunk,
 )
+from src.infrastructure.rag.vector_store.ann_index import get_vector_index
 
 if TYPE_CHECKING:
     from src.infrastructure.rag.embeddings.gemini_embeddings import (
         GeminiEmbeddingService,
     )
+    from src.infrastructure.rag.vector_store.ann_index import InProcessVectorIndex
     from src.infrastructure.rag.vector_store.pgvector_store import PgVectorStore
 
 logger = logging.getLogger(__name__)
@@ -70,6 +77,11 @@ class HybridSearchConfig:
         que ejecuta ambas búsquedas en un solo round-trip.
         Si ``False``, ejecuta búsquedas separadas y aplica RRF en Python
         (útil para testing o entornos sin la función SQL instalada).
+    vector_backend:
+        ``"pgvector"`` (default, HNSW en Postgres) o ``"in_process"``
+        (``InProcessVectorIndex``).  Con ``"in_process"`` se usa siempre la
+        estrategia de RRF en Python; si el índice no está cargado se cae al
+        camino pgvector.
     """
 
     vector_k: int = 30
@@ -77,6 +89,7 @@ class HybridSearchConfig:
     rrf_k: int = 60
     top_k: int = 20
     use_sql_function: bool = True
+    vector_backend: str = "pgvector"
 
     @classmethod
     def from_settings(cls) -> HybridSearchConfig:
@@ -86,6 +99,7 @@ class HybridSearchConfig:
         return cls(
             rrf_k=settings.retrieval_rrf_k,
             top_k=settings.retrieval_top_k,
+            vector_backend=settings.retrieval_vector_backend,
         )
 
 
@@ -106,6 +120,9 @@ class HybridSearchService:
     config:
         Configuración opcional.  Si se omite usa ``HybridSearchConfig()``
         con valores por defecto.
+    vector_index:
+        Índice en proceso para ``vector_backend="in_process"``.  Si se omite
+        se usa el del proceso (``get_vector_index()``), cargado en el lifespan.
 
     Example
     -------
@@ -121,10 +138,12 @@ class HybridSearchService:
         embedding_service: GeminiEmbeddingService,
         vector_store: PgVectorStore,
         config: HybridSearchConfig | None = None,
+        vector_index: InProcessVectorIndex | None = None,
     ) -> None:
         self._embedding_service = embedding_service
         self._vector_store = vector_store
         self._config = config or HybridSearchConfig()
+        self._vector_index = vector_index if vector_index is not None else get_vector_index()
 
     async def search(
         self,
@@ -135,6 +154,7 @@ class HybridSearchService:
         rrf_k: int | None = None,
         vector_weight: float = 1.0,
         bm25_weight: float = 1.0,
+        query_embedding: list[float] | None = None,
     ) -> tuple[list[StoredChunk], RetrievalMetrics]:
         """Ejecuta la búsqueda híbrida y retorna los chunks más relevantes.
 
@@ -157,6 +177,9 @@ class HybridSearchService:
             Peso para scores del ranking vectorial en RRF (default 1.0).
         bm25_weight:
             Peso para scores del ranking BM25 en RRF (default 1.0).
+        query_embedding:
+            Embedding ya calculado de *query* (p. ej. por el prefetch
+            especulativo); si se omite se llama a ``embed_query``.
 
         Returns
         -------
@@ -175,11 +198,13 @@ class HybridSearchService:
         t_total_start = time.monotonic()
 
         # 1. Embedding de la query (RETRIEVAL_QUERY)
-        t0 = time.monotonic()
-        query_embedding = await self._embedding_service.embed_query(query)
-        metrics.embedding_ms = (time.monotonic() - t0) * 1000
+        if query_embedding is None:
+            t0 = time.monotonic()
+            query_embedding = await self._embedding_service.embed_query(query)
+            metrics.embedding_ms = (time.monotonic() - t0) * 1000
 
-        if self._config.use_sql_function:
+        use_index = self._use_in_process_index()
+        if self._config.use_sql_function and not use_index:
             chunks, search_ms = await self._search_via_sql(
                 query_embedding=query_embedding,
                 query_text=query,
@@ -198,6 +223,7 @@ class HybridSearchService:
                 rrf_k=effective_rrf_k,
                 vector_weight=vector_weight,
                 bm25_weight=bm25_weight,
+                use_index=use_index,
             )
             metrics.vector_search_ms = v_ms
             metrics.bm25_search_ms = b_ms
@@ -206,13 +232,22 @@ class HybridSearchService:
         metrics.total_ms = (time.monotonic() - t_total_start) * 1000
 
         logger.info(
-            "hybrid_search_done query=%r chunks=%d total_ms=%.1f",
+            "hybrid_search_done query=%r chunks=%d vector_backend=%s total_ms=%.1f",
             query,
             len(chunks),
+            "in_process" if use_index else "pgvector",
             metrics.total_ms,
         )
         return chunks, metrics
 
+    def _use_in_process_index(self) -> bool:
+        if self._config.vector_backend != "in_process":
+            return False
+        if self._vector_index is None or not self._vector_index.ready:
+            logger.warning("hybrid_search_vector_index_unavailable fallback=pgvector")
+            return False
+        return True
+
     # ------------------------------------------------------------------
     # Estrategia A: función SQL hybrid_search (single round-trip)
     # ------------------------------------------------------------------
@@ -251,28 +286,54 @@ class HybridSearchService:
         rrf_k: int,
         vector_weight: float,
         bm25_weight: float,
+        use_index: bool = False,
     ) -> tuple[list[StoredChunk], float, float, float]:
-        """Ejecuta vector + BM25 en paralelo y aplica RRF en Python."""
-        # Lanzar ambas búsquedas en paralelo
-        t_vec = time.monotonic()
+        """Ejecuta vector + BM25 en paralelo y aplica RRF en Python.
 
-        vector_rows, bm25_rows = await asyncio.gather(
-            self._vector_store.similarity_search(
+        Con ``use_index`` el vector leg sale del índice en proceso (CPU) y
+        solo se hidratan sus ids; BM25 va después por la misma sesión.
+        """
+        if use_index and self._vector_index is not None:
+            t_vec = time.monotonic()
+            scored_ids = self._vector_index.search(
                 query_embedding,
                 k=self._config.vector_k,
                 accessible_doc_ids=accessible_doc_ids,
-            ),
-            self._vector_store.bm25_search(
+            )
+            vector_rows = await self._vector_store.fetch_chunks_by_ids(
+                scored_ids,
+                accessible_doc_ids=accessible_doc_ids,
+            )
+            vector_ms = (time.monotonic() - t_vec) * 1000
+
+            t_bm25 = time.monotonic()
+            bm25_rows = await self._vector_store.bm25_search(
                 query_text,
                 k=self._config.bm25_k,
                 accessible_doc_ids=accessible_doc_ids,
-            ),
-        )
+            )
+            bm25_ms = (time.monotonic() - t_bm25) * 1000
+        else:
+            # Lanzar ambas búsquedas en paralelo
+            t_vec = time.monotonic()
+
+            vector_rows, bm25_rows = await asyncio.gather(
+                self._vector_store.similarity_search(
+                    query_embedding,
+                    k=self._config.vector_k,
+                    accessible_doc_ids=accessible_doc_ids,
+                ),
+                self._vector_store.bm25_search(
+                    query_text,
+                    k=self._config.bm25_k,
+                    accessible_doc_ids=accessible_doc_ids,
+                ),
+            )
 
-        # Estimamos latencias por separado (gather las solapa)
-        parallel_ms = (time.monotonic() - t_vec) * 1000
-        vector_ms = parallel_ms
-        bm25_ms = parallel_ms
+            # Estimamos latencias por separado (gather las solapa)
+            parallel_ms = (time.monotonic() - t_vec) * 1000
+            vector_ms = parallel_ms
+            bm25_ms = parallel_ms
 
         vector_chunks = [StoredChunk.from_row(r) for r in vector_rows]
         bm25_chunks = [StoredChunk.from_row(r) for r in bm25_rows]
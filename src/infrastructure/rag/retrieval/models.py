@@ -72,6 +72,19 @@ class StoredChunk:
             page_number=(row.get("metadata") or {}).get("page_number"),
         )
 
+    def to_row(self) -> dict:
+        """Inversa de ``from_row``: mismo shape que ``PgVectorStore.hybrid_search``."""
+        return {
+            "id": self.id,
+            "document_id": self.document_id,
+            "chunk_index": self.chunk_index,
+            "content": self.content,
+            "area": self.area,
+            "metadata": self.metadata,
+            "document_name": self.document_name,
+            "score": self.score,
+        }
+
 
 @dataclass
 class RetrievalMetrics:
@@ -0,0 +1,89 @@
+"""Interfaz común de rerankers y selección del backend por settings.
+
+Backends (``RERANKER_BACKEND``):
+
+* ``gemini`` — ``GeminiReranker``: LLM Flash con salida JSON (default).
+* ``vertex`` — ``VertexAIReranker``: Discovery Engine Ranking API, con
+  circuit breaker y fallback RRF.
+* ``local``  — ``LocalCrossEncoderReranker``: cross-encoder ONNX en CPU,
+  sin red (``RERANKER_LOCAL_MODEL_PATH``).
+
+Todos escriben su score en ``StoredChunk.score`` y exponen ``try_rerank``
+(``None`` si el backend falla) para que ``rerank_node`` aplique el fallback
+sin cachearlo.  Los scores no están en la misma escala: ``score_thresholds``
+da los umbrales de ``score_gate`` que corresponden a cada backend.
+"""
+
+from __future__ import annotations
+
+from enum import StrEnum
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from src.infrastructure.rag.retrieval.models import StoredChunk
+
+
+class RerankerBackend(StrEnum):
+    """Backends de reranking disponibles."""
+
+    GEMINI = "gemini"
+    VERTEX = "vertex"
+    LOCAL = "local"
+
+
+class Reranker(Protocol):
+    """Contrato de los rerankers usados por ``rerank_node``."""
+
+    @property
+    def model(self) -> str: ...
+
+    async def rerank(self, query: str, chunks: list[StoredChunk], top_k: int = 5) -> list[StoredChunk]: ...
+
+    async def try_rerank(self, query: str, chunks: list[StoredChunk], top_k: int = 5) -> list[StoredChunk] | None: ...
+
+
+def score_thresholds(backend: str | None = None) -> tuple[float, float]:
+    """Umbrales ``(bajo, alto)`` de ``score_gate`` para *backend* (default ``settings.reranker_backend``).
+
+    ``gemini`` y ``vertex`` usan ``similarity_threshold`` / ``reranking_threshold``
+    (calibración T6-S6-01); ``local`` usa ``reranker_local_min_threshold`` /
+    ``reranker_local_threshold``, calibrados sobre el sigmoid del cross-encoder.
+    """
+    from src.config.settings import settings
+
+    if RerankerBackend(backend or settings.reranker_backend) is RerankerBackend.LOCAL:
+        return settings.reranker_local_min_threshold, settings.reranker_local_threshold
+    return settings.similarity_threshold, settings.reranking_threshold
+
+
+def create_reranker(backend: str | None = None) -> Reranker:
+    """Instancia el reranker de *backend* (default ``settings.reranker_backend``).
+
+    Raises
+    ------
+    ValueError
+        Si el backend no existe o ``local`` no tiene ``reranker_local_model_path``.
+    """
+    from src.config.settings import settings
+
+    selected = RerankerBackend(backend or settings.reranker_backend)
+    if selected is RerankerBackend.GEMINI:
+        from src.infrastructure.rag.retrieval.gemini_reranker import GeminiReranker
+
+        return GeminiReranker()
+    if selected is RerankerBackend.VERTEX:
+        from src.infrastructure.rag.retrieval.reranker import VertexAIReranker
+
+        return VertexAIReranker(project_id=settings.gcp_project_id)
+
+    from src.infrastructure.rag.retrieval.cross_encoder import LocalCrossEncoderReranker
+
+    if not settings.reranker_local_model_path:
+        raise ValueError("reranker_local_model_path is required when reranker_backend='local'")
+    return LocalCrossEncoderReranker(
+        settings.reranker_local_model_path,
+        max_length=settings.reranker_local_max_length,
+        batch_size=settings.reranker_local_batch_size,
+        intra_op_threads=settings.reranker_local_threads,
+        workers=settings.reranker_local_workers,
+    )
@@ -0,0 +1,217 @@
+"""Two-tier cache of rerank results (in-process LRU + Redis).
+
+``rerank_node`` sends up to 20 chunk texts to Gemini Flash on every turn
+(1-3 s), even when the same question recently produced the same candidate
+set.  The ranking is a pure function of the query, the candidates and the
+reranker model, so it can be reused:
+
+* **Key** — SHA-256 of the *normalized* query text (``normalize_query_text``),
+  the candidate fingerprint (ordered chunk ids + ``document_chunks.version``,
+  see ``chunk_versions.source_fingerprint``), ``top_k`` and the reranker model.  Editing or
+  re-indexing a candidate changes the key.
+* **Value** — the ordered ``(chunk_id, score)`` pairs returned by the
+  reranker; ``apply_cached_ranking`` rebuilds the ``StoredChunk`` list from
+  the current candidates.
+* **L1** — ``OrderedDict`` LRU with TTL; **L2** — optional Redis (JSON).
+
+Only successful rerankings are stored (the reranker's fallback to the input
+order is not).  Redis failures are fail-open.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from redis.exceptions import RedisError
+
+from src.infrastructure.rag.embeddings.query_cache import normalize_query_text
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+    from src.infrastructure.rag.retrieval.models import StoredChunk
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "rerank:"
+
+Ranking = list[tuple[str, float]]
+
+
+def build_rerank_key(query: str, candidates_fingerprint: str, *, top_k: int, model: str) -> str:
+    """Build the cache key for one rerank call."""
+    payload = "\x1f".join((normalize_query_text(query), candidates_fingerprint, str(top_k), model))
+    return f"{_KEY_PREFIX}{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def apply_cached_ranking(chunks: list[StoredChunk], ranking: Ranking) -> list[StoredChunk] | None:
+    """Order *chunks* as *ranking* and set their scores.
+
+    Returns ``None`` if a ranked id is not among the candidates (the entry
+    does not belong to this candidate set).
+    """
+    by_id = {str(chunk.id): chunk for chunk in chunks}
+    result: list[StoredChunk] = []
+    for chunk_id, score in ranking:
+        chunk = by_id.get(chunk_id)
+        if chunk is None:
+            return None
+        chunk.score = score
+        result.append(chunk)
+    return result
+
+
+@dataclass
+class RerankCacheStats:
+    """Hit/miss counters and latency of the rerank cache.
+
+    ``miss_compute_ms_total`` is the time spent reranking on misses; a hit
+    saves on average ``miss_compute_ms_total / misses`` minus its lookup.
+    """
+
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    lookup_ms_total: float = 0.0
+    miss_compute_ms_total: float = 0.0
+
+    @property
+    def hits(self) -> int:
+        return self.l1_hits + self.l2_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def saved_ms_estimate(self) -> float:
+        """Latencia de rerank evitada por los hits (promedio de los misses)."""
+        if not self.misses:
+            return 0.0
+        lookups = self.hits + self.misses
+        avg_lookup = self.lookup_ms_total / lookups
+        return max(self.hits * (self.miss_compute_ms_total / self.misses - avg_lookup), 0.0)
+
+    def to_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hit_rate, 4),
+            "avg_lookup_ms": round(self.lookup_ms_total / lookups, 3) if lookups else 0.0,
+            "avg_miss_compute_ms": round(self.miss_compute_ms_total / self.misses, 3) if self.misses else 0.0,
+            "saved_ms": round(self.saved_ms_estimate, 1),
+        }
+
+
+class RerankCache:
+    """In-process LRU with TTL, optionally backed by Redis.
+
+    Parameters
+    ----------
+    max_entries:
+        Maximum number of entries kept in the L1 LRU.
+    ttl_seconds:
+        Time-to-live for both tiers.
+    redis_client:
+        Optional Redis client for the L2 tier.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        ttl_seconds: int = 3600,
+        redis_client: Redis | None = None,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._redis = redis_client
+        self._entries: OrderedDict[str, tuple[float, Ranking]] = OrderedDict()
+        self.stats = RerankCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Ranking | None:
+        """Return the cached ranking for *key*, or ``None`` on miss."""
+        t0 = time.monotonic()
+        try:
+            ranking = self._get_l1(key)
+            if ranking is not None:
+                self.stats.l1_hits += 1
+                return ranking
+
+            ranking = await self._get_l2(key)
+            if ranking is not None:
+                self.stats.l2_hits += 1
+                self._set_l1(key, ranking)
+                return ranking
+
+            self.stats.misses += 1
+            return None
+        finally:
+            self.stats.lookup_ms_total += (time.monotonic() - t0) * 1000
+
+    async def set(self, key: str, ranking: Ranking) -> None:
+        """Store *ranking* under *key* in both tiers."""
+        self._set_l1(key, ranking)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(key, json.dumps(ranking), ex=self._ttl_seconds)
+        except RedisError as exc:
+            self.stats.errors += 1
+            logger.warning("rerank_cache_redis_set_failed error=%s", exc)
+
+    def record_miss_compute(self, elapsed_ms: float) -> None:
+        """Account the time spent reranking after a miss."""
+        self.stats.miss_compute_ms_total += elapsed_ms
+
+    def clear(self) -> None:
+        """Drop every L1 entry (the Redis tier expires on its own)."""
+        self._entries.clear()
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _get_l1(self, key: str) -> Ranking | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, ranking = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return ranking
+
+    def _set_l1(self, key: str, ranking: Ranking) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, ranking)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def _get_l2(self, key: str) -> Ranking | None:
+        if self._redis is None:
+            return None
+        try:
+            data = await self._redis.get(key)
+        except RedisError as exc:
+            self.stats.errors += 1
+            logger.warning("rerank_cache_redis_get_failed error=%s", exc)
+            return None
+        if data is None:
+            return None
+        return [(chunk_id, float(score)) for chunk_id, score in json.loads(data)]
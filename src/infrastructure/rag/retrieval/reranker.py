@@ -190,6 +190,11 @@ class VertexAIReranker:
                 ) from exc
         return self._client
 
+    @property
+    def model(self) -> str:
+        """Modelo de ranking (parte de la key de ``RerankCache``)."""
+        return self._model
+
     # ------------------------------------------------------------------
     # Interfaz pública
     # ------------------------------------------------------------------
@@ -240,6 +245,30 @@ class VertexAIReranker:
             },
         )
 
+        reranked = await self.try_rerank(query, input_chunks, effective_top_k)
+        if reranked is not None:
+            return reranked
+        result = self._fallback_rrf(input_chunks, effective_top_k)
+        self._log_post_scores(result, source="rrf_fallback")
+        return result
+
+    async def try_rerank(
+        self,
+        query: str,
+        chunks: list[StoredChunk],
+        top_k: int | None = None,
+    ) -> list[StoredChunk] | None:
+        """Como ``rerank`` pero retorna ``None`` en lugar de aplicar el fallback RRF.
+
+        ``None`` si el circuit breaker está abierto o Vertex AI falla (el
+        caller decide el fallback y no cachea el resultado).
+        """
+        if not chunks:
+            return []
+
+        effective_top_k = top_k if top_k is not None else self._top_k
+        input_chunks = chunks[:MAX_RANKING_RECORDS]
+
         if self._circuit.is_open:
             logger.warning(
                 "vertex_circuit_open_fallback",
@@ -248,9 +277,7 @@ class VertexAIReranker:
                     "chunks_count": len(input_chunks),
                 },
             )
-            result = self._fallback_rrf(input_chunks, effective_top_k)
-            self._log_post_scores(result, source="rrf_fallback")
-            return result
+            return None
 
         try:
             reranked = await self._vertex_rerank_with_retry(query, input_chunks, effective_top_k)
@@ -267,9 +294,7 @@ class VertexAIReranker:
                     "chunks_count": len(input_chunks),
                 },
             )
-            result = self._fallback_rrf(input_chunks, effective_top_k)
-            self._log_post_scores(result, source="rrf_fallback")
-            return result
+            return None
 
     # ------------------------------------------------------------------
     # Retry + llamada a Vertex AI
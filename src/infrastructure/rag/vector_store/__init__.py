@@ -1,7 +1,10 @@
 """Vector store for document chunk embeddings."""
 
+from src.infrastructure.rag.vector_store.ann_index import InProcessVectorIndex, get_vector_index
 from src.infrastructure.rag.vector_store.pgvector_store import PgVectorStore
 
 __all__ = [
+    "InProcessVectorIndex",
     "PgVectorStore",
+    "get_vector_index",
 ]
@@ -0,0 +1,203 @@
+"""Selectivity-based strategy choice for permission-filtered vector search.
+
+HNSW in pgvector filters *after* the graph walk: with a restrictive ACL most
+of the ``ef_search`` candidates are discarded and the query returns fewer
+than ``k`` rows (recall collapses), while a huge ``ANY(:doc_ids)`` array adds
+a linear probe per candidate.  ``plan_acl_search`` estimates how many chunks
+the user can actually see and picks one of:
+
+* ``exact_scan`` — tiny ACLs (``<= retrieval_acl_exact_max_chunks`` chunks):
+  distances are computed over the accessible chunks only (btree on
+  ``document_id``), no HNSW.  Exact and cheap.
+* ``iterative_hnsw`` — everything else on pgvector >= 0.8: HNSW with
+  ``hnsw.iterative_scan = relaxed_order`` keeps walking the graph until
+  ``k`` rows pass the filter (bounded by ``hnsw.max_scan_tuples``).
+* ``hnsw_post_filter`` — pgvector < 0.8: plain HNSW with ``ef_search``
+  raised in proportion to the inverse selectivity.
+* ``unfiltered`` — no ACL (``accessible_doc_ids is None``, tests/dev only).
+
+Per-document chunk counts come from ``ChunkCountCache`` (refreshed every few
+minutes) as sorted numpy arrays, so the estimate is one vectorized
+intersection of the user's ``DocIdSet`` with the active documents.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+import numpy as np
+from sqlalchemy import text
+
+from src.infrastructure.security.doc_id_set import DocIdSet
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Primera versión de pgvector con hnsw.iterative_scan
+_ITERATIVE_SCAN_MIN_VERSION = (0, 8, 0)
+# Tope de ef_search para hnsw_post_filter (límite de pgvector: 1000)
+_MAX_EF_SEARCH = 1000
+
+
+class AclSearchStrategy(StrEnum):
+    """Estrategias de búsqueda vectorial con filtro de permisos."""
+
+    UNFILTERED = "unfiltered"
+    EXACT_SCAN = "exact_scan"
+    ITERATIVE_HNSW = "iterative_hnsw"
+    HNSW_POST_FILTER = "hnsw_post_filter"
+
+
+@dataclass(frozen=True, slots=True)
+class AclSearchPlan:
+    """Estrategia elegida y los números que la justifican."""
+
+    strategy: AclSearchStrategy
+    accessible_docs: int = 0
+    active_docs: int = 0
+    accessible_chunks: int = 0
+    total_chunks: int = 0
+    ef_search: int | None = None
+    acl_cache_hit: bool = False
+
+    @property
+    def selectivity(self) -> float:
+        """Fracción del corpus visible para el usuario (1.0 = todo)."""
+        if self.strategy == AclSearchStrategy.UNFILTERED or not self.total_chunks:
+            return 1.0
+        return self.accessible_chunks / self.total_chunks
+
+    def to_dict(self) -> dict:
+        return {
+            "strategy": str(self.strategy),
+            "accessible_docs": self.accessible_docs,
+            "active_docs": self.active_docs,
+            "accessible_chunks": self.accessible_chunks,
+            "total_chunks": self.total_chunks,
+            "selectivity": round(self.selectivity, 6),
+            "ef_search": self.ef_search,
+            "acl_cache_hit": self.acl_cache_hit,
+        }
+
+
+class ChunkCountCache:
+    """Chunks por documento activo (canónicos y referencias de dedup), cacheados con TTL.
+
+    Se guardan como dos arrays alineados (``document_id`` ordenado y su
+    cantidad de chunks) para intersectar con un ``DocIdSet`` sin bucles.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._doc_ids = np.empty(0, dtype=np.int64)
+        self._counts = np.empty(0, dtype=np.int64)
+        self._total = 0
+        self._loaded_at: float | None = None
+        self._iterative_scan: bool | None = None
+
+    async def _refresh_if_stale(self, session: AsyncSession) -> None:
+        now = time.monotonic()
+        if self._loaded_at is not None and now - self._loaded_at <= self._ttl_seconds:
+            return
+        result = await session.execute(
+            text("""
+                SELECT dc.document_id, count(*) AS chunk_count
+                FROM document_chunks dc
+                JOIN documents d ON d.id = dc.document_id
+                WHERE d.is_active = true
+                GROUP BY dc.document_id
+                ORDER BY dc.document_id
+            """)
+        )
+        rows = result.all()
+        self._doc_ids = np.fromiter((row.document_id for row in rows), dtype=np.int64, count=len(rows))
+        self._counts = np.fromiter((row.chunk_count for row in rows), dtype=np.int64, count=len(rows))
+        self._total = int(self._counts.sum())
+        self._loaded_at = now
+
+    async def estimate(self, session: AsyncSession, accessible_doc_ids: DocIdSet) -> tuple[int, int, int]:
+        """Retorna ``(documentos activos accesibles, chunks accesibles, total de chunks)``."""
+        await self._refresh_if_stale(session)
+        _, _, positions = np.intersect1d(
+            accessible_doc_ids.to_numpy(), self._doc_ids, assume_unique=True, return_indices=True
+        )
+        return int(positions.shape[0]), int(self._counts[positions].sum()), self._total
+
+    async def supports_iterative_scan(self, session: AsyncSession) -> bool:
+        """``True`` si la extensión ``vector`` instalada soporta ``hnsw.iterative_scan``."""
+        if self._iterative_scan is None:
+            result = await session.execute(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'"))
+            version = result.scalar() or "0"
+            parts = tuple(int(p) for p in version.split(".")[:3] if p.isdigit())
+            self._iterative_scan = parts >= _ITERATIVE_SCAN_MIN_VERSION
+        return self._iterative_scan
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+
+_chunk_counts = ChunkCountCache()
+
+
+def get_chunk_count_cache() -> ChunkCountCache:
+    return _chunk_counts
+
+
+def choose_strategy(
+    accessible_chunks: int,
+    *,
+    exact_max_chunks: int,
+    iterative_supported: bool,
+) -> AclSearchStrategy:
+    """Decide la estrategia a partir del número de chunks accesibles."""
+    if accessible_chunks <= exact_max_chunks:
+        return AclSearchStrategy.EXACT_SCAN
+    if iterative_supported:
+        return AclSearchStrategy.ITERATIVE_HNSW
+    return AclSearchStrategy.HNSW_POST_FILTER
+
+
+async def plan_acl_search(
+    session: AsyncSession,
+    accessible_doc_ids: Sequence[int] | None,
+    *,
+    k: int,
+    base_ef_search: int,
+    exact_max_chunks: int,
+) -> AclSearchPlan:
+    """Estima la selectividad del ACL y elige la estrategia."""
+    if accessible_doc_ids is None:
+        return AclSearchPlan(strategy=AclSearchStrategy.UNFILTERED)
+
+    acl = DocIdSet.from_iterable(accessible_doc_ids)
+    cache = get_chunk_count_cache()
+    active_docs, accessible_chunks, total = await cache.estimate(session, acl)
+    strategy = choose_strategy(
+        accessible_chunks,
+        exact_max_chunks=exact_max_chunks,
+        iterative_supported=await cache.supports_iterative_scan(session),
+    )
+
+    ef_search = None
+    if strategy == AclSearchStrategy.HNSW_POST_FILTER and accessible_chunks:
+        # Candidatos esperados tras el filtro ≈ ef_search * selectividad >= k
+        needed = math.ceil(k * total / accessible_chunks)
+        ef_search = min(max(base_ef_search, needed), _MAX_EF_SEARCH)
+
+    return AclSearchPlan(
+        strategy=strategy,
+        accessible_docs=len(acl),
+        active_docs=active_docs,
+        accessible_chunks=accessible_chunks,
+        total_chunks=total,
+        ef_search=ef_search,
+    )
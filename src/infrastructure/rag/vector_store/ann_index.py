@@ -0,0 +1,526 @@
+"""In-process ANN index over ``document_chunks`` for hot-corpus retrieval.
+
+The corpus (~200k chunks of ``halfvec(768)``) fits comfortably in RAM as a
+``float16`` matrix (~300 MB), so the vector leg of hybrid search can be served
+without a Postgres round-trip through HNSW:
+
+* **Storage** — one growable ``float16`` matrix of L2-normalized embeddings,
+  plus per-row chunk id, document ordinal, IVF list and a liveness flag.
+  Deleting a document tombstones its rows; the matrix is compacted once dead
+  rows exceed ``compact_ratio``.
+* **Search** — cosine similarity (dot product of normalized vectors, same
+  score as ``1 - (a <=> b)`` in pgvector).  Below ``ivf_min_rows`` the search
+  is exact (brute force, scored in ``float32`` blocks).  Above it a spherical
+  k-means IVF is trained and only the ``nprobe`` closest lists are scanned.
+* **Permissions** — ``accessible_doc_ids`` is applied as a boolean bitmask
+  over document ordinals, gathered per row (O(N) vectorized, no Python loop).
+  When the mask leaves few rows the search goes exact over those rows, which
+  is both cheaper and loses no recall for very selective ACLs.
+* **Dedup** — only canonical rows carry an embedding (one row per distinct
+  text, see ``pgvector_store``).  A document that repeats a text elsewhere
+  grants access to that canonical row (``_shared_rows``), so the ACL mask
+  matches what Postgres returns.  A canonical row whose owning document is
+  inactive is still loaded while an active document references it, under a
+  pseudo-document that no ACL lists: it is only reachable through the
+  references.
+* **Freshness** — ``refresh()`` compares a per-document fingerprint
+  ``(chunk count, max(version), max(created_at))`` of active documents with
+  the loaded one and reloads only documents that changed.  ``run_refresh_loop``
+  polls it every ``ann_index_refresh_seconds`` from the API lifespan.
+
+Search returns ``(chunk_id, score)`` pairs; callers hydrate the rows they need
+with ``PgVectorStore.fetch_chunks_by_ids`` (a primary-key lookup).
+
+Enabled with ``ANN_INDEX_ENABLED``; ``HybridSearchService`` selects it as its
+vector leg with ``RETRIEVAL_VECTOR_BACKEND=in_process``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from sqlalchemy import text
+
+from src.infrastructure.database.vector_codec import to_float_array
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import Sequence
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Rows scored per block in exact search (bounds the float32 temporary to ~100 MB)
+_SCORE_BLOCK_ROWS = 32_768
+# Documents fetched per query while (re)loading embeddings
+_LOAD_BATCH_DOCUMENTS = 200
+# k-means training sample per list and iterations
+_KMEANS_SAMPLE_PER_LIST = 64
+_KMEANS_ITERATIONS = 10
+
+_FINGERPRINT_SQL = text("""
+    SELECT dc.document_id,
+           count(*)            AS chunk_count,
+           count(dc.embedding) AS embedded_count,
+           max(dc.version)     AS version,
+           max(dc.created_at) AS created_at
+    FROM document_chunks dc
+    JOIN documents d ON d.id = dc.document_id
+    WHERE d.is_active = true
+    GROUP BY dc.document_id
+""")
+
+_LOAD_SQL = text("""
+    SELECT dc.id, dc.document_id, dc.embedding
+    FROM document_chunks dc
+    WHERE dc.document_id = ANY(:doc_ids)
+      AND dc.embedding IS NOT NULL
+    ORDER BY dc.document_id, dc.chunk_index
+""")
+
+# Referencias de dedup: documento activo -> fila canónica de su texto
+_SHARED_REFS_SQL = text("""
+    SELECT r.document_id, c.id AS canonical_id
+    FROM document_chunks r
+    JOIN documents d ON d.id = r.document_id AND d.is_active = true
+    JOIN document_chunks c ON c.content_hash = r.content_hash AND c.is_canonical
+    WHERE NOT r.is_canonical
+      AND c.document_id <> r.document_id
+""")
+
+# Filas canónicas de documentos inactivos que algún documento activo referencia
+_ORPHAN_CANONICAL_SQL = text("""
+    SELECT c.id, CAST(:orphan_doc_id AS integer) AS document_id, c.embedding
+    FROM document_chunks c
+    JOIN documents o ON o.id = c.document_id AND o.is_active = false
+    WHERE c.is_canonical
+      AND c.embedding IS NOT NULL
+      AND EXISTS (
+          SELECT 1
+          FROM document_chunks r
+          JOIN documents d ON d.id = r.document_id AND d.is_active = true
+          WHERE r.content_hash = c.content_hash AND NOT r.is_canonical
+      )
+""")
+# Pseudo-documento de esas filas: ningún ``accessible_doc_ids`` lo incluye
+_ORPHAN_DOC_ID = -1
+
+
+@dataclass
+class VectorIndexStats:
+    """Contadores del índice en proceso."""
+
+    searches: int = 0
+    exact_searches: int = 0
+    ivf_searches: int = 0
+    refreshes: int = 0
+    documents_reloaded: int = 0
+    last_refresh_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "searches": self.searches,
+            "exact_searches": self.exact_searches,
+            "ivf_searches": self.ivf_searches,
+            "refreshes": self.refreshes,
+            "documents_reloaded": self.documents_reloaded,
+            "last_refresh_ms": round(self.last_refresh_ms, 1),
+        }
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    normalized: np.ndarray = vectors / norms
+    return normalized
+
+
+def _train_spherical_kmeans(sample: np.ndarray, nlist: int, seed: int = 0) -> np.ndarray:
+    """Spherical k-means (cosine) over *sample*; returns normalized centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(sample.shape[0], size=nlist, replace=False)].copy()
+    for _ in range(_KMEANS_ITERATIONS):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        counts = np.bincount(assignment, minlength=nlist)
+        empty = counts == 0
+        # Listas vacías: re-sembrar con puntos aleatorios
+        if empty.any():
+            sums[empty] = sample[rng.choice(sample.shape[0], size=int(empty.sum()), replace=False)]
+        centroids = _normalize_rows(sums)
+    return centroids.astype(np.float32)
+
+
+class InProcessVectorIndex:
+    """Índice vectorial en memoria (``float16`` + IVF opcional) con filtro ACL.
+
+    Parameters
+    ----------
+    dimensions:
+        Dimensión de los embeddings (768 para ``halfvec(768)``).
+    ivf_min_rows:
+        Filas vivas a partir de las cuales se entrena el IVF.  Por debajo la
+        búsqueda es siempre exacta.
+    nlist:
+        Número de listas IVF.  ``0`` = automático (``4 * sqrt(N)``).
+    nprobe:
+        Listas escaneadas por consulta.
+    exact_max_rows:
+        Si el filtro de permisos deja como máximo estas filas, la búsqueda es
+        exacta sobre ellas aunque haya IVF.
+    compact_ratio:
+        Fracción de filas muertas que dispara la compactación de la matriz.
+    """
+
+    def __init__(
+        self,
+        *,
+        dimensions: int = 768,
+        ivf_min_rows: int = 50_000,
+        nlist: int = 0,
+        nprobe: int = 32,
+        exact_max_rows: int = 8_192,
+        compact_ratio: float = 0.2,
+    ) -> None:
+        self._dim = dimensions
+        self._ivf_min_rows = ivf_min_rows
+        self._nlist = nlist
+        self._nprobe = nprobe
+        self._exact_max_rows = exact_max_rows
+        self._compact_ratio = compact_ratio
+
+        self._size = 0
+        self._matrix = np.empty((0, dimensions), dtype=np.float16)
+        self._row_doc_ord = np.empty(0, dtype=np.int32)
+        self._row_cluster = np.empty(0, dtype=np.int32)
+        self._row_alive = np.empty(0, dtype=bool)
+        self._row_chunk_ids: list[uuid.UUID | None] = []
+
+        self._doc_ord: dict[int, int] = {}
+        self._doc_rows: dict[int, np.ndarray] = {}
+        self._doc_fingerprints: dict[int, tuple] = {}
+        # document_id -> ids / filas canónicas que el documento referencia
+        self._shared_refs: dict[int, list[uuid.UUID]] = {}
+        self._shared_rows: dict[int, np.ndarray] = {}
+
+        self._centroids: np.ndarray | None = None
+        self._trained_rows = 0
+        self._refresh_lock = asyncio.Lock()
+        self._ready = False
+        self.stats = VectorIndexStats()
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    @property
+    def ready(self) -> bool:
+        """``True`` una vez completada la primera carga."""
+        return self._ready
+
+    @property
+    def live_rows(self) -> int:
+        return int(self._row_alive[: self._size].sum())
+
+    def snapshot(self) -> dict:
+        """Estado del índice para logs / health checks."""
+        return {
+            "ready": self._ready,
+            "rows": self._size,
+            "live_rows": self.live_rows,
+            "documents": len(self._doc_rows) - (_ORPHAN_DOC_ID in self._doc_rows),
+            "ivf_lists": 0 if self._centroids is None else int(self._centroids.shape[0]),
+            "matrix_mb": round(self._matrix.nbytes / 1_048_576, 1),
+            **self.stats.to_dict(),
+        }
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query_embedding: Sequence[float] | np.ndarray,
+        *,
+        k: int = 30,
+        accessible_doc_ids: Sequence[int] | None = None,
+    ) -> list[tuple[uuid.UUID, float]]:
+        """Top-*k* chunks por similitud coseno, restringidos a *accessible_doc_ids*.
+
+        Mismo contrato de seguridad que ``PgVectorStore.similarity_search``:
+        ``None`` = sin filtro, lista vacía = ningún resultado.
+        """
+        self.stats.searches += 1
+        size = self._size
+        if size == 0 or k <= 0:
+            return []
+
+        query = to_float_array(query_embedding)
+        norm = float(np.linalg.norm(query))
+        if norm > 0:
+            query = query / norm
+
+        mask = self._row_alive[:size].copy()
+        if accessible_doc_ids is not None:
+            ords = [self._doc_ord[d] for d in accessible_doc_ids if d in self._doc_ord]
+            shared = [self._shared_rows[d] for d in accessible_doc_ids if d in self._shared_rows]
+            if not ords and not shared:
+                return []
+            allowed = np.zeros(len(self._doc_ord), dtype=bool)
+            allowed[ords] = True
+            doc_mask = allowed[self._row_doc_ord[:size]]
+            if shared:
+                doc_mask[np.concatenate(shared)] = True
+            mask &= doc_mask
+
+        candidates = int(mask.sum())
+        if candidates == 0:
+            return []
+
+        centroids = self._centroids
+        if centroids is not None and candidates > self._exact_max_rows and self._nprobe < centroids.shape[0]:
+            list_scores = centroids @ query
+            probe = np.argpartition(-list_scores, self._nprobe)[: self._nprobe]
+            probe_mask = np.zeros(centroids.shape[0], dtype=bool)
+            probe_mask[probe] = True
+            ivf_mask = mask & probe_mask[self._row_cluster[:size]]
+            # Con pocas filas en las listas sondeadas, caer a búsqueda exacta
+            if int(ivf_mask.sum()) >= k:
+                self.stats.ivf_searches += 1
+                return self._score_rows(np.flatnonzero(ivf_mask), query, k)
+
+        self.stats.exact_searches += 1
+        return self._score_rows(np.flatnonzero(mask), query, k)
+
+    def _score_rows(self, rows: np.ndarray, query: np.ndarray, k: int) -> list[tuple[uuid.UUID, float]]:
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, rows.shape[0], _SCORE_BLOCK_ROWS):
+            block = rows[start : start + _SCORE_BLOCK_ROWS]
+            scores = self._matrix[block].astype(np.float32) @ query
+            best_rows = np.concatenate([best_rows, block])
+            best_scores = np.concatenate([best_scores, scores])
+            if best_scores.shape[0] > k:
+                keep = np.argpartition(-best_scores, k)[:k]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+        order = np.argsort(-best_scores)
+        results: list[tuple[uuid.UUID, float]] = []
+        for i in order:
+            chunk_id = self._row_chunk_ids[int(best_rows[i])]
+            if chunk_id is not None:
+                results.append((chunk_id, float(best_scores[i])))
+        return results
+
+    # ------------------------------------------------------------------
+    # Load / refresh
+    # ------------------------------------------------------------------
+
+    async def refresh(self, session_maker: async_sessionmaker[AsyncSession]) -> int:
+        """Sincroniza el índice con ``document_chunks``.
+
+        Recarga solo los documentos cuyo fingerprint cambió, elimina los que
+        ya no están activos y (re)entrena el IVF si el corpus creció al doble
+        desde el último entrenamiento.  Retorna la cantidad de documentos
+        recargados o eliminados.
+        """
+        async with self._refresh_lock:
+            t0 = time.monotonic()
+            async with session_maker() as session:
+                result = await session.execute(_FINGERPRINT_SQL)
+                current = {
+                    row.document_id: (row.chunk_count, row.embedded_count, row.version, row.created_at)
+                    for row in result.all()
+                }
+
+                removed = [doc_id for doc_id in self._doc_fingerprints if doc_id not in current]
+                changed = [doc_id for doc_id, fp in current.items() if self._doc_fingerprints.get(doc_id) != fp]
+
+                for doc_id in removed:
+                    self._remove_document(doc_id)
+                    del self._doc_fingerprints[doc_id]
+
+                for start in range(0, len(changed), _LOAD_BATCH_DOCUMENTS):
+                    batch = changed[start : start + _LOAD_BATCH_DOCUMENTS]
+                    rows = (await session.execute(_LOAD_SQL, {"doc_ids": batch})).all()
+                    self._load_rows(batch, rows)
+                    for doc_id in batch:
+                        self._doc_fingerprints[doc_id] = current[doc_id]
+
+                if changed or removed:
+                    self._shared_refs = {}
+                    for row in (await session.execute(_SHARED_REFS_SQL)).all():
+                        self._shared_refs.setdefault(row.document_id, []).append(row.canonical_id)
+                    orphans = (await session.execute(_ORPHAN_CANONICAL_SQL, {"orphan_doc_id": _ORPHAN_DOC_ID})).all()
+                    self._load_rows([_ORPHAN_DOC_ID], orphans)
+
+            if self._size and (self._size - self.live_rows) > self._compact_ratio * self._size:
+                self._compact()
+            if changed or removed:
+                self._rebuild_shared_rows()
+
+            live = self.live_rows
+            if live >= self._ivf_min_rows and (self._centroids is None or live >= 2 * self._trained_rows):
+                await self._train_ivf()
+
+            self._ready = True
+            self.stats.refreshes += 1
+            self.stats.documents_reloaded += len(changed) + len(removed)
+            self.stats.last_refresh_ms = (time.monotonic() - t0) * 1000
+            if changed or removed:
+                logger.info(
+                    "ann_index_refreshed changed=%d removed=%d live_rows=%d duration_ms=%.1f",
+                    len(changed),
+                    len(removed),
+                    live,
+                    self.stats.last_refresh_ms,
+                )
+            return len(changed) + len(removed)
+
+    async def run_refresh_loop(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        interval_seconds: float,
+    ) -> None:
+        """Refresca el índice cada *interval_seconds* hasta ser cancelado."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.refresh(session_maker)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("ann_index_refresh_failed")
+
+    def _load_rows(self, doc_ids: list[int], rows: Sequence[Any]) -> None:
+        for doc_id in doc_ids:
+            self._remove_document(doc_id)
+
+        by_doc: dict[int, list[Any]] = {}
+        for row in rows:
+            by_doc.setdefault(row.document_id, []).append(row)
+
+        for doc_id, doc_rows in by_doc.items():
+            vectors = np.stack([to_float_array(r.embedding) for r in doc_rows])
+            self._append_document(doc_id, [r.id for r in doc_rows], _normalize_rows(vectors))
+
+    def _append_document(self, doc_id: int, chunk_ids: list[uuid.UUID], vectors: np.ndarray) -> None:
+        count = vectors.shape[0]
+        self._ensure_capacity(self._size + count)
+        rows = np.arange(self._size, self._size + count)
+
+        ordinal = self._doc_ord.setdefault(doc_id, len(self._doc_ord))
+        self._matrix[rows] = vectors.astype(np.float16)
+        self._row_doc_ord[rows] = ordinal
+        self._row_alive[rows] = True
+        self._row_cluster[rows] = np.argmax(vectors @ self._centroids.T, axis=1) if self._centroids is not None else 0
+        self._row_chunk_ids.extend(chunk_ids)
+        self._doc_rows[doc_id] = rows
+        self._size += count
+
+    def _remove_document(self, doc_id: int) -> None:
+        rows = self._doc_rows.pop(doc_id, None)
+        if rows is None:
+            return
+        self._row_alive[rows] = False
+        for row in rows:
+            self._row_chunk_ids[int(row)] = None
+
+    def _rebuild_shared_rows(self) -> None:
+        """Traduce ``_shared_refs`` (ids) a filas de la matriz; se llama tras cargar / compactar."""
+        if not self._shared_refs:
+            self._shared_rows = {}
+            return
+        row_of = {chunk_id: row for row, chunk_id in enumerate(self._row_chunk_ids) if chunk_id is not None}
+        shared_rows: dict[int, np.ndarray] = {}
+        for doc_id, chunk_ids in self._shared_refs.items():
+            rows = [row_of[c] for c in chunk_ids if c in row_of]
+            if rows:
+                shared_rows[doc_id] = np.unique(np.asarray(rows, dtype=np.int64))
+        self._shared_rows = shared_rows
+
+    def _ensure_capacity(self, needed: int) -> None:
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 1024)
+        self._matrix = self._grow(self._matrix, new_capacity)
+        self._row_doc_ord = self._grow(self._row_doc_ord, new_capacity)
+        self._row_cluster = self._grow(self._row_cluster, new_capacity)
+        self._row_alive = self._grow(self._row_alive, new_capacity)
+
+    def _grow(self, array: np.ndarray, capacity: int) -> np.ndarray:
+        grown = np.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+        grown[: self._size] = array[: self._size]
+        return grown
+
+    def _compact(self) -> None:
+        keep = np.flatnonzero(self._row_alive[: self._size])
+        remap = np.full(self._size, -1, dtype=np.int64)
+        remap[keep] = np.arange(keep.shape[0])
+
+        self._matrix = self._matrix[keep].copy()
+        self._row_doc_ord = self._row_doc_ord[keep].copy()
+        self._row_cluster = self._row_cluster[keep].copy()
+        self._row_alive = np.ones(keep.shape[0], dtype=bool)
+        self._row_chunk_ids = [self._row_chunk_ids[int(i)] for i in keep]
+        self._doc_rows = {doc_id: remap[rows] for doc_id, rows in self._doc_rows.items()}
+        self._size = keep.shape[0]
+        self._rebuild_shared_rows()
+        logger.info("ann_index_compacted rows=%d", self._size)
+
+    async def _train_ivf(self) -> None:
+        live = np.flatnonzero(self._row_alive[: self._size])
+        nlist = self._nlist or max(int(4 * np.sqrt(live.shape[0])), 1)
+        nlist = min(nlist, live.shape[0])
+        matrix = self._matrix
+
+        def _train() -> tuple[np.ndarray, np.ndarray]:
+            rng = np.random.default_rng(0)
+            sample_size = min(live.shape[0], nlist * _KMEANS_SAMPLE_PER_LIST)
+            sample_rows = rng.choice(live, size=sample_size, replace=False)
+            centroids = _train_spherical_kmeans(matrix[sample_rows].astype(np.float32), nlist)
+            assignment = np.zeros(live.shape[0], dtype=np.int32)
+            for start in range(0, live.shape[0], _SCORE_BLOCK_ROWS):
+                block = live[start : start + _SCORE_BLOCK_ROWS]
+                assignment[start : start + block.shape[0]] = np.argmax(
+                    matrix[block].astype(np.float32) @ centroids.T, axis=1
+                )
+            return centroids, assignment
+
+        t0 = time.monotonic()
+        # CPU-bound: fuera del event loop.  No hay escrituras concurrentes
+        # porque refresh() mantiene el lock durante el entrenamiento.
+        centroids, assignment = await asyncio.to_thread(_train)
+        self._row_cluster[live] = assignment
+        self._centroids = centroids
+        self._trained_rows = live.shape[0]
+        logger.info(
+            "ann_index_ivf_trained nlist=%d rows=%d duration_ms=%.1f",
+            nlist,
+            live.shape[0],
+            (time.monotonic() - t0) * 1000,
+        )
+
+
+# ── Module-level instance (API lifespan) ─────────────────────────────
+
+_vector_index: InProcessVectorIndex | None = None
+
+
+def get_vector_index() -> InProcessVectorIndex | None:
+    """Índice en proceso del proceso actual, o ``None`` si está deshabilitado."""
+    return _vector_index
+
+
+def set_vector_index(index: InProcessVectorIndex | None) -> None:
+    """Publica (o retira, con ``None``) el índice del proceso."""
+    global _vector_index
+    _vector_index = index
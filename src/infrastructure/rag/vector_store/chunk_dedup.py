@@ -0,0 +1,121 @@
+"""Reporte de la deduplicación de chunks entre documentos.
+
+Desde la migración ``e8c1f4a7b3d2`` cada texto distinto de
+``document_chunks`` tiene una sola fila *canónica* con embedding (en HNSW)
+y entrada en el GIN parcial de ``content_tsv``; las repeticiones en otros
+documentos (disclaimers legales, encabezados, tablas de anexos) se guardan
+como referencias sin embedding.
+
+``collect_dedup_stats`` mide qué se ahorra:
+
+* **embeddings** — una referencia es un vector que no se pidió a Gemini ni
+  se guardó (``reference_tokens``: tokens que no se embebieron);
+* **índices** — tamaño real de HNSW/GIN y el estimado que tendrían sin
+  deduplicar (proporcional a las filas que indexarían).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+_STATS_SQL = text("""
+    SELECT
+        count(*)                                                    AS total_rows,
+        count(*) FILTER (WHERE is_canonical)                        AS canonical_rows,
+        count(*) FILTER (WHERE NOT is_canonical)                    AS reference_rows,
+        COALESCE(sum(token_count) FILTER (WHERE NOT is_canonical), 0) AS reference_tokens,
+        count(DISTINCT document_id) FILTER (WHERE NOT is_canonical) AS documents_with_references,
+        pg_relation_size('ix_document_chunks_embedding')            AS hnsw_bytes,
+        pg_relation_size('ix_document_chunks_content_tsv')          AS gin_bytes,
+        pg_total_relation_size('document_chunks')                   AS table_bytes
+    FROM document_chunks
+""")
+
+_TOP_SHARED_SQL = text("""
+    SELECT left(c.content, :preview_chars) AS preview,
+           count(*)                        AS copies,
+           count(DISTINCT r.document_id)   AS documents
+    FROM document_chunks c
+    JOIN document_chunks r ON r.content_hash = c.content_hash
+    WHERE c.is_canonical
+    GROUP BY c.id, c.content
+    HAVING count(*) > 1
+    ORDER BY count(*) DESC
+    LIMIT :limit
+""")
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkDedupStats:
+    """Filas canónicas vs referencias y tamaño de los índices vectorial / BM25."""
+
+    total_rows: int
+    canonical_rows: int
+    reference_rows: int
+    reference_tokens: int
+    documents_with_references: int
+    hnsw_bytes: int
+    gin_bytes: int
+    table_bytes: int
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Fracción de filas que no se embeben ni indexan."""
+        return self.reference_rows / self.total_rows if self.total_rows else 0.0
+
+    def _undeduplicated(self, index_bytes: int) -> int:
+        if not self.canonical_rows:
+            return index_bytes
+        return round(index_bytes * self.total_rows / self.canonical_rows)
+
+    @property
+    def hnsw_bytes_saved(self) -> int:
+        """Estimado: HNSW crece ~lineal con las filas indexadas."""
+        return self._undeduplicated(self.hnsw_bytes) - self.hnsw_bytes
+
+    @property
+    def gin_bytes_saved(self) -> int:
+        return self._undeduplicated(self.gin_bytes) - self.gin_bytes
+
+    def to_dict(self) -> dict:
+        return {
+            "total_rows": self.total_rows,
+            "canonical_rows": self.canonical_rows,
+            "reference_rows": self.reference_rows,
+            "dedup_ratio": round(self.dedup_ratio, 4),
+            "embeddings_avoided": self.reference_rows,
+            "tokens_not_embedded": self.reference_tokens,
+            "documents_with_references": self.documents_with_references,
+            "hnsw_mb": round(self.hnsw_bytes / 1_048_576, 1),
+            "hnsw_mb_saved": round(self.hnsw_bytes_saved / 1_048_576, 1),
+            "gin_mb": round(self.gin_bytes / 1_048_576, 1),
+            "gin_mb_saved": round(self.gin_bytes_saved / 1_048_576, 1),
+            "table_mb": round(self.table_bytes / 1_048_576, 1),
+        }
+
+
+async def collect_dedup_stats(session: AsyncSession) -> ChunkDedupStats:
+    """Cuenta filas canónicas / referencias y mide los índices (un full scan de ``document_chunks``)."""
+    row = (await session.execute(_STATS_SQL)).one()
+    return ChunkDedupStats(
+        total_rows=row.total_rows,
+        canonical_rows=row.canonical_rows,
+        reference_rows=row.reference_rows,
+        reference_tokens=int(row.reference_tokens),
+        documents_with_references=row.documents_with_references,
+        hnsw_bytes=row.hnsw_bytes,
+        gin_bytes=row.gin_bytes,
+        table_bytes=row.table_bytes,
+    )
+
+
+async def top_shared_chunks(session: AsyncSession, *, limit: int = 10, preview_chars: int = 80) -> list[dict]:
+    """Textos más repetidos entre documentos (para decidir qué boilerplate filtrar)."""
+    result = await session.execute(_TOP_SHARED_SQL, {"limit": limit, "preview_chars": preview_chars})
+    return [{"preview": row.preview, "copies": row.copies, "documents": row.documents} for row in result]
@@ -0,0 +1,37 @@
+"""Fingerprint de un conjunto ordenado de chunks y sus versiones.
+
+Clave compartida por los caches que dependen de qué chunks se eligieron y en
+qué orden: ``RerankCache`` (candidatos del reranker) y ``SemanticAnswerCache``
+(fuentes citadas por posición).  Re-indexar un documento (ids nuevos) o
+subir la ``version`` de un chunk cambia el fingerprint.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+_CHUNK_VERSIONS_SQL = text("SELECT id, version FROM document_chunks WHERE id = ANY(:ids)")
+
+
+async def source_fingerprint(session: AsyncSession, chunk_ids: Sequence[str]) -> str | None:
+    """Fingerprint of the ordered *chunk_ids* and their current versions.
+
+    Returns ``None`` when a chunk no longer exists (the context is stale and
+    nothing keyed on it must be cached).
+    """
+    if not chunk_ids:
+        return None
+    result = await session.execute(_CHUNK_VERSIONS_SQL, {"ids": list(chunk_ids)})
+    versions = {str(row.id): row.version for row in result}
+    if len(versions) != len(set(chunk_ids)):
+        return None
+    payload = "\x1f".join(f"{chunk_id}:{versions[chunk_id]}" for chunk_id in chunk_ids)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
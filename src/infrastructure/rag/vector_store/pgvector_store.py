@@ -7,6 +7,24 @@ Writes normalized ``halfvec(768)`` embeddings into the existing
 * **BM25 full-text search** via tsvector/GIN index (migration 004).
 * **Hybrid search** via the SQL function ``hybrid_search`` that fuses both
   rankings with Reciprocal Rank Fusion (RRF, k=60).
+* **Bulk ingestion** via binary ``COPY`` (``add_chunks_bulk``), one
+  round-trip per document instead of one ``INSERT`` per chunk.
+* **Permission-aware hybrid search** (``acl_hybrid_search``): the ACL is a
+  cached temp table instead of a ``bigint[]`` parameter and the vector leg
+  strategy (exact scan / iterative HNSW) is chosen by ACL selectivity.
+
+**Cross-document dedup** (migration ``e8c1f4a7b3d2``): identical chunk text
+is embedded and indexed once — only the *canonical* row of each
+``content_hash`` carries the embedding and the GIN entry; the other rows
+are per-document references.  Every read path therefore searches canonical
+rows, applies the ACL and ``is_active`` through *any* row that shares the
+text (``_visible_sql``) and attributes each hit to one visible row
+(``_representative_sql``), so a text repeated across documents comes back
+once and only if the user can see at least one of its documents.
+
+Every embedding parameter is bound with ``halfvec_param`` so it travels in
+pgvector's binary wire format; the ``CAST(... AS halfvec)`` in the SQL only
+fixes the parameter type, Postgres never parses a text literal.
 
 See: rag-indexing/SKILL.md  (PgVectorStore section)
      rag-retrieval/SKILL.md  (Búsqueda Híbrida section)
@@ -16,19 +34,64 @@ See: rag-indexing/SKILL.md  (PgVectorStore section)
 
 from __future__ import annotations
 
+import dataclasses
 import json
 import logging
+import uuid
 from typing import TYPE_CHECKING
 
 from sqlalchemy import text
 
+from src.infrastructure.database.acl_temp_table import ACL_TABLE, load_acl
+from src.infrastructure.database.vector_codec import halfvec_param, to_float_array
+from src.infrastructure.rag.vector_store.acl_search import AclSearchPlan, AclSearchStrategy, plan_acl_search
+
 if TYPE_CHECKING:
-    import uuid
+    from collections.abc import Sequence
 
     from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
 
+# Column order for COPY-based bulk ingestion (``content_tsv`` is GENERATED)
+_BULK_COLUMNS = (
+    "id",
+    "document_id",
+    "chunk_index",
+    "content",
+    "embedding",
+    "area",
+    "token_count",
+    "metadata",
+)
+
+
+def _visible_sql(ref_filter: str, hash_expr: str = "dc.content_hash") -> str:
+    """``EXISTS``: some row with this text belongs to an active document passing *ref_filter*."""
+    return (
+        "EXISTS (SELECT 1 FROM document_chunks ref JOIN documents rd ON rd.id = ref.document_id "  # noqa: S608
+        f"WHERE ref.content_hash = {hash_expr} AND rd.is_active = true AND {ref_filter})"
+    )
+
+
+def _representative_sql(ref_filter: str, hash_expr: str = "dc.content_hash") -> str:
+    """``JOIN LATERAL ... rep``: the visible row a text is attributed to (the canonical one if visible).
+
+    Being an inner join it also drops texts with no visible row.
+    """
+    return f"""
+        JOIN LATERAL (
+            SELECT ref.id, ref.document_id, ref.chunk_index, ref.content, ref.area, ref.metadata, rd.filename
+            FROM document_chunks ref
+            JOIN documents rd ON rd.id = ref.document_id
+            WHERE ref.content_hash = {hash_expr}
+              AND rd.is_active = true
+              AND {ref_filter}
+            ORDER BY ref.is_canonical DESC, ref.document_id, ref.chunk_index
+            LIMIT 1
+        ) rep ON true
+    """  # noqa: S608
+
 
 class PgVectorStore:
     """Thin wrapper around pgvector for document-chunk embeddings.
@@ -70,8 +133,6 @@ class PgVectorStore:
         chunk_ids: list[uuid.UUID] = []
 
         for chunk_index, content, embedding, area, token_count, metadata in chunks:
-            embedding_str = "[" + ",".join(map(str, embedding)) + "]"
-
             result = await self._session.execute(
                 text("""
                     INSERT INTO document_chunks
@@ -79,12 +140,11 @@ class PgVectorStore:
                     VALUES
                         (:doc_id, :idx, :content, CAST(:embedding AS halfvec), :area, :tokens, :meta)
                     RETURNING id
-                """),
+                """).bindparams(halfvec_param("embedding", embedding)),
                 {
                     "doc_id": document_id,
                     "idx": chunk_index,
                     "content": content,
-                    "embedding": embedding_str,
                     "area": area,
                     "tokens": token_count,
                     "meta": json.dumps(metadata or {}),
@@ -99,6 +159,137 @@ class PgVectorStore:
         )
         return chunk_ids
 
+    async def add_chunks_bulk(
+        self,
+        document_id: int,
+        chunks: list[tuple[int, str, list[float] | None, str, int | None, dict | None]],
+    ) -> list[uuid.UUID]:
+        """Insert all chunks of a document with a single binary ``COPY``.
+
+        Same contract as ``add_chunks`` but streams every row in one
+        round-trip.  Embeddings are sent as binary ``halfvec`` through the
+        pgvector codecs registered on the asyncpg connection (see
+        ``database/vector_codec.py``) instead of decimal text literals.
+
+        UUIDs are generated client-side so they can be returned in input
+        order (``COPY`` has no ``RETURNING``).  The ``COPY`` runs on the
+        session's own connection, so it joins the caller's transaction.
+        ``COPY`` fires the dedup trigger per row: a chunk whose text is
+        already indexed is stored as a reference, so its embedding may be
+        ``None`` (see ``embedded_content_hashes``) and is copied as ``NULL``.
+
+        Returns
+        -------
+        list[uuid.UUID]
+            The UUIDs of the inserted rows, in the same order as *chunks*.
+        """
+        if not chunks:
+            return []
+
+        chunk_ids = [uuid.uuid4() for _ in chunks]
+        records = [
+            (
+                chunk_id,
+                document_id,
+                chunk_index,
+                content,
+                None if embedding is None else to_float_array(embedding),
+                area,
+                token_count,
+                json.dumps(metadata or {}),
+            )
+            for chunk_id, (chunk_index, content, embedding, area, token_count, metadata) in zip(
+                chunk_ids, chunks, strict=True
+            )
+        ]
+
+        connection = await self._session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        if driver_connection is None:
+            raise RuntimeError("document_chunks COPY requires a live asyncpg connection")
+        await driver_connection.copy_records_to_table(
+            "document_chunks",
+            records=records,
+            columns=list(_BULK_COLUMNS),
+        )
+
+        logger.info(
+            "chunks_stored_bulk document_id=%s count=%d",
+            document_id,
+            len(chunk_ids),
+        )
+        return chunk_ids
+
+    # ------------------------------------------------------------------
+    # Write path — cross-document dedup
+    # ------------------------------------------------------------------
+
+    async def embedded_content_hashes(
+        self,
+        hashes: Sequence[bytes],
+        *,
+        exclude_document_id: int | None = None,
+    ) -> set[bytes]:
+        """Subset of *hashes* whose text already has an embedded canonical row.
+
+        Chunks with these texts need no embedding: they are stored as
+        references (``embedding=None``) to the canonical row.  Pass the
+        document being (re)indexed as ``exclude_document_id``: its own rows
+        are replaced and cannot serve as canonical.
+        """
+        if not hashes:
+            return set()
+        result = await self._session.execute(
+            text("""
+                SELECT content_hash
+                FROM document_chunks
+                WHERE content_hash = ANY(:hashes)
+                  AND is_canonical
+                  AND embedding IS NOT NULL
+                  AND document_id IS DISTINCT FROM :exclude_doc_id
+            """),
+            {"hashes": list(set(hashes)), "exclude_doc_id": exclude_document_id},
+        )
+        return {bytes(row.content_hash) for row in result}
+
+    async def chunks_missing_embedding(self, document_id: int) -> list[tuple[uuid.UUID, str]]:
+        """Canonical rows of *document_id* without an embedding, as ``(id, content)``.
+
+        Only happens when a chunk was stored without embedding because its
+        text was already indexed, and the canonical row it relied on was
+        deleted concurrently (with no other reference to promote).
+        """
+        result = await self._session.execute(
+            text("""
+                SELECT id, content
+                FROM document_chunks
+                WHERE document_id = :doc_id
+                  AND is_canonical
+                  AND embedding IS NULL
+            """),
+            {"doc_id": document_id},
+        )
+        return [(row.id, row.content) for row in result]
+
+    async def set_embeddings(self, embeddings: list[tuple[uuid.UUID, list[float]]]) -> None:
+        """Fill the embedding of existing canonical rows (``chunks_missing_embedding``)."""
+        for chunk_id, embedding in embeddings:
+            await self._session.execute(
+                text("UPDATE document_chunks SET embedding = CAST(:embedding AS halfvec) WHERE id = :id").bindparams(
+                    halfvec_param("embedding", embedding)
+                ),
+                {"id": chunk_id},
+            )
+
+    async def count_reference_chunks(self, document_id: int) -> int:
+        """Chunks of *document_id* stored as references to a text indexed elsewhere."""
+        result = await self._session.execute(
+            text("SELECT count(*) FROM document_chunks WHERE document_id = :doc_id AND NOT is_canonical"),
+            {"doc_id": document_id},
+        )
+        return int(result.scalar_one())
+
     # ------------------------------------------------------------------
     # Read path — vector search
     # ------------------------------------------------------------------
@@ -144,41 +335,36 @@ class PgVectorStore:
         effective_limit = limit if limit is not None else k
         effective_area = area if area is not None else filter_area
 
-        embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
-
-        where_clauses = ["dc.embedding IS NOT NULL", "d.is_active = true"]
-        params: dict = {
-            "embedding": embedding_str,
-            "limit": effective_limit,
-        }
+        ref_clauses = ["TRUE"]
+        params: dict = {"limit": effective_limit}
 
         if accessible_doc_ids is not None:
-            where_clauses.append("dc.document_id = ANY(:doc_ids)")
+            ref_clauses.append("ref.document_id = ANY(:doc_ids)")
             params["doc_ids"] = accessible_doc_ids
 
         if effective_area:
-            where_clauses.append("dc.area = :area")
+            ref_clauses.append("ref.area = :area")
             params["area"] = effective_area
 
-        where_sql = " AND ".join(where_clauses)
+        representative = _representative_sql(" AND ".join(ref_clauses))
 
         result = await self._session.execute(
             text(f"""
                 SELECT
-                    dc.id,
-                    dc.document_id,
-                    dc.chunk_index,
+                    rep.id,
+                    rep.document_id,
+                    rep.chunk_index,
                     dc.content,
-                    dc.area,
-                    dc.metadata,
-                    d.filename                                          AS document_name,
+                    rep.area,
+                    rep.metadata,
+                    rep.filename                                        AS document_name,
                     1 - (dc.embedding <=> CAST(:embedding AS halfvec)) AS score
                 FROM document_chunks dc
-                JOIN documents d ON dc.document_id = d.id
-                WHERE {where_sql}
+                {representative}
+                WHERE dc.embedding IS NOT NULL
                 ORDER BY dc.embedding <=> CAST(:embedding AS halfvec)
                 LIMIT :limit
-            """),  # noqa: S608
+            """).bindparams(halfvec_param("embedding", query_embedding)),  # noqa: S608
             params,
         )
 
@@ -197,6 +383,73 @@ class PgVectorStore:
             for row in rows
         ]
 
+    async def fetch_chunks_by_ids(
+        self,
+        scored_ids: list[tuple[uuid.UUID, float]],
+        *,
+        accessible_doc_ids: list[int] | None = None,
+    ) -> list[dict]:
+        """Hydrate ``(chunk_id, score)`` pairs from an external vector index.
+
+        Used when the vector leg is served by ``InProcessVectorIndex``.  Keeps
+        the input order and drops chunks that no longer exist or whose text
+        is in no active document within ``accessible_doc_ids`` (the
+        permission filter is re-applied here, not trusted from the index).
+        Each hit is attributed to its representative visible row.
+
+        Returns
+        -------
+        list[dict]
+            Same shape as ``similarity_search``.
+        """
+        if not scored_ids:
+            return []
+
+        params: dict = {"ids": [chunk_id for chunk_id, _ in scored_ids]}
+        ref_filter = "TRUE"
+        if accessible_doc_ids is not None:
+            ref_filter = "ref.document_id = ANY(:doc_ids)"
+            params["doc_ids"] = accessible_doc_ids
+
+        result = await self._session.execute(
+            text(f"""
+                SELECT
+                    dc.id          AS source_id,
+                    rep.id,
+                    rep.document_id,
+                    rep.chunk_index,
+                    dc.content,
+                    rep.area,
+                    rep.metadata,
+                    rep.filename   AS document_name
+                FROM document_chunks dc
+                {_representative_sql(ref_filter)}
+                WHERE dc.id = ANY(:ids)
+            """),  # noqa: S608
+            params,
+        )
+        rows_by_id = {row.source_id: row for row in result.fetchall()}
+        hits: list[dict] = []
+        seen: set = set()
+        for chunk_id, score in scored_ids:
+            row = rows_by_id.get(chunk_id)
+            if row is None or row.id in seen:
+                continue
+            seen.add(row.id)
+            hits.append(
+                {
+                    "id": row.id,
+                    "document_id": row.document_id,
+                    "chunk_index": row.chunk_index,
+                    "content": row.content,
+                    "area": row.area,
+                    "metadata": row.metadata,
+                    "document_name": row.document_name,
+                    "score": score,
+                }
+            )
+        return hits
+
     # ------------------------------------------------------------------
     # Read path — BM25 search
     # ------------------------------------------------------------------
@@ -231,36 +484,35 @@ class PgVectorStore:
             Dicts with keys ``id``, ``document_id``, ``chunk_index``,
             ``content``, ``area``, ``metadata``, ``score``.
         """
-        where_clauses = [
-            "d.is_active = true",
-            "dc.content_tsv @@ plainto_tsquery('spanish', :query)",
-        ]
+        ref_clauses = ["TRUE"]
         params: dict = {"query": query_text, "limit": k}
 
         if accessible_doc_ids is not None:
-            where_clauses.append("dc.document_id = ANY(:doc_ids)")
+            ref_clauses.append("ref.document_id = ANY(:doc_ids)")
             params["doc_ids"] = accessible_doc_ids
 
         if filter_area:
-            where_clauses.append("dc.area = :area")
+            ref_clauses.append("ref.area = :area")
             params["area"] = filter_area
 
-        where_sql = " AND ".join(where_clauses)
+        representative = _representative_sql(" AND ".join(ref_clauses))
 
+        # Solo filas canónicas: son las que tiene el índice GIN (parcial)
         result = await self._session.execute(
             text(f"""
                 SELECT
-                    dc.id,
-                    dc.document_id,
-                    dc.chunk_index,
+                    rep.id,
+                    rep.document_id,
+                    rep.chunk_index,
                     dc.content,
-                    dc.area,
-                    dc.metadata,
-                    d.filename                                                        AS document_name,
+                    rep.area,
+                    rep.metadata,
+                    rep.filename                                                      AS document_name,
                     ts_rank_cd(dc.content_tsv, plainto_tsquery('spanish', :query))   AS score
                 FROM document_chunks dc
-                JOIN documents d ON dc.document_id = d.id
-                WHERE {where_sql}
+                {representative}
+                WHERE dc.is_canonical
+                  AND dc.content_tsv @@ plainto_tsquery('spanish', :query)
                 ORDER BY ts_rank_cd(dc.content_tsv, plainto_tsquery('spanish', :query)) DESC
                 LIMIT :limit
             """),  # noqa: S608
@@ -297,8 +549,9 @@ class PgVectorStore:
     ) -> list[dict]:
         """Hybrid search delegating to the PostgreSQL ``hybrid_search`` function.
 
-        The SQL function (migration 004) runs vector search and BM25 in
-        parallel CTEs and fuses rankings with Reciprocal Rank Fusion (k=60).
+        The SQL function (migration 004, deduplicated in ``e8c1f4a7b3d2``)
+        runs vector search and BM25 in parallel CTEs and fuses rankings with
+        Reciprocal Rank Fusion (k=60), one row per distinct text.
 
         Parameters
         ----------
@@ -319,8 +572,6 @@ class PgVectorStore:
             Dicts with keys ``id``, ``document_id``, ``chunk_index``,
             ``content``, ``area``, ``metadata``, ``document_name``, ``score``.
         """
-        embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
-
         result = await self._session.execute(
             text("""
                 SELECT * FROM hybrid_search(
@@ -330,9 +581,8 @@ class PgVectorStore:
                     :rrf_k,
                     :doc_ids
                 )
-            """),
+            """).bindparams(halfvec_param("embedding", query_embedding)),
             {
-                "embedding": embedding_str,
                 "query_text": query_text,
                 "match_count": match_count,
                 "rrf_k": rrf_k,
@@ -354,3 +604,188 @@ class PgVectorStore:
             }
             for row in rows
         ]
+
+    async def acl_hybrid_search(
+        self,
+        query_embedding: list[float],
+        query_text: str,
+        *,
+        accessible_doc_ids: Sequence[int] | None,
+        match_count: int = 50,
+        rrf_k: int = 60,
+        vector_k: int = 30,
+        bm25_k: int = 30,
+        ef_search: int = 100,
+        exact_max_chunks: int = 5000,
+        max_scan_tuples: int = 20000,
+        acl_cache_keys: int = 32,
+    ) -> tuple[list[dict], AclSearchPlan]:
+        """Hybrid search (vector + BM25 + RRF) with a selectivity-driven ACL filter.
+
+        Same result shape and fusion as ``hybrid_search`` but:
+
+        * the ACL is loaded once per connection into a temp table keyed by a
+          hash of the ids (``acl_temp_table.load_acl``) and applied as a
+          semi-join, instead of a ``bigint[]`` parameter per query;
+        * the vector leg strategy comes from ``plan_acl_search`` — exact scan
+          over the accessible chunks for tiny ACLs, ``hnsw.iterative_scan``
+          otherwise (or a raised ``ef_search`` on pgvector < 0.8).
+
+        Parameters
+        ----------
+        accessible_doc_ids:
+            Accessible document IDs (ideally a ``DocIdSet``, used without
+            re-sorting).  ``None`` = no filter (tests/dev only).
+        ef_search:
+            Base ``hnsw.ef_search`` already set by the caller; only raised
+            for ``hnsw_post_filter``.
+        exact_max_chunks:
+            Accessible-chunk threshold below which the vector leg is exact.
+        max_scan_tuples:
+            ``hnsw.max_scan_tuples`` bound for ``iterative_hnsw``.
+        acl_cache_keys:
+            ACLs kept per pooled connection.
+
+        Returns
+        -------
+        tuple[list[dict], AclSearchPlan]
+            Rows as in ``hybrid_search`` and the plan that produced them.
+        """
+        plan = await plan_acl_search(
+            self._session,
+            accessible_doc_ids,
+            k=vector_k,
+            base_ef_search=ef_search,
+            exact_max_chunks=exact_max_chunks,
+        )
+
+        params: dict = {
+            "query_text": query_text,
+            "match_count": match_count,
+            "rrf_k": rrf_k,
+            "vector_k": vector_k,
+            "bm25_k": bm25_k,
+        }
+
+        # Filtro sobre la fila que referencia el texto (ref), no sobre la canónica
+        ref_acl = "TRUE"
+        if plan.strategy != AclSearchStrategy.UNFILTERED:
+            params["acl_key"], cache_hit = await load_acl(
+                self._session,
+                accessible_doc_ids or [],
+                max_keys=acl_cache_keys,
+            )
+            plan = dataclasses.replace(plan, acl_cache_hit=cache_hit)
+            ref_acl = (
+                f"EXISTS (SELECT 1 FROM {ACL_TABLE} acl "  # noqa: S608
+                "WHERE acl.acl_key = :acl_key AND acl.document_id = ref.document_id)"
+            )
+        visible = _visible_sql(ref_acl)
+
+        # SET no acepta bind params; los valores son ints controlados por settings.
+        if plan.strategy == AclSearchStrategy.ITERATIVE_HNSW:
+            await self._session.execute(text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+            await self._session.execute(text(f"SET LOCAL hnsw.max_scan_tuples = {int(max_scan_tuples)}"))
+        elif plan.strategy == AclSearchStrategy.HNSW_POST_FILTER and plan.ef_search:
+            await self._session.execute(text(f"SET LOCAL hnsw.ef_search = {int(plan.ef_search)}"))
+
+        if plan.strategy == AclSearchStrategy.EXACT_SCAN:
+            # Conducido desde el ACL (btree en document_id): distancia solo
+            # sobre los textos de los chunks accesibles, sin pasar por HNSW.
+            vector_source = (
+                "(SELECT DISTINCT ref.content_hash "  # noqa: S608
+                f"FROM {ACL_TABLE} acl "
+                "JOIN document_chunks ref ON ref.document_id = acl.document_id "
+                "JOIN documents rd ON rd.id = ref.document_id AND rd.is_active = true "
+                "WHERE acl.acl_key = :acl_key) accessible "
+                "JOIN document_chunks dc ON dc.content_hash = accessible.content_hash AND dc.is_canonical"
+            )
+            vector_filter = "TRUE"
+            vector_limit = ""
+        else:
+            vector_source = "document_chunks dc"
+            vector_filter = visible
+            # ORDER BY sobre el operador para que el planner use el índice HNSW
+            vector_limit = "ORDER BY dc.embedding <=> CAST(:embedding AS halfvec) LIMIT :vector_k"
+
+        result = await self._session.execute(
+            text(f"""
+                WITH
+                vector_candidates AS MATERIALIZED (
+                    SELECT dc.content_hash, dc.embedding <=> CAST(:embedding AS halfvec) AS distance
+                    FROM {vector_source}
+                    WHERE dc.embedding IS NOT NULL
+                      AND {vector_filter}
+                    {vector_limit}
+                ),
+                vector_ranked AS (
+                    SELECT content_hash, ROW_NUMBER() OVER (ORDER BY min(distance)) AS rank
+                    FROM (SELECT content_hash, distance FROM vector_candidates ORDER BY distance LIMIT :vector_k) v
+                    GROUP BY content_hash
+                ),
+                bm25_candidates AS MATERIALIZED (
+                    SELECT dc.content_hash,
+                           ts_rank_cd(dc.content_tsv, plainto_tsquery('spanish', :query_text)) AS score
+                    FROM document_chunks dc
+                    WHERE dc.is_canonical
+                      AND dc.content_tsv @@ plainto_tsquery('spanish', :query_text)
+                      AND {visible}
+                    ORDER BY score DESC
+                    LIMIT :bm25_k
+                ),
+                bm25_ranked AS (
+                    SELECT content_hash, ROW_NUMBER() OVER (ORDER BY max(score) DESC) AS rank
+                    FROM bm25_candidates
+                    GROUP BY content_hash
+                ),
+                fused AS (
+                    SELECT content_hash, sum(1.0 / (:rrf_k + rank)) AS rrf_score
+                    FROM (
+                        SELECT content_hash, rank FROM vector_ranked
+                        UNION ALL
+                        SELECT content_hash, rank FROM bm25_ranked
+                    ) ranked
+                    GROUP BY content_hash
+                    ORDER BY rrf_score DESC
+                    LIMIT :match_count
+                )
+                SELECT
+                    rep.id,
+                    rep.document_id,
+                    rep.chunk_index,
+                    rep.content,
+                    rep.area::text AS area,
+                    rep.metadata,
+                    rep.filename   AS document_name,
+                    f.rrf_score
+                FROM fused f
+                {_representative_sql(ref_acl, "f.content_hash")}
+                ORDER BY f.rrf_score DESC
+            """).bindparams(halfvec_param("embedding", query_embedding)),  # noqa: S608
+            params,
+        )
+
+        rows = result.fetchall()
+        logger.info(
+            "acl_hybrid_search strategy=%s accessible_docs=%d accessible_chunks=%d "
+            "selectivity=%.4f acl_cache_hit=%s results=%d",
+            plan.strategy,
+            plan.accessible_docs,
+            plan.accessible_chunks,
+            plan.selectivity,
+            plan.acl_cache_hit,
+            len(rows),
+        )
+        return [
+            {
+                "id": row.id,
+                "document_id": row.document_id,
+                "chunk_index": row.chunk_index,
+                "content": row.content,
+                "area": row.area,
+                "metadata": row.metadata,
+                "document_name": row.document_name,
+                "score": float(row.rrf_score),
+            }
+            for row in rows
+        ], plan
@@ -0,0 +1,127 @@
+"""Mantenimiento de ``user_accessible_docs`` desde el espejo de seguridad.
+
+``user_accessible_docs`` precalcula, por usuario, los documentos con
+SeeContents (``permissions & 2``) a través de sus grupos transitivos
+(``kuaf_membership_flat``).  Con ``permission_materialized_docs_enabled``
+``PermissionResolver`` lo lee con un lookup por PK en lugar de expandir grupos.
+
+La tabla se mantiene incrementalmente en la misma transacción que el sync:
+
+* cambios de ACL / nodos → se recalculan las filas de esos ``data_id``;
+* cambios de membresía → se recalculan los usuarios debajo de los miembros
+  afectados (el miembro mismo, o todos los usuarios de un subgrupo);
+* full sync → reconstrucción completa.
+
+``refresh_membership_view`` debe correr antes, ya que todo se deriva de
+``kuaf_membership_flat``.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, cast
+
+from sqlalchemy import text
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import CursorResult, Result
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Filas (usuario, documento) con SeeContents; {where} acota el recálculo
+_INSERT_SQL = """
+    INSERT INTO user_accessible_docs (user_id, data_id)
+    SELECT DISTINCT f.member_id, acl.data_id
+    FROM dtreeacl acl
+    JOIN kuaf_membership_flat f ON acl.right_id = f.group_id
+    JOIN kuaf k ON k.id = f.member_id
+    WHERE (acl.permissions & 2) = 2
+      AND COALESCE(k.type, 0) = 0
+      {where}
+    ON CONFLICT DO NOTHING
+"""
+
+
+def _rowcount(result: Result[Any]) -> int:
+    """Filas afectadas por un ``INSERT`` / ``DELETE`` ejecutado con ``session.execute``."""
+    return int(cast("CursorResult[Any]", result).rowcount)
+
+
+@dataclass
+class AccessDelta:
+    """IDs afectados por un sync: documentos con ACL cambiada y miembros cuya membresía cambió."""
+
+    data_ids: set[int] = field(default_factory=set)
+    member_ids: set[int] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.data_ids or self.member_ids)
+
+
+class UserAccessMaterializer:
+    """Reconstruye o actualiza ``user_accessible_docs`` dentro de la sesión del sync."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def refresh_membership_view(self) -> None:
+        """Refresca ``kuaf_membership_flat`` (sin bloquear lecturas)."""
+        await self._session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY kuaf_membership_flat"))
+        logger.info("kuaf_membership_flat_refreshed")
+
+    async def rebuild_all(self) -> int:
+        """Reconstrucción completa (full sync)."""
+        await self._session.execute(text("DELETE FROM user_accessible_docs"))
+        result = await self._session.execute(text(_INSERT_SQL.format(where="")))
+        rows = _rowcount(result)
+        logger.info("user_accessible_docs_rebuilt rows=%d", rows)
+        return rows
+
+    async def refresh_documents(self, data_ids: set[int]) -> int:
+        """Recalcula las filas de los documentos cuya ACL o existencia cambió."""
+        if not data_ids:
+            return 0
+        params = {"data_ids": sorted(data_ids)}
+        await self._session.execute(text("DELETE FROM user_accessible_docs WHERE data_id = ANY(:data_ids)"), params)
+        result = await self._session.execute(
+            text(_INSERT_SQL.format(where="AND acl.data_id = ANY(:data_ids)")),
+            params,
+        )
+        return _rowcount(result)
+
+    async def refresh_users(self, user_ids: set[int]) -> int:
+        """Recalcula todas las filas de los usuarios indicados."""
+        if not user_ids:
+            return 0
+        params = {"user_ids": sorted(user_ids)}
+        await self._session.execute(text("DELETE FROM user_accessible_docs WHERE user_id = ANY(:user_ids)"), params)
+        result = await self._session.execute(
+            text(_INSERT_SQL.format(where="AND f.member_id = ANY(:user_ids)")),
+            params,
+        )
+        return _rowcount(result)
+
+    async def affected_users(self, member_ids: set[int]) -> set[int]:
+        """Usuarios debajo de *member_ids* (cada miembro y, si es grupo, sus usuarios transitivos)."""
+        if not member_ids:
+            return set()
+        result = await self._session.execute(
+            text("SELECT DISTINCT member_id FROM kuaf_membership_flat WHERE group_id = ANY(:member_ids)"),
+            {"member_ids": sorted(member_ids)},
+        )
+        # Un usuario eliminado de kuaf ya no aparece en la vista: se recalcula igual (queda vacío)
+        return {row[0] for row in result.all()} | member_ids
+
+    async def apply(self, delta: AccessDelta) -> dict[str, int]:
+        """Aplica un ``AccessDelta`` incremental (delta sync)."""
+        users = await self.affected_users(delta.member_ids)
+        counts = {
+            "users": len(users),
+            "user_rows": await self.refresh_users(users),
+            "documents": len(delta.data_ids),
+            "document_rows": await self.refresh_documents(delta.data_ids),
+        }
+        logger.info("user_accessible_docs_updated counts=%s", counts)
+        return counts
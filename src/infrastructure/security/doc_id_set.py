@@ -0,0 +1,202 @@
+"""Compact sorted set of document IDs for permission caching.
+
+``PermissionCache`` used to store each user's accessible documents as a JSON
+list and parse it back into Python ints on every turn — for the largest
+groups (50k+ documents) that is ~500 KB of JSON and tens of milliseconds of
+``json.loads`` per request.  ``DocIdSet`` keeps the IDs as one sorted, unique
+``int64`` numpy array and serializes it with the smaller of two containers
+(roaring-style choice, at whole-set granularity):
+
+* **delta** — first ID + deltas between consecutive IDs, fixed width
+  (``uint8``/``uint16``/``uint32``/``uint64``, the narrowest that fits).
+  Decoding is a single ``np.cumsum``.
+* **bitset** — first ID + span + packed bits (``np.packbits``).  Wins when the
+  IDs are dense within their range.
+
+Set operations (``intersect``, ``union``, ``difference``, membership) run on
+the arrays directly, without materializing Python lists.  ``DocIdSet`` is a
+``Sequence[int]`` so existing callers that iterate or call ``list()`` keep
+working.
+
+Wire format (little-endian)::
+
+    u8 format (1 = delta, 2 = bitset) | u32 count | i64 first | payload
+    delta payload:  u8 width | (count - 1) x width-byte deltas
+    bitset payload: u32 span | ceil(span / 8) bytes
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterable, Iterator, Sequence
+from typing import overload
+
+import numpy as np
+
+_FORMAT_DELTA = 1
+_FORMAT_BITSET = 2
+_HEADER = struct.Struct("<BIq")
+_DELTA_WIDTH = struct.Struct("<B")
+_BITSET_SPAN = struct.Struct("<I")
+_DELTA_DTYPES = {1: "<u1", 2: "<u2", 4: "<u4", 8: "<u8"}
+
+
+class DocIdSet(Sequence[int]):
+    """Sorted, unique set of document IDs backed by an ``int64`` array."""
+
+    __slots__ = ("_ids",)
+
+    def __init__(self, ids: np.ndarray) -> None:
+        """Wrap an already sorted and unique ``int64`` array (not copied)."""
+        self._ids = ids
+
+    @classmethod
+    def from_iterable(cls, ids: Iterable[int]) -> DocIdSet:
+        """Build from any iterable of ints (sorts and de-duplicates)."""
+        if isinstance(ids, DocIdSet):
+            return ids
+        if isinstance(ids, np.ndarray):
+            return cls(np.unique(ids.astype(np.int64, copy=False)))
+        return cls(np.unique(np.fromiter(ids, dtype=np.int64)))
+
+    @classmethod
+    def empty(cls) -> DocIdSet:
+        return cls(np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def union_all(cls, sets: Iterable[DocIdSet]) -> DocIdSet:
+        """Union of many sets in a single sort (e.g. one set per group)."""
+        arrays = [s._ids for s in sets if len(s)]
+        if not arrays:
+            return cls.empty()
+        if len(arrays) == 1:
+            return cls(arrays[0])
+        return cls(np.unique(np.concatenate(arrays)))
+
+    # ------------------------------------------------------------------
+    # Sequence protocol
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return int(self._ids.shape[0])
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids.tolist())
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> DocIdSet: ...
+
+    def __getitem__(self, index: int | slice) -> int | DocIdSet:
+        if isinstance(index, slice):
+            return DocIdSet(self._ids[index])
+        return int(self._ids[index])
+
+    def __contains__(self, doc_id: object) -> bool:
+        if not isinstance(doc_id, int | np.integer) or not len(self):
+            return False
+        pos = int(np.searchsorted(self._ids, doc_id))
+        return pos < len(self) and int(self._ids[pos]) == doc_id
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DocIdSet):
+            return NotImplemented
+        return bool(np.array_equal(self._ids, other._ids))
+
+    def __hash__(self) -> int:
+        return hash(self._ids.tobytes())
+
+    def __repr__(self) -> str:
+        return f"DocIdSet(len={len(self)})"
+
+    # ------------------------------------------------------------------
+    # Set operations (no list materialization)
+    # ------------------------------------------------------------------
+
+    def intersect(self, other: DocIdSet | Iterable[int]) -> DocIdSet:
+        other_ids = DocIdSet.from_iterable(other)._ids
+        return DocIdSet(np.intersect1d(self._ids, other_ids, assume_unique=True))
+
+    def union(self, other: DocIdSet | Iterable[int]) -> DocIdSet:
+        other_ids = DocIdSet.from_iterable(other)._ids
+        return DocIdSet(np.union1d(self._ids, other_ids))
+
+    def difference(self, other: DocIdSet | Iterable[int]) -> DocIdSet:
+        other_ids = DocIdSet.from_iterable(other)._ids
+        return DocIdSet(np.setdiff1d(self._ids, other_ids, assume_unique=True))
+
+    def to_numpy(self) -> np.ndarray:
+        """Underlying sorted ``int64`` array (read-only view semantics)."""
+        return self._ids
+
+    def tolist(self) -> list[int]:
+        result: list[int] = self._ids.tolist()
+        return result
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        """Serialize with the smaller of the delta / bitset containers."""
+        count = len(self)
+        if count == 0:
+            return _HEADER.pack(_FORMAT_DELTA, 0, 0) + _DELTA_WIDTH.pack(1)
+
+        first = int(self._ids[0])
+        deltas = np.diff(self._ids)
+        max_delta = int(deltas.max()) if deltas.size else 0
+        width = next(w for w in (1, 2, 4, 8) if max_delta < 1 << (8 * w))
+        delta_size = (count - 1) * width
+
+        span = int(self._ids[-1]) - first + 1
+        bitset_size = (span + 7) // 8
+        if span < 1 << 32 and bitset_size + _BITSET_SPAN.size < delta_size + _DELTA_WIDTH.size:
+            bits = np.zeros(span, dtype=bool)
+            bits[self._ids - first] = True
+            return _HEADER.pack(_FORMAT_BITSET, count, first) + _BITSET_SPAN.pack(span) + np.packbits(bits).tobytes()
+
+        payload = deltas.astype(_DELTA_DTYPES[width]).tobytes()
+        return _HEADER.pack(_FORMAT_DELTA, count, first) + _DELTA_WIDTH.pack(width) + payload
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> DocIdSet:
+        """Inverse of ``to_bytes``.
+
+        Raises
+        ------
+        ValueError
+            If *data* is not a valid serialized ``DocIdSet``.
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("DocIdSet payload too short")
+        fmt, count, first = _HEADER.unpack_from(data)
+        offset = _HEADER.size
+        if count == 0:
+            return cls.empty()
+        if count == 1:
+            return cls(np.array([first], dtype=np.int64))
+
+        if fmt == _FORMAT_DELTA:
+            (width,) = _DELTA_WIDTH.unpack_from(data, offset)
+            if width not in _DELTA_DTYPES:
+                raise ValueError(f"Invalid DocIdSet delta width: {width}")
+            deltas = np.frombuffer(data, dtype=_DELTA_DTYPES[width], count=count - 1, offset=offset + 1)
+            ids = np.empty(count, dtype=np.int64)
+            ids[0] = first
+            np.cumsum(deltas.astype(np.int64), out=ids[1:])
+            ids[1:] += first
+            return cls(ids)
+
+        if fmt == _FORMAT_BITSET:
+            (span,) = _BITSET_SPAN.unpack_from(data, offset)
+            packed = np.frombuffer(data, dtype=np.uint8, offset=offset + _BITSET_SPAN.size)
+            bits = np.unpackbits(packed, count=span)
+            ids = np.flatnonzero(bits).astype(np.int64) + first
+            if ids.shape[0] != count:
+                raise ValueError("DocIdSet bitset count mismatch")
+            return cls(ids)
+
+        raise ValueError(f"Unknown DocIdSet format: {fmt}")
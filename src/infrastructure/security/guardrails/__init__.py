@@ -4,6 +4,7 @@ Input guardrails validate user queries before processing.
 Output guardrails validate LLM responses before delivery.
 Faithfulness judge scores response fidelity via LLM-as-judge.
 PII detector scans output for Argentine banking PII.
+Stream guard applies PII redaction and faithfulness incrementally while streaming.
 """
 
 from src.infrastructure.security.guardrails.faithfulness_judge import (
@@ -26,6 +27,10 @@ from src.infrastructure.security.guardrails.pii_detector import (
     PiiDetectionResult,
     PiiOutputDetector,
 )
+from src.infrastructure.security.guardrails.stream_guard import (
+    StreamGuardStats,
+    StreamingOutputGuard,
+)
 from src.infrastructure.security.guardrails.topic_guard import (
     TopicCategory,
     TopicGuard,
@@ -44,6 +49,8 @@ __all__ = [
     "PiiAction",
     "PiiDetectionResult",
     "PiiOutputDetector",
+    "StreamGuardStats",
+    "StreamingOutputGuard",
     "ThreatCategory",
     "TopicCategory",
     "TopicGuard",
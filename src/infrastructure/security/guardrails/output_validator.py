@@ -144,37 +144,12 @@ class OutputValidator:
 
         return OutputGuardrailResult(is_safe=True)
 
-    # ── Private methods ──────────────────────────────────────────
-
-    @staticmethod
-    def _check_pii(response: str) -> OutputGuardrailResult:
-        """Detect Argentine PII patterns in the response."""
-        detected: list[str] = []
-        for pattern, pii_type in _PII_PATTERNS:
-            if pattern.search(response):
-                detected.append(pii_type)
-
-        if detected:
-            return OutputGuardrailResult(
-                is_safe=False,
-                reason=OutputRejectionReason.SENSITIVE_DATA,
-                detail=f"Detected sensitive data: {', '.join(detected)}",
-                detected_pii_types=tuple(detected),
-            )
-
-        return OutputGuardrailResult(is_safe=True)
-
-    def _check_faithfulness(self, response: str, context: str) -> OutputGuardrailResult:
-        """Heuristic faithfulness: keyword overlap between response and context.
+    def score_keywords(self, response_keywords: set[str], context_keywords: set[str]) -> OutputGuardrailResult:
+        """Faithfulness check over precomputed keyword sets.
 
-        Extracts significant keywords (length >= MIN_KEYWORD_LENGTH) from
-        both texts, then computes the fraction of response keywords that
-        appear in the context.  If the response has no significant keywords,
-        it is considered faithful (edge case: very short responses).
+        Same rule as ``_check_faithfulness``; lets callers extract keywords
+        incrementally (e.g. per sentence while the response is streamed).
         """
-        response_keywords = _extract_keywords(response)
-        context_keywords = _extract_keywords(context)
-
         if not response_keywords:
             # Very short / trivial response — consider faithful.
             return OutputGuardrailResult(is_safe=True, faithfulness_score=1.0)
@@ -202,11 +177,41 @@ class OutputValidator:
 
         return OutputGuardrailResult(is_safe=True, faithfulness_score=score)
 
+    # ── Private methods ──────────────────────────────────────────
+
+    @staticmethod
+    def _check_pii(response: str) -> OutputGuardrailResult:
+        """Detect Argentine PII patterns in the response."""
+        detected: list[str] = []
+        for pattern, pii_type in _PII_PATTERNS:
+            if pattern.search(response):
+                detected.append(pii_type)
+
+        if detected:
+            return OutputGuardrailResult(
+                is_safe=False,
+                reason=OutputRejectionReason.SENSITIVE_DATA,
+                detail=f"Detected sensitive data: {', '.join(detected)}",
+                detected_pii_types=tuple(detected),
+            )
+
+        return OutputGuardrailResult(is_safe=True)
+
+    def _check_faithfulness(self, response: str, context: str) -> OutputGuardrailResult:
+        """Heuristic faithfulness: keyword overlap between response and context.
+
+        Extracts significant keywords (length >= MIN_KEYWORD_LENGTH) from
+        both texts, then computes the fraction of response keywords that
+        appear in the context.  If the response has no significant keywords,
+        it is considered faithful (edge case: very short responses).
+        """
+        return self.score_keywords(extract_keywords(response), extract_keywords(context))
+
 
 # ── Helpers ──────────────────────────────────────────────────────────
 
 
-def _extract_keywords(text: str) -> set[str]:
+def extract_keywords(text: str) -> set[str]:
     """Extract significant lowercase keywords from text.
 
     Filters out words shorter than MIN_KEYWORD_LENGTH and pure numbers.
@@ -190,11 +190,7 @@ class PiiOutputDetector:
                 pii_count=0,
             )
 
-        # Collect false-positive spans to exclude
-        fp_spans = self._collect_false_positive_spans(text)
-
-        # Find all PII matches, excluding false positives
-        matches = self._find_matches(text, fp_spans)
+        matches = self.find_matches(text)
 
         if not matches:
             return PiiDetectionResult(
@@ -226,6 +222,19 @@ class PiiOutputDetector:
             pii_count=pii_count,
         )
 
+    def find_matches(self, text: str) -> list[PiiMatch]:
+        """Return PII matches in *text* (false positives excluded), sorted by position.
+
+        Pure scan: does not apply actions nor update ``detection_count``.
+        Used by the streaming output guard on its look-behind window.
+        """
+        fp_spans = self._collect_false_positive_spans(text)
+        return self._find_matches(text, fp_spans)
+
+    def surrogate(self, pii_type: str) -> str:
+        """Surrogate token that replaces a PII of *pii_type* when redacting."""
+        return self._SURROGATE_MAP.get(pii_type, "[REDACTED]")
+
     # ── Private helpers ──────────────────────────────────────────
 
     @staticmethod
@@ -283,6 +292,5 @@ class PiiOutputDetector:
         # Process in reverse order to preserve indices
         result = text
         for match in reversed(matches):
-            surrogate = self._SURROGATE_MAP.get(match.pii_type, "[REDACTED]")
-            result = result[: match.start] + surrogate + result[match.end :]
+            result = result[: match.start] + self.surrogate(match.pii_type) + result[match.end :]
         return result
@@ -0,0 +1,256 @@
+"""Incremental output guardrail for streamed LLM responses.
+
+``OutputValidator`` runs after the full answer, so in a token stream any PII
+would already be on the client's screen when the verdict arrives, and
+holding the whole stream back would destroy time-to-first-token.
+``StreamingOutputGuard`` sits between the LLM stream and the SSE events:
+
+1. **PII, in flight** — every token is appended to a small pending buffer
+   and scanned with the ``PiiOutputDetector`` patterns over a look-behind
+   window (already-released text + pending text), so false-positive
+   exclusions such as ``Ley 25.326`` still see their keyword.  Only the
+   text older than ``lookbehind_chars`` is released, never cutting through
+   a word/number, and a match that reaches the pending tail is held until
+   it cannot grow any more.  Released matches are replaced by their
+   surrogate (``[DNI]``, ``[CUIT]``...), so raw PII never leaves the server.
+   Reaching ``block_threshold`` (or a detector configured to ``block``)
+   stops the stream.
+2. **Faithfulness, per sentence** — keywords of each completed sentence
+   are added to the response keyword set as it streams, while the context
+   keywords are extracted once in a worker thread, concurrently with
+   generation.  The final verdict (``OutputValidator.score_keywords``) is
+   the same lexical rule as the post-hoc check, with no re-scan at the end.
+
+Per-token cost is bounded by the window size (``max_hold_chars`` caps the
+pending buffer for long unbroken tokens) and is measured in
+``StreamGuardStats``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from src.infrastructure.security.guardrails.output_validator import (
+    OutputGuardrailResult,
+    OutputRejectionReason,
+    extract_keywords,
+)
+from src.infrastructure.security.guardrails.pii_detector import PiiAction
+
+if TYPE_CHECKING:
+    from src.infrastructure.security.guardrails.output_validator import OutputValidator
+    from src.infrastructure.security.guardrails.pii_detector import PiiMatch, PiiOutputDetector
+
+# Default look-behind: longer than any bounded PII pattern (CBU = 22 digits,
+# phones with separators ~30 chars); emails are held as a whole word anyway.
+DEFAULT_LOOKBEHIND_CHARS = 64
+
+# Sentence boundary: terminal punctuation followed by whitespace, or newline.
+_SENTENCE_END = re.compile(r"[.!?;:](?=\s)|\n")
+
+
+# ── Stats ────────────────────────────────────────────────────────────
+
+
+@dataclass
+class StreamGuardStats:
+    """Per-response cost of the incremental guard."""
+
+    tokens: int = 0
+    sentences: int = 0
+    pii_redacted: int = 0
+    max_held_chars: int = 0
+    scan_us: list[float] = field(default_factory=list, repr=False)
+
+    def _percentile(self, pct: float) -> float:
+        if not self.scan_us:
+            return 0.0
+        ordered = sorted(self.scan_us)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def to_dict(self) -> dict:
+        return {
+            "tokens": self.tokens,
+            "sentences": self.sentences,
+            "pii_redacted": self.pii_redacted,
+            "max_held_chars": self.max_held_chars,
+            "scan_p50_us": round(self._percentile(50), 1),
+            "scan_p99_us": round(self._percentile(99), 1),
+            "scan_max_us": round(max(self.scan_us, default=0.0), 1),
+            "scan_total_ms": round(sum(self.scan_us) / 1000, 2),
+        }
+
+
+# ── Guard ────────────────────────────────────────────────────────────
+
+
+class StreamingOutputGuard:
+    """Redacts PII and tracks faithfulness while a response is streamed.
+
+    Parameters
+    ----------
+    context:
+        RAG context the response should be faithful to.
+    detector:
+        PII detector whose patterns, action and ``block_threshold`` apply.
+    validator:
+        Output validator providing the faithfulness threshold.
+    lookbehind_chars:
+        Characters held back before release (and re-scanned as context).
+    max_hold_chars:
+        Hard cap on held characters; above it text is released even in
+        the middle of a word.  Default: ``4 * lookbehind_chars``.
+
+    Notes
+    -----
+    Must be created inside a running event loop (the context keyword
+    extraction is scheduled in a worker thread at construction).
+    """
+
+    def __init__(
+        self,
+        *,
+        context: str,
+        detector: PiiOutputDetector,
+        validator: OutputValidator,
+        lookbehind_chars: int = DEFAULT_LOOKBEHIND_CHARS,
+        max_hold_chars: int | None = None,
+    ) -> None:
+        self._detector = detector
+        self._validator = validator
+        self._lookbehind = lookbehind_chars
+        self._max_hold = max_hold_chars or 4 * lookbehind_chars
+        self._pending = ""
+        self._tail = ""
+        self._emitted: list[str] = []
+        self._pii_types: list[str] = []
+        self._blocked = False
+        self._sentence_buf = ""
+        self._response_keywords: set[str] = set()
+        self._context_task: asyncio.Future[set[str]] | None = None
+        if validator.enable_faithfulness:
+            self._context_task = asyncio.ensure_future(asyncio.to_thread(extract_keywords, context))
+        self.stats = StreamGuardStats()
+
+    @property
+    def blocked(self) -> bool:
+        """True once the PII block threshold was reached (stop streaming)."""
+        return self._blocked
+
+    @property
+    def emitted_text(self) -> str:
+        """Text released to the client so far (PII already redacted)."""
+        return "".join(self._emitted)
+
+    @property
+    def pii_types(self) -> tuple[str, ...]:
+        return tuple(dict.fromkeys(self._pii_types))
+
+    def feed(self, token: str) -> str:
+        """Add a streamed token; return the text that is safe to send now (may be empty)."""
+        if self._blocked:
+            return ""
+        t0 = time.perf_counter()
+        self.stats.tokens += 1
+        self._track_sentences(token)
+        self._pending += token
+        released = self._release(final=False)
+        self.stats.max_held_chars = max(self.stats.max_held_chars, len(self._pending))
+        self.stats.scan_us.append((time.perf_counter() - t0) * 1_000_000)
+        return released
+
+    def finish(self) -> str:
+        """End of stream: release (redacted) whatever is still held."""
+        if self._sentence_buf.strip():
+            self._add_sentence(self._sentence_buf)
+        self._sentence_buf = ""
+        if self._blocked:
+            return ""
+        return self._release(final=True)
+
+    async def result(self, *, check_faithfulness: bool = True) -> OutputGuardrailResult:
+        """Final verdict: PII block first, then faithfulness of the whole response."""
+        if self._blocked:
+            return OutputGuardrailResult(
+                is_safe=False,
+                reason=OutputRejectionReason.SENSITIVE_DATA,
+                detail=f"PII block threshold reached in stream: {', '.join(self.pii_types)}",
+                detected_pii_types=self.pii_types,
+            )
+        if not check_faithfulness or self._context_task is None:
+            return OutputGuardrailResult(is_safe=True, detected_pii_types=self.pii_types)
+        context_keywords = await self._context_task
+        return self._validator.score_keywords(self._response_keywords, context_keywords)
+
+    # ── Private helpers ──────────────────────────────────────────
+
+    def _release(self, *, final: bool) -> str:
+        window = self._tail + self._pending
+        offset = len(self._tail)
+        # Matches fully inside the already-released tail were handled before
+        matches = [m for m in self._detector.find_matches(window) if m.end > offset]
+
+        cut = len(window)
+        if not final:
+            cut = max(offset, len(window) - self._lookbehind)
+            # Never split a word/number: it may still become (part of) a PII
+            while offset < cut < len(window) and not window[cut - 1].isspace() and not window[cut].isspace():
+                cut -= 1
+            # Hold matches that reach the pending tail (e.g. 11 digits may become a CBU)
+            for m in matches:
+                if m.end > cut:
+                    cut = min(cut, max(m.start, offset))
+            if len(window) - cut > self._max_hold:
+                cut = len(window) - self._lookbehind
+        if cut <= offset:
+            return ""
+
+        released = [m for m in matches if m.start < cut]
+        if released and self._should_block(len(released)):
+            self._blocked = True
+            self._pending = ""
+            return ""
+
+        text = self._redact(window, offset, cut, released)
+        self._pii_types.extend(m.pii_type for m in released)
+        self.stats.pii_redacted += len(released)
+        self._pending = window[cut:]
+        self._tail = window[max(0, cut - self._lookbehind) : cut]
+        self._emitted.append(text)
+        return text
+
+    def _should_block(self, new_matches: int) -> bool:
+        if self._detector.default_action == PiiAction.BLOCK:
+            return True
+        return len(self._pii_types) + new_matches >= self._detector.block_threshold
+
+    def _redact(self, window: str, offset: int, cut: int, matches: list[PiiMatch]) -> str:
+        parts: list[str] = []
+        pos = offset
+        for m in matches:
+            start = max(m.start, offset)
+            parts.append(window[pos:start])
+            parts.append(self._detector.surrogate(m.pii_type))
+            pos = min(m.end, cut)
+        parts.append(window[pos:cut])
+        return "".join(parts)
+
+    def _track_sentences(self, token: str) -> None:
+        self._sentence_buf += token
+        last_end = -1
+        for m in _SENTENCE_END.finditer(self._sentence_buf):
+            last_end = m.end()
+        if last_end == -1:
+            return
+        self._add_sentence(self._sentence_buf[:last_end])
+        self._sentence_buf = self._sentence_buf[last_end:]
+
+    def _add_sentence(self, sentence: str) -> None:
+        if self._context_task is None:
+            return
+        self.stats.sentences += 1
+        self._response_keywords |= extract_keywords(sentence)
@@ -1,47 +1,170 @@
-import json
+"""Caché de permisos: L1 en proceso + Redis.
+
+Los documentos accesibles por usuario se guardan como ``DocIdSet`` serializado
+(deltas de ancho fijo o bitset, ver ``doc_id_set``) en lugar de una lista JSON:
+para grupos con 50k+ documentos el payload baja de ~500 KB a decenas de KB y
+decodificar es un ``np.cumsum`` en vez de ``json.loads`` + ``int()`` por ID.
+
+Delante de Redis hay un LRU en proceso con TTL corto
+(``permission_cache_l1_ttl_seconds``) que evita el round-trip y la
+decodificación en turnos consecutivos del mismo usuario.  ``invalidate_user``
+limpia el L1 local; otros workers ven el cambio cuando vence su TTL.
+
+Además se cachean, compartidos entre usuarios, los documentos de cada
+``right_id`` (usuario o grupo de ``dtreeacl``) y los ``right_id`` de cada
+usuario.  Ambas claves llevan la *época ACL* (``perm:acl:epoch``), que el
+sync xECM incrementa tras cada cambio en el espejo: una época nueva invalida
+todo sin borrar claves, y las viejas expiran por TTL.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
 from datetime import timedelta
 
 from redis.asyncio import Redis
 
 from src.config.settings import settings
+from src.infrastructure.security.doc_id_set import DocIdSet
+
+
+def _decode_doc_ids(data: bytes | str | None) -> DocIdSet | None:
+    """``DocIdSet`` de un valor leído de Redis (``None`` si la clave no existe)."""
+    if data is None:
+        return None
+    if not isinstance(data, bytes):
+        raise TypeError("PermissionCache requires a Redis client without decode_responses")
+    return DocIdSet.from_bytes(data)
 
 
 class PermissionCache:
-    """Caché de permisos basada en Redis."""
+    """Caché de permisos basada en Redis con L1 en proceso."""
+
+    def __init__(
+        self,
+        redis_client: Redis | None = None,
+        *,
+        l1_max_entries: int | None = None,
+        l1_ttl_seconds: float | None = None,
+    ) -> None:
+        """Inicializa la caché. Si no se provee cliente, usa la URL de settings.
 
-    def __init__(self, redis_client: Redis | None = None) -> None:
-        """Inicializa la caché. Si no se provee cliente, usa la URL de settings."""
-        self.redis = redis_client or Redis.from_url(settings.redis_url.get_secret_value(), decode_responses=True)
+        El cliente no debe usar ``decode_responses``: los sets de documentos
+        se guardan como bytes.
+        """
+        self.redis = redis_client or Redis.from_url(settings.redis_url.get_secret_value(), decode_responses=False)
         self.default_ttl = timedelta(minutes=5)
+        self.l1_max_entries = settings.permission_cache_l1_max_entries if l1_max_entries is None else l1_max_entries
+        self.l1_ttl_seconds = settings.permission_cache_l1_ttl_seconds if l1_ttl_seconds is None else l1_ttl_seconds
+        self.group_ttl = timedelta(seconds=settings.permission_group_cache_ttl_seconds)
+        self._l1: OrderedDict[int, tuple[float, DocIdSet]] = OrderedDict()
 
     def _get_user_docs_key(self, user_id: int) -> str:
+        # v2: DocIdSet binario (v1 era una lista JSON sin sufijo)
+        return f"perm:user:{user_id}:docs:v2"
+
+    def _get_legacy_user_docs_key(self, user_id: int) -> str:
         return f"perm:user:{user_id}:docs"
 
     def _get_user_doc_access_key(self, user_id: int, document_id: int | str) -> str:
         return f"perm:user:{user_id}:doc:{document_id}"
 
-    async def get_accessible_document_ids(self, user_id: int) -> list[int] | None:
-        """Obtiene la lista de IDs accesibles para un usuario desde la caché."""
+    def _get_acl_epoch_key(self) -> str:
+        return "perm:acl:epoch"
+
+    def _get_right_docs_key(self, epoch: int, right_id: int) -> str:
+        return f"perm:acl:{epoch}:right:{right_id}:docs"
+
+    def _get_user_rights_key(self, epoch: int, user_id: int) -> str:
+        return f"perm:acl:{epoch}:user:{user_id}:rights"
+
+    def _l1_get(self, user_id: int) -> DocIdSet | None:
+        entry = self._l1.get(user_id)
+        if entry is None:
+            return None
+        expires_at, doc_ids = entry
+        if time.monotonic() >= expires_at:
+            del self._l1[user_id]
+            return None
+        self._l1.move_to_end(user_id)
+        return doc_ids
+
+    def _l1_put(self, user_id: int, doc_ids: DocIdSet) -> None:
+        if self.l1_max_entries <= 0 or self.l1_ttl_seconds <= 0:
+            return
+        self._l1[user_id] = (time.monotonic() + self.l1_ttl_seconds, doc_ids)
+        self._l1.move_to_end(user_id)
+        while len(self._l1) > self.l1_max_entries:
+            self._l1.popitem(last=False)
+
+    async def get_accessible_document_ids(self, user_id: int) -> DocIdSet | None:
+        """Obtiene el set de IDs accesibles para un usuario desde la caché."""
+        doc_ids = self._l1_get(user_id)
+        if doc_ids is not None:
+            return doc_ids
+
         key = self._get_user_docs_key(user_id)
-        data = await self.redis.get(key)
-        if data is not None:
-            return [int(doc_id) for doc_id in json.loads(data)]
-        return None
+        doc_ids = _decode_doc_ids(await self.redis.get(key))
+        if doc_ids is None:
+            return None
+        self._l1_put(user_id, doc_ids)
+        return doc_ids
 
     async def set_accessible_document_ids(
-        self, user_id: int, document_ids: list[int], ttl: timedelta | None = None
+        self, user_id: int, document_ids: DocIdSet | list[int], ttl: timedelta | None = None
     ) -> None:
-        """Guarda la lista de IDs accesibles para un usuario en la caché."""
+        """Guarda el set de IDs accesibles para un usuario en la caché."""
+        doc_ids = DocIdSet.from_iterable(document_ids)
         key = self._get_user_docs_key(user_id)
         expiry = ttl or self.default_ttl
-        await self.redis.set(key, json.dumps(document_ids), ex=expiry)
+        await self.redis.set(key, doc_ids.to_bytes(), ex=expiry)
+        self._l1_put(user_id, doc_ids)
+
+    async def get_acl_epoch(self) -> int:
+        """Época actual del espejo de permisos (0 si nunca se publicó un cambio)."""
+        val = await self.redis.get(self._get_acl_epoch_key())
+        return int(val) if val is not None else 0
+
+    async def bump_acl_epoch(self) -> int:
+        """Invalida las cachés por grupo y de membresía de todos los usuarios."""
+        epoch = int(await self.redis.incr(self._get_acl_epoch_key()))
+        self._l1.clear()
+        return epoch
+
+    async def get_user_rights(self, user_id: int, epoch: int) -> DocIdSet | None:
+        """``right_id`` del usuario (él mismo + grupos transitivos) cacheados en *epoch*."""
+        return _decode_doc_ids(await self.redis.get(self._get_user_rights_key(epoch, user_id)))
+
+    async def set_user_rights(self, user_id: int, epoch: int, right_ids: DocIdSet) -> None:
+        await self.redis.set(self._get_user_rights_key(epoch, user_id), right_ids.to_bytes(), ex=self.group_ttl)
+
+    async def get_right_document_ids(self, right_ids: Iterable[int], epoch: int) -> dict[int, DocIdSet]:
+        """Documentos cacheados por ``right_id`` (un solo ``MGET``); omite los ausentes."""
+        ids = list(right_ids)
+        if not ids:
+            return {}
+        values = await self.redis.mget([self._get_right_docs_key(epoch, right_id) for right_id in ids])
+        return {
+            right_id: doc_ids
+            for right_id, data in zip(ids, values, strict=True)
+            if (doc_ids := _decode_doc_ids(data)) is not None
+        }
+
+    async def set_right_document_ids(self, documents: dict[int, DocIdSet], epoch: int) -> None:
+        """Guarda los documentos de varios ``right_id`` en un pipeline."""
+        if not documents:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for right_id, doc_ids in documents.items():
+                pipe.set(self._get_right_docs_key(epoch, right_id), doc_ids.to_bytes(), ex=self.group_ttl)
+            await pipe.execute()
 
     async def get_can_access(self, user_id: int, document_id: int) -> bool | None:
         """Verifica si el acceso a un documento está cacheado."""
         key = self._get_user_doc_access_key(user_id, document_id)
         val = await self.redis.get(key)
         if val is not None:
-            return str(val) == "1"
+            return val in (b"1", "1")
         return None
 
     async def set_can_access(
@@ -55,8 +178,10 @@ class PermissionCache:
 
     async def invalidate_user(self, user_id: int) -> None:
         """Invalida toda la caché de permisos de un usuario."""
-        # Borra lista de documentos
-        await self.redis.delete(self._get_user_docs_key(user_id))
+        self._l1.pop(user_id, None)
+
+        # Borra set de documentos (formato actual y legado)
+        await self.redis.delete(self._get_user_docs_key(user_id), self._get_legacy_user_docs_key(user_id))
 
         # Borra accesos específicos
         pattern = self._get_user_doc_access_key(user_id, "*")
@@ -1,11 +1,12 @@
 """Servicio de resolución de permisos basado en el Security Mirror."""
 
 import logging
-from collections.abc import Sequence
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config.settings import settings
+from src.infrastructure.security.doc_id_set import DocIdSet
 from src.infrastructure.security.group_resolver import GroupResolver
 from src.infrastructure.security.permission_cache import PermissionCache
 
@@ -73,8 +74,19 @@ class PermissionResolver:
 
         return has_access
 
-    async def get_accessible_document_ids(self, user_id: int, use_cte: bool = False) -> Sequence[int]:
-        """Obtiene la lista de documentos accesibles para un usuario."""
+    async def get_accessible_document_ids(self, user_id: int, use_cte: bool = False) -> DocIdSet:
+        """Obtiene el set (ordenado, sin duplicados) de documentos accesibles para un usuario.
+
+        En un miss de la caché por usuario se resuelve, en orden de preferencia:
+
+        1. ``user_accessible_docs`` (si ``permission_materialized_docs_enabled``):
+           un lookup por PK.
+        2. Unión de los sets por ``right_id`` cacheados en Redis (compartidos
+           entre usuarios de los mismos grupos); solo los ``right_id`` ausentes
+           van a ``dtreeacl``.  La membresía (CTE o vista) también se cachea por
+           época, así que la CTE recursiva corre como mucho una vez por usuario
+           y sync.
+        """
         try:
             cached_docs = await self.cache.get_accessible_document_ids(user_id)
             if cached_docs is not None:
@@ -82,31 +94,10 @@ class PermissionResolver:
         except Exception as e:
             logger.warning(f"Error accediendo a caché Redis para documentos: {e}")
 
-        if use_cte:
-            groups = await self.group_resolver.resolve_all_groups(user_id)
-            all_rights = [*list(groups), user_id]
-            query = text(
-                """
-                SELECT DISTINCT acl.data_id
-                FROM dtreeacl acl
-                WHERE acl.right_id = ANY(:rights)
-                  AND (acl.permissions & 2) = 2
-                """
-            )
-            result = await self.db.execute(query, {"rights": all_rights})
-            doc_ids = [row[0] for row in result.all()]
+        if settings.permission_materialized_docs_enabled:
+            doc_ids = await self._load_materialized(user_id)
         else:
-            query = text(
-                """
-                SELECT DISTINCT acl.data_id
-                FROM dtreeacl acl
-                JOIN kuaf_membership_flat f ON acl.right_id = f.group_id
-                WHERE f.member_id = :user_id
-                  AND (acl.permissions & 2) = 2
-                """
-            )
-            result = await self.db.execute(query, {"user_id": user_id})
-            doc_ids = [row[0] for row in result.all()]
+            doc_ids = await self._resolve_via_rights(user_id, use_cte)
 
         try:
             await self.cache.set_accessible_document_ids(user_id, doc_ids)
@@ -114,3 +105,77 @@ class PermissionResolver:
             logger.warning(f"Error seteando caché Redis para documentos: {e}")
 
         return doc_ids
+
+    async def _load_materialized(self, user_id: int) -> DocIdSet:
+        result = await self.db.execute(
+            text("SELECT data_id FROM user_accessible_docs WHERE user_id = :user_id ORDER BY data_id"),
+            {"user_id": user_id},
+        )
+        return DocIdSet.from_iterable(row[0] for row in result.all())
+
+    async def _resolve_rights(self, user_id: int, use_cte: bool) -> DocIdSet:
+        """``right_id`` del usuario: él mismo más sus grupos transitivos."""
+        if use_cte:
+            groups = await self.group_resolver.resolve_all_groups(user_id)
+            return DocIdSet.from_iterable([*groups, user_id])
+        result = await self.db.execute(
+            text("SELECT group_id FROM kuaf_membership_flat WHERE member_id = :user_id"),
+            {"user_id": user_id},
+        )
+        return DocIdSet.from_iterable(row[0] for row in result.all())
+
+    async def _resolve_via_rights(self, user_id: int, use_cte: bool) -> DocIdSet:
+        epoch: int | None = None
+        rights: DocIdSet | None = None
+        try:
+            epoch = await self.cache.get_acl_epoch()
+            rights = await self.cache.get_user_rights(user_id, epoch)
+        except Exception as e:
+            logger.warning(f"Error accediendo a caché Redis para membresía: {e}")
+
+        if rights is None:
+            rights = await self._resolve_rights(user_id, use_cte)
+            if epoch is not None:
+                try:
+                    await self.cache.set_user_rights(user_id, epoch, rights)
+                except Exception as e:
+                    logger.warning(f"Error seteando caché Redis para membresía: {e}")
+
+        return await self._documents_for_rights(rights, epoch)
+
+    async def _documents_for_rights(self, rights: DocIdSet, epoch: int | None) -> DocIdSet:
+        """Unión de los documentos de cada ``right_id``; consulta solo los que no están en caché."""
+        per_right: dict[int, DocIdSet] = {}
+        if epoch is not None:
+            try:
+                per_right = await self.cache.get_right_document_ids(rights, epoch)
+            except Exception as e:
+                logger.warning(f"Error accediendo a caché Redis para grupos: {e}")
+
+        missing = [right_id for right_id in rights if right_id not in per_right]
+        if missing:
+            result = await self.db.execute(
+                text(
+                    """
+                    SELECT acl.right_id, array_agg(DISTINCT acl.data_id ORDER BY acl.data_id) AS data_ids
+                    FROM dtreeacl acl
+                    WHERE acl.right_id = ANY(:rights)
+                      AND (acl.permissions & 2) = 2
+                    GROUP BY acl.right_id
+                    """
+                ),
+                {"rights": missing},
+            )
+            # Los right_id sin filas también se cachean (set vacío)
+            fetched = {right_id: DocIdSet.empty() for right_id in missing}
+            for row in result.all():
+                fetched[row.right_id] = DocIdSet.from_iterable(row.data_ids)
+            per_right.update(fetched)
+            if epoch is not None:
+                try:
+                    await self.cache.set_right_document_ids(fetched, epoch)
+                except Exception as e:
+                    logger.warning(f"Error seteando caché Redis para grupos: {e}")
+
+        logger.debug("permission_rights_resolved rights=%d cached=%d", len(rights), len(rights) - len(missing))
+        return DocIdSet.union_all(per_right.values())
@@ -0,0 +1,85 @@
+"""Tests de ``IndexingPipeline``: camino feliz y cierre ante fallas de una etapa."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+
+import pytest
+from src.application.services.indexing_pipeline import IndexingPipeline
+
+pytestmark = pytest.mark.unit
+
+
+@dataclass
+class _Chunk:
+    text: str
+    token_count: int = 1
+    metadata: dict = field(default_factory=lambda: {"area": "riesgos"})
+
+
+def _chunks(n: int):
+    for i in range(n):
+        yield _Chunk(text=f"chunk {i}")
+
+
+async def _embed(texts: list[str]) -> list[list[float]]:
+    await asyncio.sleep(0)
+    return [[0.0] for _ in texts]
+
+
+async def test_pipeline_stores_every_chunk_in_order() -> None:
+    stored: list[int] = []
+
+    async def store(tuples):
+        stored.extend(position for position, *_ in tuples)
+        return list(range(len(tuples)))
+
+    pipeline = IndexingPipeline(
+        embed=_embed, store=store, session_lock=asyncio.Lock(), batch_size=10, queue_size=2, embed_workers=1
+    )
+    result = await pipeline.run(_chunks(95))
+
+    assert stored == list(range(95))
+    assert len(result.chunk_ids) == 95
+    assert result.tokens_total == 95
+    assert result.areas_distribution == {"riesgos": 95}
+    assert result.metrics.store.batches == 10
+
+
+async def test_pipeline_store_failure_propagates_without_hanging() -> None:
+    async def store(tuples):
+        raise RuntimeError("copy failed")
+
+    pipeline = IndexingPipeline(
+        embed=_embed, store=store, session_lock=asyncio.Lock(), batch_size=10, queue_size=2, embed_workers=2
+    )
+    with pytest.raises(RuntimeError, match="copy failed"):
+        await asyncio.wait_for(pipeline.run(_chunks(1000)), timeout=5)
+
+
+async def test_pipeline_embed_failure_propagates_without_hanging() -> None:
+    async def embed(texts):
+        raise RuntimeError("quota exceeded")
+
+    async def store(tuples):
+        return []
+
+    pipeline = IndexingPipeline(
+        embed=embed, store=store, session_lock=asyncio.Lock(), batch_size=10, queue_size=2, embed_workers=2
+    )
+    with pytest.raises(RuntimeError, match="quota exceeded"):
+        await asyncio.wait_for(pipeline.run(_chunks(1000)), timeout=5)
+
+
+async def test_pipeline_chunker_failure_propagates() -> None:
+    def broken_chunks():
+        yield _Chunk(text="ok")
+        raise ValueError("corrupt page")
+
+    async def store(tuples):
+        return list(range(len(tuples)))
+
+    pipeline = IndexingPipeline(embed=_embed, store=store, session_lock=asyncio.Lock(), batch_size=10, queue_size=2)
+    with pytest.raises(ValueError, match="corrupt page"):
+        await asyncio.wait_for(pipeline.run(broken_chunks()), timeout=5)